@@ -28,8 +28,7 @@
 #
 # --------------------------------------------------------------------------------------------------------------
 
-import os, sys, platform, shlex, subprocess, shutil
-import pypandoc
+import os, sys, platform, shlex, subprocess, shutil, hashlib, fnmatch
 import colorama as col
 
 col.init(autoreset=True)
@@ -81,6 +80,13 @@ class CExtendedSetup():
             listCmdLineParts.append(os.environ["BUNDLE_VERSION"])
         if "BUNDLE_VERSION_DATE" in os.environ:
             listCmdLineParts.append(os.environ["BUNDLE_VERSION_DATE"])
+        # the PDF file within the package folder is reused, in case of the build manifest written by the previous build
+        # matches the current inputs; GENMAINDOC_FORCE_BUILD=1 forces a new build
+        if os.environ.get("GENMAINDOC_FORCE_BUILD", "").strip().lower() in ("1", "true", "yes"):
+            print()
+            print("GENMAINDOC_FORCE_BUILD is set: the main documentation is built in every case")
+        else:
+            listCmdLineParts.append("--skip-if-up-to-date")
         sCmdLine = " ".join(listCmdLineParts)
         del listCmdLineParts
         print()
@@ -125,6 +131,17 @@ class CExtendedSetup():
             print()
             return ERROR
 
+        try:
+            # pypandoc is imported here (and not at module level); it's required by this conversion only
+            import pypandoc
+            # try to access pandoc; if not installed we detect this before the conversion
+            pypandoc.get_pandoc_path()
+        except Exception as ex:
+            print()
+            printerror(str(ex))
+            print()
+            return ERROR
+
         sFileContent = pypandoc.convert_file(sReadMe_rst, 'md')
         hFile_md = open(sReadMe_md, "w", encoding="utf-8")
         listFileContent = sFileContent.splitlines()
@@ -199,6 +216,145 @@ class CExtendedSetup():
 
     # eof def delete_previous_installation():
 
+    # --------------------------------------------------------------------------------------------------------------
+
+    def __hash_file(self, sFile=None):
+        """Returns the SHA-256 hex digest of the content of a file
+        """
+        oHash = hashlib.sha256()
+        with open(sFile, "rb") as hFile:
+            for bChunk in iter(lambda: hFile.read(1048576), b""):
+                oHash.update(bChunk)
+        return oHash.hexdigest()
+    # eof def __hash_file(self, sFile=None):
+
+    # --------------------------------------------------------------------------------------------------------------
+
+    def __list_package_files(self):
+        """Returns the files installed by setuptools out of the package source folder: the Python modules and the package data
+(paths relative to the package source folder)
+        """
+        sPackageSourceFolder = self.__oRepositoryConfig.Get('PACKAGESOURCEFOLDER')
+        listPatterns = ["*.py"] + list(self.__oRepositoryConfig.Get('PACKAGEDATA'))
+        listFiles = []
+        for sFileName in sorted(os.listdir(sPackageSourceFolder)):
+            if os.path.isfile(os.path.join(sPackageSourceFolder, sFileName)) is False:
+                continue
+            for sPattern in listPatterns:
+                if fnmatch.fnmatch(sFileName, sPattern) is True:
+                    listFiles.append(sFileName)
+                    break
+        return listFiles
+    # eof def __list_package_files(self):
+
+    # --------------------------------------------------------------------------------------------------------------
+
+    def __sync_folder(self, sSourceFolder=None, listFiles=[], sDestinationFolder=None):
+        """Makes the destination folder an exact copy of the given files of the source folder: files with other content
+than in the source folder are copied again, all other files and subfolders (except of the Python byte code cache) are removed.
+The modification times of the source files are taken over; therefore setuptools (copying only files that are newer than their
+destination) does not copy unchanged files again. Returns the number of copied, unchanged and removed files.
+        """
+        nCopied    = 0
+        nUnchanged = 0
+        nRemoved   = 0
+        os.makedirs(sDestinationFolder, exist_ok=True)
+        for sFileName in listFiles:
+            sSourceFile      = os.path.join(sSourceFolder, sFileName)
+            sDestinationFile = os.path.join(sDestinationFolder, sFileName)
+            oSourceStat = os.stat(sSourceFile)
+            if ( (os.path.isfile(sDestinationFile) is True) and (os.path.getsize(sDestinationFile) == oSourceStat.st_size)
+                 and (self.__hash_file(sDestinationFile) == self.__hash_file(sSourceFile)) ):
+                if os.stat(sDestinationFile).st_mtime_ns != oSourceStat.st_mtime_ns:
+                    os.utime(sDestinationFile, ns=(oSourceStat.st_atime_ns, oSourceStat.st_mtime_ns))
+                nUnchanged = nUnchanged + 1
+                continue
+            # (the file is replaced at once; an interrupted copy does not leave a truncated file within the destination folder)
+            sTempFile = f"{sDestinationFile}.{os.getpid()}.tmp"
+            shutil.copy2(sSourceFile, sTempFile)
+            os.replace(sTempFile, sDestinationFile)
+            print(f"* Updating '{sDestinationFile}'")
+            nCopied = nCopied + 1
+        for sName in sorted(os.listdir(sDestinationFolder)):
+            if ( (sName in listFiles) or (sName == "__pycache__") ):
+                continue
+            sPath = os.path.join(sDestinationFolder, sName)
+            print(f"* Removing '{sPath}'")
+            if os.path.isdir(sPath) is True:
+                shutil.rmtree(sPath)
+            else:
+                os.remove(sPath)
+            nRemoved = nRemoved + 1
+        return nCopied, nUnchanged, nRemoved
+    # eof def __sync_folder(self, sSourceFolder=None, listFiles=[], sDestinationFolder=None):
+
+    # --------------------------------------------------------------------------------------------------------------
+
+    def __sync_package_folder(self, sDestinationFolder=None):
+        """Synchronizes a package folder with the package source folder (see '__sync_folder()')
+        """
+        sPackageSourceFolder = self.__oRepositoryConfig.Get('PACKAGESOURCEFOLDER')
+        try:
+            listFiles = self.__list_package_files()
+            nCopied, nUnchanged, nRemoved = self.__sync_folder(sPackageSourceFolder, listFiles, sDestinationFolder)
+        except Exception as ex:
+            print()
+            printexception(str(ex))
+            print()
+            return ERROR
+        print(f"* '{sDestinationFolder}' synchronized: {nCopied} file(s) updated, {nUnchanged} file(s) unchanged, {nRemoved} file(s) removed")
+        return SUCCESS
+    # eof def __sync_package_folder(self, sDestinationFolder=None):
+
+    # --------------------------------------------------------------------------------------------------------------
+
+    def sync_previous_build(self):
+        """Synchronizes the previous build of setup.py within the repository with the package source folder, instead of deleting it
+(the dist and the egg-info folder are deleted as before); in case of an error the previous build is deleted completely
+        """
+        sSetupDistFolder = self.__oRepositoryConfig.Get('SETUPDISTFOLDER')
+        sEggInfoFolder   = self.__oRepositoryConfig.Get('EGGINFOFOLDER')
+        for sFolder in (sSetupDistFolder, sEggInfoFolder):
+            if os.path.isdir(sFolder) is True:
+                print(f"* Deleting '{sFolder}'")
+                try:
+                    shutil.rmtree(sFolder)
+                except Exception as ex:
+                    print()
+                    printexception(str(ex))
+                    print()
+                    return ERROR
+        sSetupBuildLibPackageFolder = self.__oRepositoryConfig.Get('SETUPBUILDLIBPACKAGEFOLDER')
+        if os.path.isdir(sSetupBuildLibPackageFolder) is False:
+            return SUCCESS
+        nReturn = self.__sync_package_folder(sSetupBuildLibPackageFolder)
+        if nReturn != SUCCESS:
+            print(COLBY + "Synchronization failed, deleting the previous build instead")
+            print()
+            return self.delete_previous_build()
+        return SUCCESS
+    # eof def sync_previous_build():
+
+    # --------------------------------------------------------------------------------------------------------------
+
+    def sync_previous_installation(self):
+        """Synchronizes the previous package installation folder within the Python installation with the package source folder:
+changed files are updated, files not belonging to the package are removed; in case of an error the previous installation is
+deleted completely
+        """
+        sInstalledPackageFolder = self.__oRepositoryConfig.Get('INSTALLEDPACKAGEFOLDER')
+        if os.path.isdir(sInstalledPackageFolder) is False:
+            print()
+            return SUCCESS
+        nReturn = self.__sync_package_folder(sInstalledPackageFolder)
+        if nReturn != SUCCESS:
+            print(COLBY + "Synchronization failed, deleting the previous installation instead")
+            print()
+            return self.delete_previous_installation()
+        print()
+        return SUCCESS
+    # eof def sync_previous_installation():
+
 # eof class CExtendedSetup():
 
 # --------------------------------------------------------------------------------------------------------------
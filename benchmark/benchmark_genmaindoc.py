@@ -0,0 +1,445 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# benchmark_genmaindoc.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# Hermetic benchmark of the genmaindoc orchestration (CDocBuilder.Build).
+#
+# For every requested number of repositories N the benchmark generates within a work folder:
+# - N synthetic IMPORTS repositories with a stub 'genpackagedoc.py' (writes a PDF file and a JSON file
+#   with configurable delay and size)
+# - a stub 'pdflatex' (needs two passes until the auxiliary files are stable)
+# - a minimal book (main tex file with preamble and chapters)
+#
+# Every N is measured in a separate Python process (end-to-end build time, per phase time taken from CBuildTrace,
+# peak memory of the orchestrating process and of the child processes). Neither the real repositories nor a TeX
+# installation are required.
+#
+# Usage:
+#
+#    python benchmark/benchmark_genmaindoc.py --sizes 1,10,50,100,500 --output results.json
+#    python benchmark/benchmark_genmaindoc.py --sizes 1,10,50 --baseline results.json
+#
+# --------------------------------------------------------------------------------------------------------------
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import os, sys, time, json, shutil, argparse, tempfile, subprocess, platform
+
+import colorama as col
+
+# the benchmark imports the orchestration code out of this repository (and not an installed version)
+sReferencePath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if sReferencePath not in sys.path:
+    sys.path.insert(0, sReferencePath)
+
+col.init(autoreset=True)
+
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+
+SUCCESS = 0
+ERROR   = 1
+
+DEFAULT_SIZES = "1,10,50,100,500"
+
+# --------------------------------------------------------------------------------------------------------------
+
+STUB_GENPACKAGEDOC = '''# stub package doc generator (generated by benchmark_genmaindoc.py)
+import os, sys, time, json, argparse
+oParser = argparse.ArgumentParser()
+oParser.add_argument('--pdfdest', type=str)
+oParser.add_argument('--configdest', type=str)
+oParser.add_argument('--strict', type=str)
+oParser.add_argument('--simulateonly', action='store_true')
+oArgs = oParser.parse_args()
+sRepositoryName = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+time.sleep(###DELAY###)
+print(f"stub genpackagedoc: {sRepositoryName}\\n" * ###LOGLINES###)
+if oArgs.simulateonly is False:
+    # minimal PDF file with a page tree of 3 pages (the padding simulates the size of a real documentation)
+    listObjects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Kids [3 0 R 4 0 R 5 0 R] /Count 3 >>"]
+    listObjects.extend([b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>"] * 3)
+    bPDF = b"%PDF-1.4\\n%stub\\n" + b"%" + b"0" * ###PDFSIZE### + b"\\n"
+    listOffsets = []
+    for nObject, bObject in enumerate(listObjects, start=1):
+        listOffsets.append(len(bPDF))
+        bPDF = bPDF + b"%d 0 obj\\n" % nObject + bObject + b"\\nendobj\\n"
+    nXRef = len(bPDF)
+    bPDF = bPDF + b"xref\\n0 %d\\n0000000000 65535 f \\n" % (len(listObjects) + 1)
+    bPDF = bPDF + b"".join(b"%010d 00000 n \\n" % nOffset for nOffset in listOffsets)
+    bPDF = bPDF + b"trailer\\n<< /Size %d /Root 1 0 R >>\\nstartxref\\n%d\\n%%%%EOF\\n" % (len(listObjects) + 1, nXRef)
+    with open(os.path.join(oArgs.pdfdest, f"{sRepositoryName}.pdf"), "wb") as hPDFFile:
+        hPDFFile.write(bPDF)
+dictConfig = {'REPOSITORYNAME' : sRepositoryName, 'PACKAGENAME' : sRepositoryName.replace("-", "_"),
+              'AUTHOR' : "benchmark", 'AUTHOREMAIL' : "benchmark@example.com", 'DESCRIPTION' : f"Stub repository {sRepositoryName}",
+              'URL' : f"https://example.com/{sRepositoryName}", 'PACKAGEVERSION' : "0.1.0", 'PACKAGEDATE' : "18.10.2026"}
+with open(os.path.join(oArgs.configdest, f"_CONFIG_{sRepositoryName}.json"), "w") as hConfigFile:
+    json.dump(dictConfig, hConfigFile, indent=3)
+sys.exit(0)
+'''
+
+STUB_PDFLATEX = '''# stub LaTeX compiler (generated by benchmark_genmaindoc.py)
+import os, sys, time
+listArgs = sys.argv[1:]
+sJobName = [sArg.split("=", 1)[1].strip('"') for sArg in listArgs if sArg.startswith("-jobname=")][0]
+# (variant build: auxiliary files and PDF file are written to the output directory)
+listOutputDirectory = [sArg.split("=", 1)[1].strip('"') for sArg in listArgs if sArg.startswith("-output-directory=")]
+if len(listOutputDirectory) > 0:
+    sJobName = os.path.join(listOutputDirectory[0], sJobName)
+if "-ini" in listArgs:
+    with open(f"{sJobName}.fmt", "w") as hFile:
+        hFile.write("stub format")
+    sys.exit(0)
+time.sleep(###DELAY###)
+# the content of the aux file changes once (like a TOC that needs a second pass)
+sAuxFile = f"{sJobName}.aux"
+nState = 0
+if os.path.isfile(sAuxFile):
+    with open(sAuxFile) as hFile:
+        nState = int(hFile.readline().strip("% \\n") or 0)
+with open(sAuxFile, "w") as hFile:
+    hFile.write(f"% {min(nState + 1, 2)}\\n")
+if "-draftmode" not in listArgs:
+    with open(f"{sJobName}.pdf", "wb") as hFile:
+        hFile.write(b"%PDF-1.4\\n%stub\\n%%EOF\\n")
+print("stub pdflatex " + " ".join(listArgs))
+sys.exit(0)
+'''
+
+MAIN_TEX = r'''\documentclass{report}
+\input{./styles/preamble}
+\csname endofdump\endcsname
+\input{./BundleVersionDate.tex}
+\begin{document}
+\include{./include/introduction}
+\include{./include/installation}
+\input{./externaldocs/library_doc_overview}
+\input{./externaldocs/library_doc_imports}
+\input{./externaldocs/python_modules_installed}
+\input{./externaldocs/final_summary}
+\end{document}
+'''
+
+# --------------------------------------------------------------------------------------------------------------
+
+def printerror(sMsg):
+    sys.stderr.write(COLBR + f"Error: {sMsg}!\n")
+
+# --------------------------------------------------------------------------------------------------------------
+
+class CBenchmarkConfig():
+    """Minimal replacement of CMainDocConfig (CDocBuilder only requires GetConfig()).
+    """
+
+    def __init__(self, dictMainDocConfig=None):
+        self.__dictMainDocConfig = dictMainDocConfig
+
+    def GetConfig(self):
+        return self.__dictMainDocConfig
+
+# eof class CBenchmarkConfig():
+
+# --------------------------------------------------------------------------------------------------------------
+
+def WriteScript(sFile=None, sContent=None, dictReplacements={}):
+    for sKey, oValue in dictReplacements.items():
+        sContent = sContent.replace(f"###{sKey}###", str(oValue))
+    with open(sFile, "w", encoding="utf-8") as hFile:
+        hFile.write(sContent)
+
+# --------------------------------------------------------------------------------------------------------------
+
+def PrepareWorkspace(sWorkFolder=None, nRepositories=1, oArgs=None):
+    """Generates repositories, stub LaTeX compiler and book sources of a single benchmark run. Returns the maindoc configuration.
+    """
+    if os.path.isdir(sWorkFolder):
+        shutil.rmtree(sWorkFolder)
+    os.makedirs(sWorkFolder)
+
+    listImports = []
+    for nIndex in range(nRepositories):
+        sRepository = os.path.join(sWorkFolder, "repositories", f"python-stub-{nIndex:04d}")
+        os.makedirs(os.path.join(sRepository, "config"))
+        WriteScript(os.path.join(sRepository, "genpackagedoc.py"), STUB_GENPACKAGEDOC,
+                    {'DELAY' : oArgs.delay, 'PDFSIZE' : oArgs.pdfsize, 'LOGLINES' : oArgs.loglines})
+        with open(os.path.join(sRepository, "config", "repository_config.json"), "w", encoding="utf-8") as hFile:
+            json.dump({'PACKAGENAME' : f"python_stub_{nIndex:04d}"}, hFile)
+        listImports.append(sRepository.replace("\\", "/"))
+
+    sToolsFolder = os.path.join(sWorkFolder, "tools")
+    os.makedirs(sToolsFolder)
+    sStubPdfLaTeX = os.path.join(sToolsFolder, "pdflatex_stub.py")
+    WriteScript(sStubPdfLaTeX, STUB_PDFLATEX, {'DELAY' : oArgs.latexdelay})
+    if platform.system() == "Windows":
+        sLaTeXInterpreter = os.path.join(sToolsFolder, "pdflatex.cmd")
+        with open(sLaTeXInterpreter, "w") as hFile:
+            hFile.write(f"@\"{sys.executable}\" \"{sStubPdfLaTeX}\" %*\n")
+    else:
+        sLaTeXInterpreter = os.path.join(sToolsFolder, "pdflatex")
+        with open(sLaTeXInterpreter, "w") as hFile:
+            hFile.write(f"#!/bin/sh\nexec \"{sys.executable}\" \"{sStubPdfLaTeX}\" \"$@\"\n")
+        os.chmod(sLaTeXInterpreter, 0o755)
+
+    sBookSourcesFolder = os.path.join(sWorkFolder, "book")
+    os.makedirs(os.path.join(sBookSourcesFolder, "styles"))
+    os.makedirs(os.path.join(sBookSourcesFolder, "include"))
+    with open(os.path.join(sBookSourcesFolder, "benchmark_main.tex"), "w", encoding="utf-8") as hFile:
+        hFile.write(MAIN_TEX)
+    with open(os.path.join(sBookSourcesFolder, "styles", "preamble.tex"), "w", encoding="utf-8") as hFile:
+        hFile.write("% stub preamble\n")
+    for sChapter in ("introduction", "installation"):
+        with open(os.path.join(sBookSourcesFolder, "include", f"{sChapter}.tex"), "w", encoding="utf-8") as hFile:
+            hFile.write(f"\\chapter{{{sChapter}}}\n")
+
+    sPackageName = "BenchmarkPackage"
+    os.makedirs(os.path.join(sWorkFolder, sPackageName))
+
+    sMainDocConfigFile = os.path.join(sWorkFolder, "benchmark_config.json")
+    with open(sMainDocConfigFile, "w", encoding="utf-8") as hFile:
+        hFile.write("{}\n")
+
+    dictMainDocConfig = {}
+    dictMainDocConfig['IMPORTS']             = listImports
+    dictMainDocConfig['BOOKSOURCES']         = sBookSourcesFolder.replace("\\", "/")
+    dictMainDocConfig['OUTPUTFOLDER']        = dictMainDocConfig['BOOKSOURCES']
+    dictMainDocConfig['VARIANT']             = None
+    dictMainDocConfig['MAINTEXFILENAME']     = "benchmark_main.tex"
+    dictMainDocConfig['JOBNAME']             = "benchmark_main"
+    dictMainDocConfig['CONTROL']             = {'STRICT' : True, 'UPDATE_EXTERNAL_DOC' : True}
+    dictMainDocConfig['PYTHON']              = sys.executable
+    dictMainDocConfig['JOBS']                = oArgs.jobs
+    dictMainDocConfig['SIMULATE_ONLY']       = False
+    dictMainDocConfig['DRYRUN']              = False
+    dictMainDocConfig['WATCH']               = False
+    dictMainDocConfig['SKIPIFUPTODATE']      = False
+    dictMainDocConfig['BUILDDATE']           = None
+    dictMainDocConfig['MAINDOC_CONFIGFILE']  = sMainDocConfigFile.replace("\\", "/")
+    dictMainDocConfig['MAINDOC_CONFIGFILES'] = [dictMainDocConfig['MAINDOC_CONFIGFILE']]
+    dictMainDocConfig['IGNORECACHE']         = oArgs.ignorecache
+    dictMainDocConfig['INPROCESS']           = oArgs.inprocess
+    dictMainDocConfig['CACHEFOLDER']         = os.path.join(sWorkFolder, ".genmaindoc_cache").replace("\\", "/")
+    dictMainDocConfig['CACHEDIR']            = None
+    dictMainDocConfig['CACHEMAXSIZE']        = 2048
+    dictMainDocConfig['CHAPTERS']            = None
+    dictMainDocConfig['TRACEFILE']           = None
+    dictMainDocConfig['LATEXINTERPRETER']    = sLaTeXInterpreter.replace("\\", "/")
+    dictMainDocConfig['REFERENCEPATH']       = sWorkFolder.replace("\\", "/")
+    dictMainDocConfig['PACKAGENAME']         = sPackageName
+    dictMainDocConfig['NOW']                 = time.strftime('%d.%m.%Y - %H:%M:%S')
+    dictMainDocConfig['VERSION']             = "benchmark"
+    dictMainDocConfig['BUNDLE_NAME']         = "Benchmark Bundle"
+    dictMainDocConfig['BUNDLE_VERSION']      = "0.0.0"
+    dictMainDocConfig['BUNDLE_VERSION_DATE'] = "10.2026"
+    dictMainDocConfig['ROBFWVERSION']        = "benchmark"
+    dictMainDocConfig['PROXY']               = "127.0.0.1:8080"
+    return dictMainDocConfig
+
+# eof def PrepareWorkspace(sWorkFolder=None, nRepositories=1, oArgs=None):
+
+# --------------------------------------------------------------------------------------------------------------
+
+def GetPeakMemory():
+    """Returns the peak resident set size (MB) of this process and of all terminated child processes (or None, if not available).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    nFactor = 1024 * 1024 if platform.system() == "Darwin" else 1024 # ru_maxrss: bytes (macOS), kilobytes (Linux)
+    fSelf     = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / nFactor
+    fChildren = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / nFactor
+    return round(fSelf, 1), round(fChildren, 1)
+
+# --------------------------------------------------------------------------------------------------------------
+
+def RunSingle(nRepositories=1, oArgs=None):
+    """Executes a single benchmark run (within this process) and returns the measured values.
+    """
+    from maindoc.CDocBuilder import CDocBuilder
+    from maindoc.CBuildTrace import CBuildTrace
+
+    sWorkFolder = os.path.join(oArgs.workfolder, f"N{nRepositories:04d}")
+    dictMainDocConfig = PrepareWorkspace(sWorkFolder, nRepositories, oArgs)
+
+    dictResult = {'N' : nRepositories, 'RUNS' : []}
+    for nRun in range(oArgs.runs):
+        # the first run starts with an empty build cache, all following runs are incremental builds
+        dictMainDocConfig['NOW'] = time.strftime('%d.%m.%Y - %H:%M:%S')
+        oBuildTrace = CBuildTrace()
+        oDocBuilder = CDocBuilder(CBenchmarkConfig(dictMainDocConfig), oBuildTrace)
+        fStartCounter = time.perf_counter()
+        bPDFIsComplete, bSuccess, sResult = oDocBuilder.Build()
+        fDuration = time.perf_counter() - fStartCounter
+        del oDocBuilder
+        if bSuccess is not True:
+            raise Exception(f"Build failed (N={nRepositories}, run {nRun + 1}): {sResult}")
+
+        dictPhases = {}
+        for dictSpan in oBuildTrace.GetSpans():
+            sName = dictSpan['name']
+            if dictSpan['cat'] == "repository" and sName.startswith("render ") and sName != "render repositories":
+                sName = "repository jobs (sum)"
+            elif sName.startswith("LaTeX pass"):
+                sName = "LaTeX passes (sum)"
+            dictPhases[sName] = round(dictPhases.get(sName, 0.0) + dictSpan['dur'] / 1000000, 4)
+        fPhasesTotal = dictPhases.get("render repositories", 0.0) + dictPhases.get("LaTeX compiler", 0.0)
+        dictRun = {}
+        dictRun['BUILD_S']       = round(fDuration, 4)
+        dictRun['OVERHEAD_S']    = round(fDuration - fPhasesTotal, 4) # everything outside rendering and LaTeX compilation
+        dictRun['PHASES_S']      = dictPhases
+        dictRun['LATEXPASSES']   = dictMainDocConfig.get('LATEXPASSES')
+        dictResult['RUNS'].append(dictRun)
+
+    fPeakSelf, fPeakChildren = GetPeakMemory()
+    dictResult['PEAKRSS_MB']          = fPeakSelf
+    dictResult['PEAKRSS_CHILDREN_MB'] = fPeakChildren
+
+    if oArgs.keep is False:
+        shutil.rmtree(sWorkFolder, ignore_errors=True)
+    return dictResult
+
+# eof def RunSingle(nRepositories=1, oArgs=None):
+
+# --------------------------------------------------------------------------------------------------------------
+
+def PrintResults(listResults=[], dictBaseline=None):
+    sHeadline = "N".rjust(5) + "run".rjust(5) + "build [s]".rjust(12) + "overhead [s]".rjust(14) + "render [s]".rjust(12) \
+                + "latex [s]".rjust(11) + "baseline".rjust(11)
+    print()
+    print(COLBY + sHeadline)
+    print(COLBY + "-" * len(sHeadline))
+    for dictResult in listResults:
+        for nRun, dictRun in enumerate(dictResult['RUNS']):
+            sBaseline = "-"
+            if dictBaseline is not None and str(dictResult['N']) in dictBaseline:
+                listBaselineRuns = dictBaseline[str(dictResult['N'])]['RUNS']
+                if nRun < len(listBaselineRuns) and listBaselineRuns[nRun]['BUILD_S'] > 0:
+                    fRatio = dictRun['BUILD_S'] / listBaselineRuns[nRun]['BUILD_S']
+                    sBaseline = f"{(fRatio - 1) * 100:+.1f}%"
+            print(str(dictResult['N']).rjust(5) + str(nRun + 1).rjust(5) + f"{dictRun['BUILD_S']:.3f}".rjust(12)
+                  + f"{dictRun['OVERHEAD_S']:.3f}".rjust(14) + f"{dictRun['PHASES_S'].get('render repositories', 0.0):.3f}".rjust(12)
+                  + f"{dictRun['PHASES_S'].get('LaTeX compiler', 0.0):.3f}".rjust(11) + sBaseline.rjust(11))
+    print()
+
+    # the peak memory is measured once per size (over all runs of this size): the orchestrating process and the largest
+    # of its child processes (package doc generators, pool workers, LaTeX compiler); on Linux the peak of a child process
+    # is at least the resident set size of the forking process (ru_maxrss is inherited by fork and exec)
+    sHeadline = "N".rjust(5) + "peak RSS genmaindoc [MB]".rjust(26) + "peak RSS child processes [MB]".rjust(31)
+    print(COLBY + sHeadline)
+    print(COLBY + "-" * len(sHeadline))
+    for dictResult in listResults:
+        sPeakSelf     = "-" if dictResult['PEAKRSS_MB'] is None else f"{dictResult['PEAKRSS_MB']:.1f}"
+        sPeakChildren = "-" if dictResult['PEAKRSS_CHILDREN_MB'] is None else f"{dictResult['PEAKRSS_CHILDREN_MB']:.1f}"
+        print(str(dictResult['N']).rjust(5) + sPeakSelf.rjust(26) + sPeakChildren.rjust(31))
+    print()
+
+# --------------------------------------------------------------------------------------------------------------
+
+def GetCmdLine():
+    oCmdLineParser = argparse.ArgumentParser(description="Hermetic benchmark of the genmaindoc orchestration (CDocBuilder.Build)")
+    oCmdLineParser.add_argument('--sizes', type=str, default=DEFAULT_SIZES, help=f'Comma separated list of numbers of repositories. Default: {DEFAULT_SIZES}')
+    oCmdLineParser.add_argument('--runs', type=int, default=2, help='Number of builds per size (the first one with empty build cache). Default: 2')
+    oCmdLineParser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Number of parallel repository jobs. Default: number of CPUs')
+    oCmdLineParser.add_argument('--delay', type=float, default=0.0, help='Runtime of every stub package doc generator in seconds. Default: 0.0')
+    oCmdLineParser.add_argument('--pdfsize', type=int, default=100000, help='Size of every stub PDF file in bytes. Default: 100000')
+    oCmdLineParser.add_argument('--loglines', type=int, default=10, help='Number of output lines of every stub package doc generator. Default: 10')
+    oCmdLineParser.add_argument('--latexdelay', type=float, default=0.0, help='Runtime of every stub LaTeX pass in seconds. Default: 0.0')
+    oCmdLineParser.add_argument('--inprocess', action='store_true', help='Execute the stub package doc generators within the worker processes')
+    oCmdLineParser.add_argument('--ignorecache', action='store_true', help='Render all repositories in every run (build cache not used)')
+    oCmdLineParser.add_argument('--workfolder', type=str, default=None, help='Folder for the generated repositories. Default: temporary folder')
+    oCmdLineParser.add_argument('--keep', action='store_true', help='Keep the generated repositories and outputs')
+    oCmdLineParser.add_argument('--output', type=str, default=None, help='Path and name of a JSON file to store the results (to be used as baseline later)')
+    oCmdLineParser.add_argument('--baseline', type=str, default=None, help='Path and name of a JSON file with results of a previous benchmark')
+    oCmdLineParser.add_argument('--single', type=int, default=None, help=argparse.SUPPRESS) # internal: measure a single size within this process
+    return oCmdLineParser.parse_args()
+
+# --------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    oArgs = GetCmdLine()
+
+    if oArgs.single is not None:
+        # child process: measure a single size and print the result as JSON (last line of output)
+        dictResult = RunSingle(oArgs.single, oArgs)
+        sys.stdout.flush()
+        print("BENCHMARKRESULT:" + json.dumps(dictResult))
+        sys.exit(SUCCESS)
+
+    try:
+        listSizes = [int(sSize) for sSize in oArgs.sizes.split(",") if sSize.strip() != ""]
+    except ValueError:
+        printerror(f"Invalid list of sizes: '{oArgs.sizes}'")
+        sys.exit(ERROR)
+
+    dictBaseline = None
+    if oArgs.baseline is not None:
+        with open(oArgs.baseline, encoding="utf-8") as hBaselineFile:
+            dictBaseline = json.load(hBaselineFile)['RESULTS']
+
+    bTemporaryWorkFolder = oArgs.workfolder is None
+    if bTemporaryWorkFolder is True:
+        oArgs.workfolder = tempfile.mkdtemp(prefix="genmaindoc_benchmark_")
+    oArgs.workfolder = os.path.abspath(oArgs.workfolder)
+
+    listResults = []
+    for nSize in listSizes:
+        print(COLBY + f"Benchmark: N = {nSize}")
+        # every size is measured in a fresh process (peak memory, no state shared between the sizes)
+        listCmdLineParts = [sys.executable, os.path.abspath(__file__), "--single", str(nSize), "--runs", str(oArgs.runs),
+                            "--jobs", str(oArgs.jobs), "--delay", str(oArgs.delay), "--pdfsize", str(oArgs.pdfsize),
+                            "--loglines", str(oArgs.loglines), "--latexdelay", str(oArgs.latexdelay), "--workfolder", oArgs.workfolder]
+        if oArgs.ignorecache is True:
+            listCmdLineParts.append("--ignorecache")
+        if oArgs.inprocess is True:
+            listCmdLineParts.append("--inprocess")
+        if oArgs.keep is True:
+            listCmdLineParts.append("--keep")
+        oProcess = subprocess.run(listCmdLineParts, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, text=True)
+        listLines = oProcess.stdout.splitlines()
+        listResultLines = [sLine for sLine in listLines if sLine.startswith("BENCHMARKRESULT:")]
+        if oProcess.returncode != SUCCESS or len(listResultLines) == 0:
+            print("\n".join(listLines[-30:]))
+            printerror(f"Benchmark with N = {nSize} failed (returned {oProcess.returncode})")
+            sys.exit(ERROR)
+        listResults.append(json.loads(listResultLines[-1][len("BENCHMARKRESULT:"):]))
+
+    if bTemporaryWorkFolder is True and oArgs.keep is False:
+        shutil.rmtree(oArgs.workfolder, ignore_errors=True)
+
+    PrintResults(listResults, dictBaseline)
+
+    if oArgs.output is not None:
+        dictOutput = {'PLATFORM' : platform.platform(), 'PYTHON' : sys.version.split()[0], 'JOBS' : oArgs.jobs,
+                      'DELAY' : oArgs.delay, 'PDFSIZE' : oArgs.pdfsize, 'LATEXDELAY' : oArgs.latexdelay,
+                      'RESULTS' : {str(dictResult['N']) : dictResult for dictResult in listResults}}
+        with open(oArgs.output, "w", encoding="utf-8") as hOutputFile:
+            json.dump(dictOutput, hOutputFile, indent=3)
+        print(COLBY + f"Results written to '{oArgs.output}'")
+        print()
+
+    print(COLBG + "benchmark done")
+    sys.exit(SUCCESS)
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,163 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# check_startup_time.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# Startup time regression check of genmaindoc and the helper scripts of this repository.
+#
+# Every command is executed several times; the fastest run minus the startup time of the bare Python interpreter
+# is the startup overhead of the command. The check fails (return value 1) in case of
+# - the startup overhead of a command exceeds the budget (--budget, in milliseconds), or
+# - a command imports a module, that is required by the build phases only (FORBIDDEN_MODULES;
+#   these modules are imported lazily by the phases that need them).
+#
+# Usage:
+#
+#    python benchmark/check_startup_time.py
+#    python benchmark/check_startup_time.py --budget 150 --runs 10 --verbose
+#
+# --------------------------------------------------------------------------------------------------------------
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import os, sys, time, argparse, subprocess
+
+import colorama as col
+
+col.init(autoreset=True)
+
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+
+SUCCESS = 0
+ERROR   = 1
+
+# startup overhead budget per command (milliseconds)
+DEFAULT_BUDGET = 200
+
+# commands to be checked (script and arguments, relative to the repository root folder)
+COMMANDS = (["genmaindoc.py", "--help"],
+            ["genmaindoc.py", "--worker", "--help"],
+            ["dump_repository_config.py"],
+            ["-c", "import config.CRepositoryConfig, additions.CExtendedSetup"])
+
+# modules that must not be imported by the commands above
+FORBIDDEN_MODULES = ("pypandoc", "robot", "maindoc.CDocBuilder", "maindoc.CExternalDocRenderer", "maindoc.CLaTeXCompiler")
+
+# --------------------------------------------------------------------------------------------------------------
+
+def printerror(sMsg):
+    sys.stderr.write(COLBR + f"Error: {sMsg}!\n")
+
+# --------------------------------------------------------------------------------------------------------------
+
+def MeasureCommand(listCommand=[], nRuns=1, sReferencePath=None):
+    """Executes a command ``nRuns`` times. Returns the wall time of the fastest run (seconds) and the return value of the last run.
+    """
+    fMinTime = None
+    nReturn = None
+    for nRun in range(nRuns):
+        fStartTime = time.perf_counter()
+        oProcess = subprocess.run([sys.executable] + listCommand, cwd=sReferencePath, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        fTime = time.perf_counter() - fStartTime
+        nReturn = oProcess.returncode
+        if fMinTime is None or fTime < fMinTime:
+            fMinTime = fTime
+    return fMinTime, nReturn
+
+# --------------------------------------------------------------------------------------------------------------
+
+def GetImportedModules(listCommand=[], sReferencePath=None):
+    """Executes a command with '-X importtime'. Returns a list of tuples (module name, cumulative import time in microseconds).
+    """
+    oProcess = subprocess.run([sys.executable, "-X", "importtime"] + listCommand, cwd=sReferencePath, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, text=True)
+    listModules = []
+    for sLine in oProcess.stderr.splitlines():
+        if sLine.startswith("import time:") is False:
+            continue
+        listParts = sLine[len("import time:"):].split("|")
+        if len(listParts) != 3 or listParts[1].strip().isdigit() is False:
+            continue # headline
+        listModules.append((listParts[2].strip(), int(listParts[1].strip())))
+    return listModules
+
+# --------------------------------------------------------------------------------------------------------------
+
+def GetCmdLine():
+    oCmdLineParser = argparse.ArgumentParser(description="Startup time regression check of genmaindoc and the helper scripts")
+    oCmdLineParser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help=f'Startup overhead budget per command in milliseconds. Default: {DEFAULT_BUDGET}')
+    oCmdLineParser.add_argument('--runs', type=int, default=5, help='Number of runs per command (the fastest run counts). Default: 5')
+    oCmdLineParser.add_argument('--verbose', action='store_true', help='Print the slowest imports of every command')
+    return oCmdLineParser.parse_args()
+
+# --------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    oArgs = GetCmdLine()
+
+    sReferencePath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+    fPythonTime, nReturn = MeasureCommand(["-c", "pass"], oArgs.runs, sReferencePath)
+
+    print()
+    print(COLBY + f"Startup of bare Python interpreter: {fPythonTime * 1000:.0f} ms (budget for the overhead of every command: {oArgs.budget} ms)")
+    print()
+
+    listErrors = []
+    for listCommand in COMMANDS:
+        sCommand = " ".join(listCommand)
+        fTime, nReturn = MeasureCommand(listCommand, oArgs.runs, sReferencePath)
+        fOverhead = max(0.0, fTime - fPythonTime)
+        listModules = GetImportedModules(listCommand, sReferencePath)
+        # (only the forbidden modules themselves are reported, not their submodules)
+        listForbidden = sorted(set(sForbidden for sName, nTime in listModules for sForbidden in FORBIDDEN_MODULES
+                                   if sName == sForbidden or sName.startswith(f"{sForbidden}.")))
+        sLine = f"{sCommand.ljust(70)} {fOverhead * 1000:7.0f} ms  (returned {nReturn})"
+        if nReturn != SUCCESS:
+            listErrors.append(f"'{sCommand}' returned {nReturn}")
+        if fOverhead * 1000 > oArgs.budget:
+            listErrors.append(f"'{sCommand}' exceeds the budget: {fOverhead * 1000:.0f} ms > {oArgs.budget} ms")
+        if len(listForbidden) > 0:
+            listErrors.append(f"'{sCommand}' imports {', '.join(listForbidden)}")
+        if ( (nReturn != SUCCESS) or (fOverhead * 1000 > oArgs.budget) or (len(listForbidden) > 0) ):
+            print(COLBR + sLine)
+        else:
+            print(COLBG + sLine)
+        if oArgs.verbose is True:
+            for sName, nTime in sorted(listModules, key=lambda tupleModule: tupleModule[1], reverse=True)[:8]:
+                print(f"      {sName.ljust(50)} {nTime / 1000:7.1f} ms")
+
+    print()
+    if len(listErrors) > 0:
+        for sError in listErrors:
+            printerror(sError)
+        print()
+        sys.exit(ERROR)
+
+    print(COLBG + "startup time check done")
+    sys.exit(SUCCESS)
+
+# --------------------------------------------------------------------------------------------------------------
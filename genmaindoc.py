@@ -26,13 +26,13 @@
 #
 # --------------------------------------------------------------------------------------------------------------
 
-import os, sys
+import os, sys, argparse
 
 import colorama as col
 
 from config.CRepositoryConfig import CRepositoryConfig # providing repository and environment specific information
 from maindoc.CMainDocConfig import CMainDocConfig      # providing main documentation specific information
-from maindoc.CDocBuilder import CDocBuilder
+from maindoc.CBuildTrace import CBuildTrace      # phase tracing (command line '--trace')
 
 col.init(autoreset=True)
 
@@ -54,65 +54,143 @@ def printexception(sMsg):
 
 # --------------------------------------------------------------------------------------------------------------
 
-# -- setting up the repository configuration (relative to the path of this script)
-oRepositoryConfig = None
-try:
-    oRepositoryConfig = CRepositoryConfig(os.path.abspath(sys.argv[0]))
-except Exception as ex:
-    print()
-    printexception(str(ex))
-    print()
-    sys.exit(ERROR)
-
-# -- setting up the maindoc configuration
-oMainDocConfig = None
-try:
-    oMainDocConfig = CMainDocConfig(oRepositoryConfig)
-except Exception as ex:
-    print()
-    printexception(str(ex))
-    print()
-    sys.exit(ERROR)
-
-# -- setting up and calling the doc builder
-try:
-    oDocBuilder = CDocBuilder(oMainDocConfig)
-except Exception as ex:
-    print()
-    printexception(str(ex))
-    print()
-    sys.exit(ERROR)
-
-bPDFIsComplete, bSuccess, sResult = oDocBuilder.Build()
-if bSuccess is None:
-    print()
-    printexception(sResult)
-    print()
-    sys.exit(ERROR)
-elif bSuccess is False:
-    print()
-    printerror(sResult)
-    print()
-    sys.exit(ERROR)
-elif bSuccess is True:
-   # bSuccess is True means: PDF has been generated; but even so the PDF can be incomplete (e.g. meta information is missing)
-   if bPDFIsComplete is True:
-      print(COLBY + sResult)
-      print()
-      print(COLBG + "genmaindoc done")
-      print()
-      sys.exit(SUCCESS)
-   else:
-      print(COLBY + sResult)
-      print()
-      print(COLBY + "genmaindoc done - but with warnings")
-      print()
-      sys.exit(WARNING_PDF_NOT_COMPLETE)
-else:
-    print()
-    printerror("Internal genmaindoc error")
-    print()
-    sys.exit(ERROR)
+# The main code is executed only in case of this script is called directly; the worker processes
+# rendering the external documentations (see CExternalDocRenderer) import this script again.
+
+if __name__ == "__main__":
+
+    # -- worker mode (multi node build): the worker renders the repository documentations queued by a coordinator
+    #    ('genmaindoc.py --queue <folder>'); neither the maindoc configuration nor a LaTeX compiler is required here
+    if "--worker" in sys.argv[1:]:
+        oCmdLineParser = argparse.ArgumentParser()
+        oCmdLineParser.add_argument('--worker', action='store_true', help='Work as worker of a multi node build.')
+        oCmdLineParser.add_argument('--queue', type=str, required=True, help='Path to the work queue folder (shared with the coordinator).')
+        oCmdLineParser.add_argument('--idletimeout', type=int, default=60, help='The worker terminates after this time (seconds) without jobs; 0: never. Default: 60')
+        oCmdLineParser.add_argument('--inprocess', action='store_true', help='If True, the package doc generators are executed within the worker process. Default: False')
+        oCmdLineArgs = oCmdLineParser.parse_args()
+        from maindoc.CWorkQueue import CQueueWorker
+        try:
+            oQueueWorker = CQueueWorker(os.path.abspath(oCmdLineArgs.queue), oCmdLineArgs.idletimeout, oCmdLineArgs.inprocess)
+            bSuccess, sResult = oQueueWorker.Run()
+        except Exception as ex:
+            bSuccess = None
+            sResult  = str(ex)
+        if bSuccess is not True:
+            print()
+            printexception(sResult)
+            print()
+            sys.exit(ERROR)
+        print()
+        print(COLBG + sResult)
+        print()
+        sys.exit(SUCCESS)
+
+    # -- the spans of all build phases are collected from the beginning; the trace file is known after the command line is parsed
+    oBuildTrace = CBuildTrace()
+
+    # -- setting up the repository configuration (relative to the path of this script)
+    oRepositoryConfig = None
+    try:
+        with oBuildTrace.Span("CRepositoryConfig"):
+            oRepositoryConfig = CRepositoryConfig(os.path.abspath(sys.argv[0]))
+    except Exception as ex:
+        print()
+        printexception(str(ex))
+        print()
+        sys.exit(ERROR)
+
+    # -- setting up the maindoc configuration
+    oMainDocConfig = None
+    try:
+        with oBuildTrace.Span("CMainDocConfig"):
+            oMainDocConfig = CMainDocConfig(oRepositoryConfig)
+    except Exception as ex:
+        print()
+        printexception(str(ex))
+        print()
+        sys.exit(ERROR)
+
+    # -- setting up and calling the doc builder
+    oBuildTrace.SetTraceFile(oMainDocConfig.Get('TRACEFILE'))
+
+    # -- watch mode: initial build and rebuilds after every change of the sources, until Ctrl+C
+    if oMainDocConfig.Get('WATCH') is True:
+        from maindoc.CWatchBuilder import CWatchBuilder
+        try:
+            oWatchBuilder = CWatchBuilder(oMainDocConfig, oBuildTrace)
+            bSuccess, sResult = oWatchBuilder.Run()
+        except Exception as ex:
+            bSuccess = None
+            sResult  = str(ex)
+        if bSuccess is not True:
+            print()
+            printexception(sResult)
+            print()
+            sys.exit(ERROR)
+        print()
+        print(COLBG + sResult)
+        print()
+        sys.exit(SUCCESS)
+
+    try:
+        # (imported not before here: the build modules are not required for '--help' or in case of configuration errors)
+        listConfigFiles = oMainDocConfig.Get('MAINDOC_CONFIGFILES')
+        if len(listConfigFiles) > 1:
+            # -- several maindoc configurations: every configuration is built as variant of the main documentation
+            from maindoc.CVariantBuilder import CVariantBuilder
+            listMainDocConfigs = [oMainDocConfig]
+            with oBuildTrace.Span("CMainDocConfig (variants)"):
+                for sConfigFile in listConfigFiles[1:]:
+                    listMainDocConfigs.append(CMainDocConfig(oRepositoryConfig, sConfigFile))
+            oDocBuilder = CVariantBuilder(listMainDocConfigs, oBuildTrace)
+        else:
+            from maindoc.CDocBuilder import CDocBuilder
+            oDocBuilder = CDocBuilder(oMainDocConfig, oBuildTrace)
+    except Exception as ex:
+        print()
+        printexception(str(ex))
+        print()
+        sys.exit(ERROR)
+
+    with oBuildTrace.Span(f"{type(oDocBuilder).__name__}.Build"):
+        bPDFIsComplete, bSuccess, sResult = oDocBuilder.Build()
+
+    if oBuildTrace.GetTraceFile() is not None:
+        bTraceSuccess, sTraceResult = oBuildTrace.Write()
+        if bTraceSuccess is True:
+            print(COLBY + sTraceResult)
+        else:
+            print(COLBY + f"Warning: {sTraceResult}")
+        print()
+    if bSuccess is None:
+        print()
+        printexception(sResult)
+        print()
+        sys.exit(ERROR)
+    elif bSuccess is False:
+        print()
+        printerror(sResult)
+        print()
+        sys.exit(ERROR)
+    elif bSuccess is True:
+       # bSuccess is True means: PDF has been generated; but even so the PDF can be incomplete (e.g. meta information is missing)
+       if bPDFIsComplete is True:
+          print(COLBY + sResult)
+          print()
+          print(COLBG + "genmaindoc done")
+          print()
+          sys.exit(SUCCESS)
+       else:
+          print(COLBY + sResult)
+          print()
+          print(COLBY + "genmaindoc done - but with warnings")
+          print()
+          sys.exit(WARNING_PDF_NOT_COMPLETE)
+    else:
+        print()
+        printerror("Internal genmaindoc error")
+        print()
+        sys.exit(ERROR)
 
 
 # --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,405 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CArtifactStore.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the persistent artifact store of GenMainDoc (command line ``--cache-dir``).
+
+In opposite to the build cache (``CBuildCache``; one entry per repository, local to the working copy) the artifact store
+keeps the artifacts of many builds and is meant to be shared between builds on fresh checkouts (e.g. saved and restored by CI).
+The store is a plain folder:
+
+* ``objects/<xx>/<sha256>`` : content of the artifact files, addressed by their SHA-256 hash (identical files are stored once)
+* ``entries/<kind>/<key>.json`` : one entry per key (fingerprint of the inputs), listing the files of the entry and their hashes
+
+The time of the last access of an entry is the modification time of its entry file. In case of the size of the store exceeds
+the limit, the least recently used entries are removed (``Evict()``). Objects are written before the entry referring to them;
+therefore objects that have been written (or reused) recently, are never removed by ``Evict()``, also if no entry refers to them
+(a concurrent build may be about to write the entry).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time, json, hashlib, shutil, threading
+
+from PythonExtensionsCollection.String.CString import CString
+
+# version of the store layout; entries of another version are ignored
+ARTIFACTSTOREVERSION = "1"
+
+# default size limit of the store in MB (command line '--cache-max-size')
+ARTIFACTSTORE_MAX_SIZE = 2048
+
+# objects (and temporary files) younger than this time (seconds) are not removed by Evict()
+ARTIFACTSTORE_GRACE_PERIOD = 600
+
+# kinds of artifacts (subfolders of 'entries')
+KIND_EXTERNALDOCS = "externaldocs"  # output of the package doc generator of a repository
+KIND_FORMAT       = "format"        # precompiled preamble
+KIND_PDF          = "pdf"           # final PDF file (together with the auxiliary files of the LaTeX job)
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CArtifactStore():
+   """
+Content addressed artifact store.
+
+Methods to execute: ``Fetch()``, ``Put()``, ``CountAccess()``, ``Evict()``, ``GetStatistics()``
+   """
+
+   def __init__(self, sStoreFolder=None, nMaxSize=ARTIFACTSTORE_MAX_SIZE):
+      """
+Constructor of class ``CArtifactStore``.
+
+* ``sStoreFolder``
+
+  / *Condition*: required / *Type*: str /
+
+  Path to the store folder (will be created, if not yet existing).
+
+* ``nMaxSize``
+
+  / *Condition*: optional / *Type*: int / *Default*: ARTIFACTSTORE_MAX_SIZE /
+
+  Size limit of the store in MB (see ``Evict()``).
+      """
+
+      sMethod = "CArtifactStore.__init__"
+
+      if sStoreFolder is None:
+         bSuccess = None
+         sResult  = "sStoreFolder is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sStoreFolder = CString.NormalizePath(sStoreFolder)
+      self.__nMaxSize     = nMaxSize
+      self.__dictCounters = {} # kind -> [hits, misses]
+      self.__oLock        = threading.Lock()
+
+   # eof def __init__(self, sStoreFolder=None, nMaxSize=ARTIFACTSTORE_MAX_SIZE):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetObjectFile(self, sHash=None):
+      """Returns the path of the object file containing the content with the hash ``sHash``.
+      """
+      return f"{self.__sStoreFolder}/objects/{sHash[:2]}/{sHash}"
+
+   # eof def __GetObjectFile(self, sHash=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetEntryFile(self, sKind=None, sKey=None):
+      """Returns the path of the entry file of the key ``sKey``.
+      """
+      return f"{self.__sStoreFolder}/entries/{sKind}/{sKey}.json"
+
+   # eof def __GetEntryFile(self, sKind=None, sKey=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __HashFile(sFile=None):
+      """Returns the SHA-256 hex digest of the content of a file.
+      """
+      oHash = hashlib.sha256()
+      with open(sFile, "rb") as hFile:
+         for bChunk in iter(lambda: hFile.read(1048576), b""):
+            oHash.update(bChunk)
+      return oHash.hexdigest()
+
+   # eof def __HashFile(sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def CountAccess(self, sKind=None, bHit=False):
+      """Counts a hit or a miss of an artifact of kind ``sKind``. ``Fetch()`` counts by itself; this method is used for
+accesses within other processes (e.g. the worker processes rendering the repositories), that report their result.
+      """
+      with self.__oLock:
+         listCounters = self.__dictCounters.setdefault(sKind, [0, 0])
+         if bHit is True:
+            listCounters[0] = listCounters[0] + 1
+         else:
+            listCounters[1] = listCounters[1] + 1
+
+   # eof def CountAccess(self, sKind=None, bHit=False):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Fetch(self, sKind=None, sKey=None, sDestinationFolder=None, bCount=True):
+      """
+Copies the files of the entry ``sKey`` to ``sDestinationFolder`` and marks the entry as recently used.
+
+**Returns:**
+
+* ``dictFiles``
+
+  / *Type*: dict /
+
+  Paths of the restored files by their role (as given to ``Put()``), or ``None`` in case of no complete entry exists.
+      """
+      sEntryFile = self.__GetEntryFile(sKind, sKey)
+      dictFiles = None
+      if os.path.isfile(sEntryFile) is True:
+         try:
+            with open(sEntryFile, encoding="utf-8") as hEntryFile:
+               dictEntry = json.load(hEntryFile)
+            if dictEntry['VERSION'] != ARTIFACTSTOREVERSION:
+               raise Exception(f"version {dictEntry['VERSION']}")
+            dictRestored = {}
+            for sRole, dictFile in dictEntry['FILES'].items():
+               sDestinationFile = CString.NormalizePath(f"{sDestinationFolder}/{dictFile['NAME']}")
+               os.makedirs(os.path.dirname(sDestinationFile), exist_ok=True)
+               shutil.copyfile(self.__GetObjectFile(dictFile['HASH']), sDestinationFile)
+               dictRestored[sRole] = sDestinationFile
+            os.utime(sEntryFile) # (least recently used entries are evicted first)
+            dictFiles = dictRestored
+         except Exception:
+            # an incomplete or corrupted entry (e.g. an object has been evicted by a concurrent build) is handled like a missing entry
+            dictFiles = None
+      if bCount is True:
+         self.CountAccess(sKind, dictFiles is not None)
+      return dictFiles
+
+   # eof def Fetch(self, sKind=None, sKey=None, sDestinationFolder=None, bCount=True):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Put(self, sKind=None, sKey=None, dictFiles=None, sReferenceFolder=None):
+      """
+Stores files as entry ``sKey``.
+
+* ``dictFiles``
+
+  / *Condition*: required / *Type*: dict /
+
+  Paths of the files by their role (files with path ``None`` are skipped).
+
+* ``sReferenceFolder``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  In case of given, the files are restored (``Fetch()``) with their path relative to this folder; otherwise with their file name only.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CArtifactStore.Put"
+
+      sEntryFile = self.__GetEntryFile(sKind, sKey)
+      # (temporary files are unique per process and thread; concurrent builds may store the same entry)
+      sTempSuffix = f".{os.getpid()}.{threading.get_native_id()}.tmp"
+      try:
+         dictEntry = {'VERSION' : ARTIFACTSTOREVERSION, 'FILES' : {}}
+         for sRole, sFile in dictFiles.items():
+            if sFile is None:
+               continue
+            sHash = CArtifactStore.__HashFile(sFile)
+            sObjectFile = self.__GetObjectFile(sHash)
+            try:
+               # (a reused object is protected against a concurrent Evict() like a new one, until the entry is written)
+               os.utime(sObjectFile)
+            except OSError:
+               os.makedirs(os.path.dirname(sObjectFile), exist_ok=True)
+               shutil.copyfile(sFile, f"{sObjectFile}{sTempSuffix}")
+               os.replace(f"{sObjectFile}{sTempSuffix}", sObjectFile)
+            if sReferenceFolder is None:
+               sName = os.path.basename(sFile)
+            else:
+               sName = os.path.relpath(sFile, sReferenceFolder).replace("\\", "/")
+            dictEntry['FILES'][sRole] = {'NAME' : sName, 'HASH' : sHash}
+         # the entry file is written at last; the objects of an entry are complete as soon as the entry exists
+         os.makedirs(os.path.dirname(sEntryFile), exist_ok=True)
+         with open(f"{sEntryFile}{sTempSuffix}", "w", encoding="utf-8") as hEntryFile:
+            json.dump(dictEntry, hEntryFile, indent=3)
+         os.replace(f"{sEntryFile}{sTempSuffix}", sEntryFile)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Artifacts '{sKind}/{sKey}' stored"
+      return bSuccess, sResult
+
+   # eof def Put(self, sKind=None, sKey=None, dictFiles=None, sReferenceFolder=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Evict(self):
+      """
+Removes the least recently used entries until the size of all objects is below the size limit. Objects not referenced
+by any remaining entry are removed, except objects written within the last ``ARTIFACTSTORE_GRACE_PERIOD`` seconds
+(they can belong to an entry, that a concurrent build has not written yet).
+
+**Returns:**
+
+* ``nSize``
+
+  / *Type*: int /
+
+  Size of the store in bytes (after the eviction).
+
+* ``nEvicted``
+
+  / *Type*: int /
+
+  Number of removed entries.
+      """
+
+      # -- all entries, the least recently used first
+      listEntries = [] # (access time, entry file, set of hashes)
+      sEntriesFolder = f"{self.__sStoreFolder}/entries"
+      for sRootFolder, listFolders, listFileNames in os.walk(sEntriesFolder):
+         for sFileName in listFileNames:
+            sEntryFile = os.path.join(sRootFolder, sFileName)
+            if sFileName.endswith(".json") is False:
+               continue
+            try:
+               with open(sEntryFile, encoding="utf-8") as hEntryFile:
+                  dictEntry = json.load(hEntryFile)
+               setHashes = set(dictFile['HASH'] for dictFile in dictEntry['FILES'].values())
+               listEntries.append((os.path.getmtime(sEntryFile), sEntryFile, setHashes))
+            except Exception:
+               try:
+                  os.remove(sEntryFile) # (corrupted entry)
+               except OSError:
+                  pass
+      listEntries.sort()
+
+      # -- size of all objects
+      fGraceTime = time.time() - ARTIFACTSTORE_GRACE_PERIOD
+      dictObjectSizes = {}
+      sObjectsFolder = f"{self.__sStoreFolder}/objects"
+      for sRootFolder, listFolders, listFileNames in os.walk(sObjectsFolder):
+         for sFileName in listFileNames:
+            sObjectFile = os.path.join(sRootFolder, sFileName)
+            try:
+               oStat = os.stat(sObjectFile)
+               if sFileName.endswith(".tmp") is True:
+                  # (an object currently written by a concurrent build, or left over by an aborted build)
+                  if oStat.st_mtime < fGraceTime:
+                     os.remove(sObjectFile)
+                  continue
+            except OSError:
+               continue # (removed by a concurrent eviction)
+            dictObjectSizes[sFileName] = oStat.st_size
+
+      # -- remove entries, until the objects referenced by the remaining entries fit into the size limit
+      dictReferences = {}
+      for fAccessTime, sEntryFile, setHashes in listEntries:
+         for sHash in setHashes:
+            dictReferences[sHash] = dictReferences.get(sHash, 0) + 1
+      nSize = sum(dictObjectSizes.get(sHash, 0) for sHash in dictReferences)
+      nMaxSize = self.__nMaxSize * 1048576
+      nEvicted = 0
+      for fAccessTime, sEntryFile, setHashes in listEntries:
+         if nSize <= nMaxSize:
+            break
+         try:
+            os.remove(sEntryFile)
+         except OSError:
+            pass # (removed by a concurrent eviction)
+         nEvicted = nEvicted + 1
+         for sHash in setHashes:
+            dictReferences[sHash] = dictReferences[sHash] - 1
+            if dictReferences[sHash] == 0:
+               del dictReferences[sHash]
+               nSize = nSize - dictObjectSizes.get(sHash, 0)
+
+      # -- remove the objects without reference (the modification time is checked immediately before, because Put() of a concurrent
+      #    build refreshes it in case of reusing an object)
+      for sHash in dictObjectSizes:
+         if sHash not in dictReferences:
+            sObjectFile = self.__GetObjectFile(sHash)
+            try:
+               if os.path.getmtime(sObjectFile) < fGraceTime:
+                  os.remove(sObjectFile)
+            except OSError:
+               pass
+
+      return nSize, nEvicted
+
+   # eof def Evict(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetStatistics(self):
+      """Returns the number of hits and misses of all kinds of artifacts as text (e.g. ``externaldocs: 12 hit(s), 2 miss(es)``).
+      """
+      listParts = []
+      for sKind in sorted(self.__dictCounters):
+         nHits, nMisses = self.__dictCounters[sKind]
+         listParts.append(f"{sKind}: {nHits} hit(s), {nMisses} miss(es)")
+      if len(listParts) == 0:
+         return "no access"
+      return "; ".join(listParts)
+
+   # eof def GetStatistics(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetStoreFolder(self):
+      """Returns the path of the store folder.
+      """
+      return self.__sStoreFolder
+
+   # eof def GetStoreFolder(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   __HashFile = staticmethod(__HashFile)
+
+# eof class CArtifactStore():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,416 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CBuildCache.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the persistent build cache of GenMainDoc.
+
+The cache stores the output of the package doc generator of every repository (PDF file and JSON file), keyed by
+a fingerprint of the repository. In case of the fingerprint of a repository did not change since the previous build,
+the cached output is restored instead of rendering the documentation again.
+
+Optionally the cache is backed by an artifact store (command line ``--cache-dir``; see ``CArtifactStore``), that keeps
+the output of all fingerprints and can be shared between builds on fresh checkouts.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, json, hashlib, shutil
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CArtifactStore import CArtifactStore, KIND_EXTERNALDOCS
+
+# version of the cache layout; a change invalidates all existing cache entries
+CACHEVERSION = "1"
+
+# folders within repositories that contain outputs or tool data (and no sources)
+FINGERPRINT_EXCLUDED_FOLDERS = (".git", "__pycache__", "build", "dist", ".tox", ".nox", ".venv", "venv",
+                                ".pytest_cache", ".mypy_cache", ".ruff_cache")
+
+# file extensions of files, that are compiled from sources (sources itself are never excluded by extension)
+FINGERPRINT_EXCLUDED_EXTENSIONS = (".pyc",)
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CBuildCache():
+   """
+Persistent build cache for the documentation of the repositories listed in section ``IMPORTS``.
+
+The cache is a plain folder. Every repository has a subfolder containing exactly one cache entry
+(the output belonging to the most recent fingerprint).
+   """
+
+   def __init__(self, sCacheFolder=None, sArtifactStoreFolder=None):
+      """
+Constructor of class ``CBuildCache``.
+
+* ``sCacheFolder``
+
+  / *Condition*: required / *Type*: str /
+
+  Path to the cache folder (will be created, if not yet existing).
+
+* ``sArtifactStoreFolder``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  Path to the artifact store folder (command line ``--cache-dir``). In case of given, cache entries missing in the cache folder
+  are taken from the artifact store, and new cache entries are stored also there.
+      """
+
+      sMethod = "CBuildCache.__init__"
+
+      if sCacheFolder is None:
+         bSuccess = None
+         sResult  = "sCacheFolder is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sCacheFolder = CString.NormalizePath(sCacheFolder)
+      self.__oArtifactStore = None
+      if sArtifactStoreFolder is not None:
+         self.__oArtifactStore = CArtifactStore(sArtifactStoreFolder)
+
+   # eof def __init__(self, sCacheFolder=None, sArtifactStoreFolder=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetGeneratorVersion():
+      """Returns the version of the installed package doc generator (GenPackageDoc), or ``"unknown"``.
+      """
+      try:
+         from importlib.metadata import version
+         return version("GenPackageDoc")
+      except Exception:
+         return "unknown"
+
+   # eof def GetGeneratorVersion():
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetGeneratorOutputs(sRepository=None):
+      """Returns the output paths of the package doc generator within a repository, taken out of the configuration
+of the repository (``config/repository_config.json``, key ``PACKAGEDOC``) and of the package doc generator
+(``packagedoc_config.json``, keys ``OUTPUT``, ``PDFDEST`` and ``HTMLDEST``).
+
+**Returns:**
+
+* ``setOutputFolders``
+
+  / *Type*: set /
+
+  Output folders (relative to the repository root folder); everything inside is an output.
+
+* ``setOutputFiles``
+
+  / *Type*: set /
+
+  Output files (relative to the repository root folder).
+
+Paths outside the repository, and paths that cannot be resolved, are not part of the result.
+      """
+      setOutputFolders = set()
+      setOutputFiles   = set()
+
+      sRepository = CString.NormalizePath(sRepository)
+
+      def ReadJsonFile(sJsonFile):
+         # (lines commented out by '#' are removed before parsing; same format as used by the package doc generator)
+         try:
+            with open(sJsonFile, encoding="utf-8") as hFile:
+               listLines = [sLine for sLine in hFile.read().splitlines() if sLine.strip().startswith("#") is False]
+            return json.loads("\n".join(listLines))
+         except Exception:
+            return None
+
+      def GetRelPath(sPath, sReferencePath):
+         sPath = CString.NormalizePath(sPath=sPath, sReferencePathAbs=sReferencePath)
+         sRelPath = os.path.relpath(sPath, sRepository).replace("\\", "/")
+         if ( (sRelPath == "..") or (sRelPath.startswith("../") is True) ):
+            return None
+         return sRelPath
+
+      dictRepositoryConfig = ReadJsonFile(f"{sRepository}/config/repository_config.json")
+      if ( (isinstance(dictRepositoryConfig, dict) is False) or (isinstance(dictRepositoryConfig.get('PACKAGEDOC'), str) is False) ):
+         return setOutputFolders, setOutputFiles
+      sPackageDocFolder = CString.NormalizePath(sPath=dictRepositoryConfig['PACKAGEDOC'], sReferencePathAbs=sRepository)
+      dictPackageDocConfig = ReadJsonFile(f"{sPackageDocFolder}/packagedoc_config.json")
+      if isinstance(dictPackageDocConfig, dict) is False:
+         return setOutputFolders, setOutputFiles
+
+      dictPaths = {}
+      for sKey in ('OUTPUT', 'PDFDEST', 'HTMLDEST'):
+         sValue = dictPackageDocConfig.get(sKey)
+         if isinstance(sValue, str) is False:
+            continue
+         # placeholders are resolved like in the package doc generator (keys of the repository configuration)
+         for sRepositoryKey, RepositoryValue in dictRepositoryConfig.items():
+            if isinstance(RepositoryValue, str) is True:
+               sValue = sValue.replace(f"###{sRepositoryKey}###", RepositoryValue)
+         if "###" in sValue:
+            continue
+         dictPaths[sKey] = GetRelPath(sValue, sPackageDocFolder)
+
+      # the output folder contains the entire build of the package doc generator
+      if dictPaths.get('OUTPUT') not in (None, "."):
+         setOutputFolders.add(dictPaths['OUTPUT'])
+      # the PDF file is copied to 'PDFDEST', the HTML files are written to 'HTMLDEST'
+      dictDocument = dictPackageDocConfig.get('DOCUMENT')
+      if ( (dictPaths.get('PDFDEST') is not None) and (isinstance(dictDocument, dict) is True) and (isinstance(dictDocument.get('OUTPUTFILENAME'), str) is True) ):
+         sPDFFileName = os.path.splitext(os.path.basename(dictDocument['OUTPUTFILENAME']))[0] + ".pdf"
+         setOutputFiles.add(os.path.normpath(f"{dictPaths['PDFDEST']}/{sPDFFileName}").replace("\\", "/"))
+      if dictPaths.get('HTMLDEST') is not None:
+         sHTMLFolder = os.path.join(sRepository, dictPaths['HTMLDEST'])
+         if os.path.isdir(sHTMLFolder) is True:
+            for sFileName in os.listdir(sHTMLFolder):
+               if sFileName.lower().endswith(".html") is True:
+                  setOutputFiles.add(os.path.normpath(f"{dictPaths['HTMLDEST']}/{sFileName}").replace("\\", "/"))
+
+      return setOutputFolders, setOutputFiles
+
+   # eof def GetGeneratorOutputs(sRepository=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def ListRepositoryFiles(sRepository=None):
+      """Returns the sorted list of all source files of a repository (paths relative to the repository root folder).
+
+Tool and build folders (``FINGERPRINT_EXCLUDED_FOLDERS``), compiled files (``FINGERPRINT_EXCLUDED_EXTENSIONS``)
+and the output paths of the package doc generator (``GetGeneratorOutputs()``) are skipped. Other files (also PDF and HTML files)
+are sources.
+      """
+      setOutputFolders, setOutputFiles = CBuildCache.GetGeneratorOutputs(sRepository)
+      listFiles = []
+      for sRootFolder, listFolders, listFileNames in os.walk(sRepository):
+         sRelRootFolder = os.path.relpath(sRootFolder, sRepository).replace("\\", "/")
+         listFolders[:] = [sFolder for sFolder in listFolders if ( (sFolder not in FINGERPRINT_EXCLUDED_FOLDERS) and (sFolder.endswith(".egg-info") is False)
+                                                                 and (os.path.normpath(f"{sRelRootFolder}/{sFolder}").replace("\\", "/") not in setOutputFolders) )]
+         for sFileName in listFileNames:
+            if sFileName.lower().endswith(FINGERPRINT_EXCLUDED_EXTENSIONS):
+               continue
+            sFile = os.path.join(sRootFolder, sFileName)
+            sRelFile = os.path.relpath(sFile, sRepository).replace("\\", "/")
+            if sRelFile in setOutputFiles:
+               continue
+            listFiles.append(sRelFile)
+      listFiles.sort()
+      return listFiles
+
+   # eof def ListRepositoryFiles(sRepository=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetRepositoryFingerprint(sRepository=None, bStrict=True, bSimulateOnly=False, sGeneratorVersion=None):
+      """Computes the fingerprint of a repository.
+
+The fingerprint covers the content of all source files of the repository (including ``config/repository_config.json``),
+the version of the package doc generator and the ``strict`` and ``simulateonly`` flags.
+
+**Returns:**
+
+* ``sFingerprint``
+
+  / *Type*: str /
+
+  SHA-256 hex digest.
+      """
+      if sGeneratorVersion is None:
+         sGeneratorVersion = CBuildCache.GetGeneratorVersion()
+
+      oHash = hashlib.sha256()
+      oHash.update(f"cache:{CACHEVERSION}\n".encode("utf-8"))
+      oHash.update(f"generator:{sGeneratorVersion}\n".encode("utf-8"))
+      oHash.update(f"strict:{bStrict}\nsimulateonly:{bSimulateOnly}\n".encode("utf-8"))
+
+      # the repository configuration is always part of the fingerprint (independent from the exclusion rules above)
+      sRepositoryConfigFile = f"{sRepository}/config/repository_config.json"
+      if os.path.isfile(sRepositoryConfigFile) is True:
+         with open(sRepositoryConfigFile, "rb") as hFile:
+            oHash.update(b"config:" + hashlib.sha256(hFile.read()).digest())
+
+      for sRelFile in CBuildCache.ListRepositoryFiles(sRepository):
+         oFileHash = hashlib.sha256()
+         with open(os.path.join(sRepository, sRelFile), "rb") as hFile:
+            for bChunk in iter(lambda: hFile.read(1048576), b""):
+               oFileHash.update(bChunk)
+         oHash.update(sRelFile.encode("utf-8") + b"\0" + oFileHash.digest())
+
+      return oHash.hexdigest()
+
+   # eof def GetRepositoryFingerprint(sRepository=None, bStrict=True, bSimulateOnly=False, sGeneratorVersion=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Restore(self, sRepositoryName=None, sFingerprint=None, sDestinationFolder=None):
+      """Restores the cached output of a repository into ``sDestinationFolder``.
+
+**Returns:**
+
+* ``dictFiles``
+
+  / *Type*: dict /
+
+  Paths of the restored files (keys ``PDFFILE`` and ``JSONFILE``; ``PDFFILE`` is ``None`` in simulation mode),
+  or ``None`` in case of no matching cache entry exists. The key ``ARTIFACTSTORE`` indicates, if the files are taken
+  from the artifact store.
+      """
+      sEntryFolder = f"{self.__sCacheFolder}/externaldocs/{sRepositoryName}/{sFingerprint}"
+      sEntryFile = f"{sEntryFolder}/entry.json"
+      if os.path.isfile(sEntryFile) is False:
+         return self.__RestoreFromArtifactStore(sRepositoryName, sFingerprint, sDestinationFolder)
+      try:
+         with open(sEntryFile, encoding="utf-8") as hEntryFile:
+            dictEntry = json.load(hEntryFile)
+         dictFiles = {'PDFFILE' : None, 'JSONFILE' : None}
+         for sKey in dictFiles:
+            if dictEntry[sKey] is None:
+               continue
+            sDestinationFile = CString.NormalizePath(f"{sDestinationFolder}/{dictEntry[sKey]}")
+            shutil.copy2(f"{sEntryFolder}/{dictEntry[sKey]}", sDestinationFile)
+            dictFiles[sKey] = sDestinationFile
+      except Exception:
+         # an incomplete or corrupted cache entry is handled like a missing cache entry
+         return self.__RestoreFromArtifactStore(sRepositoryName, sFingerprint, sDestinationFolder)
+      dictFiles['ARTIFACTSTORE'] = False
+      return dictFiles
+
+   # eof def Restore(self, sRepositoryName=None, sFingerprint=None, sDestinationFolder=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __RestoreFromArtifactStore(self, sRepositoryName=None, sFingerprint=None, sDestinationFolder=None):
+      """Restores the output of a repository from the artifact store (if available) and takes it over into the cache folder.
+Returns the paths of the restored files (see ``Restore()``), or ``None``.
+      """
+      if self.__oArtifactStore is None:
+         return None
+      # (the hits and misses are counted by the main process, out of the results of the jobs)
+      dictStoredFiles = self.__oArtifactStore.Fetch(KIND_EXTERNALDOCS, f"{sRepositoryName}_{sFingerprint}", sDestinationFolder, bCount=False)
+      if dictStoredFiles is None:
+         return None
+      dictFiles = {'PDFFILE' : dictStoredFiles.get('PDFFILE'), 'JSONFILE' : dictStoredFiles.get('JSONFILE')}
+      self.__StoreInCacheFolder(sRepositoryName, sFingerprint, dictFiles)
+      dictFiles['ARTIFACTSTORE'] = True
+      return dictFiles
+
+   # eof def __RestoreFromArtifactStore(self, sRepositoryName=None, sFingerprint=None, sDestinationFolder=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StoreInCacheFolder(self, sRepositoryName=None, sFingerprint=None, dictFiles=None):
+      """Stores the output of a repository in the cache folder (previous cache entries of this repository are removed).
+Returns ``(bSuccess, sResult)``.
+      """
+      sMethod = "CBuildCache.__StoreInCacheFolder"
+
+      sRepositoryFolder = f"{self.__sCacheFolder}/externaldocs/{sRepositoryName}"
+      sEntryFolder = f"{sRepositoryFolder}/{sFingerprint}"
+      try:
+         if os.path.isdir(sRepositoryFolder) is True:
+            shutil.rmtree(sRepositoryFolder)
+         os.makedirs(sEntryFolder)
+         dictEntry = {}
+         for sKey in ('PDFFILE', 'JSONFILE'):
+            dictEntry[sKey] = None
+            if dictFiles[sKey] is not None:
+               dictEntry[sKey] = os.path.basename(dictFiles[sKey])
+               shutil.copy2(dictFiles[sKey], f"{sEntryFolder}/{dictEntry[sKey]}")
+         # the entry file is written at last; an entry without this file is incomplete
+         with open(f"{sEntryFolder}/entry.json", "w", encoding="utf-8") as hEntryFile:
+            json.dump(dictEntry, hEntryFile, indent=3)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Output of '{sRepositoryName}' stored in cache"
+      return bSuccess, sResult
+
+   # eof def __StoreInCacheFolder(self, sRepositoryName=None, sFingerprint=None, dictFiles=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Store(self, sRepositoryName=None, sFingerprint=None, dictFiles=None):
+      """Stores the output of a repository (``dictFiles`` with keys ``PDFFILE`` and ``JSONFILE``) in the cache
+(and in the artifact store, if available). Previous cache entries of this repository are removed.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+      sMethod = "CBuildCache.Store"
+
+      bSuccess, sResult = self.__StoreInCacheFolder(sRepositoryName, sFingerprint, dictFiles)
+      if bSuccess is not True:
+         return bSuccess, sResult
+
+      if self.__oArtifactStore is not None:
+         dictStoredFiles = {'PDFFILE' : dictFiles['PDFFILE'], 'JSONFILE' : dictFiles['JSONFILE']}
+         bSuccess, sResult = self.__oArtifactStore.Put(KIND_EXTERNALDOCS, f"{sRepositoryName}_{sFingerprint}", dictStoredFiles)
+         if bSuccess is not True:
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Output of '{sRepositoryName}' stored in cache"
+      return bSuccess, sResult
+
+   # eof def Store(self, sRepositoryName=None, sFingerprint=None, dictFiles=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   GetGeneratorVersion      = staticmethod(GetGeneratorVersion)
+   GetGeneratorOutputs      = staticmethod(GetGeneratorOutputs)
+   ListRepositoryFiles      = staticmethod(ListRepositoryFiles)
+   GetRepositoryFingerprint = staticmethod(GetRepositoryFingerprint)
+
+# eof class CBuildCache():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,321 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CBuildGraph.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the dependency graph of the build stages.
+
+Every stage declares its inputs and outputs (usually paths of files or folders). A stage depends on all stages
+producing one of its inputs; inputs that are not produced by any stage are sources. The scheduler starts every
+stage as soon as all stages it depends on are completed successfully; independent stages are executed in parallel
+(threads; the stages themselves start separate processes for the heavy work).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import time, threading
+import concurrent.futures
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CBuildTrace import CBuildTrace
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CBuildStage():
+   """
+A single stage of the build: a callable returning ``(bSuccess, sResult)`` together with its inputs and outputs.
+   """
+
+   def __init__(self, sName=None, fnExecute=None, listInputs=[], listOutputs=[]):
+      self.sName       = sName
+      self.fnExecute   = fnExecute
+      self.listInputs  = list(listInputs)
+      self.listOutputs = list(listOutputs)
+      self.listDependencies = [] # names of the stages producing the inputs (computed by CBuildGraph)
+
+   def __del__(self):
+      pass
+
+# eof class CBuildStage():
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CBuildGraph():
+   """
+Dependency graph of the build stages.
+
+Methods to execute: ``AddStage()``, ``GetOutputs()``, ``GetPlan()``, ``PrintPlan()``, ``Execute()``
+   """
+
+   def __init__(self, oBuildTrace=None):
+      """
+Constructor of class ``CBuildGraph``.
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace() / *Default*: None /
+
+  Build trace; every stage is recorded as span (category ``stage``) on the track of the thread executing the stage.
+      """
+
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+      self.__listStages  = []   # in order of declaration
+      self.__dictStages  = {}   # stage name -> stage
+      self.__dictThreadNames = {}
+      self.__oLock = threading.Lock()
+
+   # eof def __init__(self, oBuildTrace=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def AddStage(self, sName=None, fnExecute=None, listInputs=[], listOutputs=[]):
+      """
+Adds a stage to the graph.
+
+* ``sName``
+
+  / *Condition*: required / *Type*: str /
+
+  Name of the stage (unique).
+
+* ``fnExecute``
+
+  / *Condition*: required / *Type*: callable /
+
+  Function without parameters executing the stage; returns ``(bSuccess, sResult)``.
+
+* ``listInputs``, ``listOutputs``
+
+  / *Condition*: optional / *Type*: list / *Default*: [] /
+
+  Inputs and outputs of the stage. Every output must be produced by only one stage.
+      """
+
+      sMethod = "CBuildGraph.AddStage"
+
+      if sName in self.__dictStages:
+         bSuccess = None
+         sResult  = f"Stage '{sName}' already defined"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      for oStage in self.__listStages:
+         listCommonOutputs = [sOutput for sOutput in listOutputs if sOutput in oStage.listOutputs]
+         if len(listCommonOutputs) > 0:
+            bSuccess = None
+            sResult  = f"Stages '{oStage.sName}' and '{sName}' produce the same output '{listCommonOutputs[0]}'"
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      oStage = CBuildStage(sName, fnExecute, listInputs, listOutputs)
+      self.__listStages.append(oStage)
+      self.__dictStages[sName] = oStage
+
+   # eof def AddStage(self, sName=None, fnExecute=None, listInputs=[], listOutputs=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetOutputs(self):
+      """Returns the outputs of all stages (in order of declaration).
+      """
+      return [sOutput for oStage in self.__listStages for sOutput in oStage.listOutputs]
+
+   # eof def GetOutputs(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ResolveDependencies(self):
+      """Computes the dependencies of all stages out of their inputs and outputs.
+      """
+      dictProducers = {}
+      for oStage in self.__listStages:
+         for sOutput in oStage.listOutputs:
+            dictProducers[sOutput] = oStage.sName
+      for oStage in self.__listStages:
+         oStage.listDependencies = []
+         for sInput in oStage.listInputs:
+            sProducer = dictProducers.get(sInput)
+            if ( (sProducer is not None) and (sProducer != oStage.sName) and (sProducer not in oStage.listDependencies) ):
+               oStage.listDependencies.append(sProducer)
+
+   # eof def __ResolveDependencies(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetPlan(self):
+      """
+Returns the execution plan: list of levels, every level is a list of names of stages that can be executed in parallel
+(all stages they depend on belong to previous levels). Raises an exception in case of cyclic dependencies.
+      """
+
+      sMethod = "CBuildGraph.GetPlan"
+
+      self.__ResolveDependencies()
+      listLevels = []
+      setDone = set()
+      listRemaining = [oStage.sName for oStage in self.__listStages]
+      while len(listRemaining) > 0:
+         listLevel = [sName for sName in listRemaining if set(self.__dictStages[sName].listDependencies) <= setDone]
+         if len(listLevel) == 0:
+            bSuccess = None
+            sResult  = f"Cyclic dependencies between the stages: {', '.join(listRemaining)}"
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+         listLevels.append(listLevel)
+         setDone.update(listLevel)
+         listRemaining = [sName for sName in listRemaining if sName not in setDone]
+      return listLevels
+
+   # eof def GetPlan(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def PrintPlan(self):
+      """Prints the execution plan (command line ``--dry-run``).
+      """
+      listLevels = self.GetPlan()
+      print(COLBY + f"Build plan ({len(self.__listStages)} stages, {len(listLevels)} levels; stages of the same level are executed in parallel):")
+      print()
+      for nLevel, listLevel in enumerate(listLevels, start=1):
+         for sName in listLevel:
+            oStage = self.__dictStages[sName]
+            print(f"[{nLevel}] {sName}")
+            if len(oStage.listDependencies) > 0:
+               print(f"      after  : {', '.join(oStage.listDependencies)}")
+            for sOutput in oStage.listOutputs:
+               print(f"      output : {sOutput}")
+      print()
+
+   # eof def PrintPlan(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ExecuteStage(self, oStage=None):
+      """Executes a single stage (within a thread of the scheduler). Returns ``(bSuccess, sResult)``; exceptions are returned as error.
+      """
+      nTid = threading.get_native_id()
+      with self.__oLock:
+         if nTid not in self.__dictThreadNames:
+            self.__dictThreadNames[nTid] = f"build stages {len(self.__dictThreadNames) + 1}"
+      fStartTime = time.time()
+      fStartCounter = time.perf_counter()
+      try:
+         bSuccess, sResult = oStage.fnExecute()
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+      self.__oBuildTrace.AddSpan(f"stage: {oStage.sName}", "stage", fStartTime, time.perf_counter() - fStartCounter,
+                                 nTid=nTid, sThreadName=self.__dictThreadNames[nTid], dictArgs={'success' : bSuccess})
+      return bSuccess, sResult
+
+   # eof def __ExecuteStage(self, oStage=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Execute(self):
+      """
+Executes all stages. Every stage is started as soon as all stages it depends on are completed successfully.
+In case of a stage fails, no further stage is started; the stages already running are completed.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation (in case of an error: the result of the first failed stage).
+      """
+
+      sMethod = "CBuildGraph.Execute"
+
+      try:
+         self.GetPlan() # (resolves the dependencies and detects cycles)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, sResult
+
+      setDone = set()
+      listPending = [oStage.sName for oStage in self.__listStages]
+      dictRunning = {} # future -> stage name
+      bSuccessFirstError = True
+      sResultFirstError  = None
+
+      with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(self.__listStages))) as oExecutor:
+         while True:
+            if bSuccessFirstError is True:
+               for sName in list(listPending):
+                  if set(self.__dictStages[sName].listDependencies) <= setDone:
+                     listPending.remove(sName)
+                     dictRunning[oExecutor.submit(self.__ExecuteStage, self.__dictStages[sName])] = sName
+            if len(dictRunning) == 0:
+               break
+            setCompleted, setNotCompleted = concurrent.futures.wait(dictRunning, return_when=concurrent.futures.FIRST_COMPLETED)
+            for oFuture in setCompleted:
+               sName = dictRunning.pop(oFuture)
+               bSuccess, sResult = oFuture.result()
+               if bSuccess is True:
+                  setDone.add(sName)
+               elif bSuccessFirstError is True:
+                  bSuccessFirstError = bSuccess
+                  sResultFirstError  = f"Stage '{sName}' failed: {sResult}"
+         # eof while True:
+
+      if bSuccessFirstError is not True:
+         # (the result of the stage is already formatted by the stage)
+         return bSuccessFirstError, sResultFirstError
+
+      bSuccess = True
+      sResult  = f"{len(setDone)} stages executed"
+      return bSuccess, sResult
+
+   # eof def Execute(self):
+
+# eof class CBuildGraph():
+
+# --------------------------------------------------------------------------------------------------------------
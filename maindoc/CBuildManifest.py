@@ -0,0 +1,393 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CBuildManifest.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the build manifest of the main documentation.
+
+The manifest ``build_manifest.json`` is written to the package folder (next to the PDF file) after every complete build.
+It contains the fingerprints of all inputs of the build and the hashes of the files copied to the package folder.
+In case of the inputs did not change and the files within the package folder are still the ones of the previous build,
+the build can be skipped (command line ``--skip-if-up-to-date``; used by ``setup.py``).
+
+Inputs of the build:
+
+* ``GENMAINDOC``: the sources of ``genmaindoc`` (``genmaindoc.py``, ``maindoc``, ``config``),
+* ``CONFIGURATION``: the maindoc configuration file, the bundle information and the build date given in command line,
+* ``BOOKSOURCES``: the main tex file and all files within the book sources it depends on (see ``CTeXDependencies``; the files
+  generated by the build are excluded),
+* ``REPOSITORIES``: the fingerprint of every imported repository (as in the build cache, see ``CBuildCache``),
+* ``PYTHON``: the Python environment (interpreter, Python version and the names and versions of the installed Python packages,
+  see ``CPackageInventory``; without the distribution of this package, that is installed by the packaging itself),
+* ``TEX``: the TeX installation.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, re, sys, json, hashlib
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CBuildCache import CBuildCache
+from maindoc.CPackageInventory import CPackageInventory
+from maindoc.CLaTeXCompiler import CLaTeXCompiler
+from maindoc.CTeXDependencies import CTeXDependencies
+
+# version of the manifest layout; a change invalidates all existing manifests
+BUILDMANIFESTVERSION = "1"
+
+# name of the manifest file within the package folder
+BUILDMANIFESTFILENAME = "build_manifest.json"
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CBuildManifest():
+   """
+Build manifest of the main documentation (see module description).
+
+Methods to execute: ``ComputeInputs()``, then ``Check()`` and (after the build) ``Write()``
+   """
+
+   def __init__(self, dictMainDocConfig=None):
+      """
+Constructor of class ``CBuildManifest``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``).
+      """
+
+      sMethod = "CBuildManifest.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__dictMainDocConfig = dictMainDocConfig
+      self.__sPackageFolder = CString.NormalizePath(f"{dictMainDocConfig['REFERENCEPATH']}/{dictMainDocConfig['PACKAGENAME']}")
+      self.__sManifestFile = f"{self.__sPackageFolder}/{BUILDMANIFESTFILENAME}"
+
+   # eof def __init__(self, dictMainDocConfig=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __HashFile(sFile=None):
+      """Returns the SHA-256 hex digest of the content of a file.
+      """
+      oHash = hashlib.sha256()
+      with open(sFile, "rb") as hFile:
+         for bChunk in iter(lambda: hFile.read(1048576), b""):
+            oHash.update(bChunk)
+      return oHash.hexdigest()
+
+   # eof def __HashFile(sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __HashFiles(sFolder=None, listRelFiles=[]):
+      """Returns the fingerprint of a list of files (paths relative to ``sFolder``): names and contents.
+      """
+      oHash = hashlib.sha256()
+      for sRelFile in sorted(listRelFiles):
+         oHash.update(sRelFile.encode("utf-8") + b"\0" + bytes.fromhex(CBuildManifest.__HashFile(f"{sFolder}/{sRelFile}")))
+      return oHash.hexdigest()
+
+   # eof def __HashFiles(sFolder=None, listRelFiles=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetGenMainDocFingerprint(self):
+      """Returns the fingerprint of the sources of genmaindoc (located relative to this module).
+      """
+      sGenMainDocFolder = CString.NormalizePath(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+      listRelFiles = ["genmaindoc.py"]
+      for sFolder in ("maindoc", "config"):
+         listRelFiles.extend([f"{sFolder}/{sRelFile}" for sRelFile in CBuildCache.ListRepositoryFiles(f"{sGenMainDocFolder}/{sFolder}")])
+      return CBuildManifest.__HashFiles(sGenMainDocFolder, listRelFiles)
+
+   # eof def __GetGenMainDocFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetConfigurationFingerprint(self):
+      """Returns the fingerprint of the maindoc configuration file and of the bundle information given in command line.
+      """
+      oHash = hashlib.sha256()
+      oHash.update(bytes.fromhex(CBuildManifest.__HashFile(self.__dictMainDocConfig['MAINDOC_CONFIGFILE'])))
+      for sKey in ('BUNDLE_NAME', 'BUNDLE_VERSION', 'BUNDLE_VERSION_DATE', 'BUILDDATE', 'SIMULATE_ONLY'):
+         oHash.update(f"{sKey}:{self.__dictMainDocConfig[sKey]}\n".encode("utf-8"))
+      return oHash.hexdigest()
+
+   # eof def __GetConfigurationFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetBookSourcesFingerprint(self):
+      """Returns the fingerprint of the main tex file and of all files within the book sources folder it depends on (the same file set
+as used by the LaTeX compiler). Other files within the book sources folder (e.g. the PDF files of other main documentations) and
+the files generated by the build (the external doc folders and the bundle version and date) are excluded.
+      """
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      listGeneratedFiles = [self.__dictMainDocConfig['EXTERNALDOCFOLDER'], self.__dictMainDocConfig['GENERATEDDOCFOLDER'],
+                            f"{self.__dictMainDocConfig['OUTPUTFOLDER']}/BundleVersionDate.tex"]
+      oTeXDependencies = CTeXDependencies(self.__dictMainDocConfig)
+      bSuccess, sResult = oTeXDependencies.Scan(listGeneratedFiles)
+      if bSuccess is not True:
+         raise Exception(sResult)
+      listRelFiles = []
+      for sFile in oTeXDependencies.GetFiles():
+         if ( (sFile.startswith(f"{sBookSourcesFolder}/") is False) or (os.path.isfile(sFile) is False) ):
+            continue
+         if any( (sFile == sGeneratedFile) or (sFile.startswith(f"{sGeneratedFile}/") is True) for sGeneratedFile in listGeneratedFiles ):
+            continue
+         listRelFiles.append(sFile[len(sBookSourcesFolder) + 1:])
+      del oTeXDependencies
+      return CBuildManifest.__HashFiles(sBookSourcesFolder, listRelFiles)
+
+   # eof def __GetBookSourcesFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetPythonFingerprint(self):
+      """Returns the fingerprint of the Python environment: path and version of the interpreter and the names and versions of all
+installed Python packages. The distribution of this package is excluded (``setup.py install`` installs it after the build;
+otherwise every packaging run would invalidate the manifest).
+      """
+      sGenMainDocFolder = CString.NormalizePath(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+      with open(f"{sGenMainDocFolder}/config/repository_config.json", encoding="utf-8") as hConfigFile:
+         sOwnDistribution = re.sub(r"[-_.]+", "-", json.load(hConfigFile)['REPOSITORYNAME']).lower()
+      oHash = hashlib.sha256()
+      oHash.update(f"interpreter: {CString.NormalizePath(sys.executable)}\n".encode("utf-8"))
+      oHash.update(f"version: {sys.version}\n".encode("utf-8"))
+      for sName, sVersion in CPackageInventory.ComputeInstalledPackages():
+         if re.sub(r"[-_.]+", "-", sName).lower() == sOwnDistribution:
+            continue
+         oHash.update(f"{sName}=={sVersion}\n".encode("utf-8"))
+      return oHash.hexdigest()
+
+   # eof def __GetPythonFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetArtifacts(self):
+      """Returns the files copied to the package folder by the build (paths relative to the package folder).
+      """
+      listArtifacts = [f"{self.__dictMainDocConfig['JOBNAME']}.pdf"]
+      if self.__dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC'] is True:
+         listArtifacts.extend(["Components.rst", "Components.html"])
+      return listArtifacts
+
+   # eof def __GetArtifacts(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def ComputeInputs(self):
+      """
+Computes the fingerprints of all inputs of the build (see module description). The inputs are computed before the build;
+changes of the inputs during the build are detected by the next check.
+
+**Returns:**
+
+* ``dictInputs``
+
+  / *Type*: dict /
+
+  Fingerprints of the inputs by their name (``REPOSITORIES``: fingerprint by repository), or ``None`` in case of an error.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CBuildManifest.ComputeInputs"
+
+      dictInputs = {}
+      try:
+         dictInputs['GENMAINDOC']    = self.__GetGenMainDocFingerprint()
+         dictInputs['CONFIGURATION'] = self.__GetConfigurationFingerprint()
+         dictInputs['BOOKSOURCES']   = self.__GetBookSourcesFingerprint()
+         dictInputs['REPOSITORIES']  = {}
+         if self.__dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC'] is True:
+            sGeneratorVersion = CBuildCache.GetGeneratorVersion()
+            for sRepository in self.__dictMainDocConfig['IMPORTS']:
+               dictInputs['REPOSITORIES'][sRepository] = CBuildCache.GetRepositoryFingerprint(sRepository, self.__dictMainDocConfig['CONTROL']['STRICT'],
+                                                                                              self.__dictMainDocConfig['SIMULATE_ONLY'], sGeneratorVersion)
+         dictInputs['PYTHON']        = self.__GetPythonFingerprint()
+         oLaTeXCompiler = CLaTeXCompiler(self.__dictMainDocConfig)
+         dictInputs['TEX']           = hashlib.sha256(oLaTeXCompiler.GetTeXInstallationFingerprint().encode("utf-8")).hexdigest()
+         del oLaTeXCompiler
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return None, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Build manifest inputs computed ({len(dictInputs['REPOSITORIES'])} repositories)"
+      return dictInputs, bSuccess, sResult
+
+   # eof def ComputeInputs(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Check(self, dictInputs=None):
+      """
+Compares the inputs of the build with the manifest of the previous build, and the files within the package folder with the
+artifacts listed in the manifest.
+
+**Returns:**
+
+* ``bUpToDate``
+
+  / *Type*: bool /
+
+  Indicates if the files within the package folder are up to date (the build can be skipped).
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the check (in case of not up to date: the reason).
+      """
+
+      if os.path.isfile(self.__sManifestFile) is False:
+         return False, f"No build manifest '{self.__sManifestFile}'"
+      try:
+         with open(self.__sManifestFile, encoding="utf-8") as hManifestFile:
+            dictManifest = json.load(hManifestFile)
+      except Exception as ex:
+         return False, f"Build manifest '{self.__sManifestFile}' not readable ({ex})"
+      if dictManifest.get('VERSION') != BUILDMANIFESTVERSION:
+         return False, f"Build manifest '{self.__sManifestFile}' has version {dictManifest.get('VERSION')} (expected: {BUILDMANIFESTVERSION})"
+
+      listChanges = []
+      dictPreviousInputs = dictManifest['INPUTS']
+      for sName in dictInputs:
+         if sName == "REPOSITORIES":
+            dictPrevious = dictPreviousInputs.get(sName, {})
+            for sRepository in sorted(set(dictInputs[sName]) | set(dictPrevious)):
+               if dictInputs[sName].get(sRepository) != dictPrevious.get(sRepository):
+                  listChanges.append(f"repository '{os.path.basename(sRepository)}'")
+         elif dictInputs[sName] != dictPreviousInputs.get(sName):
+            listChanges.append(sName.lower())
+      if len(listChanges) > 0:
+         return False, "Inputs changed since the previous build: " + ", ".join(listChanges)
+
+      dictArtifacts = dictManifest['ARTIFACTS']
+      if sorted(dictArtifacts) != sorted(self.__GetArtifacts()):
+         return False, "Files within the package folder changed since the previous build: " + ", ".join(self.__GetArtifacts())
+      for sRelFile, sHash in sorted(dictArtifacts.items()):
+         sFile = f"{self.__sPackageFolder}/{sRelFile}"
+         if ( (os.path.isfile(sFile) is False) or (CBuildManifest.__HashFile(sFile) != sHash) ):
+            return False, f"File within the package folder changed since the previous build: '{sFile}'"
+
+      return True, f"Main documentation is up to date (build manifest '{self.__sManifestFile}' of {dictManifest['CREATED']})"
+
+   # eof def Check(self, dictInputs=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Write(self, dictInputs=None):
+      """
+Writes the manifest: the inputs of the build (computed before the build by ``ComputeInputs()``) and the hashes of the files
+within the package folder.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CBuildManifest.Write"
+
+      sTempFile = f"{self.__sManifestFile}.{os.getpid()}.tmp"
+      try:
+         dictManifest = {}
+         dictManifest['VERSION']   = BUILDMANIFESTVERSION
+         dictManifest['CREATED']   = self.__dictMainDocConfig['NOW']
+         dictManifest['INPUTS']    = dictInputs
+         dictManifest['ARTIFACTS'] = {}
+         for sRelFile in self.__GetArtifacts():
+            dictManifest['ARTIFACTS'][sRelFile] = CBuildManifest.__HashFile(f"{self.__sPackageFolder}/{sRelFile}")
+         with open(sTempFile, "w", encoding="utf-8") as hManifestFile:
+            json.dump(dictManifest, hManifestFile, indent=3)
+         os.replace(sTempFile, self.__sManifestFile)
+      except Exception as ex:
+         if os.path.isfile(sTempFile) is True:
+            os.remove(sTempFile)
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Build manifest written: '{self.__sManifestFile}'"
+      return bSuccess, sResult
+
+   # eof def Write(self, dictInputs=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   __HashFile  = staticmethod(__HashFile)
+   __HashFiles = staticmethod(__HashFiles)
+
+# eof class CBuildManifest():
+
+# --------------------------------------------------------------------------------------------------------------
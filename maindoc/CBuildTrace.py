@@ -0,0 +1,255 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CBuildTrace.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the phase tracing of GenMainDoc (command line ``--trace``).
+
+Every build phase is recorded as span (wall time, CPU time, exit code). The spans are written to a JSON file
+in Chrome trace event format, that can be opened with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+Every span is placed on the track of the thread that executed it (the build stages are executed in parallel threads,
+see ``CBuildGraph``). The CPU time of this thread is recorded as ``cpu_thread_s``; the CPU times taken from ``os.times()``
+(``process_cpu_*``) are process wide and contain also the CPU time of all other stages executed at the same time.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time, json, threading
+
+from PythonExtensionsCollection.String.CString import CString
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CTraceSpan():
+   """
+A single span of the build trace. To be used as context manager (see ``CBuildTrace.Span()``).
+   """
+
+   def __init__(self, oBuildTrace=None, sName=None, sCategory=None, dictArgs=None):
+      self.__oBuildTrace = oBuildTrace
+      self.__sName       = sName
+      self.__sCategory   = sCategory
+      self.__dictArgs    = {}
+      if dictArgs is not None:
+         self.__dictArgs.update(dictArgs)
+      self.__fStartTime     = None
+      self.__fStartCounter  = None
+      self.__fStartThreadTime = None
+      self.__oStartTimes    = None
+      self.__nTid           = None
+
+   def __del__(self):
+      pass
+
+   def __enter__(self):
+      self.__fStartTime    = time.time()
+      self.__fStartCounter = time.perf_counter()
+      self.__fStartThreadTime = time.thread_time()
+      self.__oStartTimes   = os.times()
+      self.__nTid          = threading.get_native_id()
+      return self
+
+   def __exit__(self, oExceptionType, oException, oTraceback):
+      fDuration = time.perf_counter() - self.__fStartCounter
+      oTimes = os.times()
+      self.__dictArgs['cpu_thread_s'] = round(time.thread_time() - self.__fStartThreadTime, 6)
+      # (process wide; the CPU time of child processes, e.g. the LaTeX compiler, is counted after the child processes terminated)
+      self.__dictArgs['process_cpu_user_s']   = round(oTimes.user - self.__oStartTimes.user, 6)
+      self.__dictArgs['process_cpu_system_s'] = round(oTimes.system - self.__oStartTimes.system, 6)
+      self.__dictArgs['process_cpu_children_s'] = round((oTimes.children_user - self.__oStartTimes.children_user)
+                                                        + (oTimes.children_system - self.__oStartTimes.children_system), 6)
+      if oException is not None:
+         self.__dictArgs['exception'] = str(oException)
+      self.__oBuildTrace.AddSpan(self.__sName, self.__sCategory, self.__fStartTime, fDuration, nTid=self.__nTid, dictArgs=self.__dictArgs)
+      return False # exceptions are not suppressed
+
+   def SetArg(self, sKey=None, oValue=None):
+      """Adds an argument (e.g. a return value or a file name) to the span.
+      """
+      self.__dictArgs[sKey] = oValue
+
+   def SetExitCode(self, nExitCode=None):
+      """Adds the exit code of the traced command to the span.
+      """
+      self.__dictArgs['exit_code'] = nExitCode
+
+# eof class CTraceSpan():
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CBuildTrace():
+   """
+Collects the spans of all build phases and writes them to the trace file.
+
+The spans are always collected (the overhead is negligible); the trace file is written only in case of a trace file
+is defined (``SetTraceFile()``).
+   """
+
+   def __init__(self, sTraceFile=None):
+      """
+Constructor of class ``CBuildTrace``.
+
+* ``sTraceFile``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  Path and name of the trace file. Can also be defined later (``SetTraceFile()``).
+      """
+
+      self.__nPid = os.getpid()
+      self.__nMainTid = threading.get_native_id() # (track of the thread, that created the trace)
+      self.__listEvents = []
+      self.__dictThreadNames = {}
+      self.__sTraceFile = None
+      self.SetTraceFile(sTraceFile)
+
+   # eof def __init__(self, sTraceFile=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def SetTraceFile(self, sTraceFile=None):
+      """Defines the path and name of the trace file (``None``: no trace file is written).
+      """
+      if sTraceFile is not None:
+         sTraceFile = CString.NormalizePath(os.path.abspath(sTraceFile))
+      self.__sTraceFile = sTraceFile
+
+   def GetTraceFile(self):
+      """Returns the path and name of the trace file (or ``None``).
+      """
+      return self.__sTraceFile
+
+   def GetSpans(self):
+      """Returns a copy of all spans collected up to now (list of trace events with the keys ``name``, ``cat``, ``ts``, ``dur``, ``tid`` and ``args``).
+      """
+      return [dict(dictEvent) for dictEvent in self.__listEvents]
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Span(self, sName=None, sCategory="genmaindoc", dictArgs=None):
+      """
+Returns a new span to be used as context manager:
+
+.. code::
+
+   with oBuildTrace.Span("LaTeX pass 1", "latex") as oSpan:
+      nReturn = subprocess.call(...)
+      oSpan.SetExitCode(nReturn)
+      """
+      return CTraceSpan(self, sName, sCategory, dictArgs)
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def AddSpan(self, sName=None, sCategory="genmaindoc", fStartTime=None, fDuration=0.0, nTid=None, sThreadName=None, dictArgs=None):
+      """
+Adds a span that has been measured outside this object (e.g. within a worker process).
+
+``fStartTime`` is the start time in seconds since epoch (``time.time()``), ``fDuration`` is the wall time in seconds.
+``nTid`` identifies the track within the trace (e.g. the native id of a thread or the process id of a worker process;
+default: the thread, that created the trace).
+      """
+      if nTid is None:
+         nTid = self.__nMainTid
+      if ( (sThreadName is not None) and (nTid not in self.__dictThreadNames) ):
+         self.__dictThreadNames[nTid] = sThreadName
+      dictEvent = {}
+      dictEvent['name'] = sName
+      dictEvent['cat']  = sCategory
+      dictEvent['ph']   = "X"
+      dictEvent['ts']   = int(fStartTime * 1000000)
+      dictEvent['dur']  = int(fDuration * 1000000)
+      dictEvent['pid']  = self.__nPid
+      dictEvent['tid']  = nTid
+      dictEvent['args'] = dict(dictArgs) if dictArgs is not None else {}
+      dictEvent['args']['wall_s'] = round(fDuration, 6)
+      self.__listEvents.append(dictEvent)
+
+   # eof def AddSpan(self, sName=None, sCategory="genmaindoc", fStartTime=None, fDuration=0.0, nTid=None, sThreadName=None, dictArgs=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Write(self):
+      """
+Writes all spans collected up to now to the trace file.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CBuildTrace.Write"
+
+      if self.__sTraceFile is None:
+         bSuccess = True
+         sResult  = "No trace file defined"
+         return bSuccess, sResult
+
+      listEvents = []
+      listEvents.append({'name' : "process_name", 'ph' : "M", 'pid' : self.__nPid, 'tid' : self.__nPid, 'args' : {'name' : "genmaindoc"}})
+      listEvents.append({'name' : "thread_name", 'ph' : "M", 'pid' : self.__nPid, 'tid' : self.__nMainTid, 'args' : {'name' : "main"}})
+      for nTid, sThreadName in self.__dictThreadNames.items():
+         listEvents.append({'name' : "thread_name", 'ph' : "M", 'pid' : self.__nPid, 'tid' : nTid, 'args' : {'name' : sThreadName}})
+      listEvents.extend(sorted(self.__listEvents, key=lambda dictEvent: dictEvent['ts']))
+
+      try:
+         sTraceFolder = os.path.dirname(self.__sTraceFile)
+         if os.path.isdir(sTraceFolder) is False:
+            os.makedirs(sTraceFolder)
+         with open(self.__sTraceFile, "w", encoding="utf-8") as hTraceFile:
+            json.dump({'traceEvents' : listEvents, 'displayTimeUnit' : "ms"}, hTraceFile, indent=1)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Build trace ({len(self.__listEvents)} spans) written to '{self.__sTraceFile}'"
+      return bSuccess, sResult
+
+   # eof def Write(self):
+
+# eof class CBuildTrace():
+
+# --------------------------------------------------------------------------------------------------------------
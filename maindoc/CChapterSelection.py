@@ -0,0 +1,322 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CChapterSelection.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the chapter selection of the main documentation (command line ``--chapters``).
+
+Only the selected chapters (``\\include`` within the main tex file) are typeset. This is realized by a wrapper tex file
+containing ``\\includeonly``, that inputs the main tex file. The job name is the same as for a full build; therefore
+the page numbers and references of all other chapters are taken out of their existing ``.aux`` files.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, re, json, hashlib
+
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CGeneratedFile import CGeneratedFile
+
+col.init(autoreset=True)
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+# value of command line parameter '--chapters' to select all chapters that changed since the previous build
+CHAPTERS_CHANGED = "changed"
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CChapterSelection():
+   """
+Selection of the chapters to be typeset.
+
+Methods to execute: ``Prepare()`` (before the LaTeX compiler is called) and ``UpdateState()`` (after the LaTeX compiler
+succeeded).
+   """
+
+   def __init__(self, dictMainDocConfig=None):
+      """
+Constructor of class ``CChapterSelection``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``).
+      """
+
+      sMethod = "CChapterSelection.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__dictMainDocConfig = dictMainDocConfig
+      self.__dictChapterHashes = {}
+      self.__listSelectedChapters = None
+
+      sStateName = self.__dictMainDocConfig['JOBNAME']
+      if self.__dictMainDocConfig['VARIANT'] is not None:
+         sStateName = f"{sStateName}_{self.__dictMainDocConfig['VARIANT']}"
+      self.__sStateFile = CString.NormalizePath(f"{self.__dictMainDocConfig['CACHEFOLDER']}/chapters/{sStateName}.json")
+
+   # eof def __init__(self, dictMainDocConfig=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetChapters(self):
+      """Returns the list of all chapters of the main tex file (the arguments of ``\\include`` as they are, e.g. ``./include/logging``).
+      """
+
+      sMainTexFile = self.__dictMainDocConfig['MAINTEXFILE']
+      listChapters = []
+      with open(sMainTexFile, encoding="utf-8", errors="replace") as hMainTexFile:
+         for sLine in hMainTexFile:
+            sLine = sLine.split("%", 1)[0] # ignore comments
+            for oMatch in re.finditer(r"\\include\{(.+?)\}", sLine):
+               listChapters.append(oMatch.group(1).strip())
+      return listChapters
+
+   # eof def __GetChapters(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetChapterFile(self, sChapter=None, sExtension=".tex"):
+      """Returns the path and name of the source file (or of an auxiliary file like the ``.aux`` file) of a chapter.
+
+The source file is located within the book sources folder; the auxiliary files are written by the LaTeX compiler
+into the output folder (``-output-directory``, different for every variant).
+      """
+      sReferenceFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      if sExtension != ".tex":
+         sReferenceFolder = self.__dictMainDocConfig['OUTPUTFOLDER']
+      return CString.NormalizePath(sPath=f"{sChapter}{sExtension}", sReferencePathAbs=sReferenceFolder)
+
+   # eof def __GetChapterFile(self, sChapter=None, sExtension=".tex"):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetChapterName(self, sChapter=None):
+      """Returns the name of a chapter without leading ``./`` and without extension (e.g. ``include/logging``).
+      """
+      sChapter = sChapter.strip().replace("\\", "/")
+      while sChapter.startswith("./"):
+         sChapter = sChapter[2:]
+      if sChapter.endswith(".tex"):
+         sChapter = sChapter[:-4]
+      return sChapter
+
+   # eof def __GetChapterName(self, sChapter=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ReadState(self):
+      """Returns the chapter hashes of the previous build (or ``None``, in case of no state is available).
+      """
+      if os.path.isfile(self.__sStateFile) is False:
+         return None
+      try:
+         with open(self.__sStateFile, encoding="utf-8") as hStateFile:
+            return json.load(hStateFile)['CHAPTERS']
+      except Exception:
+         return None
+
+   # eof def __ReadState(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Prepare(self):
+      """
+Computes the chapters to be typeset (command line ``--chapters``) and writes the ``\\includeonly`` wrapper tex file.
+
+* No ``--chapters``: full build.
+* ``--chapters changed``: all chapters whose source file changed since the previous build. In case of no previous build
+  is known or no chapter changed, a full build is done.
+* ``--chapters <name>,<name>,...``: the given chapters (name of the tex file, with or without path, e.g. ``logging``).
+
+Chapters without ``.aux`` file are always typeset (otherwise their page numbers and references are not available).
+
+The selection is stored in the configuration (``CHAPTERSELECTION``: list of chapters, ``None`` in case of a full build).
+
+**Returns:**
+
+* ``sTexFile``
+
+  / *Type*: str /
+
+  The tex file to be compiled (either the main tex file or the wrapper tex file).
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CChapterSelection.Prepare"
+
+      sMainTexFile = self.__dictMainDocConfig['MAINTEXFILE']
+      self.__dictMainDocConfig['CHAPTERSELECTION'] = None
+      self.__listSelectedChapters = None
+
+      listChapters = self.__GetChapters()
+      self.__dictChapterHashes = {}
+      for sChapter in listChapters:
+         sHash = None
+         sChapterFile = self.__GetChapterFile(sChapter)
+         if os.path.isfile(sChapterFile) is True:
+            with open(sChapterFile, "rb") as hChapterFile:
+               sHash = hashlib.sha256(hChapterFile.read()).hexdigest()
+         self.__dictChapterHashes[sChapter] = sHash
+
+      listChapterArgs = self.__dictMainDocConfig.get('CHAPTERS')
+      if listChapterArgs is None:
+         bSuccess = True
+         sResult  = "Full build (all chapters)"
+         return sMainTexFile, bSuccess, sResult
+
+      listSelectedChapters = []
+      if listChapterArgs == [CHAPTERS_CHANGED]:
+         dictPreviousHashes = self.__ReadState()
+         if dictPreviousHashes is None:
+            print(COLBY + "No state of a previous build available. All chapters are typeset.")
+            print()
+            bSuccess = True
+            sResult  = "Full build (all chapters)"
+            return sMainTexFile, bSuccess, sResult
+         for sChapter in listChapters:
+            if dictPreviousHashes.get(sChapter) != self.__dictChapterHashes[sChapter]:
+               listSelectedChapters.append(sChapter)
+         if len(listSelectedChapters) == 0:
+            print(COLBY + "No chapter changed since the previous build. All chapters are typeset.")
+            print()
+            bSuccess = True
+            sResult  = "Full build (all chapters)"
+            return sMainTexFile, bSuccess, sResult
+      else:
+         for sChapterArg in listChapterArgs:
+            sChapterArgName = self.__GetChapterName(sChapterArg)
+            listMatches = []
+            for sChapter in listChapters:
+               sChapterName = self.__GetChapterName(sChapter)
+               if ( (sChapterName == sChapterArgName) or (os.path.basename(sChapterName) == sChapterArgName) ):
+                  listMatches.append(sChapter)
+            if len(listMatches) == 0:
+               bSuccess = False
+               sResult  = f"Chapter '{sChapterArg}' not found in main tex file '{sMainTexFile}'. Available chapters: " + ", ".join([self.__GetChapterName(sChapter) for sChapter in listChapters])
+               return None, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+            for sChapter in listMatches:
+               if sChapter not in listSelectedChapters:
+                  listSelectedChapters.append(sChapter)
+
+      # chapters without .aux file (e.g. new chapters) are typeset in any case
+      for sChapter in listChapters:
+         if ( (sChapter not in listSelectedChapters) and (os.path.isfile(self.__GetChapterFile(sChapter, ".aux")) is False) ):
+            print(COLBY + f"Chapter '{self.__GetChapterName(sChapter)}' has no .aux file and is typeset also.")
+            listSelectedChapters.append(sChapter)
+
+      # keep the order of the main tex file
+      listSelectedChapters = [sChapter for sChapter in listChapters if sChapter in listSelectedChapters]
+
+      if len(listSelectedChapters) == len(listChapters):
+         bSuccess = True
+         sResult  = "Full build (all chapters selected)"
+         return sMainTexFile, bSuccess, sResult
+
+      # the wrapper is placed within the output folder (next to the main tex file, in case of no variants are built); the LaTeX
+      # compiler resolves all paths relative to the book sources folder
+      sOutputFolder = self.__dictMainDocConfig['OUTPUTFOLDER']
+      JOBNAME = self.__dictMainDocConfig['JOBNAME']
+      sWrapperTexFile = f"{sOutputFolder}/{JOBNAME}_includeonly.tex"
+      oWrapperTexFile = CGeneratedFile(sWrapperTexFile, bTimeStampLine=True)
+      oWrapperTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
+      oWrapperTexFile.Write("%")
+      oWrapperTexFile.Write("% Chapter selection (genmaindoc command line '--chapters'). Not selected chapters are taken over")
+      oWrapperTexFile.Write("% from their existing .aux files (page numbers, references) but are not typeset.")
+      oWrapperTexFile.Write("%")
+      oWrapperTexFile.Write(r"\includeonly{" + ",".join(listSelectedChapters) + "}")
+      oWrapperTexFile.Write(r"\input{" + os.path.basename(sMainTexFile) + "}")
+      bChanged, bSuccess, sResult = oWrapperTexFile.Commit()
+      del oWrapperTexFile
+      if bSuccess is not True:
+         return None, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      self.__listSelectedChapters = listSelectedChapters
+      self.__dictMainDocConfig['CHAPTERSELECTION'] = listSelectedChapters
+
+      bSuccess = True
+      sResult  = "Partial build. Selected chapters: " + ", ".join([self.__GetChapterName(sChapter) for sChapter in listSelectedChapters])
+      return sWrapperTexFile, bSuccess, sResult
+
+   # eof def Prepare(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def UpdateState(self):
+      """
+Stores the hashes of the typeset chapters (the reference for ``--chapters changed``). The hashes of not typeset chapters are kept.
+A failure is not handled as error (the next build with ``--chapters changed`` typesets more chapters than necessary only).
+      """
+
+      if self.__listSelectedChapters is None:
+         dictChapterHashes = dict(self.__dictChapterHashes)
+      else:
+         dictChapterHashes = self.__ReadState()
+         if dictChapterHashes is None:
+            dictChapterHashes = {}
+         for sChapter in self.__listSelectedChapters:
+            dictChapterHashes[sChapter] = self.__dictChapterHashes[sChapter]
+      try:
+         os.makedirs(os.path.dirname(self.__sStateFile), exist_ok=True)
+         with open(self.__sStateFile, "w", encoding="utf-8") as hStateFile:
+            json.dump({'CHAPTERS' : dictChapterHashes}, hStateFile, indent=3)
+      except Exception as ex:
+         print(COLBY + f"Warning: Chapter state not stored: {ex}")
+         print()
+
+   # eof def UpdateState(self):
+
+# eof class CChapterSelection():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -30,15 +30,27 @@ Python module containing all methods to generate the main documentation.
 
 # --------------------------------------------------------------------------------------------------------------
 
-import os, sys, time, json, shlex, subprocess, platform, shutil, re
+import os, sys, time, json, shlex, subprocess, platform, shutil, re, hashlib, threading
 import colorama as col
-import pypandoc
 
 from PythonExtensionsCollection.String.CString import CString
 from PythonExtensionsCollection.File.CFile import CFile
 from PythonExtensionsCollection.Folder.CFolder import CFolder
 from PythonExtensionsCollection.Utils.CUtils import *
 
+from maindoc.CExternalDocRenderer import CExternalDocRenderer, ARTIFACTSTORE_HIT
+from maindoc.CLaTeXCompiler import CLaTeXCompiler
+from maindoc.CBuildTrace import CBuildTrace
+from maindoc.CPackageInventory import CPackageInventory
+from maindoc.CBuildGraph import CBuildGraph
+from maindoc.CPDFPageCount import CPDFPageCount
+from maindoc.CPDFOptimizer import CPDFOptimizer
+from maindoc.CArtifactStore import CArtifactStore, KIND_EXTERNALDOCS
+from maindoc.CTeXDependencies import CTeXDependencies
+from maindoc.CImageOptimizer import CImageOptimizer
+from maindoc.CBuildManifest import CBuildManifest
+from maindoc.CGeneratedFile import CGeneratedFile
+
 col.init(autoreset=True)
 COLBR = col.Style.BRIGHT + col.Fore.RED
 COLBG = col.Style.BRIGHT + col.Fore.GREEN
@@ -48,6 +60,9 @@ COLBW = col.Style.BRIGHT + col.Fore.WHITE
 SUCCESS = 0
 ERROR   = 1
 
+# name of the (in memory) results of the package doc generators within the build graph
+RENDERRESULTS = "(results of the package doc generators)"
+
 # --------------------------------------------------------------------------------------------------------------
 #TM***
 
@@ -58,7 +73,7 @@ Main class ,,,
 Method to execute: ``Build()``
    """
 
-   def __init__(self, oMainDocConfig=None):
+   def __init__(self, oMainDocConfig=None, oBuildTrace=None, listRenderResults=None, oArtifactStore=None, bPackageFiles=True):
       """
 Constructor of class ``CDocBuilder``.
 
@@ -67,6 +82,32 @@ Constructor of class ``CDocBuilder``.
   / *Condition*: required / *Type*: CMainDocConfig() /
 
   Main documentation configuration containing static and dynamic configuration values.
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace() / *Default*: None /
+
+  Build trace; every build phase is recorded as span (command line ``--trace``).
+
+* ``listRenderResults``
+
+  / *Condition*: optional / *Type*: list / *Default*: None /
+
+  Results of the package doc generators rendered already for several variants of the documentation (see ``CVariantBuilder``).
+  In case of given, the repositories are not rendered again; the results of the repositories in ``IMPORTS`` are taken over.
+
+* ``oArtifactStore``
+
+  / *Condition*: optional / *Type*: CArtifactStore() / *Default*: None /
+
+  Artifact store shared with other builds of the same invocation (the size limit is applied by the owner of the store).
+  In case of not given, the build opens the artifact store itself (command line ``--cache-dir``).
+
+* ``bPackageFiles``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  Indicates if the PDF file and the overview files are copied to the package folder.
       """
 
       sMethod = "CDocBuilder.__init__"
@@ -80,7 +121,22 @@ Constructor of class ``CDocBuilder``.
 
       self.__dictMainDocConfig = oMainDocConfig.GetConfig()
 
-   # eof def __init__(self, oMainDocConfig=None):
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+
+      self.__listRenderResults = [] # results of the package doc generators (stage 'render repositories')
+      self.__listPrerenderedResults = listRenderResults # (variant build)
+      self.__oLaTeXCompiler    = None
+      self.__oArtifactStore    = oArtifactStore # command line '--cache-dir'
+      self.__bOwnArtifactStore = oArtifactStore is None
+      self.__bPackageFiles     = bPackageFiles
+      self.__listGraphicsReferences = [] # images of the book (stage 'optimize images')
+      self.__nGeneratedFiles        = 0 # files written by the stages (see __CommitGeneratedFile)
+      self.__nGeneratedFilesChanged = 0
+      self.__oGeneratedFilesLock    = threading.Lock() # (the stages are executed in parallel)
+
+   # eof def __init__(self, oMainDocConfig=None, oBuildTrace=None, listRenderResults=None, oArtifactStore=None, bPackageFiles=True):
 
    def __del__(self):
       pass
@@ -165,6 +221,22 @@ Constructor of class ``CDocBuilder``.
    # --------------------------------------------------------------------------------------------------------------
    #TM***
 
+   def __CommitGeneratedFile(self, oGeneratedFile=None):
+      """Writes a generated file in case of its content changed (see ``CGeneratedFile``) and counts the written and the changed files.
+Returns ``(bSuccess, sResult)``.
+      """
+      bChanged, bSuccess, sResult = oGeneratedFile.Commit()
+      with self.__oGeneratedFilesLock:
+         self.__nGeneratedFiles = self.__nGeneratedFiles + 1
+         if bChanged is True:
+            self.__nGeneratedFilesChanged = self.__nGeneratedFilesChanged + 1
+      return bSuccess, sResult
+
+   # eof def __CommitGeneratedFile(self, oGeneratedFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
    def __PrepareOverviewFiles(self, listofdictConfig=[]):
       """Writes some overview files containing some assorted configuration values taken out of the collected repository configurations
       """
@@ -184,11 +256,11 @@ Constructor of class ``CDocBuilder``.
       BUNDLE_VERSION      = self.__dictMainDocConfig['BUNDLE_VERSION'].replace('_',r'\_') # LaTeX requires this masking
       BUNDLE_VERSION_DATE = self.__dictMainDocConfig['BUNDLE_VERSION_DATE'].replace('_',r'\_') # LaTeX requires this masking
 
-      sExternalDocFolder = self.__dictMainDocConfig['EXTERNALDOCFOLDER']
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
       sOverviewFileName_tex = "library_doc_overview.tex"
       sOverviewFile_tex = f"{sExternalDocFolder}/{sOverviewFileName_tex}"
       self.__dictMainDocConfig['OVERVIEWFILE_TEX'] = sOverviewFile_tex
-      oOverviewFile_tex = CFile(sOverviewFile_tex)
+      oOverviewFile_tex = CGeneratedFile(sOverviewFile_tex, bTimeStampLine=True)
       oOverviewFile_tex.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
       oOverviewFile_tex.Write()
       oOverviewFile_tex.Write(r"\chapter{Library documentation}")
@@ -255,7 +327,10 @@ Constructor of class ``CDocBuilder``.
       oOverviewFile_tex.Write(r"\end{center}")
       oOverviewFile_tex.Write()
 
+      bSuccess, sResult = self.__CommitGeneratedFile(oOverviewFile_tex)
       del oOverviewFile_tex
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
       # -- 2. RST version
 
@@ -264,11 +339,11 @@ Constructor of class ``CDocBuilder``.
       BUNDLE_VERSION      = self.__dictMainDocConfig['BUNDLE_VERSION']
       BUNDLE_VERSION_DATE = self.__dictMainDocConfig['BUNDLE_VERSION_DATE']
 
-      sExternalDocFolder = self.__dictMainDocConfig['EXTERNALDOCFOLDER']
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
       sOverviewFileName_rst = "Components.rst"
       sOverviewFile_rst = f"{sExternalDocFolder}/{sOverviewFileName_rst}"
       self.__dictMainDocConfig['OVERVIEWFILE_RST'] = sOverviewFile_rst
-      oOverviewFile_rst = CFile(sOverviewFile_rst)
+      oOverviewFile_rst = CGeneratedFile(sOverviewFile_rst)
 
       oOverviewFile_rst.Write(f"**{BUNDLE_NAME} bundle**")
       oOverviewFile_rst.Write()
@@ -308,7 +383,10 @@ Constructor of class ``CDocBuilder``.
 
       oOverviewFile_rst.Write()
 
+      bSuccess, sResult = self.__CommitGeneratedFile(oOverviewFile_rst)
       del oOverviewFile_rst
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
       # -- 3. HTML version
 
@@ -319,11 +397,11 @@ Constructor of class ``CDocBuilder``.
 
       ROBFWVERSION = self.__dictMainDocConfig['ROBFWVERSION']
 
-      sExternalDocFolder = self.__dictMainDocConfig['EXTERNALDOCFOLDER']
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
       sOverviewFileName_html = "Components.html"
       sOverviewFile_html = f"{sExternalDocFolder}/{sOverviewFileName_html}"
       self.__dictMainDocConfig['OVERVIEWFILE_HTML'] = sOverviewFile_html
-      oOverviewFile_html = CFile(sOverviewFile_html)
+      oOverviewFile_html = CGeneratedFile(sOverviewFile_html)
 
       sHeader = """<html><head>
 <meta http-equiv="content-type" content="text/html; charset=windows-1252">
@@ -393,7 +471,10 @@ Constructor of class ``CDocBuilder``.
       oOverviewFile_html.Write(sFooter)
       oOverviewFile_html.Write()
 
+      bSuccess, sResult = self.__CommitGeneratedFile(oOverviewFile_html)
       del oOverviewFile_html
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
       bSuccess = True
       sResult  = f"Overview files written:\n* '{sOverviewFile_tex}'\n* '{sOverviewFile_rst}'\n* '{sOverviewFile_html}'"
@@ -405,258 +486,300 @@ Constructor of class ``CDocBuilder``.
    # --------------------------------------------------------------------------------------------------------------
    #TM***
 
-   def Build(self):
+   def __StagePrepareExternalDocFolder(self):
+      """Stage: creates the external doc folder and removes the subfolders of repositories that are not imported any more.
+In case of a variant build, the external doc folder is shared by all variants (and prepared by ``CVariantBuilder``);
+the files generated for a single variant are located within the external doc folder of the output folder of this variant.
       """
-**Arguments:**
 
-(*no arguments*)
+      sMethod = "CDocBuilder.__StagePrepareExternalDocFolder"
 
-**Returns:**
+      sExternalDocFolder  = self.__dictMainDocConfig['EXTERNALDOCFOLDER']
+      sGeneratedDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
 
-* ``bSuccess``
+      oGeneratedDocFolder = CFolder(sGeneratedDocFolder)
+      bSuccess, sResult = oGeneratedDocFolder.Create(bOverwrite=False, bRecursive=True)
+      del oGeneratedDocFolder
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      if self.__listPrerenderedResults is not None:
+         bSuccess = True
+         sResult  = f"External doc folder prepared: '{sGeneratedDocFolder}'"
+         return bSuccess, sResult
 
-  / *Type*: bool /
+      # The external doc folder is not deleted; the subfolders of the repositories are refreshed separately
+      # (either rendered again or restored from the build cache). Only subfolders of repositories that are not
+      # imported any more, are removed.
+      oExternalDocFolder = CFolder(sExternalDocFolder)
+      bSuccess, sResult = oExternalDocFolder.Create(bOverwrite=False)
+      del oExternalDocFolder
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      listRepositoryNames = [os.path.basename(sRepository) for sRepository in self.__dictMainDocConfig['IMPORTS']]
+      listRepositoryNames.append("graphics") # (optimized images, see CImageOptimizer)
+      for sEntryName in os.listdir(sExternalDocFolder):
+         sEntry = f"{sExternalDocFolder}/{sEntryName}"
+         if ( (os.path.isdir(sEntry) is True) and (sEntryName not in listRepositoryNames) ):
+            oStaleFolder = CFolder(sEntry)
+            bSuccess, sResult = oStaleFolder.Delete(bConfirmDelete=False)
+            del oStaleFolder
+            if bSuccess is not True:
+               return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-  Indicates if the computation  was successful or not.
+      bSuccess = True
+      sResult  = f"External doc folder prepared: '{sExternalDocFolder}'"
+      return bSuccess, sResult
 
-* ``sResult``
+   # eof def __StagePrepareExternalDocFolder(self):
 
-  / *Type*: str /
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
 
-  The result of the computation.
+   def __StageRenderRepositories(self):
+      """Stage: renders the documentation of all repositories (the results are kept for the stages depending on them).
       """
 
-      sMethod = "CDocBuilder.Build"
-      bSuccess = False
-      sResult  = "UNKNOWN"
+      sMethod = "CDocBuilder.__StageRenderRepositories"
 
-      listRepositories, bSuccess, sResult = self.__GetRepositoryList()
+      listRepositories = self.__dictMainDocConfig['IMPORTS']
+
+      if self.__listPrerenderedResults is not None:
+         # variant build: the repositories have been rendered once for all variants
+         dictResults = {dictResult['REPOSITORY'] : dictResult for dictResult in self.__listPrerenderedResults}
+         listMissingRepositories = [sRepository for sRepository in listRepositories if sRepository not in dictResults]
+         if len(listMissingRepositories) > 0:
+            bSuccess = False
+            sResult  = "No rendered documentation of the repositories:\n* " + "\n* ".join(listMissingRepositories)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         self.__listRenderResults = [dictResults[sRepository] for sRepository in listRepositories]
+         bSuccess = True
+         sResult  = f"Documentation of {len(listRepositories)} repositories taken over from the shared external doc folder"
+         return bSuccess, sResult
+
+      # The package doc generators of all repositories are executed in parallel (number of jobs: command line '--jobs').
+      # The order of the results is the order of the repositories in 'IMPORTS' (independent from the completion order of the jobs).
+      oExternalDocRenderer = CExternalDocRenderer(self.__dictMainDocConfig, self.__oBuildTrace)
+      with self.__oBuildTrace.Span("render repositories", "repository", {'repositories' : len(listRepositories)}):
+         listResults, bSuccess, sResult = oExternalDocRenderer.Render(listRepositories)
+      del oExternalDocRenderer
+      # (the artifact store has been accessed by the worker processes; they report hits and misses within their results)
+      if self.__oArtifactStore is not None:
+         for dictResult in listResults:
+            if dictResult.get('ARTIFACTSTORE') is not None:
+               self.__oArtifactStore.CountAccess(KIND_EXTERNALDOCS, dictResult['ARTIFACTSTORE'] == ARTIFACTSTORE_HIT)
       if bSuccess is not True:
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
-      if not os.path.isdir(sBookSourcesFolder):
-         bSuccess = False
-         sResult  = f"The input folder '{sBookSourcesFolder}' does not exist."
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      self.__listRenderResults = listResults
+      return bSuccess, sResult
 
-      # compute files and subfolders
-      sMainTexFileName = self.__dictMainDocConfig['MAINTEXFILENAME']
-      sMainTexFile     = f"{sBookSourcesFolder}/{sMainTexFileName}"
-      if os.path.isfile(sMainTexFile) is False:
-         bSuccess = False
-         sResult  = f"The main tex file '{sMainTexFile}' does not exist."
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+   # eof def __StageRenderRepositories(self):
 
-      self.__dictMainDocConfig['MAINTEXFILE'] = sMainTexFile
-      sExternalDocFolder = f"{sBookSourcesFolder}/externaldocs"
-      self.__dictMainDocConfig['EXTERNALDOCFOLDER'] = sExternalDocFolder
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
 
-      oExternalDocFolder = CFolder(sExternalDocFolder)
-      bSuccess, sResult = oExternalDocFolder.Create(bOverwrite=True)
-      del oExternalDocFolder
+   def __StageOverviewFiles(self):
+      """Stage: writes the overview files (tex, rst, html) out of the configuration files collected from the repositories.
+      """
+
+      sMethod = "CDocBuilder.__StageOverviewFiles"
+
+      listConfigFiles = [dictResult['JSONFILE'] for dictResult in self.__listRenderResults]
+
+      # get some assorted configuration values out of the configuration files collected from repositories
+      with self.__oBuildTrace.Span("__GetConfig"):
+         listofdictConfig, bSuccess, sResult = self.__GetConfig(listConfigFiles)
       if bSuccess is not True:
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(sResult)
+      print()
 
-      sPython            = self.__dictMainDocConfig['PYTHON']
-      bStrict            = self.__dictMainDocConfig['CONTROL']['STRICT']
-      bUpdateExternalDoc = self.__dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC']
+      # prepare some overview files containing some assorted configuration values taken out of the collected repository configurations
+      with self.__oBuildTrace.Span("__PrepareOverviewFiles"):
+         bSuccess, sResult = self.__PrepareOverviewFiles(listofdictConfig)
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(sResult)
+      print()
 
-      # iterate the list of repositories and call the package doc generator inside these repositories,
-      # redirect the PDF destination to the output folders used to build the main documentation
-      listPDFFiles = []
-      listConfigFiles = []
+      return bSuccess, sResult
 
-      if bUpdateExternalDoc is True:
+   # eof def __StageOverviewFiles(self):
 
-         # In case of someone only wants to see the outcome of changes in the manually maintained part of the tex sources,
-         # the rendering of all external documents (the automatically generated part) can be suppressed
-         # (with "UPDATE_EXTERNAL_DOC" : false; see maindoc_config.json). This saves time.
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
 
-         for sRepository in listRepositories:
+   def __StageLibraryDocImports(self):
+      """Stage: creates the import tex file to import the library documentations into the main documentation.
+      """
 
-            if os.path.isdir(sRepository) is False:
-               bSuccess = False
-               sResult  = f"The repository folder '{sRepository}' does not exist"
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      sMethod = "CDocBuilder.__StageLibraryDocImports"
 
-            sRepositoryName = os.path.basename(sRepository)
-            sDestinationFolder = f"{sExternalDocFolder}/{sRepositoryName}"
-            oDestinationFolder = CFolder(sDestinationFolder)
-            bSuccess, sResult = oDestinationFolder.Create(bOverwrite=True)
-            del oDestinationFolder
-            if bSuccess is not True:
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-
-            sDocumentationBuilder = f"{sRepository}/genpackagedoc.py"
-            if os.path.isfile(sDocumentationBuilder) is False:
-               bSuccess = False
-               sResult  = f"The package doc generator '{sDocumentationBuilder}' does not exist"
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-
-            # create command line and execute the documentation builder
-            listCmdLineParts = []
-            listCmdLineParts.append(f"\"{sPython}\"")
-            listCmdLineParts.append(f"\"{sDocumentationBuilder}\"")
-            listCmdLineParts.append(f"--pdfdest=\"{sDestinationFolder}\"")
-            listCmdLineParts.append(f"--configdest=\"{sDestinationFolder}\"")
-            listCmdLineParts.append(f"--strict {bStrict}")
-            if self.__dictMainDocConfig['SIMULATE_ONLY'] is True:
-               listCmdLineParts.append(f"--simulateonly")
-            sCmdLine = " ".join(listCmdLineParts)
-            del listCmdLineParts
-            listCmdLineParts = shlex.split(sCmdLine)
-            # -- debug
-            sCmdLine = " ".join(listCmdLineParts)
-            print()
-            print("Now executing command line:\n" + sCmdLine)
-            print()
-            nReturn = ERROR
-            try:
-               nReturn = subprocess.call(listCmdLineParts)
-            except Exception as ex:
-               bSuccess = None
-               sResult  = str(ex)
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-            if nReturn != SUCCESS:
-               bSuccess = False
-               sResult  = f"Documentation builder returns error {nReturn}"
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-
-            # We need to identify the name of some output files inside sDestinationFolder:
-            # - PDF file (documentation of package in current repository)
-            # - JSON file (configuration values of current repository and documentation build process)
-            sPDFFile = None
-            sJsonFile = None
-            listLocalEntries = os.listdir(sDestinationFolder)
-            for sEntryName in listLocalEntries:
-               if sEntryName.lower().endswith('.pdf'):
-                  sPDFFile = CString.NormalizePath(os.path.join(sDestinationFolder, sEntryName))
-               if sEntryName.lower().endswith('.json'):
-                  sJsonFile = CString.NormalizePath(os.path.join(sDestinationFolder, sEntryName))
-
-            # not available in simulation mode
-            if self.__dictMainDocConfig['SIMULATE_ONLY'] is False:
-               if sPDFFile is None:
-                  bSuccess = False
-                  sResult  = f"PDF file not found within '{sDestinationFolder}'"
-                  return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-               listPDFFiles.append(sPDFFile)
-
-            if sJsonFile is None:
-               bSuccess = False
-               sResult  = f"Json configuration file not found within '{sDestinationFolder}'"
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-            listConfigFiles.append(sJsonFile)
-         # eof for sRepository in listRepositories:
-
-         # get some assorted configuration values out of the configuration files collected from repositories
-         listofdictConfig, bSuccess, sResult = self.__GetConfig(listConfigFiles)
-         if bSuccess is not True:
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-         else:
-            print(sResult)
-            print()
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
 
-         # prepare some overview files containing some assorted configuration values taken out of the collected repository configurations
-         bSuccess, sResult = self.__PrepareOverviewFiles(listofdictConfig)
-         if bSuccess is not True:
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-         else:
-            print(sResult)
-            print()
+      listPDFFiles = [dictResult['PDFFILE'] for dictResult in self.__listRenderResults if dictResult['PDFFILE'] is not None]
 
-         # create the import tex file to import the library documentations into the main documentation
-         sLibraryDocImportTexFile = f"{sExternalDocFolder}/library_doc_imports.tex"
-         oLibraryDocImportTexFile = CFile(sLibraryDocImportTexFile)
-         oLibraryDocImportTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
-         oLibraryDocImportTexFile.Write("%")
-         oLibraryDocImportTexFile.Write("% This document imports the documentation of additional libraries into the main documentation.")
-         oLibraryDocImportTexFile.Write("%")
-         oLibraryDocImportTexFile.Write(r"% The split of the \includepdf for a single PDF file is a workaround to avoid a linebreak after the section heading")
-         oLibraryDocImportTexFile.Write(r"% (one \newpage too much within pdfpages.sty).")
-         oLibraryDocImportTexFile.Write("%")
-         oLibraryDocImportTexFile.Write()
-         for sPDFFile in listPDFFiles:
-            if not sPDFFile.startswith(sBookSourcesFolder):
-               bSuccess = False
-               sResult  = f"The PDF file '{sPDFFile}' is not located within the folder structure of '{sBookSourcesFolder}'. It is not possible to compute a relative path to this PDF file."
-               return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-
-            sHeadline = os.path.basename(sPDFFile)[:-4] # name of pdf file without extension
-            # the path to the PDF file to be imported, must be relative to the position of the main tex file,
-            # and this means also that the PDF must be created within a subfolder of the folder containing the main tex file
-            sHeadline = sHeadline.replace('_',r'\_') # LaTeX requires this masking
-
-            sPDFRelPath = "." + sPDFFile[len(sBookSourcesFolder):]
-            oLibraryDocImportTexFile.Write(r"\includepdf[pages=1,pagecommand=\section{" + sHeadline + "}]{" + sPDFRelPath + "}")
+      # The number of pages of every PDF file is identified once (page count index, cached by file hash). Explicit page ranges
+      # save pdfpages the scan of the PDF files in every LaTeX pass; the labels can be used as reference to the library documentations.
+      oPDFPageCount = CPDFPageCount(self.__dictMainDocConfig['CACHEFOLDER'])
+      listofTuplesPDFFiles = []
+      for sPDFFile in listPDFFiles:
+         if not sPDFFile.startswith(sBookSourcesFolder):
+            bSuccess = False
+            sResult  = f"The PDF file '{sPDFFile}' is not located within the folder structure of '{sBookSourcesFolder}'. It is not possible to compute a relative path to this PDF file."
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         nPageCount, bSuccess, sResult = oPDFPageCount.GetPageCount(sPDFFile)
+         if bSuccess is not True:
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         if nPageCount is None:
+            # (pdfpages identifies the number of pages itself)
+            print(COLBY + f"Warning: {sResult}. The pages are imported without explicit page range.")
+         listofTuplesPDFFiles.append((sPDFFile, nPageCount))
+      oPDFPageCount.Save()
+      del oPDFPageCount
+
+      sLibraryDocImportTexFile = f"{sExternalDocFolder}/library_doc_imports.tex"
+      oLibraryDocImportTexFile = CGeneratedFile(sLibraryDocImportTexFile, bTimeStampLine=True)
+      oLibraryDocImportTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
+      oLibraryDocImportTexFile.Write("%")
+      oLibraryDocImportTexFile.Write("% This document imports the documentation of additional libraries into the main documentation.")
+      oLibraryDocImportTexFile.Write("%")
+      oLibraryDocImportTexFile.Write(r"% The split of the \includepdf for a single PDF file is a workaround to avoid a linebreak after the section heading")
+      oLibraryDocImportTexFile.Write(r"% (one \newpage too much within pdfpages.sty).")
+      oLibraryDocImportTexFile.Write("%")
+      oLibraryDocImportTexFile.Write(r"% The page ranges are computed by genmaindoc; every library documentation can be referenced with \ref{libdoc:<name>}")
+      oLibraryDocImportTexFile.Write(r"% (section) and \pageref{libdoc:<name>} (first page). Names that are not unique get the suffix -2, -3, ...")
+      oLibraryDocImportTexFile.Write("%")
+      oLibraryDocImportTexFile.Write()
+      setLabels = set()
+      for sPDFFile, nPageCount in listofTuplesPDFFiles:
+         sHeadline = os.path.basename(sPDFFile)[:-4] # name of pdf file without extension
+         # (the label consists of letters, digits and hyphens only; different names can result in the same label)
+         sLabelBase = "libdoc:" + re.sub(r"[^A-Za-z0-9]+", "-", sHeadline)
+         sLabel = sLabelBase
+         nSuffix = 1
+         while sLabel in setLabels:
+            nSuffix = nSuffix + 1
+            sLabel = f"{sLabelBase}-{nSuffix}"
+         setLabels.add(sLabel)
+         # the path to the PDF file to be imported, must be relative to the position of the main tex file,
+         # and this means also that the PDF must be created within a subfolder of the folder containing the main tex file
+         sHeadline = sHeadline.replace('_',r'\_') # LaTeX requires this masking
+
+         sPDFRelPath = "." + sPDFFile[len(sBookSourcesFolder):]
+         if nPageCount is not None:
+            oLibraryDocImportTexFile.Write(f"% {sPDFRelPath} : {nPageCount} pages")
+         oLibraryDocImportTexFile.Write(r"\includepdf[pages=1,pagecommand={\section{" + sHeadline + r"}\label{" + sLabel + "}}]{" + sPDFRelPath + "}")
+         if nPageCount is None:
             oLibraryDocImportTexFile.Write(r"\includepdf[width=\textwidth,frame=true,pages=2-,pagecommand={}]{" + sPDFRelPath + "}")
-         # eof for sPDFFile in listPDFFiles:
-         del oLibraryDocImportTexFile
+         elif nPageCount > 1:
+            oLibraryDocImportTexFile.Write(r"\includepdf[width=\textwidth,frame=true,pages=2-" + str(nPageCount) + ",pagecommand={}]{" + sPDFRelPath + "}")
+      # eof for sPDFFile, nPageCount in listofTuplesPDFFiles:
+      bSuccess, sResult = self.__CommitGeneratedFile(oLibraryDocImportTexFile)
+      del oLibraryDocImportTexFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-      # eof if bUpdateExternalDoc is True:
+      bSuccess = True
+      sResult  = f"Import file written: '{sLibraryDocImportTexFile}'"
+      return bSuccess, sResult
 
-      else:
+   # eof def __StageLibraryDocImports(self):
 
-         # Import of external documentation not wanted. Therefore we create two dummy files to avoid LaTeX compilation errors
-         # of the main tex document.
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
 
-         self.__bPDFIsComplete = False
+   def __StagePlaceholderFiles(self):
+      """Stage: creates two dummy files instead of the overview and the imports (in case of "UPDATE_EXTERNAL_DOC" is false).
+      """
 
-         sOverviewFile = f"{sExternalDocFolder}/library_doc_overview.tex"
-         oOverviewFile = CFile(sOverviewFile)
-         oOverviewFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
-         oOverviewFile.Write()
-         oOverviewFile.Write("\chapter{Overview not available}")
-         oOverviewFile.Write()
-         sOutputMessage = r"{\Large\textcolor{red}{\textbf{\textit{Overview of external documentations is deactivated}}}}"
-         oOverviewFile.Write(sOutputMessage)
-         oOverviewFile.Write()
-         del oOverviewFile
+      sMethod = "CDocBuilder.__StagePlaceholderFiles"
+
+      # Import of external documentation not wanted. Therefore we create two dummy files to avoid LaTeX compilation errors
+      # of the main tex document.
+
+      self.__bPDFIsComplete = False
+
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
+
+      sOverviewFile = f"{sExternalDocFolder}/library_doc_overview.tex"
+      oOverviewFile = CGeneratedFile(sOverviewFile, bTimeStampLine=True)
+      oOverviewFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
+      oOverviewFile.Write()
+      oOverviewFile.Write("\chapter{Overview not available}")
+      oOverviewFile.Write()
+      sOutputMessage = r"{\Large\textcolor{red}{\textbf{\textit{Overview of external documentations is deactivated}}}}"
+      oOverviewFile.Write(sOutputMessage)
+      oOverviewFile.Write()
+      bSuccess, sResult = self.__CommitGeneratedFile(oOverviewFile)
+      del oOverviewFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      sLibraryDocImportTexFile = f"{sExternalDocFolder}/library_doc_imports.tex"
+      oLibraryDocImportTexFile = CGeneratedFile(sLibraryDocImportTexFile, bTimeStampLine=True)
+      oLibraryDocImportTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
+      oLibraryDocImportTexFile.Write()
+      oLibraryDocImportTexFile.Write("\chapter{Imports not available}")
+      oLibraryDocImportTexFile.Write()
+      sOutputMessage = r"{\Large\textcolor{red}{\textbf{\textit{Import of external documentations is deactivated}}}}"
+      oLibraryDocImportTexFile.Write(sOutputMessage)
+      oLibraryDocImportTexFile.Write()
+      bSuccess, sResult = self.__CommitGeneratedFile(oLibraryDocImportTexFile)
+      del oLibraryDocImportTexFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-         sLibraryDocImportTexFile = f"{sExternalDocFolder}/library_doc_imports.tex"
-         oLibraryDocImportTexFile = CFile(sLibraryDocImportTexFile)
-         oLibraryDocImportTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
-         oLibraryDocImportTexFile.Write()
-         oLibraryDocImportTexFile.Write("\chapter{Imports not available}")
-         oLibraryDocImportTexFile.Write()
-         sOutputMessage = r"{\Large\textcolor{red}{\textbf{\textit{Import of external documentations is deactivated}}}}"
-         oLibraryDocImportTexFile.Write(sOutputMessage)
-         oLibraryDocImportTexFile.Write()
-         del oLibraryDocImportTexFile
+      bSuccess = True
+      sResult  = "Placeholder files written"
+      return bSuccess, sResult
 
-      # eof else - if bUpdateExternalDoc is True:
+   # eof def __StagePlaceholderFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StageInstalledPythonModules(self):
+      """Stage: creates the tex file containing the list of installed Python modules (appendix).
+      """
 
-      # -- Create another tex file containing a list of installed Python modules
+      sMethod = "CDocBuilder.__StageInstalledPythonModules"
+
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
 
       sPythonModulesTexFile = f"{sExternalDocFolder}/python_modules_installed.tex"
-      oPythonModulesTexFile = CFile(sPythonModulesTexFile)
-      oPythonModulesTexFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
-      oPythonModulesTexFile.Write("%")
-      oPythonModulesTexFile.Write(r"\chapter{Appendix}") # in case of more content is added to appendix, this headline should be moved to outside this tex file
-      oPythonModulesTexFile.Write(r"\section{Installed Python Modules}")
-      oPythonModulesTexFile.Write("This chapter contains a list of installed Python modules together with their version numbers.")
-      oPythonModulesTexFile.Write()
-      oPythonModulesTexFile.Write(r"\vspace{2ex}")
-      oPythonModulesTexFile.Write()
-      oPythonModulesTexFile.Write(f"Based on: Python {sys.version}")
-      oPythonModulesTexFile.Write()
-      oPythonModulesTexFile.Write(r"\vspace{2ex}")
-      oPythonModulesTexFile.Write()
-      listofTuplesPackages, bSuccess, sResult = CUtils.GetInstalledPackages()
-      oPythonModulesTexFile.Write(f"{sResult}")
+      listPythonModulesTexLines = []
+      listPythonModulesTexLines.append(f"% Generated at {self.__dictMainDocConfig['NOW']}")
+      listPythonModulesTexLines.append("%")
+      listPythonModulesTexLines.append(r"\chapter{Appendix}") # in case of more content is added to appendix, this headline should be moved to outside this tex file
+      listPythonModulesTexLines.append(r"\section{Installed Python Modules}")
+      listPythonModulesTexLines.append("This chapter contains a list of installed Python modules together with their version numbers.")
+      listPythonModulesTexLines.append("")
+      listPythonModulesTexLines.append(r"\vspace{2ex}")
+      listPythonModulesTexLines.append("")
+      listPythonModulesTexLines.append(f"Based on: Python {sys.version}")
+      listPythonModulesTexLines.append("")
+      listPythonModulesTexLines.append(r"\vspace{2ex}")
+      listPythonModulesTexLines.append("")
+      with self.__oBuildTrace.Span("installed Python modules (appendix)"):
+         # (the inventory is cached as long as the Python environment does not change)
+         oPackageInventory = CPackageInventory(self.__dictMainDocConfig['CACHEFOLDER'])
+         listofTuplesPackages, bSuccess, sResult = oPackageInventory.GetInstalledPackages()
+         del oPackageInventory
+      listPythonModulesTexLines.append(f"{sResult}")
       if bSuccess is not True:
          self.__bPDFIsComplete = False
       else:
-         oPythonModulesTexFile.Write(r"\vspace{2ex}")
-         oPythonModulesTexFile.Write(r"\begin{multicols}{3}")
+         listPythonModulesTexLines.append(r"\vspace{2ex}")
+         listPythonModulesTexLines.append(r"\begin{multicols}{3}")
          for tuplePackage in listofTuplesPackages:
             sName    = tuplePackage[0]
             sName    = sName.replace('_',r'\_') # LaTeX requires this masking
             sVersion = tuplePackage[1]
-            oPythonModulesTexFile.Write(f"{sName} : {sVersion}" + r"\newline")
-         oPythonModulesTexFile.Write(r"\end{multicols}")
-      oPythonModulesTexFile.Write()
+            listPythonModulesTexLines.append(f"{sName} : {sVersion}" + r"\newline")
+         listPythonModulesTexLines.append(r"\end{multicols}")
+      listPythonModulesTexLines.append("")
 
       sAdditionalInstallationHints = """\\vspace{2ex}
 
@@ -689,17 +812,37 @@ The proxy address is an option and depends on the conditions under which your co
       # take over the concrete proxy address defined in the genmaindoc configuration file
       PROXY = self.__dictMainDocConfig['PROXY']
       sAdditionalInstallationHints = sAdditionalInstallationHints.replace("###PROXY###", PROXY)
-      oPythonModulesTexFile.Write(f"{sAdditionalInstallationHints}")
+      listPythonModulesTexLines.append(f"{sAdditionalInstallationHints}")
 
+      oPythonModulesTexFile = CGeneratedFile(sPythonModulesTexFile, bTimeStampLine=True)
+      oPythonModulesTexFile.Write(listPythonModulesTexLines)
+      bSuccess, sResult = self.__CommitGeneratedFile(oPythonModulesTexFile)
       del oPythonModulesTexFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Installed Python modules written: '{sPythonModulesTexFile}'"
+      return bSuccess, sResult
+
+   # eof def __StageInstalledPythonModules(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StageBundleVersionDate(self):
+      """Stage: creates the tex file containing the version and the date of the entire framework bundle (title page).
+      """
+
+      sMethod = "CDocBuilder.__StageBundleVersionDate"
 
       # -- Create another tex file containing the version and the date of the entire framework bundle.
       #    The values are part of the bundle information (currently defined within environment variables).
       #    This new tex file is imported in the main tex file and ensures that that the main documentation
       #    contains in the title page a version number and a date that is up to date.
 
-      BOOKSOURCES = self.__dictMainDocConfig['BOOKSOURCES']
-      sBundleVersionDateTeXFile = f"{BOOKSOURCES}/BundleVersionDate.tex"
+      OUTPUTFOLDER = self.__dictMainDocConfig['OUTPUTFOLDER']
+      sBundleVersionDateTeXFile = f"{OUTPUTFOLDER}/BundleVersionDate.tex"
       self.__dictMainDocConfig['BUNDLEVERSIONDATETEXFILE'] = sBundleVersionDateTeXFile
 
       COVERSHEETSUFFIX = None # is optional
@@ -717,7 +860,7 @@ The proxy address is an option and depends on the conditions under which your co
       BUNDLE_VERSION      = self.__dictMainDocConfig['BUNDLE_VERSION'].replace('_',r'\_') # LaTeX requires this masking
       BUNDLE_VERSION_DATE = self.__dictMainDocConfig['BUNDLE_VERSION_DATE'].replace('_',r'\_') # LaTeX requires this masking
 
-      oBundleVersionDateTeXFile = CFile(sBundleVersionDateTeXFile)
+      oBundleVersionDateTeXFile = CGeneratedFile(sBundleVersionDateTeXFile, bTimeStampLine=True)
       oBundleVersionDateTeXFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
       oBundleVersionDateTeXFile.Write()
       oBundleVersionDateTeXFile.Write(r"\title{\textbf{Specification of \\")
@@ -735,23 +878,44 @@ The proxy address is an option and depends on the conditions under which your co
 
       oBundleVersionDateTeXFile.Write(r"\date{\vspace{4ex}\textbf{" + BUNDLE_VERSION_DATE + "}}")
       oBundleVersionDateTeXFile.Write()
+
+      # reproducible build: the PDF file gets a fixed document ID (derived from the bundle information and the build date instead of
+      # the current time) and contains no path and name of embedded PDF files (these depend on the location of the working copy)
+      if self.__dictMainDocConfig['BUILDDATE'] is not None:
+         sDocumentIdentity = "\n".join([self.__dictMainDocConfig['JOBNAME'], str(self.__dictMainDocConfig['VARIANT']), self.__dictMainDocConfig['BUNDLE_NAME'],
+                                        self.__dictMainDocConfig['BUNDLE_VERSION'], self.__dictMainDocConfig['BUNDLE_VERSION_DATE'],
+                                        str(self.__dictMainDocConfig['BUILDDATE'])])
+         sDocumentID = hashlib.md5(sDocumentIdentity.encode("utf-8")).hexdigest()
+         oBundleVersionDateTeXFile.Write(r"\ifdefined\pdftrailerid\pdftrailerid{" + sDocumentID + r"}\fi")
+         oBundleVersionDateTeXFile.Write(r"\ifdefined\pdfsuppressptexinfo\pdfsuppressptexinfo=-1\relax\fi")
+         oBundleVersionDateTeXFile.Write()
+      bSuccess, sResult = self.__CommitGeneratedFile(oBundleVersionDateTeXFile)
       del oBundleVersionDateTeXFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-      # derive name of expected PDF file out of the job name
-      JOBNAME = self.__dictMainDocConfig['JOBNAME']
-      sPDFFileName = f"{JOBNAME}.pdf"
-      sPDFFileExpected = f"{sBookSourcesFolder}/{sPDFFileName}"
-      self.__dictMainDocConfig['PDFFILEEXPECTED'] = sPDFFileExpected
+      bSuccess = True
+      sResult  = f"Bundle version and date written: '{sBundleVersionDateTeXFile}'"
+      return bSuccess, sResult
 
-      # PDF file will also be copied to the package folder, from there it will be installed to Python site-packages
-      sPackageFolder = f"{self.__dictMainDocConfig['REFERENCEPATH']}/{self.__dictMainDocConfig['PACKAGENAME']}"
-      sPDFFileDestination = f"{sPackageFolder}/{sPDFFileName}"
-      self.__dictMainDocConfig['PDFFILEDESTINATION'] = sPDFFileDestination
+   # eof def __StageBundleVersionDate(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StageFinalSummary(self):
+      """Stage: creates the final summary about the document creation.
+      """
+
+      sMethod = "CDocBuilder.__StageFinalSummary"
+
+      sExternalDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
+      sPDFFileName = os.path.basename(self.__dictMainDocConfig['PDFFILEEXPECTED'])
 
       # create final summary about document creation
       sPDFFileName_masked = sPDFFileName.replace('_', r'\_') # LaTeX requires this masking
       sFinalSummaryFile = f"{sExternalDocFolder}/final_summary.tex"
-      oFinalSummaryFile = CFile(sFinalSummaryFile)
+      oFinalSummaryFile = CGeneratedFile(sFinalSummaryFile, bTimeStampLine=True)
       oFinalSummaryFile.Write(f"% Generated at {self.__dictMainDocConfig['NOW']}")
       oFinalSummaryFile.Write()
       oFinalSummaryFile.Write(r"\vfill")
@@ -763,94 +927,128 @@ The proxy address is an option and depends on the conditions under which your co
       oFinalSummaryFile.Write(r"\end{tabular}")
       oFinalSummaryFile.Write(r"\end{center}")
       oFinalSummaryFile.Write()
+      bSuccess, sResult = self.__CommitGeneratedFile(oFinalSummaryFile)
       del oFinalSummaryFile
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
-      # --------------------------------------------------------------------------------------------------------------
-      # The code after the following if statement only belongs to the LaTeX compiler building the PDF.
-      # In simulation mode we skip this part completely.
-      # --------------------------------------------------------------------------------------------------------------
-      if self.__dictMainDocConfig['SIMULATE_ONLY'] is True:
-         print()
-         print(COLBY + "GenMainDoc is running in simulation mode.")
-         print(COLBY + "Skipping call of LaTeX compiler. No new PDF output will be generated, already existing output will not be updated!")
-         print(COLBY + "! This is not handled as error and also not handled as warning !")
-         print()
-         bSuccess = True
-         sResult  = f"Generation of PDF output skipped because of simulation mode!"
-         self.__bPDFIsComplete = True # not nice, but otherwise a warning will be thrown in main function; in simulation mode we do not want to have a statement about the PDF output
-         return self.__bPDFIsComplete, bSuccess, sResult
-
-      # --------------------------------------------------------------------------------------------------------------
+      bSuccess = True
+      sResult  = f"Final summary written: '{sFinalSummaryFile}'"
+      return bSuccess, sResult
 
-      # convert main tex file to PDF
-      sLaTeXInterpreter = self.__dictMainDocConfig['LATEXINTERPRETER']
-      if os.path.isfile(sLaTeXInterpreter) is False:
-         # consider strictness regarding availability of LaTeX compiler
-         bStrict = self.__dictMainDocConfig['CONTROL']['STRICT']
-         print()
-         print(COLBR + f"Missing LaTeX compiler '{sLaTeXInterpreter}'!")
-         print()
-         if bStrict is True:
-            bSuccess = False
-            sResult  = f"Generating the documentation in PDF format not possible because of missing LaTeX compiler ('strict' mode)!"
-            sResult = CString.FormatResult(sMethod, bSuccess, sResult)
-         else:
-            bSuccess = True
-            sResult  = f"Generating the documentation in PDF format not possible because of missing LaTeX compiler ('non strict' mode)!"
-         return self.__bPDFIsComplete, bSuccess, sResult
+   # eof def __StageFinalSummary(self):
 
-      # start the compiler
-      listCmdLineParts = []
-      listCmdLineParts.append(f"\"{sLaTeXInterpreter}\"")
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
 
-      JOBNAME = self.__dictMainDocConfig['JOBNAME']
-      listCmdLineParts.append(f"-jobname=\"{JOBNAME}\"")
-      listCmdLineParts.append(f"\"{sMainTexFile}\"")
+   def __StageOptimizeImages(self):
+      """Stage: provides the optimized variants of the images of the book (see ``CImageOptimizer``).
+      """
 
-      sCmdLine = " ".join(listCmdLineParts)
-      del listCmdLineParts
-      listCmdLineParts = shlex.split(sCmdLine)
+      sMethod = "CDocBuilder.__StageOptimizeImages"
 
-      # -- debug
-      sCmdLine = " ".join(listCmdLineParts)
-      print()
-      print("Now executing command line:\n" + sCmdLine)
+      oImageOptimizer = CImageOptimizer(self.__dictMainDocConfig)
+      with self.__oBuildTrace.Span("optimize images", "latex", {'images' : len(self.__listGraphicsReferences)}):
+         bSuccess, sResult = oImageOptimizer.Optimize(self.__listGraphicsReferences)
+      del oImageOptimizer
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + sResult)
       print()
+      return bSuccess, sResult
 
-      for nDummy in range(2): # call LaTeX compiler 2 times to get TOC and index lists updated properly
-         cwd = os.getcwd() # we have to save cwd because later we have to change
-         nReturn = ERROR
-         try:
-            os.chdir(sBookSourcesFolder) # otherwise LaTeX compiler is not able to find files inside
-            nReturn = subprocess.call(listCmdLineParts)
-            print()
-            print(f"LaTeX compiler returned {nReturn}")
-            print()
-            os.chdir(cwd) # restore original value
-         except Exception as ex:
-            os.chdir(cwd) # restore original value
-            bSuccess = None
-            sResult  = str(ex)
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-         if nReturn != SUCCESS:
-            bSuccess = False
-            sResult  = f"LaTeX compiler not returned expected value {SUCCESS}"
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-      # eof for nDummy in range(2):
+   # eof def __StageOptimizeImages(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StagePrecompilePreamble(self):
+      """Stage: precompiles the preamble of the main tex file (independent from all files generated by the build).
+      """
+      sFormatName = self.__oLaTeXCompiler.PrepareFormat()
+      bSuccess = True
+      if sFormatName is None:
+         sResult = "No precompiled preamble"
+      else:
+         sResult = f"Precompiled preamble: '{sFormatName}'"
+      return bSuccess, sResult
+
+   # eof def __StagePrecompilePreamble(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StageLaTeXCompiler(self):
+      """Stage: converts the main tex file to PDF (as often as necessary to get TOC and index lists updated properly).
+      """
+
+      sMethod = "CDocBuilder.__StageLaTeXCompiler"
+
+      with self.__oBuildTrace.Span("LaTeX compiler", "latex"):
+         bSuccess, sResult = self.__oLaTeXCompiler.Compile()
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
       # -- verify the outcome
+      sPDFFileExpected = self.__dictMainDocConfig['PDFFILEEXPECTED']
       if os.path.isfile(sPDFFileExpected) is False:
          bSuccess = False
          sResult  = f"Expected PDF file '{sPDFFileExpected}' not generated"
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      return bSuccess, sResult
+
+   # eof def __StageLaTeXCompiler(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StageOptimizePDF(self):
+      """Stage: post-processing of the PDF file before it is copied to the package folder (see ``CPDFOptimizer``).
+      """
 
-      oPDFFile = CFile(sPDFFileExpected)
-      bSuccess, sResult = oPDFFile.CopyTo(sPDFFileDestination, bOverwrite=True)
-      del oPDFFile
+      sMethod = "CDocBuilder.__StageOptimizePDF"
+
+      sPDFFileExpected = self.__dictMainDocConfig['PDFFILEEXPECTED']
+      oPDFOptimizer = CPDFOptimizer(sPDFFileExpected, self.__dictMainDocConfig['BUILDDATE'] is not None)
+      with self.__oBuildTrace.Span("optimize PDF file", "artifacts", {'file' : sPDFFileExpected}):
+         bSuccess, sResult = oPDFOptimizer.Optimize()
+      del oPDFOptimizer
       if bSuccess is not True:
-         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
-      print(COLBY + f"* PDF file: {sPDFFileDestination}")
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + sResult)
       print()
+      return bSuccess, sResult
+
+   # eof def __StageOptimizePDF(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StagePackageFiles(self):
+      """Stage: copies the PDF file and the overview files to the package folder (from there they are installed to Python site-packages).
+      """
+
+      sMethod = "CDocBuilder.__StagePackageFiles"
+
+      sPDFFileExpected    = self.__dictMainDocConfig['PDFFILEEXPECTED']
+      sPDFFileDestination = self.__dictMainDocConfig['PDFFILEDESTINATION']
+      sPackageFolder      = os.path.dirname(sPDFFileDestination)
+
+      if self.__dictMainDocConfig['CHAPTERSELECTION'] is not None:
+         # the PDF file of a partial build (command line '--chapters') is for preview only and is not copied to the package folder
+         self.__bPDFIsComplete = False
+         print(COLBY + f"* PDF file (partial build, not copied to package folder): {sPDFFileExpected}")
+         print()
+      else:
+         oPDFFile = CFile(sPDFFileExpected)
+         with self.__oBuildTrace.Span("copy PDF file", "artifacts", {'destination' : sPDFFileDestination}):
+            bSuccess, sResult = oPDFFile.CopyTo(sPDFFileDestination, bOverwrite=True)
+         del oPDFFile
+         if bSuccess is not True:
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         print(COLBY + f"* PDF file: {sPDFFileDestination}")
+         print()
 
       if "OVERVIEWFILE_RST" in self.__dictMainDocConfig:
          # in case of "UPDATE_EXTERNAL_DOC" is false, "OVERVIEWFILE_RST" is not available; therefore nothing to copy to the package folder
@@ -858,15 +1056,16 @@ The proxy address is an option and depends on the conditions under which your co
          if os.path.isfile(OVERVIEWFILE_RST) is False:
             bSuccess = False
             sResult  = f"Expected overview file '{OVERVIEWFILE_RST}' not generated"
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
          sOverviewFileName = os.path.basename(OVERVIEWFILE_RST)
          sOverviewFile_dest = f"{sPackageFolder}/{sOverviewFileName}"
          oOverviewFile = CFile(OVERVIEWFILE_RST)
-         bSuccess, sResult = oOverviewFile.CopyTo(sOverviewFile_dest, bOverwrite=True)
+         with self.__oBuildTrace.Span("copy overview file (rst)", "artifacts", {'destination' : sOverviewFile_dest}):
+            bSuccess, sResult = oOverviewFile.CopyTo(sOverviewFile_dest, bOverwrite=True)
          del oOverviewFile
          if bSuccess is not True:
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
          print(COLBY + f"* Overview: {sOverviewFile_dest}")
          print()
       # eof if "OVERVIEWFILE_RST" in self.__dictMainDocConfig:
@@ -877,20 +1076,320 @@ The proxy address is an option and depends on the conditions under which your co
          if os.path.isfile(OVERVIEWFILE_HTML) is False:
             bSuccess = False
             sResult  = f"Expected overview file '{OVERVIEWFILE_HTML}' not generated"
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
 
          sOverviewFileName = os.path.basename(OVERVIEWFILE_HTML)
          sOverviewFile_dest = f"{sPackageFolder}/{sOverviewFileName}"
          oOverviewFile = CFile(OVERVIEWFILE_HTML)
-         bSuccess, sResult = oOverviewFile.CopyTo(sOverviewFile_dest, bOverwrite=True)
+         with self.__oBuildTrace.Span("copy overview file (html)", "artifacts", {'destination' : sOverviewFile_dest}):
+            bSuccess, sResult = oOverviewFile.CopyTo(sOverviewFile_dest, bOverwrite=True)
          del oOverviewFile
          if bSuccess is not True:
-            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
          print(COLBY + f"* Overview: {sOverviewFile_dest}")
          print()
       # eof if "OVERVIEWFILE_HTML" in self.__dictMainDocConfig:
 
       bSuccess = True
+      sResult  = f"Package files copied to '{sPackageFolder}'"
+      return bSuccess, sResult
+
+   # eof def __StagePackageFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __CloseArtifactStore(self):
+      """Applies the size limit to the artifact store (command line ``--cache-dir``) and prints the hits and misses of this build.
+      """
+      if self.__oArtifactStore is None:
+         return
+      if self.__bOwnArtifactStore is False:
+         # (shared with other builds; the size limit is applied by the owner of the store)
+         self.__oArtifactStore = None
+         return
+      sStoreFolder = self.__oArtifactStore.GetStoreFolder()
+      try:
+         with self.__oBuildTrace.Span("artifact store eviction", "cache"):
+            nSize, nEvicted = self.__oArtifactStore.Evict()
+         sSize = f"{nSize / 1048576:.1f} MB of {self.__dictMainDocConfig['CACHEMAXSIZE']} MB, {nEvicted} entries evicted"
+      except Exception as ex:
+         # a problem with the artifact store is not an error of the documentation build
+         sSize = f"size limit not applied: {ex}"
+      print(COLBY + f"Artifact store '{sStoreFolder}' ({sSize}):")
+      print(COLBY + f"{self.__oArtifactStore.GetStatistics()}")
+      print()
+      self.__oArtifactStore = None
+
+   # eof def __CloseArtifactStore(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Build(self):
+      """
+Builds the main documentation. The build is divided into stages with explicit inputs and outputs (see ``CBuildGraph``);
+independent stages are executed in parallel, and every stage is started as soon as its inputs are available
+(e.g. the list of installed Python modules and the precompiled preamble are prepared while the documentation
+of the repositories is rendered). In case of a dry run (command line ``--dry-run``) the plan is printed only.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+* ``bPDFIsComplete``
+
+  / *Type*: bool /
+
+  Indicates if the PDF file is complete or not.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation  was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CDocBuilder.Build"
+      bSuccess = False
+      sResult  = "UNKNOWN"
+
+      listRepositories, bSuccess, sResult = self.__GetRepositoryList()
+      if bSuccess is not True:
+         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      if not os.path.isdir(sBookSourcesFolder):
+         bSuccess = False
+         sResult  = f"The input folder '{sBookSourcesFolder}' does not exist."
+         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      # compute files and subfolders
+      sMainTexFileName = self.__dictMainDocConfig['MAINTEXFILENAME']
+      sMainTexFile     = f"{sBookSourcesFolder}/{sMainTexFileName}"
+      if os.path.isfile(sMainTexFile) is False:
+         bSuccess = False
+         sResult  = f"The main tex file '{sMainTexFile}' does not exist."
+         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      self.__dictMainDocConfig['MAINTEXFILE'] = sMainTexFile
+      sExternalDocFolder = f"{sBookSourcesFolder}/externaldocs"
+      self.__dictMainDocConfig['EXTERNALDOCFOLDER'] = sExternalDocFolder
+
+      # all files generated for this documentation are located within the output folder (that is the book sources folder,
+      # except in case of a variant build); the rendered documentation of the repositories is located within the book sources folder
+      sOutputFolder = self.__dictMainDocConfig['OUTPUTFOLDER']
+      sGeneratedDocFolder = f"{sOutputFolder}/externaldocs"
+      self.__dictMainDocConfig['GENERATEDDOCFOLDER'] = sGeneratedDocFolder
+
+      # derive name of expected PDF file out of the job name
+      JOBNAME = self.__dictMainDocConfig['JOBNAME']
+      sPDFFileName = f"{JOBNAME}.pdf"
+      sPDFFileExpected = f"{sOutputFolder}/{sPDFFileName}"
+      self.__dictMainDocConfig['PDFFILEEXPECTED'] = sPDFFileExpected
+
+      # PDF file will also be copied to the package folder, from there it will be installed to Python site-packages
+      sPackageFolder = f"{self.__dictMainDocConfig['REFERENCEPATH']}/{self.__dictMainDocConfig['PACKAGENAME']}"
+      sPDFFileDestination = f"{sPackageFolder}/{sPDFFileName}"
+      self.__dictMainDocConfig['PDFFILEDESTINATION'] = sPDFFileDestination
+
+      bUpdateExternalDoc = self.__dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC']
+
+      # -- the LaTeX compiler is not called in simulation mode and in case of the LaTeX compiler is missing
+      sLaTeXInterpreter = self.__dictMainDocConfig['LATEXINTERPRETER']
+      bCompile = ( (self.__dictMainDocConfig['SIMULATE_ONLY'] is False) and (os.path.isfile(sLaTeXInterpreter) is True) )
+
+      # -- build manifest within the package folder: the inputs of a complete build are recorded together with the files copied
+      #    to the package folder; in case of nothing changed since the previous build, the build can be skipped (used by setup.py)
+      oBuildManifest = None
+      dictManifestInputs = None
+      if ( (bCompile is True) and (self.__bPackageFiles is True) and (self.__dictMainDocConfig['DRYRUN'] is False)
+           and (self.__dictMainDocConfig['CHAPTERS'] is None) ):
+         oBuildManifest = CBuildManifest(self.__dictMainDocConfig)
+         with self.__oBuildTrace.Span("build manifest inputs", "artifacts"):
+            dictManifestInputs, bSuccess, sResult = oBuildManifest.ComputeInputs()
+         if bSuccess is not True:
+            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         if ( (self.__dictMainDocConfig['SKIPIFUPTODATE'] is True) and (self.__dictMainDocConfig['WATCH'] is False) ):
+            bUpToDate, sResult = oBuildManifest.Check(dictManifestInputs)
+            if bUpToDate is True:
+               print(COLBG + sResult)
+               print()
+               self.__bPDFIsComplete = True
+               bSuccess = True
+               return self.__bPDFIsComplete, bSuccess, sResult
+            print(COLBY + f"{sResult} - building the main documentation")
+            print()
+
+      # -- declaration of the build stages (the dependencies between the stages are derived from their inputs and outputs)
+      sOverviewFile_tex        = f"{sGeneratedDocFolder}/library_doc_overview.tex"
+      sOverviewFile_rst        = f"{sGeneratedDocFolder}/Components.rst"
+      sOverviewFile_html       = f"{sGeneratedDocFolder}/Components.html"
+      sLibraryDocImportTexFile = f"{sGeneratedDocFolder}/library_doc_imports.tex"
+      sPythonModulesTexFile    = f"{sGeneratedDocFolder}/python_modules_installed.tex"
+      sBundleVersionDateTeXFile = f"{sOutputFolder}/BundleVersionDate.tex"
+      sFinalSummaryFile        = f"{sGeneratedDocFolder}/final_summary.tex"
+      sOptimizedGraphicsFile   = f"{sGeneratedDocFolder}/optimized_graphics.tex"
+      sOptimizedGraphicsFolder = f"{sGeneratedDocFolder}/graphics"
+      sFormatFile              = f"{sBookSourcesFolder}/{CLaTeXCompiler.GetFormatName(self.__dictMainDocConfig)}.fmt"
+      listRepositoryFolders    = [f"{sExternalDocFolder}/{os.path.basename(sRepository)}" for sRepository in listRepositories]
+
+      listExternalDocFolders = [sExternalDocFolder]
+      if sGeneratedDocFolder != sExternalDocFolder:
+         listExternalDocFolders.extend([sOutputFolder, sGeneratedDocFolder])
+
+      oBuildGraph = CBuildGraph(self.__oBuildTrace)
+      oBuildGraph.AddStage("external doc folder", self.__StagePrepareExternalDocFolder,
+                           [], listExternalDocFolders)
+      if bUpdateExternalDoc is True:
+         # In case of someone only wants to see the outcome of changes in the manually maintained part of the tex sources,
+         # the rendering of all external documents (the automatically generated part) can be suppressed
+         # (with "UPDATE_EXTERNAL_DOC" : false; see maindoc_config.json). This saves time.
+         oBuildGraph.AddStage("render repositories", self.__StageRenderRepositories,
+                              [sExternalDocFolder] + listRepositories, [RENDERRESULTS] + listRepositoryFolders)
+         oBuildGraph.AddStage("overview files", self.__StageOverviewFiles,
+                              [RENDERRESULTS], [sOverviewFile_tex, sOverviewFile_rst, sOverviewFile_html])
+         oBuildGraph.AddStage("library doc imports", self.__StageLibraryDocImports,
+                              [RENDERRESULTS], [sLibraryDocImportTexFile])
+      else:
+         oBuildGraph.AddStage("placeholder files", self.__StagePlaceholderFiles,
+                              [sGeneratedDocFolder], [sOverviewFile_tex, sLibraryDocImportTexFile])
+      oBuildGraph.AddStage("installed Python modules", self.__StageInstalledPythonModules,
+                           [sGeneratedDocFolder], [sPythonModulesTexFile])
+      oBuildGraph.AddStage("bundle version and date", self.__StageBundleVersionDate,
+                           [sOutputFolder], [sBundleVersionDateTeXFile])
+      oBuildGraph.AddStage("final summary", self.__StageFinalSummary,
+                           [sGeneratedDocFolder], [sFinalSummaryFile])
+      # (the main tex file inputs the image mapping in every case; without LaTeX compiler the images are not optimized)
+      oBuildGraph.AddStage("optimize images", self.__StageOptimizeImages,
+                           [sGeneratedDocFolder, sMainTexFile], [sOptimizedGraphicsFile, sOptimizedGraphicsFolder])
+      # -- artifact store shared with other builds (e.g. CI runs on fresh checkouts)
+      if ( (self.__oArtifactStore is None) and (self.__dictMainDocConfig['CACHEDIR'] is not None) ):
+         self.__oArtifactStore = CArtifactStore(self.__dictMainDocConfig['CACHEDIR'], self.__dictMainDocConfig['CACHEMAXSIZE'])
+
+      if bCompile is True:
+         self.__oLaTeXCompiler = CLaTeXCompiler(self.__dictMainDocConfig, self.__oBuildTrace, self.__oArtifactStore)
+         oBuildGraph.AddStage("precompile preamble", self.__StagePrecompilePreamble,
+                              [sMainTexFile], [sFormatFile])
+         oBuildGraph.AddStage("LaTeX compiler", self.__StageLaTeXCompiler,
+                              [sMainTexFile, sFormatFile, sOverviewFile_tex, sLibraryDocImportTexFile, sPythonModulesTexFile,
+                               sBundleVersionDateTeXFile, sFinalSummaryFile, sOptimizedGraphicsFile], [sPDFFileExpected])
+         listPackageInputs = [sPDFFileExpected]
+         # optional post-processing of the PDF file (not in case of a partial build, that is for preview only)
+         bOptimizePDF = ( ("OPTIMIZE_PDF" in self.__dictMainDocConfig['CONTROL']) and (self.__dictMainDocConfig['CONTROL']['OPTIMIZE_PDF'] is True)
+                          and (self.__dictMainDocConfig['CHAPTERS'] is None) )
+         if bOptimizePDF is True:
+            sPDFFileOptimized = f"{sPDFFileExpected} (optimized)" # (the PDF file is optimized in place)
+            oBuildGraph.AddStage("optimize PDF", self.__StageOptimizePDF,
+                                 [sPDFFileExpected], [sPDFFileOptimized])
+            listPackageInputs = [sPDFFileOptimized]
+         listPackageOutputs = [sPDFFileDestination]
+         if bUpdateExternalDoc is True:
+            listPackageInputs.extend([sOverviewFile_rst, sOverviewFile_html])
+            listPackageOutputs.extend([f"{sPackageFolder}/{os.path.basename(sOverviewFile_rst)}", f"{sPackageFolder}/{os.path.basename(sOverviewFile_html)}"])
+         # (in case of a variant build only the primary variant is copied to the package folder)
+         if self.__bPackageFiles is True:
+            oBuildGraph.AddStage("package files", self.__StagePackageFiles,
+                                 listPackageInputs, listPackageOutputs)
+
+      # -- static check of the book sources: files referenced by the main tex file, that do not exist and that are not generated
+      #    by a stage of this build, are reported before any stage is executed (otherwise the LaTeX compiler fails after minutes)
+      oTeXDependencies = CTeXDependencies(self.__dictMainDocConfig)
+      with self.__oBuildTrace.Span("scan tex dependencies", "latex"):
+         bSuccess, sResult = oTeXDependencies.Scan(oBuildGraph.GetOutputs())
+      if bSuccess is not True:
+         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + sResult)
+      print()
+      if len(oTeXDependencies.GetMissingFiles()) > 0:
+         sMissingFiles = oTeXDependencies.FormatMissingFiles()
+         if ( (bCompile is True) and (self.__dictMainDocConfig['DRYRUN'] is False) ):
+            bSuccess = False
+            sResult  = f"Files referenced by the main tex file not found (within '{sBookSourcesFolder}'):\n{sMissingFiles}"
+            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         print(COLBY + f"Warning: Files referenced by the main tex file not found (within '{sBookSourcesFolder}'):")
+         print(COLBY + sMissingFiles)
+         print()
+      if bCompile is True:
+         self.__listGraphicsReferences = oTeXDependencies.GetReferences("includegraphics")
+      del oTeXDependencies
+
+      if self.__dictMainDocConfig['DRYRUN'] is True:
+         try:
+            oBuildGraph.PrintPlan()
+         except Exception as ex:
+            bSuccess = None
+            sResult  = str(ex)
+            return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         if self.__dictMainDocConfig['SIMULATE_ONLY'] is True:
+            print(COLBY + "The LaTeX compiler stages are not part of the plan (simulation mode).")
+            print()
+         elif bCompile is False:
+            print(COLBY + f"The LaTeX compiler stages are not part of the plan (missing LaTeX compiler '{sLaTeXInterpreter}').")
+            print()
+         self.__oArtifactStore = None
+         bSuccess = True
+         sResult  = "Dry run: build plan printed, no stage executed"
+         return self.__bPDFIsComplete, bSuccess, sResult
+
+      # -- execution of the build stages
+      bSuccess, sResult = oBuildGraph.Execute()
+      del oBuildGraph
+      self.__oLaTeXCompiler = None
+      self.__CloseArtifactStore()
+      if bSuccess is not True:
+         return self.__bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + f"Generated files: {self.__nGeneratedFilesChanged} of {self.__nGeneratedFiles} changed " \
+                  + f"({self.__nGeneratedFiles - self.__nGeneratedFilesChanged} unchanged and not written again)")
+      print()
+
+      # --------------------------------------------------------------------------------------------------------------
+      # In simulation mode the LaTeX compiler building the PDF has been skipped completely.
+      # --------------------------------------------------------------------------------------------------------------
+      if self.__dictMainDocConfig['SIMULATE_ONLY'] is True:
+         print()
+         print(COLBY + "GenMainDoc is running in simulation mode.")
+         print(COLBY + "Skipping call of LaTeX compiler. No new PDF output will be generated, already existing output will not be updated!")
+         print(COLBY + "! This is not handled as error and also not handled as warning !")
+         print()
+         bSuccess = True
+         sResult  = f"Generation of PDF output skipped because of simulation mode!"
+         self.__bPDFIsComplete = True # not nice, but otherwise a warning will be thrown in main function; in simulation mode we do not want to have a statement about the PDF output
+         return self.__bPDFIsComplete, bSuccess, sResult
+
+      if bCompile is False:
+         # consider strictness regarding availability of LaTeX compiler
+         bStrict = self.__dictMainDocConfig['CONTROL']['STRICT']
+         print()
+         print(COLBR + f"Missing LaTeX compiler '{sLaTeXInterpreter}'!")
+         print()
+         if bStrict is True:
+            bSuccess = False
+            sResult  = f"Generating the documentation in PDF format not possible because of missing LaTeX compiler ('strict' mode)!"
+            sResult = CString.FormatResult(sMethod, bSuccess, sResult)
+         else:
+            bSuccess = True
+            sResult  = f"Generating the documentation in PDF format not possible because of missing LaTeX compiler ('non strict' mode)!"
+         return self.__bPDFIsComplete, bSuccess, sResult
+
+      bSuccess = True
+
+      # (an incomplete PDF file is not recorded; the next build is not skipped)
+      if ( (oBuildManifest is not None) and (self.__bPDFIsComplete is True) ):
+         bManifestWritten, sManifestResult = oBuildManifest.Write(dictManifestInputs)
+         if bManifestWritten is True:
+            print(COLBY + sManifestResult)
+         else:
+            print(COLBY + f"Warning: {sManifestResult}")
+         print()
 
       if self.__bPDFIsComplete is True:
          sResult  = "Main documentation generated"
@@ -0,0 +1,756 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CExternalDocRenderer.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the rendering of the external documentations (the documentations of all repositories
+listed in section ``IMPORTS`` of the maindoc configuration).
+
+The package doc generator of every repository is executed within a pool of worker processes, or - in case of
+a work queue is used (command line ``--queue``) - by the workers of the work queue on other hosts.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time, shlex, shutil, multiprocessing
+import concurrent.futures
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CBuildCache import CBuildCache
+from maindoc.CBuildTrace import CBuildTrace
+from maindoc.CLoggedProcess import CLoggedProcess
+from maindoc.CInProcessGenerator import CInProcessGenerator, WarmUpWorker
+from maindoc.CWorkQueue import CWorkQueue, QUEUE_POLL_INTERVAL, QUEUE_TIMEOUT
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+SUCCESS = 0
+ERROR   = 1
+
+# status of a single repository job (used in the result table)
+STATUS_OK        = "OK"
+STATUS_CACHED    = "CACHED"
+STATUS_FAILED    = "FAILED"
+STATUS_CANCELLED = "CANCELLED"
+
+# result of the lookup of a repository job in the artifact store (command line '--cache-dir')
+ARTIFACTSTORE_HIT  = "HIT"
+ARTIFACTSTORE_MISS = "MISS"
+
+# start method of the worker processes. The pool is created within a thread of the build graph; a forked child process would inherit
+# locks held by other threads at the time of the fork (and could deadlock). 'forkserver' is not available on Windows.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def NewJobResult(dictJob=None, sStatus=STATUS_FAILED, bSuccess=None, sResult="UNKNOWN"):
+   """Returns an initial result dictionary for the job ``dictJob`` (see ``RenderRepository()``).
+   """
+   dictResult = {}
+   dictResult['INDEX']          = dictJob['INDEX']
+   dictResult['REPOSITORY']     = dictJob['REPOSITORY']
+   dictResult['REPOSITORYNAME'] = os.path.basename(dictJob['REPOSITORY'])
+   dictResult['STATUS']         = sStatus
+   dictResult['RETURN']         = None
+   dictResult['PDFFILE']        = None
+   dictResult['JSONFILE']       = None
+   dictResult['LOGFILE']        = None
+   dictResult['ARTIFACTSTORE']  = None # result of the lookup in the artifact store (ARTIFACTSTORE_HIT, ARTIFACTSTORE_MISS or None)
+   dictResult['DURATION']       = 0.0
+   dictResult['STARTTIME']      = None
+   dictResult['CPUTIME']        = None
+   dictResult['PID']            = None
+   dictResult['bSuccess']       = bSuccess
+   dictResult['sResult']        = sResult
+   return dictResult
+
+# eof def NewJobResult(dictJob=None, sStatus=STATUS_FAILED, bSuccess=None, sResult="UNKNOWN"):
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def RenderRepository(dictJob=None, oCancelEvent=None):
+   """Executes a single repository job (see ``ExecuteRepositoryJob()``) and measures it.
+
+This function is executed within a worker process of the process pool. Therefore it is defined on module level
+(and not as method of ``CExternalDocRenderer``).
+
+The result contains additionally the start time (``STARTTIME``, seconds since epoch), the wall time (``DURATION``),
+the CPU time of the worker process and the package doc generator (``CPUTIME``) and the process id of the worker (``PID``).
+   """
+   fStartTime    = time.time()
+   fStartCounter = time.perf_counter()
+   oStartTimes   = os.times()
+   dictResult = ExecuteRepositoryJob(dictJob, oCancelEvent)
+   oTimes = os.times()
+   dictResult['STARTTIME'] = fStartTime
+   dictResult['DURATION']  = time.perf_counter() - fStartCounter
+   dictResult['CPUTIME']   = (oTimes.user - oStartTimes.user) + (oTimes.system - oStartTimes.system) \
+                             + (oTimes.children_user - oStartTimes.children_user) + (oTimes.children_system - oStartTimes.children_system)
+   dictResult['PID']       = os.getpid()
+   return dictResult
+
+# eof def RenderRepository(dictJob=None, oCancelEvent=None):
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def ExecuteRepositoryJob(dictJob=None, oCancelEvent=None):
+   """Executes the package doc generator inside a single repository and identifies the generated output files.
+
+**Arguments:**
+
+* ``dictJob``
+
+  / *Condition*: required / *Type*: dict /
+
+  Job description with the keys ``INDEX``, ``REPOSITORY``, ``DESTINATIONFOLDER``, ``PYTHON``, ``STRICT``, ``SIMULATE_ONLY``,
+  ``CACHEFOLDER``, ``CACHEDIR``, ``IGNORECACHE``, ``GENERATORVERSION`` and ``INPROCESS``.
+
+  With ``INPROCESS`` the package doc generator is executed within the worker process (see ``CInProcessGenerator``)
+  instead of a separate Python interpreter.
+
+  In case of the fingerprint of the repository matches the fingerprint of the cached output, the cached output is restored
+  and the package doc generator is not executed (``IGNORECACHE`` switches off the restore, but not the update of the cache).
+  ``CACHEDIR`` is the (optional) artifact store behind the build cache (see ``CBuildCache``).
+
+* ``oCancelEvent``
+
+  / *Condition*: optional / *Type*: multiprocessing.Event / *Default*: None /
+
+  If set by the main process, a running package doc generator is terminated.
+
+**Returns:**
+
+* ``dictResult``
+
+  / *Type*: dict /
+
+  Result of the job with the keys ``INDEX``, ``REPOSITORY``, ``REPOSITORYNAME``, ``STATUS``, ``RETURN``, ``PDFFILE``,
+  ``JSONFILE``, ``ARTIFACTSTORE``, ``bSuccess`` and ``sResult`` (see ``NewJobResult()``).
+   """
+
+   sMethod = "ExecuteRepositoryJob"
+
+   sRepository = dictJob['REPOSITORY']
+   sRepositoryName = os.path.basename(sRepository)
+   sDestinationFolder = dictJob['DESTINATIONFOLDER']
+
+   dictResult = NewJobResult(dictJob)
+
+   if ( (oCancelEvent is not None) and (oCancelEvent.is_set() is True) ):
+      dictResult['STATUS']   = STATUS_CANCELLED
+      dictResult['bSuccess'] = False
+      dictResult['sResult']  = "Cancelled because of previous error"
+      return dictResult
+
+   # (the folder is recreated silently; the console shows only one progress line per repository)
+   try:
+      if os.path.isdir(sDestinationFolder) is True:
+         shutil.rmtree(sDestinationFolder)
+      os.makedirs(sDestinationFolder)
+   except Exception as ex:
+      dictResult['bSuccess'] = None
+      dictResult['sResult']  = CString.FormatResult(sMethod, None, str(ex))
+      return dictResult
+
+   # -- restore the output from the build cache (if the repository did not change since the previous build)
+   oBuildCache = None
+   sFingerprint = None
+   if dictJob['CACHEFOLDER'] is not None:
+      oBuildCache = CBuildCache(dictJob['CACHEFOLDER'], dictJob['CACHEDIR'])
+      sFingerprint = CBuildCache.GetRepositoryFingerprint(sRepository, dictJob['STRICT'], dictJob['SIMULATE_ONLY'], dictJob['GENERATORVERSION'])
+      if dictJob['IGNORECACHE'] is False:
+         dictFiles = oBuildCache.Restore(sRepositoryName, sFingerprint, sDestinationFolder)
+         if dictFiles is not None:
+            dictResult['PDFFILE']  = dictFiles['PDFFILE']
+            dictResult['JSONFILE'] = dictFiles['JSONFILE']
+            if dictFiles['ARTIFACTSTORE'] is True:
+               dictResult['ARTIFACTSTORE'] = ARTIFACTSTORE_HIT
+            dictResult['STATUS']   = STATUS_CACHED
+            dictResult['bSuccess'] = True
+            dictResult['sResult']  = f"Documentation of '{sRepositoryName}' restored from cache"
+            return dictResult
+
+   sDocumentationBuilder = f"{sRepository}/genpackagedoc.py"
+
+   # create command line and execute the documentation builder
+   listCmdLineParts = []
+   listCmdLineParts.append(f"\"{dictJob['PYTHON']}\"")
+   listCmdLineParts.append(f"\"{sDocumentationBuilder}\"")
+   listCmdLineParts.append(f"--pdfdest=\"{sDestinationFolder}\"")
+   listCmdLineParts.append(f"--configdest=\"{sDestinationFolder}\"")
+   listCmdLineParts.append(f"--strict {dictJob['STRICT']}")
+   if dictJob['SIMULATE_ONLY'] is True:
+      listCmdLineParts.append(f"--simulateonly")
+   sCmdLine = " ".join(listCmdLineParts)
+   del listCmdLineParts
+   listCmdLineParts = shlex.split(sCmdLine)
+   # the console output of the package doc generator is redirected to a log file within the destination folder
+   sLogFile = f"{sDestinationFolder}/genpackagedoc.log"
+   dictResult['LOGFILE'] = sLogFile
+   dictFiles = None
+   if dictJob['INPROCESS'] is True:
+      # the package doc generator is executed within this (warm) worker process; the output files are taken over
+      # from the configuration of the package doc generator
+      oLoggedProcess = CInProcessGenerator(sDocumentationBuilder, listCmdLineParts[2:], sLogFile)
+   else:
+      oLoggedProcess = CLoggedProcess(listCmdLineParts, sLogFile)
+   try:
+      nReturn = oLoggedProcess.Run(oCancelEvent)
+      if ( (dictJob['INPROCESS'] is True) and (nReturn is not None) ):
+         dictFiles = oLoggedProcess.GetOutputFiles()
+   except Exception as ex:
+      dictResult['bSuccess'] = None
+      dictResult['sResult']  = CString.FormatResult(sMethod, None, str(ex))
+      return dictResult
+   if nReturn is None:
+      dictResult['STATUS']   = STATUS_CANCELLED
+      dictResult['bSuccess'] = False
+      dictResult['sResult']  = "Cancelled because of previous error"
+      return dictResult
+
+   dictResult['RETURN']   = nReturn
+
+   if nReturn != SUCCESS:
+      bSuccess = False
+      sResult  = f"Documentation builder of '{sRepositoryName}' returns error {nReturn}. Last lines of '{sLogFile}':\n{oLoggedProcess.GetTail()}"
+      dictResult['bSuccess'] = bSuccess
+      dictResult['sResult']  = CString.FormatResult(sMethod, bSuccess, sResult)
+      return dictResult
+
+   # We need to identify the name of some output files inside sDestinationFolder:
+   # - PDF file (documentation of package in current repository)
+   # - JSON file (configuration values of current repository and documentation build process)
+   # (already known in case of the package doc generator has been executed in process)
+   sPDFFile = None
+   sJsonFile = None
+   if dictFiles is not None:
+      sPDFFile  = dictFiles['PDFFILE']
+      sJsonFile = dictFiles['JSONFILE']
+   else:
+      listLocalEntries = os.listdir(sDestinationFolder)
+      for sEntryName in listLocalEntries:
+         if sEntryName.lower().endswith('.pdf'):
+            sPDFFile = CString.NormalizePath(os.path.join(sDestinationFolder, sEntryName))
+         if sEntryName.lower().endswith('.json'):
+            sJsonFile = CString.NormalizePath(os.path.join(sDestinationFolder, sEntryName))
+
+   # not available in simulation mode
+   if dictJob['SIMULATE_ONLY'] is False:
+      if sPDFFile is None:
+         bSuccess = False
+         sResult  = f"PDF file not found within '{sDestinationFolder}'"
+         dictResult['bSuccess'] = bSuccess
+         dictResult['sResult']  = CString.FormatResult(sMethod, bSuccess, sResult)
+         return dictResult
+
+   if sJsonFile is None:
+      bSuccess = False
+      sResult  = f"Json configuration file not found within '{sDestinationFolder}'"
+      dictResult['bSuccess'] = bSuccess
+      dictResult['sResult']  = CString.FormatResult(sMethod, bSuccess, sResult)
+      return dictResult
+
+   dictResult['PDFFILE']  = sPDFFile
+   dictResult['JSONFILE'] = sJsonFile
+   dictResult['STATUS']   = STATUS_OK
+   dictResult['bSuccess'] = True
+   dictResult['sResult']  = f"Documentation of '{sRepositoryName}' rendered"
+
+   # -- update the build cache (a problem with the cache is not an error of the documentation build)
+   if oBuildCache is not None:
+      if ( (dictJob['CACHEDIR'] is not None) and (dictJob['IGNORECACHE'] is False) ):
+         dictResult['ARTIFACTSTORE'] = ARTIFACTSTORE_MISS
+      bSuccess, sResult = oBuildCache.Store(sRepositoryName, sFingerprint, dictResult)
+      if bSuccess is not True:
+         print(COLBY + f"Warning: {sResult}")
+         print()
+
+   return dictResult
+
+# eof def ExecuteRepositoryJob(dictJob=None, oCancelEvent=None):
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CExternalDocRenderer():
+   """
+Renders the documentation of all repositories listed in section ``IMPORTS`` of the maindoc configuration
+within a pool of worker processes.
+
+Method to execute: ``Render()``
+   """
+
+   def __init__(self, dictMainDocConfig=None, oBuildTrace=None):
+      """
+Constructor of class ``CExternalDocRenderer``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``).
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace / *Default*: None /
+
+  Build trace; every repository job is recorded as span.
+      """
+
+      sMethod = "CExternalDocRenderer.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__dictMainDocConfig = dictMainDocConfig
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+
+   # eof def __init__(self, dictMainDocConfig=None, oBuildTrace=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrintProgress(self, dictResult=None, nNrOfDone=0, nNrOfJobs=0):
+      """Prints a compact progress line for a finished repository job.
+      """
+
+      sLine = f"[{str(nNrOfDone).rjust(len(str(nNrOfJobs)))}/{nNrOfJobs}] {dictResult['REPOSITORYNAME']} : {dictResult['STATUS']} ({dictResult['DURATION']:.1f} s)"
+      if dictResult['STATUS'] in (STATUS_OK, STATUS_CACHED):
+         print(COLBG + sLine)
+      elif dictResult['STATUS'] == STATUS_CANCELLED:
+         print(COLBY + sLine)
+      else:
+         print(COLBR + sLine)
+         if dictResult['LOGFILE'] is not None:
+            print(COLBR + f"      log file: {dictResult['LOGFILE']}")
+
+   # eof def __PrintProgress(self, dictResult=None, nNrOfDone=0, nNrOfJobs=0):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrintResultTable(self, listResults=[]):
+      """Prints a table containing the result of every repository job.
+      """
+
+      nJustName = 45
+      for dictResult in listResults:
+         nJustName = max(nJustName, len(dictResult['REPOSITORYNAME']) + 2)
+
+      sHeadline = "#".rjust(3) + "  " + "Repository".ljust(nJustName) + "Status".ljust(11) + "Return".ljust(8) + "Duration"
+      print()
+      print(COLBY + sHeadline)
+      print(COLBY + "-" * len(sHeadline))
+      for dictResult in listResults:
+         sReturn = "-" if dictResult['RETURN'] is None else str(dictResult['RETURN'])
+         sLine = str(dictResult['INDEX'] + 1).rjust(3) + "  " + dictResult['REPOSITORYNAME'].ljust(nJustName) \
+                 + dictResult['STATUS'].ljust(11) + sReturn.ljust(8) + f"{dictResult['DURATION']:.1f} s"
+         if dictResult['STATUS'] in (STATUS_OK, STATUS_CACHED):
+            print(COLBG + sLine)
+         elif dictResult['STATUS'] == STATUS_CANCELLED:
+            print(COLBY + sLine)
+         else:
+            print(COLBR + sLine)
+      print()
+
+   # eof def __PrintResultTable(self, listResults=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __RenderInPool(self, listJobs=[], nJobs=1):
+      """
+Executes the repository jobs within a local pool of ``nJobs`` worker processes.
+
+**Returns:**
+
+* ``listResults``
+
+  / *Type*: list /
+
+  List of result dictionaries by index of the jobs (``None`` for jobs cancelled before they have been started).
+
+* ``dictFirstError``
+
+  / *Type*: dict /
+
+  The result of the first failed job (or ``None``).
+      """
+
+      sMethod = "CExternalDocRenderer.__RenderInPool"
+
+      nJobs = max(1, min(nJobs, len(listJobs)))
+      print(COLBY + f"Rendering {len(listJobs)} repositories with {nJobs} parallel jobs")
+      print()
+
+      # results are stored by index to keep the order of the repositories deterministic (independent from the completion order)
+      listResults = [None] * len(listJobs)
+      dictFirstError = None
+      nNrOfDone = 0
+
+      # the manager process and the worker processes are started by the same (fork safe) context
+      oContext = multiprocessing.get_context(POOL_START_METHOD)
+      oManager = oContext.Manager()
+      oCancelEvent = oManager.Event()
+      try:
+         # in process mode the worker processes import the package doc generator once at start
+         oInitializer = WarmUpWorker if self.__dictMainDocConfig.get('INPROCESS', False) is True else None
+         with concurrent.futures.ProcessPoolExecutor(max_workers=nJobs, mp_context=oContext, initializer=oInitializer) as oExecutor:
+            dictFutures = {}
+            for dictJob in listJobs:
+               oFuture = oExecutor.submit(RenderRepository, dictJob, oCancelEvent)
+               dictFutures[oFuture] = dictJob
+            for oFuture in concurrent.futures.as_completed(dictFutures):
+               dictJob = dictFutures[oFuture]
+               if oFuture.cancelled() is True:
+                  continue
+               try:
+                  dictResult = oFuture.result()
+               except Exception as ex:
+                  dictResult = NewJobResult(dictJob, STATUS_FAILED, None, CString.FormatResult(sMethod, None, str(ex)))
+               listResults[dictResult['INDEX']] = dictResult
+               nNrOfDone = nNrOfDone + 1
+               self.__PrintProgress(dictResult, nNrOfDone, len(listJobs))
+               if ( (dictResult['STATUS'] == STATUS_FAILED) and (dictFirstError is None) ):
+                  dictFirstError = dictResult
+                  # cancel all pending jobs and terminate all running jobs
+                  oCancelEvent.set()
+                  for oPendingFuture in dictFutures:
+                     oPendingFuture.cancel()
+            # eof for oFuture in concurrent.futures.as_completed(dictFutures):
+      finally:
+         oManager.shutdown()
+
+      return listResults, dictFirstError
+
+   # eof def __RenderInPool(self, listJobs=[], nJobs=1):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __RenderViaQueue(self, listJobs=[]):
+      """
+Executes the repository jobs by the workers of a work queue (command line ``--queue``; see ``CWorkQueue``).
+
+The build cache is handled here (by the coordinator): only repositories without matching cache entry are queued.
+The files returned by the workers are copied to the destination folders of the repositories.
+
+**Returns:**
+
+* ``listResults``
+
+  / *Type*: list /
+
+  List of result dictionaries by index of the jobs (``None`` for jobs without result).
+
+* ``dictFirstError``
+
+  / *Type*: dict /
+
+  The result of the first failed job (or ``None``).
+      """
+
+      sMethod = "CExternalDocRenderer.__RenderViaQueue"
+
+      listResults = [None] * len(listJobs)
+      dictFirstError = None
+      nNrOfDone = 0
+
+      sQueueFolder = self.__dictMainDocConfig['QUEUEFOLDER']
+      nTimeout = self.__dictMainDocConfig['CONTROL'].get('QUEUE_TIMEOUT', QUEUE_TIMEOUT)
+
+      oWorkQueue = CWorkQueue(sQueueFolder)
+      print(COLBY + f"Rendering {len(listJobs)} repositories by the workers of work queue '{oWorkQueue.GetRunFolder()}'")
+      print(COLBY + f"(start the workers with: genmaindoc.py --worker --queue \"{sQueueFolder}\")")
+      print()
+
+      dictPendingJobs = {} # job id -> (job, fingerprint)
+      try:
+         for dictJob in listJobs:
+            sRepositoryName = os.path.basename(dictJob['REPOSITORY'])
+            oBuildCache = None
+            sFingerprint = None
+            if dictJob['CACHEFOLDER'] is not None:
+               oBuildCache = CBuildCache(dictJob['CACHEFOLDER'], dictJob['CACHEDIR'])
+               sFingerprint = CBuildCache.GetRepositoryFingerprint(dictJob['REPOSITORY'], dictJob['STRICT'], dictJob['SIMULATE_ONLY'], dictJob['GENERATORVERSION'])
+               if dictJob['IGNORECACHE'] is False:
+                  dictResult = self.__RestoreFromCache(dictJob, oBuildCache, sFingerprint)
+                  if dictResult is not None:
+                     listResults[dictJob['INDEX']] = dictResult
+                     nNrOfDone = nNrOfDone + 1
+                     self.__PrintProgress(dictResult, nNrOfDone, len(listJobs))
+                     continue
+            # the workers do not use the build cache (the cache is local to the coordinator)
+            dictQueueJob = dict(dictJob)
+            dictQueueJob['CACHEFOLDER'] = None
+            dictQueueJob['CACHEDIR']    = None
+            sJobId = f"{dictJob['INDEX']:04d}_{sRepositoryName}"
+            oWorkQueue.Submit(sJobId, dictQueueJob)
+            dictPendingJobs[sJobId] = (dictJob, sFingerprint)
+
+         fStartTime = time.time()
+         while len(dictPendingJobs) > 0:
+            for sJobId, dictResult, sArtifactFolder in oWorkQueue.GetResults():
+               if sJobId not in dictPendingJobs:
+                  continue
+               dictJob, sFingerprint = dictPendingJobs.pop(sJobId)
+               dictResult = self.__TakeOverQueueResult(dictJob, dictResult, sArtifactFolder, sFingerprint)
+               listResults[dictJob['INDEX']] = dictResult
+               nNrOfDone = nNrOfDone + 1
+               self.__PrintProgress(dictResult, nNrOfDone, len(listJobs))
+               if ( (dictResult['STATUS'] == STATUS_FAILED) and (dictFirstError is None) ):
+                  dictFirstError = dictResult
+                  # the workers do not start the remaining jobs and terminate the running jobs
+                  oWorkQueue.Cancel()
+                  break
+            if ( (dictFirstError is not None) or (len(dictPendingJobs) == 0) ):
+               break
+            if (time.time() - fStartTime) > nTimeout:
+               oWorkQueue.Cancel()
+               bSuccess = False
+               sResult  = f"No result of the workers within {nTimeout} seconds (jobs: {', '.join(sorted(dictPendingJobs))}). Are workers running for queue '{sQueueFolder}'?"
+               for dictJob, sFingerprint in dictPendingJobs.values():
+                  listResults[dictJob['INDEX']] = NewJobResult(dictJob, STATUS_FAILED, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult))
+               dictFirstError = listResults[min(dictJob['INDEX'] for dictJob, sFingerprint in dictPendingJobs.values())]
+               break
+            for sJobId in oWorkQueue.RecoverStaleClaims():
+               print(COLBY + f"Claim of job '{sJobId}' released (no heartbeat of the worker); the job will be executed again")
+            time.sleep(QUEUE_POLL_INTERVAL)
+      except Exception as ex:
+         oWorkQueue.Cancel()
+         bSuccess = None
+         sResult  = CString.FormatResult(sMethod, bSuccess, str(ex))
+         for dictJob in listJobs:
+            if listResults[dictJob['INDEX']] is None:
+               listResults[dictJob['INDEX']] = NewJobResult(dictJob, STATUS_FAILED, bSuccess, sResult)
+         if dictFirstError is None:
+            # (in case of all jobs are already finished, the exception is the error)
+            dictFirstError = next((dictResult for dictResult in listResults if dictResult['STATUS'] == STATUS_FAILED), {'bSuccess' : bSuccess, 'sResult' : sResult})
+      finally:
+         oWorkQueue.Close()
+
+      return listResults, dictFirstError
+
+   # eof def __RenderViaQueue(self, listJobs=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __RestoreFromCache(self, dictJob=None, oBuildCache=None, sFingerprint=None):
+      """Restores the output of a repository job from the build cache. Returns the result of the job (or ``None`` in case of no matching cache entry exists).
+      """
+      sDestinationFolder = dictJob['DESTINATIONFOLDER']
+      if os.path.isdir(sDestinationFolder) is True:
+         shutil.rmtree(sDestinationFolder)
+      os.makedirs(sDestinationFolder)
+      dictFiles = oBuildCache.Restore(os.path.basename(dictJob['REPOSITORY']), sFingerprint, sDestinationFolder)
+      if dictFiles is None:
+         return None
+      dictResult = NewJobResult(dictJob, STATUS_CACHED, True, f"Documentation of '{os.path.basename(dictJob['REPOSITORY'])}' restored from cache")
+      dictResult['PDFFILE']  = dictFiles['PDFFILE']
+      dictResult['JSONFILE'] = dictFiles['JSONFILE']
+      if dictFiles['ARTIFACTSTORE'] is True:
+         dictResult['ARTIFACTSTORE'] = ARTIFACTSTORE_HIT
+      return dictResult
+
+   # eof def __RestoreFromCache(self, dictJob=None, oBuildCache=None, sFingerprint=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __TakeOverQueueResult(self, dictJob=None, dictResult=None, sArtifactFolder=None, sFingerprint=None):
+      """Copies the files returned by a worker (``sArtifactFolder``) to the destination folder of the repository and updates the build cache.
+Returns the result of the job with the paths of the files within the destination folder.
+      """
+
+      sMethod = "CExternalDocRenderer.__TakeOverQueueResult"
+
+      sDestinationFolder = dictJob['DESTINATIONFOLDER']
+      try:
+         if os.path.isdir(sDestinationFolder) is True:
+            shutil.rmtree(sDestinationFolder)
+         os.makedirs(sDestinationFolder)
+         for sKey in ('PDFFILE', 'JSONFILE', 'LOGFILE'):
+            if dictResult[sKey] is None:
+               continue
+            sArtifactFile = f"{sArtifactFolder}/{dictResult[sKey]}"
+            if os.path.isfile(sArtifactFile) is False:
+               dictResult[sKey] = None # (e.g. no log file in case of the job has been cancelled)
+               continue
+            sDestinationFile = CString.NormalizePath(f"{sDestinationFolder}/{dictResult[sKey]}")
+            shutil.copy2(sArtifactFile, sDestinationFile)
+            dictResult[sKey] = sDestinationFile
+            # (error messages of the worker refer to the log file within the work queue)
+            dictResult['sResult'] = dictResult['sResult'].replace(CString.NormalizePath(sArtifactFile), sDestinationFile)
+      except Exception as ex:
+         dictResult['STATUS']   = STATUS_FAILED
+         dictResult['bSuccess'] = None
+         dictResult['sResult']  = CString.FormatResult(sMethod, None, str(ex))
+         return dictResult
+
+      # -- update the build cache (a problem with the cache is not an error of the documentation build)
+      if ( (dictResult['STATUS'] == STATUS_OK) and (dictJob['CACHEFOLDER'] is not None) and (sFingerprint is not None) ):
+         if ( (dictJob['CACHEDIR'] is not None) and (dictJob['IGNORECACHE'] is False) ):
+            dictResult['ARTIFACTSTORE'] = ARTIFACTSTORE_MISS
+         bSuccess, sResult = CBuildCache(dictJob['CACHEFOLDER'], dictJob['CACHEDIR']).Store(dictResult['REPOSITORYNAME'], sFingerprint, dictResult)
+         if bSuccess is not True:
+            print(COLBY + f"Warning: {sResult}")
+            print()
+
+      return dictResult
+
+   # eof def __TakeOverQueueResult(self, dictJob=None, dictResult=None, sArtifactFolder=None, sFingerprint=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Render(self, listRepositories=[]):
+      """
+Executes the package doc generator of every repository in ``listRepositories``.
+
+The number of parallel jobs is taken from the configuration value ``JOBS`` (command line ``--jobs``).
+In case of the configuration value ``QUEUEFOLDER`` is set (command line ``--queue``), the jobs are executed by the workers
+of this work queue instead (the number of parallel jobs is the number of running workers).
+In case of an error in one repository, all remaining jobs are cancelled.
+
+**Arguments:**
+
+* ``listRepositories``
+
+  / *Condition*: required / *Type*: list /
+
+  List of repository paths (the order of this list is the order of the imports in the main documentation).
+
+**Returns:**
+
+* ``listResults``
+
+  / *Type*: list /
+
+  List of result dictionaries (see ``RenderRepository()``), in the same order as ``listRepositories``.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CExternalDocRenderer.Render"
+
+      listResults = []
+
+      sExternalDocFolder = self.__dictMainDocConfig['EXTERNALDOCFOLDER']
+      nJobs = self.__dictMainDocConfig['JOBS']
+
+      # prepare the jobs (and check the preconditions before any worker is started)
+      sGeneratorVersion = CBuildCache.GetGeneratorVersion()
+      listJobs = []
+      for nIndex, sRepository in enumerate(listRepositories):
+         if os.path.isdir(sRepository) is False:
+            bSuccess = False
+            sResult  = f"The repository folder '{sRepository}' does not exist"
+            return listResults, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         sDocumentationBuilder = f"{sRepository}/genpackagedoc.py"
+         if os.path.isfile(sDocumentationBuilder) is False:
+            bSuccess = False
+            sResult  = f"The package doc generator '{sDocumentationBuilder}' does not exist"
+            return listResults, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         sRepositoryName = os.path.basename(sRepository)
+         dictJob = {}
+         dictJob['INDEX']             = nIndex
+         dictJob['REPOSITORY']        = sRepository
+         dictJob['DESTINATIONFOLDER'] = f"{sExternalDocFolder}/{sRepositoryName}"
+         dictJob['PYTHON']            = self.__dictMainDocConfig['PYTHON']
+         dictJob['STRICT']            = self.__dictMainDocConfig['CONTROL']['STRICT']
+         dictJob['SIMULATE_ONLY']     = self.__dictMainDocConfig['SIMULATE_ONLY']
+         dictJob['CACHEFOLDER']       = self.__dictMainDocConfig['CACHEFOLDER']
+         dictJob['CACHEDIR']          = self.__dictMainDocConfig['CACHEDIR']
+         dictJob['IGNORECACHE']       = self.__dictMainDocConfig['IGNORECACHE']
+         dictJob['GENERATORVERSION']  = sGeneratorVersion
+         dictJob['INPROCESS']         = self.__dictMainDocConfig.get('INPROCESS', False)
+         listJobs.append(dictJob)
+
+      if len(listJobs) == 0:
+         bSuccess = True # empty list is not an error
+         sResult  = "No repositories to render"
+         return listResults, bSuccess, sResult
+
+      if self.__dictMainDocConfig.get('QUEUEFOLDER') is not None:
+         listResults, dictFirstError = self.__RenderViaQueue(listJobs)
+      else:
+         listResults, dictFirstError = self.__RenderInPool(listJobs, nJobs)
+
+      # jobs cancelled before they have been started, have no result
+      for dictJob in listJobs:
+         if listResults[dictJob['INDEX']] is None:
+            listResults[dictJob['INDEX']] = NewJobResult(dictJob, STATUS_CANCELLED, False, "Cancelled because of previous error")
+
+      self.__PrintResultTable(listResults)
+
+      # jobs cancelled before they have been started, have no start time and are not part of the trace
+      for dictResult in listResults:
+         if dictResult['STARTTIME'] is None:
+            continue
+         dictArgs = {'repository' : dictResult['REPOSITORY'], 'status' : dictResult['STATUS'], 'exit_code' : dictResult['RETURN'], 'cpu_s' : round(dictResult['CPUTIME'], 6)}
+         # (the workers of a work queue are named by host and process id)
+         sThreadName = f"worker {dictResult.get('WORKER', dictResult['PID'])}"
+         self.__oBuildTrace.AddSpan(f"render {dictResult['REPOSITORYNAME']}", "repository", dictResult['STARTTIME'], dictResult['DURATION'],
+                                    nTid=dictResult['PID'], sThreadName=sThreadName, dictArgs=dictArgs)
+
+      if dictFirstError is not None:
+         return listResults, dictFirstError['bSuccess'], dictFirstError['sResult']
+
+      nNrOfCached = len([dictResult for dictResult in listResults if dictResult['STATUS'] == STATUS_CACHED])
+      bSuccess = True
+      sResult  = f"Documentation of {len(listResults)} repositories rendered ({nNrOfCached} restored from cache)"
+      return listResults, bSuccess, sResult
+
+   # eof def Render(self, listRepositories=[]):
+
+# eof class CExternalDocRenderer():
+
+# --------------------------------------------------------------------------------------------------------------
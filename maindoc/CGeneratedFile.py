@@ -0,0 +1,208 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CGeneratedFile.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the writer of the files generated by the build (e.g. the tex files within the external doc folder).
+
+The content is collected in memory and compared with the existing file. The file is replaced only in case of the content changed
+(the modification time of an unchanged file is kept), and the file is replaced at once (an interrupted build does not leave
+a partially written file).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, threading
+
+from PythonExtensionsCollection.String.CString import CString
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CGeneratedFile():
+   """
+Writer of a generated text file (see module description). The interface of ``Write()`` corresponds to ``CFile.Write()``.
+
+Methods to execute: ``Write()`` (several times), then ``Commit()``
+   """
+
+   def __init__(self, sFile=None, bTimeStampLine=False):
+      """
+Constructor of class ``CGeneratedFile``.
+
+* ``sFile``
+
+  / *Condition*: required / *Type*: str /
+
+  Path and name of the generated file.
+
+* ``bTimeStampLine``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the first line of the file contains the time stamp of the build and is not part of the comparison
+  (a file with a changed time stamp only is not replaced).
+      """
+
+      sMethod = "CGeneratedFile.__init__"
+
+      if sFile is None:
+         bSuccess = None
+         sResult  = "sFile is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sFile          = CString.NormalizePath(sFile)
+      self.__bTimeStampLine = bTimeStampLine
+      self.__listLines      = []
+
+   # eof def __init__(self, sFile=None, bTimeStampLine=False):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetFile(self):
+      """Returns the path and name of the generated file.
+      """
+      return self.__sFile
+
+   # eof def GetFile(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Write(self, Content=""):
+      """
+Adds the content to the generated file (in memory; the file itself is written by ``Commit()``). Like with ``CFile.Write()``,
+every line is terminated by a line break.
+
+* ``Content``
+
+  / *Condition*: optional / *Type*: str, list or tuple / *Default*: "" /
+
+  A single line (a string) or a list of lines.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      if isinstance(Content, (list, tuple)) is True:
+         for Element in Content:
+            self.__listLines.append(str(Element))
+      else:
+         self.__listLines.append(str(Content))
+      bSuccess = True
+      sResult  = "Done"
+      return bSuccess, sResult
+
+   # eof def Write(self, Content=""):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Commit(self):
+      """
+Compares the collected content with the existing file and replaces the file at once in case of the content changed.
+
+**Returns:**
+
+* ``bChanged``
+
+  / *Type*: bool /
+
+  Indicates if the file has been written (new or changed content) or not (unchanged content).
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CGeneratedFile.Commit"
+
+      # (same line endings as in files written by CFile)
+      bContent = "".join(f"{sLine}\n" for sLine in self.__listLines).replace("\n", os.linesep).encode("utf-8")
+
+      bExistingContent = None
+      if os.path.isfile(self.__sFile) is True:
+         try:
+            with open(self.__sFile, "rb") as hFile:
+               bExistingContent = hFile.read()
+         except Exception:
+            bExistingContent = None
+      if bExistingContent is not None:
+         if self.__bTimeStampLine is True:
+            bUnchanged = ( bExistingContent.partition(b"\n")[2] == bContent.partition(b"\n")[2] )
+         else:
+            bUnchanged = ( bExistingContent == bContent )
+         if bUnchanged is True:
+            bChanged = False
+            bSuccess = True
+            sResult  = f"File '{self.__sFile}' unchanged"
+            return bChanged, bSuccess, sResult
+
+      sTempFile = f"{self.__sFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+      try:
+         with open(sTempFile, "wb") as hFile:
+            hFile.write(bContent)
+         os.replace(sTempFile, self.__sFile)
+      except Exception as ex:
+         if os.path.isfile(sTempFile) is True:
+            os.remove(sTempFile)
+         bChanged = False
+         bSuccess = None
+         sResult  = f"Not possible to write file '{self.__sFile}'.\nReason: {ex}"
+         return bChanged, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bChanged = True
+      bSuccess = True
+      sResult  = f"File '{self.__sFile}' written"
+      return bChanged, bSuccess, sResult
+
+   # eof def Commit(self):
+
+# eof class CGeneratedFile():
+
+# --------------------------------------------------------------------------------------------------------------
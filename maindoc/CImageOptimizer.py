@@ -0,0 +1,462 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CImageOptimizer.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the optimization of the images of the book (maindoc configuration:
+``"CONTROL" : {"OPTIMIZE_IMAGES" : true}``).
+
+For every PNG or JPEG file referenced by ``\\includegraphics`` a variant is computed, that
+
+* has no alpha channel in case of the image is fully opaque,
+* is reduced to a palette image in case of the image has not more than 256 colors (lossless),
+* is downscaled to the print resolution (``"IMAGE_DPI"``, default: 300) in case of the resolution at natural size is higher
+  (the natural size is kept),
+* is stored as JPEG in case of a photo-like image without alpha channel, where the JPEG file is less than half the size of the PNG file
+  and visually lossless (PSNR of at least 40 dB).
+
+A variant is used only if it is smaller than the original image. The variants are cached within the build cache folder,
+identified by the hash of the original image (and by the settings); unchanged images are never processed again.
+The used variants are copied to ``externaldocs/graphics``, and the generated file ``externaldocs/optimized_graphics.tex``
+(input by the main tex file after the preamble) lets ``\\includegraphics`` load the variant instead of the original image.
+In case of a variant build both are located within the ``externaldocs`` folder of the output folder of the variant.
+
+The optimization requires the Python package ``Pillow`` (optional; without this package the original images are used).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, io, json, math, shutil, hashlib, threading
+import concurrent.futures
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CPDFPageCount import CPDFPageCount
+from maindoc.CGeneratedFile import CGeneratedFile
+
+# version of the image variants; a change invalidates all cached variants
+IMAGEOPTIMIZERVERSION = "1"
+
+# default print resolution (dots per inch)
+IMAGE_DPI = 300
+
+# resolution assumed by pdflatex for images without resolution information
+DEFAULT_IMAGE_DPI = 72
+
+# quality of the JPEG variants
+JPEG_QUALITY = 90
+
+# a JPEG variant is used only if it is smaller than this ratio of the PNG variant
+JPEG_MAX_RATIO = 0.5
+
+# ... and only if the JPEG variant is visually lossless (peak signal-to-noise ratio in dB; screenshots with text stay PNG)
+JPEG_MIN_PSNR = 40.0
+
+# extensions of the images that are optimized
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# serializes the read-modify-write of the index of the cached variants (shared by the variants built in parallel)
+IMAGEINDEX_LOCK = threading.Lock()
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CImageOptimizer():
+   """
+Optimization of the images of the book (cached variants of the images referenced by ``\\includegraphics``).
+
+Method to execute: ``Optimize()``
+   """
+
+   def __init__(self, dictMainDocConfig=None):
+      """
+Constructor of class ``CImageOptimizer``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``, extended by ``EXTERNALDOCFOLDER``
+  and ``GENERATEDDOCFOLDER``).
+      """
+
+      sMethod = "CImageOptimizer.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      dictControl = dictMainDocConfig['CONTROL']
+      self.__bOptimize = ( ("OPTIMIZE_IMAGES" in dictControl) and (dictControl['OPTIMIZE_IMAGES'] is True) )
+      self.__nDPI = IMAGE_DPI
+      if "IMAGE_DPI" in dictControl:
+         self.__nDPI = dictControl['IMAGE_DPI']
+      self.__nJobs = dictMainDocConfig['JOBS']
+      sExternalDocFolder = dictMainDocConfig['EXTERNALDOCFOLDER']
+      sGeneratedDocFolder = dictMainDocConfig.get('GENERATEDDOCFOLDER', sExternalDocFolder)
+      self.__sExternalDocFolder = CString.NormalizePath(sExternalDocFolder)
+      self.__sGraphicsFolder = CString.NormalizePath(f"{sGeneratedDocFolder}/graphics")
+      self.__sMapFile = CString.NormalizePath(f"{sGeneratedDocFolder}/optimized_graphics.tex")
+      # (the LaTeX compiler does not search images within the output folder of a variant build; therefore in this case
+      # the variants are referenced with absolute path)
+      sBookSourcesFolder = CString.NormalizePath(dictMainDocConfig['BOOKSOURCES'])
+      if self.__sGraphicsFolder.startswith(f"{sBookSourcesFolder}/"):
+         self.__sGraphicsPath = "./" + self.__sGraphicsFolder[len(sBookSourcesFolder) + 1:]
+      else:
+         self.__sGraphicsPath = self.__sGraphicsFolder
+      self.__sCacheFolder = None
+      if dictMainDocConfig.get('CACHEFOLDER') is not None:
+         self.__sCacheFolder = CString.NormalizePath(f"{dictMainDocConfig['CACHEFOLDER']}/images")
+
+   # eof def __init__(self, dictMainDocConfig=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ComputeVariant(sImageFile=None, nDPI=IMAGE_DPI):
+      """Computes the optimized variant of an image. Returns ``(sExtension, bytesData)``, or ``(None, None)`` in case of no variant
+is smaller than the original image.
+      """
+      import PIL.Image, PIL.ImageChops, PIL.ImageStat
+      with PIL.Image.open(sImageFile) as oImage:
+         oImage.load()
+         sFormat = oImage.format
+         tupleDPI = oImage.info.get('dpi')
+         oVariant = oImage.copy()
+
+      dictSaveOptions = {}
+      if tupleDPI is not None:
+         dictSaveOptions['dpi'] = tupleDPI
+      bChanged = False
+
+      # -- resolution at natural size (the natural size is kept, therefore the resolution information is adapted)
+      fDPI = float(tupleDPI[0]) if ( (tupleDPI is not None) and (tupleDPI[0] > 0) ) else DEFAULT_IMAGE_DPI
+      if fDPI > nDPI:
+         tupleSize = (max(1, round(oVariant.width * nDPI / fDPI)), max(1, round(oVariant.height * nDPI / fDPI)))
+         if oVariant.mode not in ("RGB", "RGBA", "L", "LA"):
+            oVariant = oVariant.convert("RGBA" if "A" in oVariant.getbands() or "transparency" in oVariant.info else "RGB")
+         oVariant = oVariant.resize(tupleSize, PIL.Image.LANCZOS)
+         dictSaveOptions['dpi'] = (nDPI, nDPI)
+         bChanged = True
+
+      if ( (sFormat == "JPEG") and (bChanged is False) ):
+         return None, None # (a JPEG file is not encoded once more without need)
+
+      # -- alpha channel of a fully opaque image
+      if ( (oVariant.mode in ("RGBA", "LA")) and (oVariant.getchannel("A").getextrema() == (255, 255)) ):
+         oVariant = oVariant.convert(oVariant.mode[:-1])
+
+      # -- palette in case of not more than 256 colors (used only if the conversion is lossless)
+      listCandidates = []
+      bPhotoLike = False
+      if oVariant.mode == "RGB":
+         listColors = oVariant.getcolors(256)
+         if listColors is None:
+            bPhotoLike = True
+         else:
+            oPalette = PIL.Image.new("P", (1, 1))
+            listPalette = [nValue for nCount, tupleColor in listColors for nValue in tupleColor]
+            oPalette.putpalette(listPalette + [0] * (768 - len(listPalette)))
+            oPaletteVariant = oVariant.quantize(palette=oPalette, dither=PIL.Image.Dither.NONE)
+            if PIL.ImageChops.difference(oVariant, oPaletteVariant.convert("RGB")).getbbox() is None:
+               oVariant = oPaletteVariant
+
+      oBuffer = io.BytesIO()
+      oVariant.save(oBuffer, "PNG", optimize=True, **dictSaveOptions)
+      listCandidates.append((".png", oBuffer.getvalue()))
+
+      # -- JPEG in case of photo-like images (only if the JPEG file is considerably smaller)
+      if ( (bPhotoLike is True) or (sFormat == "JPEG") ):
+         oBuffer = io.BytesIO()
+         oVariant.save(oBuffer, "JPEG", quality=JPEG_QUALITY, optimize=True, **dictSaveOptions)
+         bytesJPEG = oBuffer.getvalue()
+         if sFormat == "JPEG":
+            listCandidates.append((".jpg", bytesJPEG))
+         elif len(bytesJPEG) < JPEG_MAX_RATIO * len(listCandidates[0][1]):
+            with PIL.Image.open(io.BytesIO(bytesJPEG)) as oJPEG:
+               listRMS = PIL.ImageStat.Stat(PIL.ImageChops.difference(oVariant, oJPEG.convert(oVariant.mode))).rms
+            fMSE = sum(fRMS * fRMS for fRMS in listRMS) / len(listRMS)
+            if ( (fMSE == 0) or (10 * math.log10(255 * 255 / fMSE) >= JPEG_MIN_PSNR) ):
+               listCandidates.append((".jpg", bytesJPEG))
+
+      sExtension, bytesData = min(listCandidates, key=lambda tupleCandidate: len(tupleCandidate[1]))
+      if ( (bChanged is False) and (len(bytesData) >= os.path.getsize(sImageFile)) ):
+         return None, None
+      return sExtension, bytesData
+
+   # eof def __ComputeVariant(sImageFile=None, nDPI=IMAGE_DPI):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __LoadIndex(self):
+      """Reads the index of the cached variants (variant key -> file name of the variant or ``None`` for 'original kept').
+      """
+      if self.__sCacheFolder is None:
+         return {}
+      sIndexFile = f"{self.__sCacheFolder}/image_variants.json"
+      if os.path.isfile(sIndexFile) is False:
+         return {}
+      try:
+         with open(sIndexFile, encoding="utf-8") as hIndexFile:
+            dictIndexFile = json.load(hIndexFile)
+         if dictIndexFile['VERSION'] == IMAGEOPTIMIZERVERSION:
+            return dictIndexFile['VARIANTS']
+      except Exception:
+         pass # (the images are processed again)
+      return {}
+
+   # eof def __LoadIndex(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __UpdateIndex(self, dictVariants={}):
+      """Adds the variants to the index of the cached variants (a problem with the cache is not an error).
+
+The index is read again under ``IMAGEINDEX_LOCK``; the variants added in the meantime by other builds are kept.
+      """
+      if self.__sCacheFolder is None:
+         return
+      with IMAGEINDEX_LOCK:
+         dictIndex = self.__LoadIndex()
+         dictIndex.update(dictVariants)
+         self.__SaveIndex(dictIndex)
+
+   # eof def __UpdateIndex(self, dictVariants={}):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __SaveIndex(self, dictIndex={}):
+      """Writes the index of the cached variants (a problem with the cache is not an error).
+      """
+      if self.__sCacheFolder is None:
+         return
+      try:
+         if os.path.isdir(self.__sCacheFolder) is False:
+            os.makedirs(self.__sCacheFolder)
+         sIndexFile = f"{self.__sCacheFolder}/image_variants.json"
+         sTempFile = f"{sIndexFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+         with open(sTempFile, "w", encoding="utf-8") as hIndexFile:
+            json.dump({'VERSION' : IMAGEOPTIMIZERVERSION, 'VARIANTS' : dictIndex}, hIndexFile, indent=3)
+         os.replace(sTempFile, sIndexFile)
+      except Exception:
+         pass
+
+   # eof def __SaveIndex(self, dictIndex={}):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __WriteMapFile(self, dictMapping={}):
+      """Writes the file ``optimized_graphics.tex`` (argument of ``\\includegraphics`` -> path of the variant).
+      """
+      listLines = []
+      listLines.append("% file generated by genmaindoc.py - do not edit")
+      listLines.append("% (images replaced by optimized variants; see maindoc configuration: OPTIMIZE_IMAGES)")
+      if len(dictMapping) > 0:
+         listLines.append("\\makeatletter")
+         listLines.append("\\let\\genmaindoc@Ginclude@graphics\\Ginclude@graphics")
+         listLines.append("\\def\\Ginclude@graphics#1{%")
+         listLines.append("   \\ifcsname genmaindoc@graphics@#1\\endcsname")
+         listLines.append("      \\edef\\genmaindoc@graphicsfile{\\csname genmaindoc@graphics@#1\\endcsname}%")
+         listLines.append("   \\else")
+         listLines.append("      \\def\\genmaindoc@graphicsfile{#1}%")
+         listLines.append("   \\fi")
+         listLines.append("   \\expandafter\\genmaindoc@Ginclude@graphics\\expandafter{\\genmaindoc@graphicsfile}}")
+         for sArgument in sorted(dictMapping):
+            listLines.append(f"\\expandafter\\def\\csname genmaindoc@graphics@{sArgument}\\endcsname{{{dictMapping[sArgument]}}}")
+         listLines.append("\\makeatother")
+      # (written only in case of the content changed)
+      oMapFile = CGeneratedFile(self.__sMapFile)
+      oMapFile.Write(listLines)
+      bChanged, bSuccess, sResult = oMapFile.Commit()
+      del oMapFile
+      if bSuccess is not True:
+         raise Exception(sResult)
+
+   # eof def __WriteMapFile(self, dictMapping={}):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Optimize(self, listReferences=[]):
+      """
+Provides the optimized variants of the images and writes the file ``optimized_graphics.tex``. In case of the optimization
+is switched off or ``Pillow`` is not installed, this file is written without mapping (this is not an error).
+
+* ``listReferences``
+
+  / *Condition*: optional / *Type*: list / *Default*: [] /
+
+  References to the images (``CTeXDependencies.GetReferences("includegraphics")``).
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CImageOptimizer.Optimize"
+
+      bPillow = True
+      try:
+         import PIL
+      except ImportError:
+         bPillow = False
+
+      if ( (self.__bOptimize is False) or (bPillow is False) ):
+         listReferences = []
+
+      # -- images within the book sources (generated images, e.g. of the external documentations, are not optimized)
+      dictImages = {} # image file -> variant key
+      try:
+         for dictReference in listReferences:
+            sImageFile = dictReference['DEPENDENCY']
+            if ( (sImageFile.lower().endswith(IMAGE_EXTENSIONS) is False) or (sImageFile.startswith(f"{self.__sExternalDocFolder}/") is True)
+                 or (os.path.isfile(sImageFile) is False) or (sImageFile in dictImages) ):
+               continue
+            sHash = CPDFPageCount.ComputeFileHash(sImageFile)
+            dictImages[sImageFile] = hashlib.sha256(f"{IMAGEOPTIMIZERVERSION}|{self.__nDPI}|{sHash}".encode("utf-8")).hexdigest()
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      # -- variants not yet within the cache are computed in parallel
+      dictIndex = self.__LoadIndex()
+      dictVariants = {} # variant key -> file name of the variant (within the cache folder) or None
+      dictVariantData = {} # variant key -> (extension, data) of the new variants
+      listPending = []
+      for sImageFile, sKey in dictImages.items():
+         if ( (sKey in dictIndex) and ( (dictIndex[sKey] is None) or (os.path.isfile(f"{self.__sCacheFolder}/{dictIndex[sKey]}") is True) ) ):
+            dictVariants[sKey] = dictIndex[sKey]
+         elif ( (sKey not in dictVariants) and (sKey not in listPending) ):
+            listPending.append(sKey)
+      dictPendingFiles = {sKey : sImageFile for sImageFile, sKey in dictImages.items() if sKey in listPending}
+      try:
+         with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(self.__nJobs, len(listPending)))) as oExecutor:
+            dictFutures = {sKey : oExecutor.submit(CImageOptimizer.__ComputeVariant, dictPendingFiles[sKey], self.__nDPI) for sKey in listPending}
+            for sKey, oFuture in dictFutures.items():
+               sExtension, bytesData = oFuture.result()
+               if sExtension is None:
+                  dictVariants[sKey] = None
+               else:
+                  dictVariants[sKey] = f"{sKey}{sExtension}"
+                  dictVariantData[sKey] = (sExtension, bytesData)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      # -- new variants are written to the cache; the used variants are copied to the graphics folder of the external documentations
+      try:
+         if ( (len(dictVariantData) > 0) and (self.__sCacheFolder is not None) and (os.path.isdir(self.__sCacheFolder) is False) ):
+            os.makedirs(self.__sCacheFolder)
+         if os.path.isdir(self.__sGraphicsFolder) is False:
+            os.makedirs(self.__sGraphicsFolder)
+         setUsedFiles = set()
+         nSizeBefore = 0
+         nSizeAfter  = 0
+         for sImageFile, sKey in dictImages.items():
+            sVariantFileName = dictVariants[sKey]
+            nSizeBefore = nSizeBefore + os.path.getsize(sImageFile)
+            if sVariantFileName is None:
+               nSizeAfter = nSizeAfter + os.path.getsize(sImageFile)
+               continue
+            sTargetFile = f"{self.__sGraphicsFolder}/{sVariantFileName}"
+            if sKey in dictVariantData:
+               bytesData = dictVariantData[sKey][1]
+               if self.__sCacheFolder is not None:
+                  sCacheFile = f"{self.__sCacheFolder}/{sVariantFileName}"
+                  sTempFile = f"{sCacheFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+                  with open(sTempFile, "wb") as hVariantFile:
+                     hVariantFile.write(bytesData)
+                  os.replace(sTempFile, sCacheFile)
+               if ( (os.path.isfile(sTargetFile) is False) or (os.path.getsize(sTargetFile) != len(bytesData)) ):
+                  with open(sTargetFile, "wb") as hVariantFile:
+                     hVariantFile.write(bytesData)
+            else:
+               sCacheFile = f"{self.__sCacheFolder}/{sVariantFileName}"
+               if ( (os.path.isfile(sTargetFile) is False) or (os.path.getsize(sTargetFile) != os.path.getsize(sCacheFile)) ):
+                  shutil.copyfile(sCacheFile, sTargetFile)
+            setUsedFiles.add(sVariantFileName)
+            nSizeAfter = nSizeAfter + os.path.getsize(sTargetFile)
+         # (variants of images that are not referenced any more)
+         for sFileName in os.listdir(self.__sGraphicsFolder):
+            if sFileName not in setUsedFiles:
+               os.remove(f"{self.__sGraphicsFolder}/{sFileName}")
+         dictMapping = {}
+         for dictReference in listReferences:
+            sKey = dictImages.get(dictReference['DEPENDENCY'])
+            if ( (sKey is not None) and (dictVariants[sKey] is not None) ):
+               dictMapping[dictReference['ARGUMENT']] = f"{self.__sGraphicsPath}/{dictVariants[sKey]}"
+         self.__WriteMapFile(dictMapping)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      if len(dictVariantData) > 0:
+         # (variants of previous versions of the images are kept; a reverted image is taken from the cache)
+         self.__UpdateIndex(dictVariants)
+
+      bSuccess = True
+      if self.__bOptimize is False:
+         sResult = "Images not optimized (switched off)"
+      elif bPillow is False:
+         sResult = "Images not optimized: the Python package 'Pillow' is not installed"
+      else:
+         nVariants = len([sKey for sKey in set(dictImages.values()) if dictVariants[sKey] is not None])
+         sResult = f"Images optimized: {len(dictImages)} images, {nVariants} variants ({len(listPending)} processed, " \
+                   + f"{len(dictImages) - len(listPending)} taken from cache), {nSizeBefore / 1024:.0f} KB -> {nSizeAfter / 1024:.0f} KB"
+      return bSuccess, sResult
+
+   # eof def Optimize(self, listReferences=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   __ComputeVariant = staticmethod(__ComputeVariant)
+
+# eof class CImageOptimizer():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,302 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CInProcessGenerator.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module to execute the package doc generator of a repository (``genpackagedoc.py``) within the current
+Python process (command line ``--inprocess``).
+
+The worker processes of ``CExternalDocRenderer`` stay alive between the repositories. Therefore the interpreter
+startup and the import of GenPackageDoc and its dependencies happen once per worker, and not once per repository.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, sys, collections, traceback
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CLoggedProcess import LOG_TAIL_LINES
+
+# modules imported when a worker process starts (to be shared by all package doc generators executed in this worker)
+WARMUP_MODULES = ("GenPackageDoc.CPackageDocConfig", "GenPackageDoc.CDocBuilder", "PythonExtensionsCollection.File.CFile",
+                  "PythonExtensionsCollection.Folder.CFolder", "colorama")
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def WarmUpWorker():
+   """Imports the modules required by every package doc generator (initializer of the worker processes).
+A missing module is not an error here; the package doc generator reports it.
+   """
+   import importlib
+   for sModule in WARMUP_MODULES:
+      try:
+         importlib.import_module(sModule)
+      except Exception:
+         pass
+
+# eof def WarmUpWorker():
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CInProcessGenerator():
+   """
+Executes ``genpackagedoc.py`` of a repository within the current process.
+
+The script is executed like a main script (``__name__ == "__main__"``, ``sys.argv``, working folder = repository).
+Modules belonging to the repository (e.g. the ``config`` package of every repository) are removed from ``sys.modules``
+before and after the execution, so that repositories do not see modules of other repositories.
+
+The console output (also the output of child processes, like the LaTeX compiler) is redirected to a log file.
+
+Method to execute: ``Run()``
+   """
+
+   def __init__(self, sDocumentationBuilder=None, listArguments=[], sLogFile=None):
+      """
+Constructor of class ``CInProcessGenerator``.
+
+* ``sDocumentationBuilder``
+
+  / *Condition*: required / *Type*: str /
+
+  Path and name of ``genpackagedoc.py``.
+
+* ``listArguments``
+
+  / *Condition*: optional / *Type*: list / *Default*: [] /
+
+  Command line arguments of ``genpackagedoc.py`` (without script name).
+
+* ``sLogFile``
+
+  / *Condition*: required / *Type*: str /
+
+  Path and name of the log file.
+      """
+
+      self.__sDocumentationBuilder = CString.NormalizePath(sDocumentationBuilder)
+      self.__sRepository           = os.path.dirname(self.__sDocumentationBuilder)
+      self.__listArguments         = listArguments
+      self.__sLogFile              = sLogFile
+      self.__dictGlobals           = None
+
+   # eof def __init__(self, sDocumentationBuilder=None, listArguments=[], sLogFile=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetRepositoryModuleNames(self):
+      """Returns the names of all top level modules and packages within the root folder of the repository.
+      """
+      listModuleNames = []
+      for sEntryName in os.listdir(self.__sRepository):
+         sEntry = os.path.join(self.__sRepository, sEntryName)
+         if ( (os.path.isdir(sEntry) is True) and (os.path.isfile(os.path.join(sEntry, "__init__.py")) is True) ):
+            listModuleNames.append(sEntryName)
+         elif ( (sEntryName.endswith(".py") is True) and (sEntryName != "setup.py") ):
+            listModuleNames.append(sEntryName[:-3])
+      # the additional libraries of a repository are imported from "./additions" (see genpackagedoc.py)
+      listModuleNames.append("additions")
+      return listModuleNames
+
+   # eof def __GetRepositoryModuleNames(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PurgeModules(self, listModuleNames=[]):
+      """Removes all modules with the given names (and their submodules) from ``sys.modules`` and returns them.
+      """
+      dictRemovedModules = {}
+      for sName in list(sys.modules.keys()):
+         if sName.split(".")[0] in listModuleNames:
+            dictRemovedModules[sName] = sys.modules.pop(sName)
+      return dictRemovedModules
+
+   # eof def __PurgeModules(self, listModuleNames=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Run(self, oCancelEvent=None):
+      """
+Executes ``genpackagedoc.py`` and waits until it is finished.
+
+* ``oCancelEvent``
+
+  / *Condition*: optional / *Type*: threading.Event or multiprocessing.Event / *Default*: None /
+
+  If already set, ``genpackagedoc.py`` is not executed. A running package doc generator cannot be cancelled
+  (it runs within this process).
+
+**Returns:**
+
+* ``nReturn``
+
+  / *Type*: int /
+
+  The exit code of ``genpackagedoc.py`` (the value of ``sys.exit()``; 0 in case of the script ends without ``sys.exit()``;
+  1 in case of an unhandled exception; ``None`` in case of not executed because of ``oCancelEvent``).
+      """
+
+      if ( (oCancelEvent is not None) and (oCancelEvent.is_set() is True) ):
+         return None
+
+      listModuleNames = self.__GetRepositoryModuleNames()
+
+      # save the state of the interpreter
+      listSavedArgv   = sys.argv
+      listSavedPath   = list(sys.path)
+      sSavedCwd       = os.getcwd()
+      oSavedStdout    = sys.stdout
+      oSavedStderr    = sys.stderr
+      dictSavedModules = self.__PurgeModules(listModuleNames)
+
+      sys.stdout.flush()
+      sys.stderr.flush()
+      nSavedStdoutFd = os.dup(1)
+      nSavedStderrFd = os.dup(2)
+
+      nReturn = 1
+      with open(self.__sLogFile, "ab") as hLogFile:
+         hLogFile.write(f"=== in process: {self.__sDocumentationBuilder} {' '.join(self.__listArguments)}\n".encode("utf-8"))
+         hLogFile.flush()
+         # the redirection on file descriptor level includes child processes started by the package doc generator
+         os.dup2(hLogFile.fileno(), 1)
+         os.dup2(hLogFile.fileno(), 2)
+         try:
+            sys.argv = [self.__sDocumentationBuilder] + list(self.__listArguments)
+            sys.path.insert(0, self.__sRepository)
+            os.chdir(self.__sRepository)
+            self.__dictGlobals = {'__name__' : "__main__", '__file__' : self.__sDocumentationBuilder, '__builtins__' : __builtins__}
+            with open(self.__sDocumentationBuilder, encoding="utf-8") as hScriptFile:
+               oCode = compile(hScriptFile.read(), self.__sDocumentationBuilder, "exec")
+            try:
+               exec(oCode, self.__dictGlobals)
+               nReturn = 0
+            except SystemExit as reason:
+               if reason.code is None:
+                  nReturn = 0
+               elif isinstance(reason.code, int):
+                  nReturn = reason.code
+               else:
+                  print(reason.code, file=sys.stderr)
+                  nReturn = 1
+            except BaseException:
+               traceback.print_exc()
+               nReturn = 1
+         finally:
+            try:
+               sys.stdout.flush()
+               sys.stderr.flush()
+            except Exception:
+               pass
+            # restore the state of the interpreter
+            os.dup2(nSavedStdoutFd, 1)
+            os.dup2(nSavedStderrFd, 2)
+            os.close(nSavedStdoutFd)
+            os.close(nSavedStderrFd)
+            sys.stdout = oSavedStdout # (colorama.init() within the package doc generator wraps the streams)
+            sys.stderr = oSavedStderr
+            os.chdir(sSavedCwd)
+            sys.path[:] = listSavedPath
+            sys.argv = listSavedArgv
+            self.__PurgeModules(listModuleNames)
+            sys.modules.update(dictSavedModules)
+         hLogFile.write(f"=== returned {nReturn}\n".encode("utf-8"))
+
+      return nReturn
+
+   # eof def Run(self, oCancelEvent=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetOutputFiles(self):
+      """
+Returns the output files of the package doc generator, taken out of its configuration object (``oPackageDocConfig``
+within ``genpackagedoc.py``).
+
+**Returns:**
+
+* ``dictFiles``
+
+  / *Type*: dict /
+
+  Keys ``PDFFILE`` and ``JSONFILE`` (``None`` for files not existing), or ``None`` in case of the configuration object
+  is not available.
+      """
+
+      if self.__dictGlobals is None:
+         return None
+      oPackageDocConfig = self.__dictGlobals.get('oPackageDocConfig')
+      if ( (oPackageDocConfig is None) or (hasattr(oPackageDocConfig, "GetConfig") is False) ):
+         return None
+      try:
+         dictPackageDocConfig = oPackageDocConfig.GetConfig()
+         dictFiles = {'PDFFILE' : None, 'JSONFILE' : None}
+         if ( (dictPackageDocConfig.get('PDFDEST') is not None) and (dictPackageDocConfig.get('sPDFFileName') is not None) ):
+            sPDFFile = CString.NormalizePath(f"{dictPackageDocConfig['PDFDEST']}/{dictPackageDocConfig['sPDFFileName']}")
+            if os.path.isfile(sPDFFile) is True:
+               dictFiles['PDFFILE'] = sPDFFile
+         if ( (dictPackageDocConfig.get('CONFIGDEST') is not None) and (dictPackageDocConfig.get('PACKAGENAME') is not None) ):
+            sJsonFile = CString.NormalizePath(f"{dictPackageDocConfig['CONFIGDEST']}/_CONFIG_{dictPackageDocConfig['PACKAGENAME']}.json")
+            if os.path.isfile(sJsonFile) is True:
+               dictFiles['JSONFILE'] = sJsonFile
+      except Exception:
+         return None
+      return dictFiles
+
+   # eof def GetOutputFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetTail(self):
+      """Returns the last lines of the log file (as string).
+      """
+      dequeTail = collections.deque(maxlen=LOG_TAIL_LINES)
+      try:
+         with open(self.__sLogFile, "rb") as hLogFile:
+            # only the end of the log file is read (the size of the log file is not limited)
+            hLogFile.seek(0, os.SEEK_END)
+            hLogFile.seek(max(0, hLogFile.tell() - 200 * LOG_TAIL_LINES))
+            for bLine in hLogFile:
+               dequeTail.append(bLine.decode("utf-8", errors="replace").rstrip())
+      except Exception:
+         pass
+      return "\n".join(dequeTail)
+
+   # eof def GetTail(self):
+
+# eof class CInProcessGenerator():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,718 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CLaTeXCompiler.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the LaTeX compilation of the main documentation.
+
+The LaTeX compiler is called until the auxiliary files (``.aux``, ``.toc``, ...) are stable,
+but not more often than a configurable maximum number of passes.
+
+The common part of the preamble (up to ``\\endofdump`` in the main tex file) is precompiled into a format file
+(with ``mylatexformat``), that is used by every pass. The format file is rebuilt only in case of the preamble,
+a style file or the TeX installation changed.
+
+Intermediate passes run in draft mode (no PDF output, no embedding of images and PDF files); only the final pass writes the PDF file.
+
+With an artifact store (command line ``--cache-dir``) the format file and the PDF file of a full build are taken from the store,
+in case of their inputs have been compiled before.
+
+The LaTeX compiler is executed within the book sources folder. In case of variants of the main documentation (several maindoc
+configurations), every variant has its own output folder (``-output-directory``); the LaTeX compiler looks for the files
+generated for the variant (``\\input``) within this folder first.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, re, time, json, hashlib, shlex, subprocess
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CChapterSelection import CChapterSelection
+from maindoc.CTeXDependencies import CTeXDependencies
+from maindoc.CBuildTrace import CBuildTrace
+from maindoc.CLoggedProcess import CLoggedProcess
+from maindoc.CArtifactStore import KIND_FORMAT, KIND_PDF
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+SUCCESS = 0
+ERROR   = 1
+
+# default for the maximum number of LaTeX passes (maindoc configuration: "CONTROL" : {"MAX_LATEX_PASSES" : ...})
+MAX_LATEX_PASSES = 5
+
+# marker within the main tex file: end of the part of the preamble that is precompiled into the format file
+ENDOFDUMP = r"\csname endofdump\endcsname"
+
+# extensions of the auxiliary files of the LaTeX job, that influence the next pass (TOC, references, bookmarks, lists)
+AUXILIARY_EXTENSIONS = (".aux", ".toc", ".out", ".lof", ".lot")
+
+# extensions of the files generated for the documentation, that are inputs of the LaTeX compiler (part of the input fingerprint)
+INPUT_EXTENSIONS = (".tex", ".sty", ".cls", ".bib", ".png", ".jpg", ".jpeg", ".pdf", ".eps", ".svg")
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CLaTeXCompiler():
+   """
+Compiles the main tex file of the documentation to PDF.
+
+Method to execute: ``Compile()``
+   """
+
+   def __init__(self, dictMainDocConfig=None, oBuildTrace=None, oArtifactStore=None):
+      """
+Constructor of class ``CLaTeXCompiler``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``).
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace / *Default*: None /
+
+  Build trace; the precompilation of the preamble and every LaTeX pass are recorded as span.
+
+* ``oArtifactStore``
+
+  / *Condition*: optional / *Type*: CArtifactStore / *Default*: None /
+
+  Artifact store for the format file and the PDF file (command line ``--cache-dir``).
+      """
+
+      sMethod = "CLaTeXCompiler.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__dictMainDocConfig = dictMainDocConfig
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+      self.__oArtifactStore = oArtifactStore
+
+      self.__bFormatPrepared = False
+      self.__sFormatName     = None
+
+   # eof def __init__(self, dictMainDocConfig=None, oBuildTrace=None, oArtifactStore=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetAuxiliaryFiles(self):
+      """Returns the list of auxiliary files of the LaTeX job: the files of the main job and the ``.aux`` files of all
+chapters imported by ``\\include`` (taken out of the main ``.aux`` file).
+      """
+
+      sOutputFolder = self.__dictMainDocConfig['OUTPUTFOLDER']
+      JOBNAME = self.__dictMainDocConfig['JOBNAME']
+
+      listAuxiliaryFiles = []
+      for sExtension in AUXILIARY_EXTENSIONS:
+         listAuxiliaryFiles.append(f"{sOutputFolder}/{JOBNAME}{sExtension}")
+
+      sMainAuxFile = f"{sOutputFolder}/{JOBNAME}.aux"
+      if os.path.isfile(sMainAuxFile) is True:
+         with open(sMainAuxFile, encoding="utf-8", errors="replace") as hAuxFile:
+            for sLine in hAuxFile:
+               oMatch = re.match(r"\\@input\{(.+?)\}", sLine)
+               if oMatch is not None:
+                  listAuxiliaryFiles.append(CString.NormalizePath(sPath=oMatch.group(1), sReferencePathAbs=sOutputFolder))
+
+      return listAuxiliaryFiles
+
+   # eof def __GetAuxiliaryFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __HashAuxiliaryFiles(self):
+      """Returns a dictionary with the SHA-256 hash of every auxiliary file (``None`` for files not existing).
+      """
+
+      dictHashes = {}
+      for sAuxiliaryFile in self.__GetAuxiliaryFiles():
+         sHash = None
+         if os.path.isfile(sAuxiliaryFile) is True:
+            with open(sAuxiliaryFile, "rb") as hAuxiliaryFile:
+               sHash = hashlib.sha256(hAuxiliaryFile.read()).hexdigest()
+         dictHashes[sAuxiliaryFile] = sHash
+      return dictHashes
+
+   # eof def __HashAuxiliaryFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetConsoleLogFile(self):
+      """Returns the path and name of the log file containing the console output of all LaTeX calls.
+      """
+      return f"{self.__dictMainDocConfig['OUTPUTFOLDER']}/{self.__dictMainDocConfig['JOBNAME']}.console.log"
+
+   # eof def __GetConsoleLogFile(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetEnvironment(self):
+      """Returns the environment variables for the LaTeX compiler: in case of a reproducible build (fixed build date) the
+LaTeX compiler takes the creation date and modification date of the PDF file, and the date of the document, from the build date.
+      """
+      if self.__dictMainDocConfig['BUILDDATE'] is None:
+         return None
+      return {'SOURCE_DATE_EPOCH' : str(self.__dictMainDocConfig['BUILDDATE']), 'FORCE_SOURCE_DATE' : "1"}
+
+   # eof def __GetEnvironment(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetMaxPasses(self):
+      """Returns the maximum number of LaTeX passes (maindoc configuration: ``"CONTROL" : {"MAX_LATEX_PASSES" : ...}``).
+      """
+
+      nMaxPasses = MAX_LATEX_PASSES
+      if "MAX_LATEX_PASSES" in self.__dictMainDocConfig['CONTROL']:
+         nMaxPasses = int(self.__dictMainDocConfig['CONTROL']['MAX_LATEX_PASSES'])
+      return max(1, nMaxPasses)
+
+   # eof def __GetMaxPasses(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetTeXInstallationFingerprint(self):
+      """
+Returns a string identifying the TeX installation: version and time stamp of the LaTeX compiler and of the
+base format ``pdflatex.fmt`` (changes in case of the TeX installation is updated).
+      """
+
+      sLaTeXInterpreter = self.__dictMainDocConfig['LATEXINTERPRETER']
+      listParts = []
+      oStat = os.stat(sLaTeXInterpreter)
+      listParts.append(f"{sLaTeXInterpreter}:{oStat.st_size}:{oStat.st_mtime_ns}")
+      try:
+         oProcess = subprocess.run([sLaTeXInterpreter, "--version"], capture_output=True, text=True, stdin=subprocess.DEVNULL)
+         listParts.append(oProcess.stdout.strip())
+      except Exception:
+         pass
+      # kpsewhich is part of every TeX distribution and is located next to the LaTeX compiler
+      sKpseWhich = os.path.join(os.path.dirname(sLaTeXInterpreter), "kpsewhich")
+      try:
+         oProcess = subprocess.run([sKpseWhich, "pdflatex.fmt"], capture_output=True, text=True, stdin=subprocess.DEVNULL)
+         sBaseFormatFile = oProcess.stdout.strip()
+         if os.path.isfile(sBaseFormatFile) is True:
+            oStat = os.stat(sBaseFormatFile)
+            listParts.append(f"{sBaseFormatFile}:{oStat.st_size}:{oStat.st_mtime_ns}")
+      except Exception:
+         pass
+      return "\n".join(listParts)
+
+   # eof def GetTeXInstallationFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetPreambleFingerprint(self, sPreamble=""):
+      """Returns the fingerprint of the precompiled preamble: the preamble part of the main tex file, all files within
+the styles folder and the TeX installation.
+      """
+
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      oHash = hashlib.sha256()
+      oHash.update(sPreamble.encode("utf-8"))
+      sStylesFolder = f"{sBookSourcesFolder}/styles"
+      listStyleFiles = []
+      for sRootFolder, listFolders, listFileNames in os.walk(sStylesFolder):
+         for sFileName in listFileNames:
+            listStyleFiles.append(os.path.join(sRootFolder, sFileName))
+      for sStyleFile in sorted(listStyleFiles):
+         with open(sStyleFile, "rb") as hStyleFile:
+            oHash.update(os.path.relpath(sStyleFile, sStylesFolder).encode("utf-8") + b"\0" + hashlib.sha256(hStyleFile.read()).digest())
+      oHash.update(self.GetTeXInstallationFingerprint().encode("utf-8"))
+      return oHash.hexdigest()
+
+   # eof def __GetPreambleFingerprint(self, sPreamble=""):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetInputFingerprint(self):
+      """Returns the fingerprint of all inputs of a full build: the main tex file and all files it depends on (see ``CTeXDependencies``),
+all input files generated for this documentation (``GENERATEDDOCFOLDER``), the job name, the build date of a reproducible build
+and the TeX installation. Other files within the book sources folder (e.g. the PDF files of other main documentations) are not
+part of the fingerprint. The time stamp of the build (written into the generated tex files) is ignored, and also the time stamp
+line of generated files that have not been written again.
+
+Returns ``None`` in case of the dependencies cannot be identified (the artifact store is not used in this case).
+      """
+
+      sBookSourcesFolder  = self.__dictMainDocConfig['BOOKSOURCES']
+      sOutputFolder       = self.__dictMainDocConfig['OUTPUTFOLDER']
+      sGeneratedDocFolder = self.__dictMainDocConfig['GENERATEDDOCFOLDER']
+      JOBNAME = self.__dictMainDocConfig['JOBNAME']
+      bNow = self.__dictMainDocConfig['NOW'].encode("utf-8")
+
+      # (all generated files exist at this point in time; therefore they are scanned like the book sources)
+      oTeXDependencies = CTeXDependencies(self.__dictMainDocConfig)
+      bSuccess, sResult = oTeXDependencies.Scan()
+      if bSuccess is not True:
+         print(COLBY + f"Warning: Artifact store not used. {sResult}")
+         return None
+      setInputFiles = set(sFile for sFile in oTeXDependencies.GetFiles() if os.path.isfile(sFile) is True)
+      del oTeXDependencies
+      if os.path.isdir(sGeneratedDocFolder) is True:
+         for sRootFolder, listSubFolders, listFileNames in os.walk(sGeneratedDocFolder):
+            for sFileName in listFileNames:
+               if sFileName.lower().endswith(INPUT_EXTENSIONS) is True:
+                  setInputFiles.add(CString.NormalizePath(os.path.join(sRootFolder, sFileName)))
+
+      oHash = hashlib.sha256()
+      oHash.update(f"jobname:{JOBNAME}\n".encode("utf-8"))
+      oHash.update(f"builddate:{self.__dictMainDocConfig['BUILDDATE']}\n".encode("utf-8"))
+      oHash.update(self.GetTeXInstallationFingerprint().encode("utf-8"))
+      for sFile in sorted(setInputFiles):
+         with open(sFile, "rb") as hInputFile:
+            bContent = hInputFile.read()
+         if sFile.lower().endswith(".tex"):
+            bContent = bContent.replace(bNow, b"")
+            # (an unchanged generated file keeps the time stamp of the build that has written it; see CGeneratedFile)
+            if bContent.startswith(b"% Generated at ") is True:
+               bContent = bContent.partition(b"\n")[2]
+         # (names relative to the folders, to get the same fingerprint on every host)
+         if ( (sOutputFolder != sBookSourcesFolder) and (sFile.startswith(f"{sOutputFolder}/") is True) ):
+            sName = f"output:{sFile[len(sOutputFolder) + 1:]}"
+         elif sFile.startswith(f"{sBookSourcesFolder}/") is True:
+            sName = sFile[len(sBookSourcesFolder) + 1:]
+         else:
+            sName = sFile
+         oHash.update(sName.encode("utf-8") + b"\0" + hashlib.sha256(bContent).digest())
+      return oHash.hexdigest()
+
+   # eof def __GetInputFingerprint(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetFormatName(dictMainDocConfig=None):
+      """
+Returns the name of the format file containing the precompiled preamble: ``<JOBNAME>_preamble``, or ``<JOBNAME>_<VARIANT>_preamble``
+in case of a variant build (the format file is located within ``BOOKSOURCES``, that is shared by all variants).
+      """
+      JOBNAME  = dictMainDocConfig['JOBNAME']
+      sVariant = dictMainDocConfig.get('VARIANT')
+      if sVariant is None:
+         return f"{JOBNAME}_preamble"
+      return f"{JOBNAME}_{sVariant}_preamble"
+
+   # eof def GetFormatName(dictMainDocConfig=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrepareOutputFolder(self):
+      """In case of the output folder differs from the book sources folder (variant build), the subfolders of the book sources
+are mirrored into the output folder (the LaTeX compiler writes the ``.aux`` files of chapters imported by ``\\include`` into
+the corresponding subfolder of the output folder, but does not create this subfolder).
+      """
+
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      sOutputFolder      = self.__dictMainDocConfig['OUTPUTFOLDER']
+      if sOutputFolder == sBookSourcesFolder:
+         return
+
+      os.makedirs(sOutputFolder, exist_ok=True)
+      for sRootFolder, listFolders, listFileNames in os.walk(sBookSourcesFolder):
+         # the external docs are generated per variant (within the output folder) and do not contain chapters
+         listFolders[:] = [sFolder for sFolder in listFolders if sFolder != "externaldocs"]
+         for sFolder in listFolders:
+            sRelFolder = os.path.relpath(os.path.join(sRootFolder, sFolder), sBookSourcesFolder)
+            os.makedirs(os.path.join(sOutputFolder, sRelFolder), exist_ok=True)
+
+   # eof def __PrepareOutputFolder(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrepareFormat(self):
+      """Precompiles the common part of the preamble into the format file ``<JOBNAME>_preamble.fmt`` (within ``BOOKSOURCES``;
+name see ``GetFormatName()``).
+
+The format file is rebuilt only in case of the fingerprint (see ``__GetPreambleFingerprint()``) changed.
+
+**Returns:**
+
+* ``sFormatName``
+
+  / *Type*: str /
+
+  Name of the format (to be used with ``-fmt``), or ``None`` in case of no format file is available.
+      """
+
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      sMainTexFile       = self.__dictMainDocConfig['MAINTEXFILE']
+      sLaTeXInterpreter  = self.__dictMainDocConfig['LATEXINTERPRETER']
+      JOBNAME            = self.__dictMainDocConfig['JOBNAME']
+
+      if ( ("PRECOMPILED_PREAMBLE" in self.__dictMainDocConfig['CONTROL']) and (self.__dictMainDocConfig['CONTROL']['PRECOMPILED_PREAMBLE'] is False) ):
+         return None
+
+      with open(sMainTexFile, encoding="utf-8", errors="replace") as hMainTexFile:
+         sMainTex = hMainTexFile.read()
+      nEndOfDump = sMainTex.find(ENDOFDUMP)
+      if nEndOfDump < 0:
+         print(COLBY + f"No '{ENDOFDUMP}' within '{sMainTexFile}'. The preamble is not precompiled.")
+         print()
+         return None
+
+      sFormatName = CLaTeXCompiler.GetFormatName(self.__dictMainDocConfig)
+      sFormatFile = f"{sBookSourcesFolder}/{sFormatName}.fmt"
+      sFingerprintFile = f"{sFormatFile}.json"
+      sFingerprint = self.__GetPreambleFingerprint(sMainTex[:nEndOfDump])
+
+      if ( (os.path.isfile(sFormatFile) is True) and (os.path.isfile(sFingerprintFile) is True) ):
+         try:
+            with open(sFingerprintFile, encoding="utf-8") as hFingerprintFile:
+               if json.load(hFingerprintFile)['FINGERPRINT'] == sFingerprint:
+                  print(COLBY + f"Precompiled preamble is up to date: '{sFormatFile}'")
+                  print()
+                  return sFormatName
+         except Exception:
+            pass # rebuild the format file
+
+      if os.path.isfile(sFingerprintFile) is True:
+         os.remove(sFingerprintFile)
+
+      # -- the format file of another build with the same fingerprint (artifact store)
+      if self.__oArtifactStore is not None:
+         if self.__oArtifactStore.Fetch(KIND_FORMAT, f"{sFormatName}_{sFingerprint}", sBookSourcesFolder) is not None:
+            with open(sFingerprintFile, "w", encoding="utf-8") as hFingerprintFile:
+               json.dump({'FINGERPRINT' : sFingerprint}, hFingerprintFile, indent=3)
+            print(COLBY + f"Precompiled preamble restored from artifact store: '{sFormatFile}'")
+            print()
+            return sFormatName
+
+      # "&pdflatex" loads the LaTeX base format, mylatexformat.ltx dumps the preamble of the main tex file (up to \endofdump)
+      listCmdLineParts = [sLaTeXInterpreter, "-ini", f"-jobname={sFormatName}", "-interaction=nonstopmode", "&pdflatex", "mylatexformat.ltx", os.path.basename(sMainTexFile)]
+      nReturn = ERROR
+      oLoggedProcess = CLoggedProcess(listCmdLineParts, self.__GetConsoleLogFile(), sBookSourcesFolder, dictEnvironment=self.__GetEnvironment())
+      try:
+         with self.__oBuildTrace.Span("precompile preamble", "latex") as oSpan:
+            nReturn = oLoggedProcess.Run()
+            oSpan.SetExitCode(nReturn)
+      except Exception as ex:
+         print(COLBY + f"Warning: Precompiling the preamble failed ({ex}). Continuing without format file.")
+         print()
+         return None
+      if ( (nReturn != SUCCESS) or (os.path.isfile(sFormatFile) is False) ):
+         print(COLBY + f"Warning: Precompiling the preamble failed (returned {nReturn}). Continuing without format file.")
+         print(oLoggedProcess.GetTail())
+         print()
+         return None
+
+      with open(sFingerprintFile, "w", encoding="utf-8") as hFingerprintFile:
+         json.dump({'FINGERPRINT' : sFingerprint}, hFingerprintFile, indent=3)
+      print(COLBY + f"Preamble precompiled: '{sFormatFile}'")
+      print()
+      if self.__oArtifactStore is not None:
+         bSuccess, sResult = self.__oArtifactStore.Put(KIND_FORMAT, f"{sFormatName}_{sFingerprint}", {'FORMATFILE' : sFormatFile})
+         if bSuccess is not True:
+            print(COLBY + f"Warning: {sResult}")
+            print()
+      return sFormatName
+
+   # eof def __PrepareFormat(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def PrepareFormat(self):
+      """
+Precompiles the preamble (see ``__PrepareFormat()``). The preamble does not depend on the files generated by the build;
+therefore this method can be called before ``Compile()`` (in parallel to other build stages). Otherwise ``Compile()`` calls it.
+
+**Returns:**
+
+* ``sFormatName``
+
+  / *Type*: str /
+
+  Name of the format, or ``None`` in case of no format file is available.
+      """
+
+      # the console output of all LaTeX calls of this build is collected in a single log file, starting with the precompilation
+      sConsoleLogFile = self.__GetConsoleLogFile()
+      if os.path.isfile(sConsoleLogFile) is True:
+         os.remove(sConsoleLogFile)
+
+      self.__sFormatName     = self.__PrepareFormat()
+      self.__bFormatPrepared = True
+      return self.__sFormatName
+
+   # eof def PrepareFormat(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetCmdLineParts(self, sTexFile=None, sFormatName=None, bDraftMode=False):
+      """Returns the command line of a LaTeX pass (as list). ``sTexFile`` is the main tex file or the wrapper tex file of a chapter selection.
+
+In draft mode the LaTeX compiler does not write a PDF file and does not read images and PDF files to be embedded.
+      """
+
+      sLaTeXInterpreter  = self.__dictMainDocConfig['LATEXINTERPRETER']
+      JOBNAME            = self.__dictMainDocConfig['JOBNAME']
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      sOutputFolder      = self.__dictMainDocConfig['OUTPUTFOLDER']
+
+      listCmdLineParts = []
+      listCmdLineParts.append(f"\"{sLaTeXInterpreter}\"")
+      if sFormatName is not None:
+         listCmdLineParts.append(f"-fmt=\"{sFormatName}\"")
+      if bDraftMode is True:
+         listCmdLineParts.append("-draftmode")
+      listCmdLineParts.append(f"-jobname=\"{JOBNAME}\"")
+      if sOutputFolder != sBookSourcesFolder:
+         # variant build: the LaTeX compiler reads the files generated for this variant out of the output folder first
+         listCmdLineParts.append(f"-output-directory=\"{sOutputFolder}\"")
+      listCmdLineParts.append(f"\"{sTexFile}\"")
+
+      sCmdLine = " ".join(listCmdLineParts)
+      del listCmdLineParts
+      listCmdLineParts = shlex.split(sCmdLine)
+
+      return listCmdLineParts
+
+   # eof def __GetCmdLineParts(self, sTexFile=None, sFormatName=None, bDraftMode=False):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Compile(self):
+      """
+Calls the LaTeX compiler until the auxiliary files are stable.
+
+The auxiliary files of the previous build (persisted in ``OUTPUTFOLDER``) are the reference for the first pass.
+Therefore in case of the structure of the documentation did not change, a single pass is sufficient.
+
+Intermediate passes (that only refresh TOC and references) run in draft mode. Only the final pass writes ``<JOBNAME>.pdf``:
+
+* In case of auxiliary files of a previous build exist, the first pass is expected to be the final one and runs in normal mode.
+* Otherwise (no auxiliary files of a previous build) the first pass is certainly not the final one and runs in draft mode.
+* A pass in normal mode that changed the auxiliary files is followed by a pass in normal mode (expected to be stable and
+  therefore the final one); a pass in draft mode that changed the auxiliary files is followed by a pass in draft mode.
+  A draft pass with stable auxiliary files is followed by one final pass in normal mode.
+
+In case of a chapter selection (command line ``--chapters``), only the selected chapters are typeset (see ``CChapterSelection``).
+
+In case of a full build with an artifact store, the LaTeX compiler is not called at all, if the store contains the PDF file
+belonging to the fingerprint of all inputs (see ``__GetInputFingerprint()``); the auxiliary files are restored together with the PDF file.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CLaTeXCompiler.Compile"
+
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      sOutputFolder      = self.__dictMainDocConfig['OUTPUTFOLDER']
+      JOBNAME            = self.__dictMainDocConfig['JOBNAME']
+
+      self.__PrepareOutputFolder()
+      oChapterSelection = CChapterSelection(self.__dictMainDocConfig)
+      sTexFile, bSuccess, sResult = oChapterSelection.Prepare()
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + sResult)
+      print()
+
+      # -- the PDF file of a full build with the same inputs (artifact store)
+      sInputFingerprint = None
+      if ( (self.__oArtifactStore is not None) and (sTexFile == self.__dictMainDocConfig['MAINTEXFILE']) ):
+         sInputFingerprint = self.__GetInputFingerprint()
+      if sInputFingerprint is not None:
+         if self.__oArtifactStore.Fetch(KIND_PDF, f"{JOBNAME}_{sInputFingerprint}", sOutputFolder) is not None:
+            self.__dictMainDocConfig['LATEXPASSES'] = 0
+            oChapterSelection.UpdateState()
+            del oChapterSelection
+            bSuccess = True
+            sResult  = "LaTeX compiler: no pass, PDF file restored from artifact store"
+            print(COLBY + sResult)
+            print()
+            return bSuccess, sResult
+
+      # the console output of all LaTeX calls of this build is collected in a single log file (the LaTeX compiler writes
+      # its own log file <JOBNAME>.log additionally)
+      sConsoleLogFile = self.__GetConsoleLogFile()
+      if self.__bFormatPrepared is False:
+         self.PrepareFormat()
+      sFormatName = self.__sFormatName
+      print(COLBY + f"Console output of the LaTeX compiler: '{sConsoleLogFile}'")
+      print()
+
+      nMaxPasses = self.__GetMaxPasses()
+      dictHashesBefore = self.__HashAuxiliaryFiles()
+      listReasons = []
+      bStable = False
+      bFinalPassDone = False
+      nPass = 0
+
+      # intermediate passes in draft mode can be switched off (maindoc configuration: "CONTROL" : {"DRAFTMODE_PASSES" : false})
+      bUseDraftMode = True
+      if ( ("DRAFTMODE_PASSES" in self.__dictMainDocConfig['CONTROL']) and (self.__dictMainDocConfig['CONTROL']['DRAFTMODE_PASSES'] is False) ):
+         bUseDraftMode = False
+
+      # without auxiliary files of a previous build the first pass is certainly not the final one
+      bDraftMode = bUseDraftMode and not os.path.isfile(f"{sOutputFolder}/{JOBNAME}.aux")
+
+      while nPass < nMaxPasses:
+         nPass = nPass + 1
+         if nPass == nMaxPasses:
+            bDraftMode = False # the last possible pass has to write the PDF file
+         listCmdLineParts = self.__GetCmdLineParts(sTexFile, sFormatName, bDraftMode)
+
+         nReturn = ERROR
+         # the LaTeX compiler has to be executed within the book sources folder, otherwise it is not able to find files inside
+         oLoggedProcess = CLoggedProcess(listCmdLineParts, sConsoleLogFile, sBookSourcesFolder, dictEnvironment=self.__GetEnvironment())
+         try:
+            fStartTime = time.time()
+            with self.__oBuildTrace.Span(f"LaTeX pass {nPass}", "latex", {'draftmode' : bDraftMode, 'format' : sFormatName}) as oSpan:
+               nReturn = oLoggedProcess.Run()
+               oSpan.SetExitCode(nReturn)
+            print(f"LaTeX pass {nPass}{' (draft mode)' if bDraftMode else ''} : returned {nReturn} ({time.time() - fStartTime:.1f} s)")
+         except Exception as ex:
+            bSuccess = None
+            sResult  = str(ex)
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         if ( (nReturn != SUCCESS) and (sFormatName is not None) ):
+            # the precompiled preamble is only an optimization; in case of problems the pass is repeated without format file
+            print(COLBY + f"Warning: LaTeX compiler failed with precompiled preamble '{sFormatName}'. Repeating the pass without format file.")
+            print(oLoggedProcess.GetTail())
+            print()
+            sFormatName = None
+            nPass = nPass - 1
+            continue
+         if nReturn != SUCCESS:
+            bSuccess = False
+            sResult  = f"LaTeX compiler not returned expected value {SUCCESS} (pass {nPass}). Last lines of '{sConsoleLogFile}':\n{oLoggedProcess.GetTail()}"
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+         if bStable is True:
+            # this has been the final pass after a draft pass with stable auxiliary files
+            bFinalPassDone = True
+            break
+
+         dictHashesAfter = self.__HashAuxiliaryFiles()
+         listChangedFiles = []
+         for sAuxiliaryFile in sorted(set(dictHashesBefore) | set(dictHashesAfter)):
+            if dictHashesBefore.get(sAuxiliaryFile) != dictHashesAfter.get(sAuxiliaryFile):
+               listChangedFiles.append(os.path.basename(sAuxiliaryFile))
+         if len(listChangedFiles) == 0:
+            bStable = True
+            if bDraftMode is False:
+               bFinalPassDone = True
+               break
+            # stable, but no PDF file written up to now
+            listReasons.append(f"pass {nPass} (draft mode) stable, final pass writes the PDF file")
+            bDraftMode = False
+            continue
+         if bDraftMode is False:
+            sReason = f"pass {nPass} changed: " + ", ".join(listChangedFiles)
+         else:
+            sReason = f"pass {nPass} (draft mode) changed: " + ", ".join(listChangedFiles)
+         listReasons.append(sReason)
+         if nPass < nMaxPasses:
+            print(COLBY + f"Rerun of LaTeX compiler required ({sReason})")
+            print()
+         # (only after a draft pass the next pass is known to be not the final one; after a normal pass it is expected to be
+         # stable, and a stable normal pass ends the loop without an additional pass)
+         bDraftMode = bUseDraftMode and bDraftMode
+         dictHashesBefore = dictHashesAfter
+      # eof while nPass < nMaxPasses:
+
+      self.__dictMainDocConfig['LATEXPASSES'] = nPass
+      oChapterSelection.UpdateState()
+      del oChapterSelection
+
+      # -- only a PDF file with stable auxiliary files is stored in the artifact store
+      if ( (sInputFingerprint is not None) and (bFinalPassDone is True) ):
+         dictFiles = {'PDFFILE' : f"{sOutputFolder}/{JOBNAME}.pdf"}
+         for sAuxiliaryFile in self.__GetAuxiliaryFiles():
+            if os.path.isfile(sAuxiliaryFile) is True:
+               dictFiles[os.path.relpath(sAuxiliaryFile, sOutputFolder).replace("\\", "/")] = sAuxiliaryFile
+         bSuccess, sResult = self.__oArtifactStore.Put(KIND_PDF, f"{JOBNAME}_{sInputFingerprint}", dictFiles, sOutputFolder)
+         if bSuccess is not True:
+            print(COLBY + f"Warning: {sResult}")
+            print()
+
+      if bFinalPassDone is True:
+         sResult = f"LaTeX compiler: {nPass} pass(es), auxiliary files stable"
+      elif bStable is True:
+         sResult = f"LaTeX compiler: {nPass} pass(es), auxiliary files stable, but the final pass exceeds the maximum number of passes"
+      else:
+         sResult = f"LaTeX compiler: {nPass} pass(es), auxiliary files still not stable (maximum number of passes reached)"
+      if len(listReasons) > 0:
+         sResult = sResult + "\n* rerun reasons:\n  - " + "\n  - ".join(listReasons)
+      print(COLBY + sResult)
+      print()
+
+      bSuccess = True
+      return bSuccess, sResult
+
+   # eof def Compile(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   GetFormatName = staticmethod(GetFormatName)
+
+# eof class CLaTeXCompiler():
+
+# --------------------------------------------------------------------------------------------------------------
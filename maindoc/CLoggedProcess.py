@@ -0,0 +1,177 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CLoggedProcess.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module to execute a child process with its console output redirected to a log file.
+
+The output (stdout and stderr) is streamed into the log file while the process is running. Only the last lines
+are kept in memory (for error messages); the memory consumption does not depend on the amount of output.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time, subprocess, threading, collections
+
+# number of output lines kept in memory (tail of the log file)
+LOG_TAIL_LINES = 40
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CLoggedProcess():
+   """
+Executes a command line with the console output redirected to a log file.
+
+Method to execute: ``Run()``
+   """
+
+   def __init__(self, listCmdLineParts=None, sLogFile=None, sWorkingFolder=None, nTailLines=LOG_TAIL_LINES, dictEnvironment=None):
+      """
+Constructor of class ``CLoggedProcess``.
+
+* ``listCmdLineParts``
+
+  / *Condition*: required / *Type*: list /
+
+  The command line (as list).
+
+* ``sLogFile``
+
+  / *Condition*: required / *Type*: str /
+
+  Path and name of the log file. An existing log file is extended (the command line is written as separator).
+
+* ``sWorkingFolder``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The working folder of the process.
+
+* ``nTailLines``
+
+  / *Condition*: optional / *Type*: int / *Default*: LOG_TAIL_LINES /
+
+  Number of output lines kept in memory.
+
+* ``dictEnvironment``
+
+  / *Condition*: optional / *Type*: dict / *Default*: None /
+
+  Environment variables set for the process (in addition to the environment of this process).
+      """
+
+      self.__listCmdLineParts = listCmdLineParts
+      self.__sLogFile         = sLogFile
+      self.__sWorkingFolder   = sWorkingFolder
+      self.__dequeTail        = collections.deque(maxlen=nTailLines)
+      self.__dictEnvironment  = None
+      if dictEnvironment is not None:
+         self.__dictEnvironment = dict(os.environ)
+         self.__dictEnvironment.update(dictEnvironment)
+
+   # eof def __init__(self, listCmdLineParts=None, sLogFile=None, sWorkingFolder=None, nTailLines=LOG_TAIL_LINES, dictEnvironment=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __StreamOutput(self, hOutput=None, hLogFile=None):
+      """Copies the output of the process line by line into the log file (executed in a separate thread).
+      """
+      for bLine in iter(hOutput.readline, b""):
+         hLogFile.write(bLine)
+         self.__dequeTail.append(bLine.decode("utf-8", errors="replace").rstrip())
+      hOutput.close()
+
+   # eof def __StreamOutput(self, hOutput=None, hLogFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Run(self, oCancelEvent=None):
+      """
+Executes the command line and waits until the process terminates.
+
+* ``oCancelEvent``
+
+  / *Condition*: optional / *Type*: threading.Event or multiprocessing.Event / *Default*: None /
+
+  If set while the process is running, the process is terminated.
+
+**Returns:**
+
+* ``nReturn``
+
+  / *Type*: int /
+
+  The return value of the process (``None`` in case of the process has been terminated because of ``oCancelEvent``).
+      """
+
+      sLogFolder = os.path.dirname(self.__sLogFile)
+      if ( (sLogFolder != "") and (os.path.isdir(sLogFolder) is False) ):
+         os.makedirs(sLogFolder)
+
+      nReturn = None
+      with open(self.__sLogFile, "ab") as hLogFile:
+         hLogFile.write(f"=== {time.strftime('%d.%m.%Y - %H:%M:%S')} : {' '.join(self.__listCmdLineParts)}\n".encode("utf-8"))
+         hLogFile.flush()
+         # stdin is closed: a child process waiting for input fails immediately instead of blocking the build
+         oProcess = subprocess.Popen(self.__listCmdLineParts, cwd=self.__sWorkingFolder, stdin=subprocess.DEVNULL,
+                                     stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=self.__dictEnvironment)
+         oStreamThread = threading.Thread(target=self.__StreamOutput, args=(oProcess.stdout, hLogFile), daemon=True)
+         oStreamThread.start()
+         while True:
+            try:
+               nReturn = oProcess.wait(timeout=0.5)
+               break
+            except subprocess.TimeoutExpired:
+               if ( (oCancelEvent is not None) and (oCancelEvent.is_set() is True) ):
+                  oProcess.terminate()
+                  oProcess.wait()
+                  nReturn = None
+                  break
+         oStreamThread.join()
+         hLogFile.write(f"=== returned {nReturn}\n".encode("utf-8"))
+
+      return nReturn
+
+   # eof def Run(self, oCancelEvent=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetTail(self):
+      """Returns the last lines of the output (as string).
+      """
+      return "\n".join(self.__dequeTail)
+
+   # eof def GetTail(self):
+
+# eof class CLoggedProcess():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -31,15 +31,16 @@ This includes the repository configuration and command line values.
 
 # --------------------------------------------------------------------------------------------------------------
 
-import os, sys, time, platform, json, argparse
+import os, sys, time, calendar, platform, json, argparse
 import colorama as col
 
-from robot.version import get_full_version
 
 from PythonExtensionsCollection.String.CString import CString
 from PythonExtensionsCollection.File.CFile import CFile
 from PythonExtensionsCollection.Utils.CUtils import *
 
+from maindoc.CArtifactStore import ARTIFACTSTORE_MAX_SIZE
+
 col.init(autoreset=True)
 COLBR = col.Style.BRIGHT + col.Fore.RED
 COLBG = col.Style.BRIGHT + col.Fore.GREEN
@@ -56,9 +57,26 @@ def printerror(sMsg):
 
 # --------------------------------------------------------------------------------------------------------------
 
+def GetRobotFrameworkVersion():
+   """Returns the full version of the installed Robot Framework in the format of ``robot.version.get_full_version('Robot Framework')``.
+The version is taken from the package metadata (importing Robot Framework takes much more time).
+Returns ``None`` in case of Robot Framework is not installed.
+   """
+   import importlib.metadata # (not required for '--help')
+   try:
+      sVersion = importlib.metadata.version("robotframework")
+   except importlib.metadata.PackageNotFoundError:
+      return None
+   sInterpreter = "PyPy" if "PyPy" in sys.version else "Python"
+   return f"Robot Framework {sVersion} ({sInterpreter} {sys.version.split()[0]} on {sys.platform})"
+
+# eof def GetRobotFrameworkVersion():
+
+# --------------------------------------------------------------------------------------------------------------
+
 class CMainDocConfig():
 
-   def __init__(self, oRepositoryConfig=None):
+   def __init__(self, oRepositoryConfig=None, sConfigFile=None):
       """
 Constructor of class ``CMainDocConfig``.
 
@@ -75,6 +93,14 @@ Responsible for:
 
   GenMainDoc configuration containing static and dynamic configuration values (this includes the
   Repository configuration).
+
+* ``sConfigFile``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  Path and name of the maindoc configuration file. Default: the (first) configuration file given in command line
+  (``--configfile``). In case of several configuration files are given in command line, every configuration is a variant
+  of the main documentation (see ``CVariantBuilder``).
       """
 
       sMethod = "CMainDocConfig.__init__"
@@ -106,6 +132,8 @@ Responsible for:
          raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
 
       # read the documentation build configuration from separate json file, provided in command line
+      if sConfigFile is not None:
+         self.__dictMainDocConfig['MAINDOC_CONFIGFILE'] = sConfigFile
       MAINDOC_CONFIGFILE = self.__dictMainDocConfig['MAINDOC_CONFIGFILE']
       if MAINDOC_CONFIGFILE is None:
          # --configfile missed in command line
@@ -197,8 +225,11 @@ Responsible for:
             sResult  = f"Parameter '{sParameter}' is missing in configuration file '{MAINDOC_CONFIGFILE}'. Please add"
             raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
 
-      # add current timestamp
-      self.__dictMainDocConfig['NOW'] = time.strftime('%d.%m.%Y - %H:%M:%S')
+      # add current timestamp (in case of a reproducible build: the fixed build date)
+      if self.__dictMainDocConfig['BUILDDATE'] is None:
+         self.__dictMainDocConfig['NOW'] = time.strftime('%d.%m.%Y - %H:%M:%S')
+      else:
+         self.__dictMainDocConfig['NOW'] = time.strftime('%d.%m.%Y - %H:%M:%S', time.gmtime(self.__dictMainDocConfig['BUILDDATE']))
 
       # For normalization of all relative paths inside JSON configuration files we need an absolute reference path.
       # The reference for all relative paths inside JSON configuration files is the position of the selected configuration file.
@@ -214,6 +245,19 @@ Responsible for:
       # normalize path in 'BOOKSOURCES' section
       self.__dictMainDocConfig['BOOKSOURCES'] = CString.NormalizePath(sPath=self.__dictMainDocConfig['BOOKSOURCES'], sReferencePathAbs=sReferencePathAbs)
 
+      # -- output folder of the LaTeX compiler and of the files generated for this configuration: the book sources folder;
+      #    in case of several configuration files (variants) a separate folder per variant, named like the configuration file
+      VARIANT = None
+      OUTPUTFOLDER = self.__dictMainDocConfig['BOOKSOURCES']
+      if len(self.__dictMainDocConfig['MAINDOC_CONFIGFILES']) > 1:
+         VARIANT = os.path.splitext(os.path.basename(MAINDOC_CONFIGFILE))[0]
+         OUTPUTFOLDER = CString.NormalizePath(f"{self.__dictMainDocConfig['REFERENCEPATH']}/variants/{VARIANT}")
+      self.__dictMainDocConfig['VARIANT'] = VARIANT
+      self.__dictMainDocConfig['OUTPUTFOLDER'] = OUTPUTFOLDER
+
+      # -- persistent build cache (output of the package doc generators of all repositories)
+      self.__dictMainDocConfig['CACHEFOLDER'] = CString.NormalizePath(f"{self.__dictMainDocConfig['REFERENCEPATH']}/.genmaindoc_cache")
+
       # -- prepare path to LaTeX interpreter
       sLaTeXInterpreter = None
       sKey = sPlatformSystem.upper()
@@ -222,7 +266,11 @@ Responsible for:
       self.__dictMainDocConfig['LATEXINTERPRETER'] = sLaTeXInterpreter
 
       # add version of underlying Robot Framework (core)
-      self.__dictMainDocConfig['ROBFWVERSION'] = get_full_version('Robot Framework')
+      self.__dictMainDocConfig['ROBFWVERSION'] = GetRobotFrameworkVersion()
+      if self.__dictMainDocConfig['ROBFWVERSION'] is None:
+         bSuccess = None
+         sResult  = "Robot Framework is not installed (package 'robotframework' not found)"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
 
       # debug only
       # PrettyPrint(self.__dictMainDocConfig, sPrefix="Config")
@@ -242,15 +290,29 @@ Gets command line parameter.
       sMethod = "GetCmdLine"
 
       oCmdLineParser = argparse.ArgumentParser()
-      oCmdLineParser.add_argument('--configfile', type=str, help='Path and name of maindoc configuration file')
+      oCmdLineParser.add_argument('--configfile', type=str, action='append', help='Path and name of maindoc configuration file. Can be given several times: every configuration is built as variant of the main documentation (the documentation of the repositories is rendered once for all variants; the variants are compiled in parallel, each into its own output folder \'variants/<name of configuration file>\')')
       oCmdLineParser.add_argument('--bundle_name', type=str, help='The name of the entire framework bundle')
       oCmdLineParser.add_argument('--bundle_version', type=str, help='The version of the entire framework bundle')
       oCmdLineParser.add_argument('--bundle_version_date', type=str, help='The version date of the entire framework bundle')
       oCmdLineParser.add_argument('--simulateonly', action='store_true', help='If True, the LaTeX compiler is switched off; a syntax check only remains in this case. Default: False')
+      oCmdLineParser.add_argument('--jobs', type=int, help='Number of repositories whose documentation is rendered in parallel. Default: number of CPUs')
+      oCmdLineParser.add_argument('--ignorecache', action='store_true', help='If True, the documentation of all repositories is rendered again, independent from the build cache. Default: False')
+      oCmdLineParser.add_argument('--chapters', type=str, help='Comma separated list of chapters (names of the included tex files, e.g. "logging,threading") to be typeset; "changed" selects all chapters changed since the previous build. Default: all chapters')
+      oCmdLineParser.add_argument('--inprocess', action='store_true', help='If True, the package doc generators of all repositories are executed within the (warm) worker processes instead of separate Python interpreters. Default: False')
+      oCmdLineParser.add_argument('--queue', type=str, help='Path to a work queue folder shared with other hosts. If given, the documentation of the repositories is rendered by workers (\'genmaindoc.py --worker --queue <folder>\'). Default: local rendering')
+      oCmdLineParser.add_argument('--dry-run', dest='dryrun', action='store_true', help='If True, the plan of the build stages (order, dependencies and outputs) is printed, but no stage is executed. Default: False')
+      oCmdLineParser.add_argument('--watch', action='store_true', help='If True, the sources are watched after the build and the affected build stages are executed again after every change (terminated with Ctrl+C; a single --configfile only). Default: False')
+      oCmdLineParser.add_argument('--skip-if-up-to-date', dest='skipifuptodate', action='store_true', help='If True, the build is skipped in case of the build manifest within the package folder (written by the previous build) matches the current inputs and the files within the package folder (used by setup.py). Default: False')
+      oCmdLineParser.add_argument('--cache-dir', dest='cachedir', type=str, help='Path to an artifact store folder (e.g. saved and restored by CI). If given, the documentation of the repositories, the precompiled preamble and the final PDF file are stored there, addressed by the fingerprint of their inputs, and restored in later builds. Default: no artifact store')
+      oCmdLineParser.add_argument('--cache-max-size', dest='cachemaxsize', type=int, help=f'Size limit of the artifact store in MB; the least recently used artifacts are removed. Default: {ARTIFACTSTORE_MAX_SIZE}')
+      oCmdLineParser.add_argument('--build-date', dest='builddate', type=str, help='Date of the build (\'YYYY-MM-DD\', \'YYYY-MM-DD HH:MM:SS\' (UTC) or seconds since epoch). If given (or the environment variable SOURCE_DATE_EPOCH is set), this date is written to all generated files and to the PDF file instead of the current time, and the PDF file gets a fixed document ID: identical inputs result in identical files. Default: current time')
+      oCmdLineParser.add_argument('--trace', type=str, help='Path and name of a trace file. If given, the duration of all build phases is written to this file (Chrome trace event format, e.g. for https://ui.perfetto.dev). Default: no trace file')
 
       try:
          oCmdLineArgs = oCmdLineParser.parse_args()
       except SystemExit as reason:
+         if reason.code == 0:
+            raise # '--help' is not an error
          # (nested exceptions here are a little bit long winded, but it's the only chance to print the argparse exception in red color to console)
          bSuccess = None
          sResult  = "Error in command line: " + str(reason) + "\n\n" + oCmdLineParser.format_help()
@@ -258,11 +320,14 @@ Gets command line parameter.
 
       # check of command line parameters will be done in constructor (where this method is called), but not here immediately
 
-      MAINDOC_CONFIGFILE = None
+      MAINDOC_CONFIGFILES = []
       if oCmdLineArgs.configfile is not None:
-         MAINDOC_CONFIGFILE = oCmdLineArgs.configfile
-         MAINDOC_CONFIGFILE = MAINDOC_CONFIGFILE.strip()
+         MAINDOC_CONFIGFILES = [sConfigFile.strip() for sConfigFile in oCmdLineArgs.configfile]
+      MAINDOC_CONFIGFILE = None
+      if len(MAINDOC_CONFIGFILES) > 0:
+         MAINDOC_CONFIGFILE = MAINDOC_CONFIGFILES[0]
       self.__dictMainDocConfig['MAINDOC_CONFIGFILE'] = MAINDOC_CONFIGFILE
+      self.__dictMainDocConfig['MAINDOC_CONFIGFILES'] = MAINDOC_CONFIGFILES
 
       BUNDLE_NAME = None
       if oCmdLineArgs.bundle_name is not None:
@@ -282,11 +347,109 @@ Gets command line parameter.
          BUNDLE_VERSION_DATE = BUNDLE_VERSION_DATE.strip()
       self.__dictMainDocConfig['BUNDLE_VERSION_DATE'] = BUNDLE_VERSION_DATE
 
+      # reproducible build: fixed build date (seconds since epoch, UTC) out of command line or environment (https://reproducible-builds.org/specs/source-date-epoch/)
+      BUILDDATE = None
+      sBuildDate = None
+      if oCmdLineArgs.builddate is not None:
+         sBuildDate = oCmdLineArgs.builddate.strip()
+      elif os.environ.get("SOURCE_DATE_EPOCH", "").strip() != "":
+         sBuildDate = os.environ["SOURCE_DATE_EPOCH"].strip()
+      if sBuildDate is not None:
+         if sBuildDate.isdigit() is True:
+            BUILDDATE = int(sBuildDate)
+         else:
+            for sFormat in ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+               try:
+                  BUILDDATE = calendar.timegm(time.strptime(sBuildDate, sFormat))
+                  break
+               except ValueError:
+                  pass
+         if BUILDDATE is None:
+            bSuccess = None
+            sResult  = f"Invalid build date: '{sBuildDate}'. Use 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS' or seconds since epoch for '--build-date' in command line (or SOURCE_DATE_EPOCH)."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['BUILDDATE'] = BUILDDATE
+
       SIMULATE_ONLY = False
       if oCmdLineArgs.simulateonly is not None:
          SIMULATE_ONLY = oCmdLineArgs.simulateonly
       self.__dictMainDocConfig['SIMULATE_ONLY'] = SIMULATE_ONLY
 
+      JOBS = os.cpu_count() or 1
+      if oCmdLineArgs.jobs is not None:
+         JOBS = oCmdLineArgs.jobs
+         if JOBS < 1:
+            bSuccess = None
+            sResult  = f"Invalid number of jobs: {JOBS}. Use a value greater than 0 for '--jobs' in command line."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['JOBS'] = JOBS
+
+      IGNORECACHE = False
+      if oCmdLineArgs.ignorecache is not None:
+         IGNORECACHE = oCmdLineArgs.ignorecache
+      self.__dictMainDocConfig['IGNORECACHE'] = IGNORECACHE
+
+      CHAPTERS = None
+      if oCmdLineArgs.chapters is not None:
+         CHAPTERS = [sChapter.strip() for sChapter in oCmdLineArgs.chapters.split(',') if sChapter.strip() != ""]
+         if len(CHAPTERS) == 0:
+            bSuccess = None
+            sResult  = "No chapter given. Use a comma separated list of chapters or 'changed' for '--chapters' in command line."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['CHAPTERS'] = CHAPTERS
+
+      TRACEFILE = None
+      if oCmdLineArgs.trace is not None:
+         TRACEFILE = CString.NormalizePath(os.path.abspath(oCmdLineArgs.trace.strip()))
+      self.__dictMainDocConfig['TRACEFILE'] = TRACEFILE
+
+      INPROCESS = False
+      if oCmdLineArgs.inprocess is not None:
+         INPROCESS = oCmdLineArgs.inprocess
+      self.__dictMainDocConfig['INPROCESS'] = INPROCESS
+
+      QUEUEFOLDER = None
+      if oCmdLineArgs.queue is not None:
+         QUEUEFOLDER = CString.NormalizePath(os.path.abspath(oCmdLineArgs.queue.strip()))
+      self.__dictMainDocConfig['QUEUEFOLDER'] = QUEUEFOLDER
+
+      DRYRUN = False
+      if oCmdLineArgs.dryrun is not None:
+         DRYRUN = oCmdLineArgs.dryrun
+      self.__dictMainDocConfig['DRYRUN'] = DRYRUN
+
+      WATCH = False
+      if oCmdLineArgs.watch is not None:
+         WATCH = oCmdLineArgs.watch
+         if ( (WATCH is True) and (len(MAINDOC_CONFIGFILES) > 1) ):
+            bSuccess = None
+            sResult  = "The watch mode supports a single maindoc configuration only. Use '--watch' together with a single '--configfile' in command line."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['WATCH'] = WATCH
+
+      SKIPIFUPTODATE = False
+      if oCmdLineArgs.skipifuptodate is not None:
+         SKIPIFUPTODATE = oCmdLineArgs.skipifuptodate
+         if ( (SKIPIFUPTODATE is True) and (len(MAINDOC_CONFIGFILES) > 1) ):
+            bSuccess = None
+            sResult  = "The up-to-date check supports a single maindoc configuration only. Use '--skip-if-up-to-date' together with a single '--configfile' in command line."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['SKIPIFUPTODATE'] = SKIPIFUPTODATE
+
+      CACHEDIR = None
+      if oCmdLineArgs.cachedir is not None:
+         CACHEDIR = CString.NormalizePath(os.path.abspath(oCmdLineArgs.cachedir.strip()))
+      self.__dictMainDocConfig['CACHEDIR'] = CACHEDIR
+
+      CACHEMAXSIZE = ARTIFACTSTORE_MAX_SIZE
+      if oCmdLineArgs.cachemaxsize is not None:
+         CACHEMAXSIZE = oCmdLineArgs.cachemaxsize
+         if CACHEMAXSIZE < 1:
+            bSuccess = None
+            sResult  = f"Invalid size limit of the artifact store: {CACHEMAXSIZE}. Use a value greater than 0 for '--cache-max-size' in command line."
+            raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      self.__dictMainDocConfig['CACHEMAXSIZE'] = CACHEMAXSIZE
+
    # eof def GetCmdLine(self):
 
    def PrintConfigDebug(self):
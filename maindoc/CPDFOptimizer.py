@@ -0,0 +1,235 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CPDFOptimizer.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the post-processing of the main documentation PDF file (maindoc configuration:
+``"CONTROL" : {"OPTIMIZE_PDF" : true}``).
+
+Every imported library documentation brings its own copy of fonts and images. The post-processing
+
+* replaces identical embedded font files and identical images by a single copy,
+* writes the result with compressed object streams,
+* and linearizes the PDF file (fast display of the first page).
+
+The post-processing requires the Python package ``pikepdf`` (optional; without this package the PDF file is left unchanged).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, hashlib
+
+from PythonExtensionsCollection.String.CString import CString
+
+# keys of a font descriptor referring to an embedded font file
+FONTFILEKEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+# keys of a stream dictionary that are part of the identity of the stream (besides the raw data)
+STREAMIDENTITYKEYS = ("/Type", "/Subtype", "/Filter", "/DecodeParms", "/Width", "/Height", "/BitsPerComponent", "/ColorSpace",
+                      "/Decode", "/ImageMask", "/Mask", "/SMask", "/Length1", "/Length2", "/Length3")
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CPDFOptimizer():
+   """
+Post-processing of a PDF file (deduplication of fonts and images, object streams, linearization).
+
+Method to execute: ``Optimize()``
+   """
+
+   def __init__(self, sPDFFile=None, bDeterministicID=False):
+      """
+Constructor of class ``CPDFOptimizer``.
+
+* ``sPDFFile``
+
+  / *Condition*: required / *Type*: str /
+
+  Path and name of the PDF file; the file is replaced by the optimized version.
+
+* ``bDeterministicID``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the document ID of the optimized PDF file is computed out of its content (reproducible build); otherwise the ID is random.
+      """
+
+      sMethod = "CPDFOptimizer.__init__"
+
+      if sPDFFile is None:
+         bSuccess = None
+         sResult  = "sPDFFile is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sPDFFile         = sPDFFile
+      self.__bDeterministicID = bDeterministicID
+
+   # eof def __init__(self, sPDFFile=None, bDeterministicID=False):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetStreamKey(oStream=None):
+      """Returns the identity of a stream: hash of the raw (still encoded) data and of the relevant dictionary entries.
+      """
+      oHash = hashlib.sha256()
+      for sKey in STREAMIDENTITYKEYS:
+         if sKey in oStream:
+            oHash.update(f"{sKey}={oStream[sKey]!r}\n".encode("utf-8"))
+      oHash.update(oStream.read_raw_bytes())
+      return oHash.hexdigest()
+
+   # eof def __GetStreamKey(oStream=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __DeduplicateFontFiles(oPdf=None):
+      """Lets all font descriptors refer to a single copy of identical embedded font files. Returns the number of replaced copies.
+      """
+      import pikepdf
+      dictCanonical = {}
+      nReplaced = 0
+      for oObject in oPdf.objects:
+         if ( (isinstance(oObject, pikepdf.Dictionary) is False) or (oObject.get("/Type") != pikepdf.Name.FontDescriptor) ):
+            continue
+         for sKey in FONTFILEKEYS:
+            oFontFile = oObject.get(sKey)
+            if ( (oFontFile is None) or (isinstance(oFontFile, pikepdf.Stream) is False) ):
+               continue
+            sStreamKey = CPDFOptimizer.__GetStreamKey(oFontFile)
+            oCanonical = dictCanonical.setdefault(sStreamKey, oFontFile)
+            if oCanonical.objgen != oFontFile.objgen:
+               oObject[sKey] = oCanonical
+               nReplaced = nReplaced + 1
+      return nReplaced
+
+   # eof def __DeduplicateFontFiles(oPdf=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __DeduplicateImages(oPdf=None):
+      """Lets all resource dictionaries (of pages and form XObjects) refer to a single copy of identical images.
+Returns the number of replaced references.
+      """
+      import pikepdf
+      dictCanonical = {}
+      nReplaced = 0
+      for oObject in oPdf.objects:
+         if isinstance(oObject, (pikepdf.Dictionary, pikepdf.Stream)) is False:
+            continue
+         oResources = oObject.get("/Resources")
+         if ( (oResources is None) or (isinstance(oResources, pikepdf.Dictionary) is False) ):
+            continue
+         oXObjects = oResources.get("/XObject")
+         if ( (oXObjects is None) or (isinstance(oXObjects, pikepdf.Dictionary) is False) ):
+            continue
+         for sName in list(oXObjects.keys()):
+            oXObject = oXObjects[sName]
+            if ( (isinstance(oXObject, pikepdf.Stream) is False) or (oXObject.get("/Subtype") != pikepdf.Name.Image) ):
+               continue
+            sStreamKey = CPDFOptimizer.__GetStreamKey(oXObject)
+            oCanonical = dictCanonical.setdefault(sStreamKey, oXObject)
+            if oCanonical.objgen != oXObject.objgen:
+               oXObjects[sName] = oCanonical
+               nReplaced = nReplaced + 1
+      return nReplaced
+
+   # eof def __DeduplicateImages(oPdf=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Optimize(self):
+      """
+Optimizes the PDF file. In case of ``pikepdf`` is not installed, the PDF file is left unchanged (this is not an error).
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation (including the size of the PDF file before and after the optimization).
+      """
+
+      sMethod = "CPDFOptimizer.Optimize"
+
+      try:
+         import pikepdf
+      except ImportError:
+         bSuccess = True
+         sResult  = f"PDF file not optimized: the Python package 'pikepdf' is not installed"
+         return bSuccess, sResult
+
+      nSizeBefore = os.path.getsize(self.__sPDFFile)
+      sTempFile = f"{self.__sPDFFile}.{os.getpid()}.tmp"
+      try:
+         with pikepdf.open(self.__sPDFFile) as oPdf:
+            nFontFiles = CPDFOptimizer.__DeduplicateFontFiles(oPdf)
+            nImages    = CPDFOptimizer.__DeduplicateImages(oPdf)
+            oPdf.remove_unreferenced_resources()
+            # (objects that are not referenced any more, e.g. the replaced copies, are not written)
+            oPdf.save(sTempFile, linearize=True, compress_streams=True,
+                      object_stream_mode=pikepdf.ObjectStreamMode.generate, deterministic_id=self.__bDeterministicID)
+         os.replace(sTempFile, self.__sPDFFile)
+      except Exception as ex:
+         if os.path.isfile(sTempFile) is True:
+            os.remove(sTempFile)
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      nSizeAfter = os.path.getsize(self.__sPDFFile)
+      bSuccess = True
+      sResult  = f"PDF file optimized: {nSizeBefore / 1048576:.2f} MB -> {nSizeAfter / 1048576:.2f} MB " \
+                 + f"({nFontFiles} font file copies and {nImages} image copies removed, object streams, linearized)"
+      return bSuccess, sResult
+
+   # eof def Optimize(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   __GetStreamKey         = staticmethod(__GetStreamKey)
+   __DeduplicateFontFiles = staticmethod(__DeduplicateFontFiles)
+   __DeduplicateImages    = staticmethod(__DeduplicateImages)
+
+# eof class CPDFOptimizer():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,545 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CPDFPageCount.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the page count index of the library PDF files imported into the main documentation.
+
+The number of pages is taken out of the page tree of the PDF file (trailer -> catalog -> root of the page tree -> ``/Count``).
+The PDF file is memory-mapped; only the cross reference sections, the trailer and the few objects on this path are parsed.
+The objects are located by their offsets within the cross reference (cross reference tables and streams, incremental updates,
+objects within compressed object streams). Only in case of a damaged cross reference the whole file is searched. The page counts are cached within the build cache folder, identified
+by the hash of the PDF file.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, re, json, mmap, zlib, hashlib, threading
+
+from PythonExtensionsCollection.String.CString import CString
+
+# version of the page count cache file; a change invalidates all cached page counts
+PAGECOUNTVERSION = "1"
+
+# maximum number of cross reference sections followed (incremental updates)
+MAXXREFSECTIONS = 32
+
+REGEX_ROOT  = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+REGEX_PREV  = re.compile(rb"/Prev\s+(\d+)")
+REGEX_PAGES = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+REGEX_COUNT = re.compile(rb"/Count\s+(\d+)")
+REGEX_N     = re.compile(rb"/N\s+(\d+)")
+REGEX_FIRST = re.compile(rb"/First\s+(\d+)")
+REGEX_OBJ   = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+REGEX_W     = re.compile(rb"/W\s*\[([\d\s]*)\]")
+REGEX_SIZE  = re.compile(rb"/Size\s+(\d+)")
+REGEX_INDEX = re.compile(rb"/Index\s*\[([\d\s]*)\]")
+REGEX_XREFSTM = re.compile(rb"/XRefStm\s+(\d+)")
+REGEX_FLATE = re.compile(rb"/Filter\s*(?:\[\s*)?/FlateDecode\s*\]?")
+REGEX_PREDICTOR = re.compile(rb"/Predictor\s+(\d+)")
+REGEX_COLUMNS   = re.compile(rb"/Columns\s+(\d+)")
+REGEX_COLORS    = re.compile(rb"/Colors\s+(\d+)")
+REGEX_BITSPERCOMPONENT = re.compile(rb"/BitsPerComponent\s+(\d+)")
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CPDFPageCount():
+   """
+Page count index of PDF files.
+
+Method to execute: ``GetPageCount()`` (for every PDF file), afterwards ``Save()``
+   """
+
+   def __init__(self, sCacheFolder=None):
+      """
+Constructor of class ``CPDFPageCount``.
+
+* ``sCacheFolder``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  Path to the cache folder. Without cache folder the page counts are computed every time.
+      """
+
+      self.__sCacheFile = None
+      if sCacheFolder is not None:
+         self.__sCacheFile = CString.NormalizePath(f"{sCacheFolder}/pdf_page_counts.json")
+      self.__dictCache = None      # file hash -> page count (as read from the cache file)
+      self.__dictPageCounts = {}   # file hash -> page count (of all PDF files of this build)
+
+   # eof def __init__(self, sCacheFolder=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def ComputeFileHash(sFile=None):
+      """Returns the SHA-256 hash of a file (read in chunks).
+      """
+      oHash = hashlib.sha256()
+      with open(sFile, "rb") as hFile:
+         for bChunk in iter(lambda: hFile.read(1024 * 1024), b""):
+            oHash.update(bChunk)
+      return oHash.hexdigest()
+
+   # eof def ComputeFileHash(sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __DecodePredictor(bData=b"", nColumns=1):
+      """Reverses the PNG predictors (``/Predictor`` 10 ... 15) of a stream with one byte per pixel (like the cross reference
+streams written by pdfTeX and most other PDF writers). Returns ``None`` in case of an unknown predictor.
+      """
+      bytesDecoded = bytearray()
+      bytesPrevious = bytearray(nColumns)
+      for nRowStart in range(0, len(bData) - nColumns, nColumns + 1):
+         nType = bData[nRowStart]
+         bytesRow = bytearray(bData[nRowStart + 1:nRowStart + 1 + nColumns])
+         for nIndex in range(nColumns):
+            nLeft = bytesRow[nIndex - 1] if nIndex > 0 else 0
+            nUp = bytesPrevious[nIndex]
+            nUpLeft = bytesPrevious[nIndex - 1] if nIndex > 0 else 0
+            if nType == 0:
+               nPrediction = 0
+            elif nType == 1:
+               nPrediction = nLeft
+            elif nType == 2:
+               nPrediction = nUp
+            elif nType == 3:
+               nPrediction = (nLeft + nUp) // 2
+            elif nType == 4:
+               nEstimate = nLeft + nUp - nUpLeft
+               nPrediction = min((abs(nEstimate - nLeft), 0, nLeft), (abs(nEstimate - nUp), 1, nUp), (abs(nEstimate - nUpLeft), 2, nUpLeft))[2]
+            else:
+               return None
+            bytesRow[nIndex] = (bytesRow[nIndex] + nPrediction) & 0xFF
+         bytesDecoded.extend(bytesRow)
+         bytesPrevious = bytesRow
+      return bytes(bytesDecoded)
+
+   # eof def __DecodePredictor(bData=b"", nColumns=1):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetStreamData(oPDF=None, nDictStart=0):
+      """Returns the dictionary and the decoded data of the stream whose dictionary starts at ``nDictStart`` (``None``, if not supported).
+      """
+      nStreamKeyword = oPDF.find(b"stream", nDictStart)
+      if nStreamKeyword < 0:
+         return None
+      bDict = oPDF[nDictStart:nStreamKeyword]
+      nDataStart = nStreamKeyword + len(b"stream")
+      if oPDF[nDataStart:nDataStart + 2] == b"\r\n":
+         nDataStart = nDataStart + 2
+      elif oPDF[nDataStart:nDataStart + 1] in (b"\n", b"\r"):
+         nDataStart = nDataStart + 1
+      nDataEnd = oPDF.find(b"endstream", nDataStart)
+      if nDataEnd < 0:
+         return None
+      bData = oPDF[nDataStart:nDataEnd]
+      if b"/Filter" not in bDict:
+         return bDict, bData
+      if REGEX_FLATE.search(bDict) is None:
+         return None # (other filters are not used for object streams and cross reference streams by the usual PDF writers)
+      try:
+         # (the decompressor ignores the end of line in front of 'endstream')
+         bData = zlib.decompressobj().decompress(bData)
+      except zlib.error:
+         return None
+      if b"/DecodeParms" not in bDict:
+         return bDict, bData
+      oMatchPredictor = REGEX_PREDICTOR.search(bDict)
+      nPredictor = int(oMatchPredictor.group(1)) if oMatchPredictor is not None else 1
+      if nPredictor == 1:
+         return bDict, bData
+      oMatchColors = REGEX_COLORS.search(bDict)
+      oMatchBitsPerComponent = REGEX_BITSPERCOMPONENT.search(bDict)
+      if ( (nPredictor < 10) or ( (oMatchColors is not None) and (int(oMatchColors.group(1)) != 1) )
+           or ( (oMatchBitsPerComponent is not None) and (int(oMatchBitsPerComponent.group(1)) != 8) ) ):
+         return None # (TIFF predictor, not one byte per pixel)
+      oMatchColumns = REGEX_COLUMNS.search(bDict)
+      bData = CPDFPageCount.__DecodePredictor(bData, int(oMatchColumns.group(1)) if oMatchColumns is not None else 1)
+      if bData is None:
+         return None
+      return bDict, bData
+
+   # eof def __GetStreamData(oPDF=None, nDictStart=0):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetObjectStart(oPDF=None, nOffset=0, nObject=0):
+      """Returns the position behind ``<object> <generation> obj`` at ``nOffset`` (``None``, if the offset does not point to this object).
+      """
+      if ( (nOffset <= 0) or (nOffset >= len(oPDF)) ):
+         return None
+      oMatch = REGEX_OBJ.match(oPDF[nOffset:nOffset + 64])
+      if ( (oMatch is None) or (int(oMatch.group(1)) != nObject) ):
+         return None
+      return nOffset + oMatch.end()
+
+   # eof def __GetObjectStart(oPDF=None, nOffset=0, nObject=0):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ReadXRefStream(oPDF=None, nOffset=0, dictEntries={}):
+      """Adds the entries of the cross reference stream at ``nOffset`` to ``dictEntries`` (entries already contained are kept:
+they belong to a newer section). Returns the stream dictionary (``None``, if the stream cannot be read).
+      """
+      oMatch = REGEX_OBJ.match(oPDF[nOffset:nOffset + 64])
+      if oMatch is None:
+         return None
+      tupleStream = CPDFPageCount.__GetStreamData(oPDF, nOffset + oMatch.end())
+      if tupleStream is None:
+         return None
+      bDict, bData = tupleStream
+      oMatchW = REGEX_W.search(bDict)
+      oMatchSize = REGEX_SIZE.search(bDict)
+      if ( (oMatchW is None) or (oMatchSize is None) ):
+         return None
+      listWidths = [int(sWidth) for sWidth in oMatchW.group(1).split()]
+      if len(listWidths) != 3:
+         return None
+      oMatchIndex = REGEX_INDEX.search(bDict)
+      if oMatchIndex is not None:
+         listIndex = [int(sNumber) for sNumber in oMatchIndex.group(1).split()]
+      else:
+         listIndex = [0, int(oMatchSize.group(1))]
+      nEntrySize = sum(listWidths)
+      nPosition = 0
+      for nFirst, nCount in zip(listIndex[0::2], listIndex[1::2]):
+         for nObject in range(nFirst, nFirst + nCount):
+            if nPosition + nEntrySize > len(bData):
+               return bDict
+            listFields = []
+            for nWidth in listWidths:
+               listFields.append(int.from_bytes(bData[nPosition:nPosition + nWidth], "big"))
+               nPosition = nPosition + nWidth
+            nType = listFields[0] if listWidths[0] > 0 else 1 # (type 1 is the default, if the type field is missing)
+            if nType == 1:
+               dictEntries.setdefault(nObject, (1, listFields[1], 0))
+            elif nType == 2:
+               dictEntries.setdefault(nObject, (2, listFields[1], listFields[2]))
+      return bDict
+
+   # eof def __ReadXRefStream(oPDF=None, nOffset=0, dictEntries={}):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ReadXRef(oPDF=None):
+      """
+Reads the cross reference sections (starting at ``startxref`` and following ``/Prev`` and ``/XRefStm``). Returns the reference
+``(object, generation)`` of the catalog and the cross reference entries (object -> ``(1, offset, 0)`` for uncompressed objects,
+``(2, object stream, index)`` for objects within an object stream; the newest section wins). Free entries are ignored.
+
+In case of a damaged cross reference, the reference of the catalog is taken out of the last ``/Root`` entry within the file
+and the entries are ``None``.
+      """
+      tupleRoot = None
+      dictEntries = {}
+      bDamaged = True
+      nStartXRef = oPDF.rfind(b"startxref")
+      oMatch = None
+      if nStartXRef >= 0:
+         oMatch = re.match(rb"startxref\s+(\d+)", oPDF[nStartXRef:nStartXRef + 64])
+      listOffsets = [int(oMatch.group(1))] if oMatch is not None else []
+      setVisited = set()
+      while ( (len(listOffsets) > 0) and (len(setVisited) < MAXXREFSECTIONS) ):
+         nOffset = listOffsets.pop(0)
+         if nOffset in setVisited:
+            continue
+         setVisited.add(nOffset)
+         if ( (nOffset <= 0) or (nOffset >= len(oPDF)) ):
+            bDamaged = True
+            break
+         if oPDF[nOffset:nOffset + 4] == b"xref":
+            # cross reference table (subsections: first object and number of entries, followed by the entries
+            # 'offset generation n|f'), followed by the trailer dictionary
+            nTrailer = oPDF.find(b"trailer", nOffset)
+            if nTrailer < 0:
+               bDamaged = True
+               break
+            listTokens = oPDF[nOffset + 4:nTrailer].split()
+            nToken = 0
+            try:
+               while nToken + 1 < len(listTokens):
+                  nFirst, nCount = int(listTokens[nToken]), int(listTokens[nToken + 1])
+                  nToken = nToken + 2
+                  for nObject in range(nFirst, nFirst + nCount):
+                     if nToken + 2 >= len(listTokens):
+                        break
+                     if listTokens[nToken + 2] == b"n":
+                        dictEntries.setdefault(nObject, (1, int(listTokens[nToken]), 0))
+                     nToken = nToken + 3
+            except ValueError:
+               bDamaged = True
+               break
+            nEnd = oPDF.find(b"startxref", nTrailer)
+            bDict = oPDF[nTrailer:nEnd if nEnd > 0 else nTrailer + 4096]
+            # (hybrid file: the objects within object streams are listed in an additional cross reference stream)
+            oMatchXRefStm = REGEX_XREFSTM.search(bDict)
+            if oMatchXRefStm is not None:
+               CPDFPageCount.__ReadXRefStream(oPDF, int(oMatchXRefStm.group(1)), dictEntries)
+         else:
+            # cross reference stream; the trailer entries are part of the stream dictionary
+            bDict = CPDFPageCount.__ReadXRefStream(oPDF, nOffset, dictEntries)
+            if bDict is None:
+               bDamaged = True
+               break
+         bDamaged = False
+         if tupleRoot is None:
+            oMatchRoot = REGEX_ROOT.search(bDict)
+            if oMatchRoot is not None:
+               tupleRoot = int(oMatchRoot.group(1)), int(oMatchRoot.group(2))
+         oMatchPrev = REGEX_PREV.search(bDict)
+         if oMatchPrev is not None:
+            listOffsets.append(int(oMatchPrev.group(1)))
+      if ( (bDamaged is False) and (tupleRoot is not None) ):
+         return tupleRoot, dictEntries
+      # -- damaged cross reference: the last /Root entry within the file
+      listMatches = list(REGEX_ROOT.finditer(oPDF))
+      if len(listMatches) == 0:
+         return None, None
+      return (int(listMatches[-1].group(1)), int(listMatches[-1].group(2))), None
+
+   # eof def __ReadXRef(oPDF=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetObjectFromStream(bDict=b"", bData=b"", nObject=0, nIndex=None):
+      """Returns the content of an object within the (decoded) object stream ``bData`` (``None``, if not contained).
+      """
+      oMatchN = REGEX_N.search(bDict)
+      oMatchFirst = REGEX_FIRST.search(bDict)
+      if ( (oMatchN is None) or (oMatchFirst is None) ):
+         return None
+      nFirst = int(oMatchFirst.group(1))
+      listNumbers = [int(sNumber) for sNumber in bData[:nFirst].split()]
+      listObjects = listNumbers[0::2]
+      listOffsets = listNumbers[1::2]
+      if ( (nIndex is None) or (nIndex >= len(listObjects)) or (listObjects[nIndex] != nObject) ):
+         if nObject not in listObjects:
+            return None
+         nIndex = listObjects.index(nObject)
+      nStart = nFirst + listOffsets[nIndex]
+      nEnd = nFirst + listOffsets[nIndex + 1] if nIndex + 1 < len(listOffsets) else len(bData)
+      return bData[nStart:nEnd]
+
+   # eof def __GetObjectFromStream(bDict=b"", bData=b"", nObject=0, nIndex=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetObject(oPDF=None, dictEntries=None, nObject=0, nGeneration=0):
+      """
+Returns the content of an indirect object (``None``, if not found). Objects within object streams are supported.
+
+The object is located by its cross reference entry (``dictEntries``, see ``__ReadXRef()``). Only in case of the cross reference
+is damaged (``dictEntries`` is ``None``) or does not point to the object, the whole file is searched for the object.
+      """
+      # -- object located by the cross reference
+      if dictEntries is not None:
+         tupleEntry = dictEntries.get(nObject)
+         if ( (tupleEntry is not None) and (tupleEntry[0] == 1) ):
+            nStart = CPDFPageCount.__GetObjectStart(oPDF, tupleEntry[1], nObject)
+            if nStart is not None:
+               nEnd = oPDF.find(b"endobj", nStart)
+               if nEnd < 0:
+                  nEnd = min(len(oPDF), nStart + 65536)
+               return oPDF[nStart:nEnd]
+         elif ( (tupleEntry is not None) and (tupleEntry[0] == 2) ):
+            tupleStreamEntry = dictEntries.get(tupleEntry[1])
+            if ( (tupleStreamEntry is not None) and (tupleStreamEntry[0] == 1) ):
+               nDictStart = CPDFPageCount.__GetObjectStart(oPDF, tupleStreamEntry[1], tupleEntry[1])
+               if nDictStart is not None:
+                  tupleStream = CPDFPageCount.__GetStreamData(oPDF, nDictStart)
+                  if tupleStream is not None:
+                     bObject = CPDFPageCount.__GetObjectFromStream(tupleStream[0], tupleStream[1], nObject, tupleEntry[2])
+                     if bObject is not None:
+                        return bObject
+
+      # -- damaged cross reference: uncompressed object (the last definition wins: incremental updates are appended)
+      listMatches = list(re.finditer(rb"(?<![0-9])%d\s+%d\s+obj\b" % (nObject, nGeneration), oPDF))
+      if len(listMatches) > 0:
+         nStart = listMatches[-1].end()
+         nEnd = oPDF.find(b"endobj", nStart)
+         if nEnd < 0:
+            nEnd = min(len(oPDF), nStart + 65536)
+         return oPDF[nStart:nEnd]
+
+      # -- damaged cross reference: object within a compressed object stream
+      for oMatch in re.finditer(rb"/Type\s*/ObjStm\b", oPDF):
+         nDictStart = oPDF.rfind(b"obj", 0, oMatch.start())
+         if nDictStart < 0:
+            continue
+         tupleStream = CPDFPageCount.__GetStreamData(oPDF, nDictStart)
+         if tupleStream is None:
+            continue
+         bObject = CPDFPageCount.__GetObjectFromStream(tupleStream[0], tupleStream[1], nObject)
+         if bObject is not None:
+            return bObject
+      return None
+
+   # eof def __GetObject(oPDF=None, dictEntries=None, nObject=0, nGeneration=0):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def ParsePageCount(sPDFFile=None):
+      """Returns the number of pages of a PDF file (``None``, if the page tree cannot be parsed).
+      """
+      with open(sPDFFile, "rb") as hPDFFile:
+         if os.fstat(hPDFFile.fileno()).st_size == 0:
+            return None
+         with mmap.mmap(hPDFFile.fileno(), 0, access=mmap.ACCESS_READ) as oPDF:
+            tupleRoot, dictEntries = CPDFPageCount.__ReadXRef(oPDF)
+            if tupleRoot is None:
+               return None
+            bCatalog = CPDFPageCount.__GetObject(oPDF, dictEntries, *tupleRoot)
+            if bCatalog is None:
+               return None
+            oMatchPages = REGEX_PAGES.search(bCatalog)
+            if oMatchPages is None:
+               return None
+            bPages = CPDFPageCount.__GetObject(oPDF, dictEntries, int(oMatchPages.group(1)), int(oMatchPages.group(2)))
+            if bPages is None:
+               return None
+            oMatchCount = REGEX_COUNT.search(bPages)
+            if oMatchCount is None:
+               return None
+            return int(oMatchCount.group(1))
+
+   # eof def ParsePageCount(sPDFFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetPageCount(self, sPDFFile=None):
+      """
+Returns the number of pages of a PDF file, taken from the cache in case of the PDF file did not change.
+
+**Returns:**
+
+* ``nPageCount``
+
+  / *Type*: int /
+
+  Number of pages, or ``None`` in case of the page tree of the PDF file cannot be parsed.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CPDFPageCount.GetPageCount"
+
+      if self.__dictCache is None:
+         self.__dictCache = {}
+         # (an unreadable cache file is handled like a missing cache file)
+         if ( (self.__sCacheFile is not None) and (os.path.isfile(self.__sCacheFile) is True) ):
+            try:
+               with open(self.__sCacheFile, encoding="utf-8") as hCacheFile:
+                  dictCacheFile = json.load(hCacheFile)
+               if dictCacheFile['VERSION'] == PAGECOUNTVERSION:
+                  self.__dictCache = dictCacheFile['PAGECOUNTS']
+            except Exception:
+               pass
+
+      try:
+         sHash = CPDFPageCount.ComputeFileHash(sPDFFile)
+         if sHash in self.__dictCache:
+            nPageCount = self.__dictCache[sHash]
+         else:
+            nPageCount = CPDFPageCount.ParsePageCount(sPDFFile)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return None, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      self.__dictPageCounts[sHash] = nPageCount
+      bSuccess = True
+      if nPageCount is None:
+         sResult = f"Number of pages of '{sPDFFile}' not identified"
+      else:
+         sResult = f"'{sPDFFile}' : {nPageCount} pages"
+      return nPageCount, bSuccess, sResult
+
+   # eof def GetPageCount(self, sPDFFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Save(self):
+      """Writes the page counts of all PDF files of this build to the cache file (a problem with the cache is not an error).
+      """
+      if ( (self.__sCacheFile is None) or (self.__dictPageCounts == self.__dictCache) ):
+         return
+      try:
+         sCacheFolder = os.path.dirname(self.__sCacheFile)
+         if os.path.isdir(sCacheFolder) is False:
+            os.makedirs(sCacheFolder)
+         sTempFile = f"{self.__sCacheFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+         with open(sTempFile, "w", encoding="utf-8") as hCacheFile:
+            json.dump({'VERSION' : PAGECOUNTVERSION, 'PAGECOUNTS' : self.__dictPageCounts}, hCacheFile, indent=3)
+         os.replace(sTempFile, self.__sCacheFile)
+      except Exception:
+         pass
+
+   # eof def Save(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   ComputeFileHash         = staticmethod(ComputeFileHash)
+   __DecodePredictor       = staticmethod(__DecodePredictor)
+   __GetStreamData         = staticmethod(__GetStreamData)
+   __GetObjectStart        = staticmethod(__GetObjectStart)
+   __ReadXRefStream        = staticmethod(__ReadXRefStream)
+   __ReadXRef              = staticmethod(__ReadXRef)
+   __GetObjectFromStream   = staticmethod(__GetObjectFromStream)
+   __GetObject             = staticmethod(__GetObject)
+   ParsePageCount          = staticmethod(ParsePageCount)
+
+# eof class CPDFPageCount():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,229 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CPackageInventory.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the inventory of the installed Python packages (appendix of the main documentation).
+
+The inventory is computed with ``importlib.metadata`` (instead of ``pip list`` in a separate process) and is cached
+within the build cache folder. The cache entry is valid as long as the fingerprint of the Python environment
+(path of the interpreter and modification times of the site-packages folders) does not change.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, sys, re, json, site, hashlib, threading
+import importlib.metadata
+
+from PythonExtensionsCollection.String.CString import CString
+
+# version of the inventory cache file; a change invalidates the cached inventory
+INVENTORYVERSION = "1"
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CPackageInventory():
+   """
+Inventory of the installed Python packages of the current Python interpreter.
+
+Method to execute: ``GetInstalledPackages()``
+   """
+
+   def __init__(self, sCacheFolder=None):
+      """
+Constructor of class ``CPackageInventory``.
+
+* ``sCacheFolder``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  Path to the cache folder. Without cache folder the inventory is computed every time.
+      """
+
+      self.__sCacheFile = None
+      if sCacheFolder is not None:
+         self.__sCacheFile = CString.NormalizePath(f"{sCacheFolder}/python_modules_installed.json")
+
+   # eof def __init__(self, sCacheFolder=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetSitePackagesFolders():
+      """Returns the list of all existing site-packages folders of the current Python interpreter.
+      """
+      listFolders = []
+      try:
+         listFolders.extend(site.getsitepackages())
+      except AttributeError:
+         pass # (not available in some virtual environments)
+      try:
+         listFolders.append(site.getusersitepackages())
+      except AttributeError:
+         pass
+      # folders added to the path e.g. by a virtual environment
+      listFolders.extend([sPath for sPath in sys.path if os.path.basename(sPath) in ("site-packages", "dist-packages")])
+      listSitePackagesFolders = []
+      for sFolder in listFolders:
+         sFolder = CString.NormalizePath(sFolder)
+         if ( (os.path.isdir(sFolder) is True) and (sFolder not in listSitePackagesFolders) ):
+            listSitePackagesFolders.append(sFolder)
+      return listSitePackagesFolders
+
+   # eof def GetSitePackagesFolders():
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetEnvironmentFingerprint():
+      """Returns the fingerprint of the Python environment: path of the interpreter and modification times of the
+site-packages folders (installing, upgrading or removing a package changes the modification time of its site-packages folder).
+      """
+      oHash = hashlib.sha256()
+      oHash.update(f"inventory version: {INVENTORYVERSION}\n".encode("utf-8"))
+      oHash.update(f"interpreter: {CString.NormalizePath(sys.executable)}\n".encode("utf-8"))
+      for sFolder in CPackageInventory.GetSitePackagesFolders():
+         oHash.update(f"{sFolder}: {os.stat(sFolder).st_mtime_ns}\n".encode("utf-8"))
+      return oHash.hexdigest()
+
+   # eof def GetEnvironmentFingerprint():
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def ComputeInstalledPackages():
+      """Returns the list of all installed Python packages (list of tuples containing the name and the version of the package,
+sorted by name like ``pip list``). In case of a package is installed more than once, the first one in the path is taken (like ``import``).
+      """
+      listofTuplesPackages = []
+      setNormalizedNames = set()
+      for oDistribution in importlib.metadata.distributions():
+         sName = oDistribution.metadata['Name']
+         if sName is None:
+            continue # broken metadata
+         sNormalizedName = re.sub(r"[-_.]+", "-", sName).lower()
+         if sNormalizedName in setNormalizedNames:
+            continue
+         setNormalizedNames.add(sNormalizedName)
+         listofTuplesPackages.append((sName, oDistribution.version))
+      listofTuplesPackages.sort(key=lambda tuplePackage: re.sub(r"[-_.]+", "-", tuplePackage[0]).lower())
+      return listofTuplesPackages
+
+   # eof def ComputeInstalledPackages():
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetInstalledPackages(self):
+      """
+Returns the list of all installed Python packages, taken from the cache in case of the Python environment did not change.
+
+**Returns:**
+
+* ``listofTuplesPackages``
+
+  / *Type*: list /
+
+  List of tuples containing the name and the version of the package.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CPackageInventory.GetInstalledPackages"
+
+      listofTuplesPackages = None
+
+      try:
+         sFingerprint = CPackageInventory.GetEnvironmentFingerprint()
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return listofTuplesPackages, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      # -- cached inventory (an unreadable cache file is handled like a missing cache file)
+      if ( (self.__sCacheFile is not None) and (os.path.isfile(self.__sCacheFile) is True) ):
+         try:
+            with open(self.__sCacheFile, encoding="utf-8") as hCacheFile:
+               dictCache = json.load(hCacheFile)
+            if dictCache['FINGERPRINT'] == sFingerprint:
+               listofTuplesPackages = [tuple(listPackage) for listPackage in dictCache['PACKAGES']]
+               bSuccess = True
+               sResult  = f"Identified {len(listofTuplesPackages)} packages." # (same text as without cache; the text is part of the appendix)
+               return listofTuplesPackages, bSuccess, sResult
+         except Exception:
+            pass
+
+      try:
+         listofTuplesPackages = CPackageInventory.ComputeInstalledPackages()
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return None, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      # -- update the cache (a problem with the cache is not an error of the inventory)
+      if self.__sCacheFile is not None:
+         try:
+            sCacheFolder = os.path.dirname(self.__sCacheFile)
+            if os.path.isdir(sCacheFolder) is False:
+               os.makedirs(sCacheFolder)
+            sTempFile = f"{self.__sCacheFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+            with open(sTempFile, "w", encoding="utf-8") as hCacheFile:
+               json.dump({'FINGERPRINT' : sFingerprint, 'PACKAGES' : listofTuplesPackages}, hCacheFile, indent=3)
+            os.replace(sTempFile, self.__sCacheFile)
+         except Exception:
+            pass
+
+      bSuccess = True
+      sResult  = f"Identified {len(listofTuplesPackages)} packages."
+      return listofTuplesPackages, bSuccess, sResult
+
+   # eof def GetInstalledPackages(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   # - make the methods static
+
+   GetSitePackagesFolders    = staticmethod(GetSitePackagesFolders)
+   GetEnvironmentFingerprint = staticmethod(GetEnvironmentFingerprint)
+   ComputeInstalledPackages  = staticmethod(ComputeInstalledPackages)
+
+# eof class CPackageInventory():
+
+# --------------------------------------------------------------------------------------------------------------
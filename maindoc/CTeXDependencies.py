@@ -0,0 +1,411 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CTeXDependencies.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the static dependency scanner of the book sources.
+
+Starting with the main tex file (``MAINTEXFILENAME``) the scanner follows ``\\input``, ``\\include`` and ``\\usepackage``
+of local style files (e.g. ``\\usepackage{styles/common}``) and collects the files referenced by ``\\includegraphics``
+and ``\\includepdf``. Like the LaTeX compiler, all paths are resolved relative to the book sources folder; graphics that are not
+found there, are searched within the folders declared by ``\\graphicspath``.
+
+The references found in every file are cached (``tex_dependencies.json`` within the cache folder) and are parsed again
+only in case of the modification time or the size of the file changed.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, re, json, threading
+
+from PythonExtensionsCollection.String.CString import CString
+
+# version of the cache file layout; a change invalidates the cache
+TEXDEPENDENCIESVERSION = "2"
+
+# reference to another file: command, optional star, optional arguments, file name
+TEXREFERENCE = re.compile(r"\\(input|include|includegraphics|includepdf|usepackage)\*?\s*(?:\[[^\]]*\])?\s*\{([^{}]*)\}")
+
+# search path of graphics: \graphicspath{{folder 1/}{folder 2/}...}
+TEXGRAPHICSPATH = re.compile(r"\\graphicspath\s*\{((?:\s*\{[^{}]*\})+)\s*\}")
+TEXGRAPHICSPATHENTRY = re.compile(r"\{([^{}]*)\}")
+
+# comment (up to the end of the line; '\%' is no comment)
+TEXCOMMENT = re.compile(r"(?<!\\)%.*")
+
+# extensions tried by pdflatex for graphics without extension (in this order)
+GRAPHICS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".eps")
+
+# commands referring to files, that contain further references
+NESTED_COMMANDS = ("input", "include", "usepackage")
+
+# commands referring to graphics (searched also within the folders of \graphicspath; pdfpages uses \includegraphics)
+GRAPHICS_COMMANDS = ("includegraphics", "includepdf")
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CTeXDependencies():
+   """
+Dependency graph of the book sources (all paths are normalized absolute paths).
+
+Methods to execute: ``Scan()``, then ``GetFiles()``, ``GetDependencies()``, ``GetDependents()``, ``GetReferences()``, ``GetMissingFiles()``
+   """
+
+   def __init__(self, dictMainDocConfig=None):
+      """
+Constructor of class ``CTeXDependencies``.
+
+* ``dictMainDocConfig``
+
+  / *Condition*: required / *Type*: dict /
+
+  Main documentation configuration (the dictionary returned by ``CMainDocConfig.GetConfig()``).
+      """
+
+      sMethod = "CTeXDependencies.__init__"
+
+      if dictMainDocConfig is None:
+         bSuccess = None
+         sResult  = "dictMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sBookSourcesFolder = dictMainDocConfig['BOOKSOURCES']
+      self.__sOutputFolder      = dictMainDocConfig.get('OUTPUTFOLDER', self.__sBookSourcesFolder)
+      self.__sMainTexFile = CString.NormalizePath(f"{self.__sBookSourcesFolder}/{dictMainDocConfig['MAINTEXFILENAME']}")
+      self.__sCacheFile = None
+      if dictMainDocConfig.get('CACHEFOLDER') is not None:
+         # (the variants of a variant build are scanned concurrently; each variant has its own cache file)
+         sCacheFileName = "tex_dependencies.json"
+         if dictMainDocConfig.get('VARIANT') is not None:
+            sCacheFileName = f"tex_dependencies_{dictMainDocConfig['VARIANT']}.json"
+         self.__sCacheFile = CString.NormalizePath(f"{dictMainDocConfig['CACHEFOLDER']}/{sCacheFileName}")
+
+      self.__dictCache        = {} # file -> {'MTIME', 'SIZE', 'REFERENCES'} (as read from the cache file)
+      self.__dictParsedFiles  = {} # file -> {'MTIME', 'SIZE', 'REFERENCES'} (of this scan)
+      self.__dictDependencies = {} # file -> list of referenced files
+      self.__dictDependents   = {} # file -> list of files referring to this file
+      self.__listReferences   = [] # resolved references (in the order of the scan)
+      self.__listMissingFiles = []
+
+   # eof def __init__(self, dictMainDocConfig=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __LoadCache(self):
+      """Reads the references of all files of the previous scan from the cache file.
+      """
+      self.__dictCache = {}
+      if ( (self.__sCacheFile is None) or (os.path.isfile(self.__sCacheFile) is False) ):
+         return
+      try:
+         with open(self.__sCacheFile, encoding="utf-8") as hCacheFile:
+            dictCacheFile = json.load(hCacheFile)
+         if dictCacheFile['VERSION'] == TEXDEPENDENCIESVERSION:
+            self.__dictCache = dictCacheFile['FILES']
+      except Exception:
+         pass # (the files are parsed again)
+
+   # eof def __LoadCache(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __SaveCache(self):
+      """Writes the references of all files of this scan to the cache file (a problem with the cache is not an error).
+      """
+      if ( (self.__sCacheFile is None) or (self.__dictParsedFiles == self.__dictCache) ):
+         return
+      try:
+         sCacheFolder = os.path.dirname(self.__sCacheFile)
+         if os.path.isdir(sCacheFolder) is False:
+            os.makedirs(sCacheFolder)
+         sTempFile = f"{self.__sCacheFile}.{os.getpid()}.{threading.get_native_id()}.tmp"
+         with open(sTempFile, "w", encoding="utf-8") as hCacheFile:
+            json.dump({'VERSION' : TEXDEPENDENCIESVERSION, 'FILES' : self.__dictParsedFiles}, hCacheFile, indent=3)
+         os.replace(sTempFile, self.__sCacheFile)
+      except Exception:
+         pass
+
+   # eof def __SaveCache(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetReferences(self, sFile=None):
+      """Returns the references within a file: list of ``[command, argument, line number]`` (taken from the cache, if the file did not change).
+Every folder declared by ``\\graphicspath`` is returned as reference with command ``graphicspath``.
+      """
+      oStat = os.stat(sFile)
+      dictCacheEntry = self.__dictCache.get(sFile)
+      if ( (dictCacheEntry is None) or (dictCacheEntry['MTIME'] != oStat.st_mtime_ns) or (dictCacheEntry['SIZE'] != oStat.st_size) ):
+         with open(sFile, encoding="utf-8", errors="replace") as hTexFile:
+            listLines = hTexFile.read().splitlines()
+         listReferences = []
+         for nLine, sLine in enumerate(listLines, start=1):
+            sLine = TEXCOMMENT.sub("", sLine)
+            for oMatch in TEXGRAPHICSPATH.finditer(sLine):
+               for sFolder in TEXGRAPHICSPATHENTRY.findall(oMatch.group(1)):
+                  listReferences.append(["graphicspath", sFolder.strip(), nLine])
+            for oMatch in TEXREFERENCE.finditer(sLine):
+               if oMatch.group(1) == "usepackage":
+                  # (a single \usepackage may load several packages)
+                  for sPackage in oMatch.group(2).split(","):
+                     listReferences.append([oMatch.group(1), sPackage.strip(), nLine])
+               else:
+                  listReferences.append([oMatch.group(1), oMatch.group(2).strip(), nLine])
+         dictCacheEntry = {'MTIME' : oStat.st_mtime_ns, 'SIZE' : oStat.st_size, 'REFERENCES' : listReferences}
+      self.__dictParsedFiles[sFile] = dictCacheEntry
+      return dictCacheEntry['REFERENCES']
+
+   # eof def __GetReferences(self, sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetCandidates(self, sCommand=None, sArgument=None):
+      """Returns the paths the LaTeX compiler tries for a reference (in this order), or ``None`` in case of the reference
+is not resolved by the scanner (packages of the TeX distribution, arguments containing macros).
+      """
+      if ( (sArgument == "") or ("\\" in sArgument) or ("#" in sArgument) ):
+         return None
+      sPath = CString.NormalizePath(sPath=sArgument, sReferencePathAbs=self.__sBookSourcesFolder)
+      # in case of a variant build the LaTeX compiler tries the output folder first (-output-directory; tex files only)
+      sOutputPath = None
+      if self.__sOutputFolder != self.__sBookSourcesFolder:
+         sOutputPath = CString.NormalizePath(sPath=sArgument, sReferencePathAbs=self.__sOutputFolder)
+      if sCommand == "input":
+         if sOutputPath is not None:
+            return [f"{sOutputPath}.tex", sOutputPath, f"{sPath}.tex", sPath]
+         return [f"{sPath}.tex", sPath]
+      if sCommand == "include":
+         if sOutputPath is not None:
+            return [f"{sOutputPath}.tex", f"{sPath}.tex"]
+         return [f"{sPath}.tex"]
+      if sCommand == "includegraphics":
+         if os.path.splitext(sPath)[1].lower() in GRAPHICS_EXTENSIONS:
+            return [sPath]
+         return [f"{sPath}{sExtension}" for sExtension in GRAPHICS_EXTENSIONS]
+      if sCommand == "includepdf":
+         if sPath.lower().endswith(".pdf"):
+            return [sPath]
+         return [f"{sPath}.pdf", sPath]
+      # \usepackage: only style files within the book sources are dependencies (e.g. 'styles/common')
+      if ( ("/" in sArgument) or (os.path.isfile(f"{sPath}.sty") is True) ):
+         return [f"{sPath}.sty"]
+      return None
+
+   # eof def __GetCandidates(self, sCommand=None, sArgument=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Scan(self, listGeneratedFiles=[]):
+      """
+Scans the main tex file and all files referenced by it (recursively).
+
+* ``listGeneratedFiles``
+
+  / *Condition*: optional / *Type*: list / *Default*: [] /
+
+  Files and folders generated by the build (e.g. the outputs of the build stages). References to these files
+  (and to files within these folders) are dependencies, but they are not reported as missing and are not scanned.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not (missing files are no error; see ``GetMissingFiles()``).
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CTeXDependencies.Scan"
+
+      setGeneratedFiles = set(listGeneratedFiles)
+      listGeneratedFolders = [f"{sGeneratedFile}/" for sGeneratedFile in listGeneratedFiles]
+
+      self.__LoadCache()
+      self.__dictParsedFiles  = {}
+      self.__dictDependencies = {}
+      self.__dictDependents   = {}
+      self.__listReferences   = []
+      self.__listMissingFiles = []
+
+      if os.path.isfile(self.__sMainTexFile) is False:
+         bSuccess = False
+         sResult  = f"The main tex file '{self.__sMainTexFile}' does not exist"
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      def Resolve(listCandidates=[]):
+         # returns the first candidate, that exists or is generated by the build, and if it is generated
+         for sCandidate in listCandidates:
+            if ( (sCandidate in setGeneratedFiles) or (sCandidate.startswith(tuple(listGeneratedFolders))) ):
+               return sCandidate, True
+            if os.path.isfile(sCandidate) is True:
+               return sCandidate, False
+         return None, False
+
+      def AddDependency(sFile, sCommand, sArgument, nLine, sDependency):
+         self.__listReferences.append({'FILE' : sFile, 'LINE' : nLine, 'COMMAND' : sCommand, 'ARGUMENT' : sArgument,
+                                       'DEPENDENCY' : sDependency})
+         if sDependency not in self.__dictDependencies[sFile]:
+            self.__dictDependencies[sFile].append(sDependency)
+            self.__dictDependents.setdefault(sDependency, []).append(sFile)
+         if sDependency not in self.__dictDependencies:
+            self.__dictDependencies[sDependency] = []
+            return True
+         return False
+
+      listPending = [self.__sMainTexFile]
+      self.__dictDependencies[self.__sMainTexFile] = []
+      listGraphicsPath = []  # folders declared by \graphicspath (in the order of the scan)
+      listUnresolvedGraphics = []
+      try:
+         while len(listPending) > 0:
+            sFile = listPending.pop(0)
+            for sCommand, sArgument, nLine in self.__GetReferences(sFile):
+               if sCommand == "graphicspath":
+                  listGraphicsPath.append(sArgument)
+                  continue
+               listCandidates = self.__GetCandidates(sCommand, sArgument)
+               if listCandidates is None:
+                  continue
+               sDependency, bGenerated = Resolve(listCandidates)
+               if sDependency is None:
+                  if sCommand in GRAPHICS_COMMANDS:
+                     # (resolved after the scan, when all \graphicspath declarations are known)
+                     listUnresolvedGraphics.append((sFile, sCommand, sArgument, nLine))
+                  else:
+                     self.__listMissingFiles.append({'FILE' : sFile, 'LINE' : nLine, 'COMMAND' : sCommand, 'ARGUMENT' : sArgument})
+                  continue
+               if ( (AddDependency(sFile, sCommand, sArgument, nLine, sDependency) is True) and (sCommand in NESTED_COMMANDS) and (bGenerated is False) ):
+                  listPending.append(sDependency)
+
+         # -- graphics not found relative to the book sources folder are searched within the folders of \graphicspath
+         for sFile, sCommand, sArgument, nLine in listUnresolvedGraphics:
+            sDependency = None
+            for sFolder in listGraphicsPath:
+               listCandidates = self.__GetCandidates(sCommand, f"{sFolder}{sArgument}")
+               if listCandidates is not None:
+                  sDependency, bGenerated = Resolve(listCandidates)
+                  if sDependency is not None:
+                     break
+            if sDependency is None:
+               self.__listMissingFiles.append({'FILE' : sFile, 'LINE' : nLine, 'COMMAND' : sCommand, 'ARGUMENT' : sArgument})
+               continue
+            AddDependency(sFile, sCommand, sArgument, nLine, sDependency)
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      self.__SaveCache()
+
+      bSuccess = True
+      sResult  = f"Dependencies of '{os.path.basename(self.__sMainTexFile)}': {len(self.__dictDependencies)} files, {len(self.__listMissingFiles)} missing"
+      return bSuccess, sResult
+
+   # eof def Scan(self, listGeneratedFiles=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetFiles(self):
+      """Returns the sorted list of all files of the documentation (the main tex file and all files it depends on).
+      """
+      return sorted(self.__dictDependencies)
+
+   # eof def GetFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetDependencies(self, sFile=None):
+      """Returns the list of files directly referenced by ``sFile`` (empty list for files that are not part of the documentation).
+      """
+      return list(self.__dictDependencies.get(CString.NormalizePath(sFile), []))
+
+   # eof def GetDependencies(self, sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetDependents(self, sFile=None):
+      """Returns the list of files directly referring to ``sFile``.
+      """
+      return list(self.__dictDependents.get(CString.NormalizePath(sFile), []))
+
+   # eof def GetDependents(self, sFile=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetReferences(self, sCommand=None):
+      """Returns the resolved references (optionally only the ones of command ``sCommand``, e.g. ``includegraphics``): list of
+dictionaries with the keys ``FILE`` (the referring file), ``LINE``, ``COMMAND``, ``ARGUMENT`` and ``DEPENDENCY`` (the referenced file).
+      """
+      return [dictReference for dictReference in self.__listReferences if ( (sCommand is None) or (dictReference['COMMAND'] == sCommand) )]
+
+   # eof def GetReferences(self, sCommand=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetMissingFiles(self):
+      """Returns the references to files that do not exist: list of dictionaries with the keys ``FILE`` (the referring file),
+``LINE``, ``COMMAND`` and ``ARGUMENT``.
+      """
+      return list(self.__listMissingFiles)
+
+   # eof def GetMissingFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def FormatMissingFiles(self):
+      """Returns the references to missing files as text (one line per reference: ``file:line: \\command{argument}``).
+      """
+      listLines = []
+      for dictMissingFile in self.__listMissingFiles:
+         sFile = os.path.relpath(dictMissingFile['FILE'], self.__sBookSourcesFolder).replace("\\", "/")
+         listLines.append(f"{sFile}:{dictMissingFile['LINE']}: \\{dictMissingFile['COMMAND']}{{{dictMissingFile['ARGUMENT']}}}")
+      return "\n".join(listLines)
+
+   # eof def FormatMissingFiles(self):
+
+# eof class CTeXDependencies():
+
+# --------------------------------------------------------------------------------------------------------------
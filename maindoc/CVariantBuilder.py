@@ -0,0 +1,394 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CVariantBuilder.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the build of several variants of the main documentation within a single invocation
+(command line: ``--configfile`` given several times).
+
+All variants share the book sources and the external doc folder:
+
+* The documentation of the repositories is rendered once (union of the ``IMPORTS`` of all variants); every variant
+  takes over the rendered documentation of its own repositories.
+* The variants are compiled in parallel, each into its own output folder ``variants/<name of configuration file>``
+  (LaTeX compiler option ``-output-directory``; all files generated for a variant are located within this folder).
+* Only the first variant (the primary one) is copied to the package folder.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time
+import concurrent.futures
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+from PythonExtensionsCollection.Folder.CFolder import CFolder
+
+from maindoc.CDocBuilder import CDocBuilder
+from maindoc.CExternalDocRenderer import CExternalDocRenderer, ARTIFACTSTORE_HIT
+from maindoc.CArtifactStore import CArtifactStore, KIND_EXTERNALDOCS
+from maindoc.CBuildTrace import CBuildTrace
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CVariantBuilder():
+   """
+Builds several variants of the main documentation (see module description).
+
+Method to execute: ``Build()``
+   """
+
+   def __init__(self, listMainDocConfigs=None, oBuildTrace=None):
+      """
+Constructor of class ``CVariantBuilder``.
+
+* ``listMainDocConfigs``
+
+  / *Condition*: required / *Type*: list /
+
+  List of main documentation configurations (``CMainDocConfig()``), one per variant. The first one is the primary variant.
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace() / *Default*: None /
+
+  Build trace; every build phase is recorded as span (command line ``--trace``).
+      """
+
+      sMethod = "CVariantBuilder.__init__"
+
+      if ( (listMainDocConfigs is None) or (len(listMainDocConfigs) == 0) ):
+         bSuccess = None
+         sResult  = "listMainDocConfigs is None or empty"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__listMainDocConfigs = listMainDocConfigs
+
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+
+      self.__oArtifactStore = None # command line '--cache-dir'
+
+   # eof def __init__(self, listMainDocConfigs=None, oBuildTrace=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __CheckVariants(self):
+      """Checks the preconditions of a variant build: all variants share the same book sources, and the names of the variants are unique.
+      """
+
+      sMethod = "CVariantBuilder.__CheckVariants"
+
+      dictFirstConfig = self.__listMainDocConfigs[0].GetConfig()
+      listVariants = []
+      for oMainDocConfig in self.__listMainDocConfigs:
+         dictMainDocConfig = oMainDocConfig.GetConfig()
+         if dictMainDocConfig['BOOKSOURCES'] != dictFirstConfig['BOOKSOURCES']:
+            bSuccess = False
+            sResult  = f"All variants have to share the same book sources ('{dictFirstConfig['BOOKSOURCES']}'), but the configuration " \
+                       + f"'{dictMainDocConfig['MAINDOC_CONFIGFILE']}' refers to '{dictMainDocConfig['BOOKSOURCES']}'"
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         if dictMainDocConfig['VARIANT'] in listVariants:
+            bSuccess = False
+            sResult  = f"The name of the variant '{dictMainDocConfig['VARIANT']}' is not unique (the names of the configuration files have to differ)"
+            return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         listVariants.append(dictMainDocConfig['VARIANT'])
+
+      bSuccess = True
+      sResult  = f"Variants: {', '.join(listVariants)}"
+      return bSuccess, sResult
+
+   # eof def __CheckVariants(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetRepositoryUnion(self):
+      """Returns the repositories imported by at least one variant (in the order of their first occurrence),
+and the configuration of the first variant rendering repositories (``None`` in case of no variant updates the external documentation).
+      """
+      listRepositories = []
+      dictRenderConfig = None
+      for oMainDocConfig in self.__listMainDocConfigs:
+         dictMainDocConfig = oMainDocConfig.GetConfig()
+         if dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC'] is not True:
+            continue
+         if dictRenderConfig is None:
+            dictRenderConfig = dictMainDocConfig
+         for sRepository in dictMainDocConfig['IMPORTS']:
+            if sRepository not in listRepositories:
+               listRepositories.append(sRepository)
+      return listRepositories, dictRenderConfig
+
+   # eof def __GetRepositoryUnion(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrepareExternalDocFolder(self, sExternalDocFolder=None, listRepositories=[]):
+      """Creates the shared external doc folder and removes the subfolders of repositories that are not imported by any variant.
+      """
+
+      sMethod = "CVariantBuilder.__PrepareExternalDocFolder"
+
+      oExternalDocFolder = CFolder(sExternalDocFolder)
+      bSuccess, sResult = oExternalDocFolder.Create(bOverwrite=False)
+      del oExternalDocFolder
+      if bSuccess is not True:
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      listRepositoryNames = [os.path.basename(sRepository) for sRepository in listRepositories]
+      listRepositoryNames.append("graphics") # (optimized images of a build without variants, see CImageOptimizer)
+      for sEntryName in os.listdir(sExternalDocFolder):
+         sEntry = f"{sExternalDocFolder}/{sEntryName}"
+         if ( (os.path.isdir(sEntry) is True) and (sEntryName not in listRepositoryNames) ):
+            oStaleFolder = CFolder(sEntry)
+            bSuccess, sResult = oStaleFolder.Delete(bConfirmDelete=False)
+            del oStaleFolder
+            if bSuccess is not True:
+               return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"External doc folder prepared: '{sExternalDocFolder}'"
+      return bSuccess, sResult
+
+   # eof def __PrepareExternalDocFolder(self, sExternalDocFolder=None, listRepositories=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __RenderRepositories(self, dictRenderConfig=None, listRepositories=[]):
+      """Renders the documentation of all repositories imported by at least one variant (once for all variants).
+      """
+
+      sMethod = "CVariantBuilder.__RenderRepositories"
+
+      # (the renderer reads the repositories and the external doc folder out of the configuration)
+      dictRenderConfig = dict(dictRenderConfig)
+      dictRenderConfig['IMPORTS'] = listRepositories
+      dictRenderConfig['EXTERNALDOCFOLDER'] = f"{dictRenderConfig['BOOKSOURCES']}/externaldocs"
+
+      oExternalDocRenderer = CExternalDocRenderer(dictRenderConfig, self.__oBuildTrace)
+      with self.__oBuildTrace.Span("render repositories (all variants)", "repository", {'repositories' : len(listRepositories)}):
+         listResults, bSuccess, sResult = oExternalDocRenderer.Render(listRepositories)
+      del oExternalDocRenderer
+      # (the artifact store has been accessed by the worker processes; they report hits and misses within their results)
+      if self.__oArtifactStore is not None:
+         for dictResult in listResults:
+            if dictResult.get('ARTIFACTSTORE') is not None:
+               self.__oArtifactStore.CountAccess(KIND_EXTERNALDOCS, dictResult['ARTIFACTSTORE'] == ARTIFACTSTORE_HIT)
+      if bSuccess is not True:
+         return listResults, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      return listResults, bSuccess, sResult
+
+   # eof def __RenderRepositories(self, dictRenderConfig=None, listRepositories=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __BuildVariant(self, oMainDocConfig=None, listRenderResults=None, bPrimary=False):
+      """Builds a single variant (within a thread of the variant build). Returns ``(bPDFIsComplete, bSuccess, sResult, fDuration)``.
+      """
+      sVariant = oMainDocConfig.Get('VARIANT')
+      fStartTime = time.time()
+      try:
+         oDocBuilder = CDocBuilder(oMainDocConfig, self.__oBuildTrace, listRenderResults, self.__oArtifactStore, bPrimary)
+         with self.__oBuildTrace.Span(f"variant {sVariant}", "genmaindoc", {'primary' : bPrimary}):
+            bPDFIsComplete, bSuccess, sResult = oDocBuilder.Build()
+         del oDocBuilder
+      except Exception as ex:
+         bPDFIsComplete = False
+         bSuccess = None
+         sResult  = str(ex)
+      return bPDFIsComplete, bSuccess, sResult, time.time() - fStartTime
+
+   # eof def __BuildVariant(self, oMainDocConfig=None, listRenderResults=None, bPrimary=False):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __CloseArtifactStore(self):
+      """Applies the size limit to the artifact store (command line ``--cache-dir``) and prints the hits and misses of all variants.
+      """
+      if self.__oArtifactStore is None:
+         return
+      dictFirstConfig = self.__listMainDocConfigs[0].GetConfig()
+      sStoreFolder = self.__oArtifactStore.GetStoreFolder()
+      try:
+         with self.__oBuildTrace.Span("artifact store eviction", "cache"):
+            nSize, nEvicted = self.__oArtifactStore.Evict()
+         sSize = f"{nSize / 1048576:.1f} MB of {dictFirstConfig['CACHEMAXSIZE']} MB, {nEvicted} entries evicted"
+      except Exception as ex:
+         # a problem with the artifact store is not an error of the documentation build
+         sSize = f"size limit not applied: {ex}"
+      print(COLBY + f"Artifact store '{sStoreFolder}' ({sSize}):")
+      print(COLBY + f"{self.__oArtifactStore.GetStatistics()}")
+      print()
+      self.__oArtifactStore = None
+
+   # eof def __CloseArtifactStore(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Build(self):
+      """
+Builds all variants of the main documentation. In case of a dry run (command line ``--dry-run``) the plans of all variants are printed only.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+* ``bPDFIsComplete``
+
+  / *Type*: bool /
+
+  Indicates if the PDF files of all variants are complete or not.
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not (for all variants).
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CVariantBuilder.Build"
+
+      bSuccess, sResult = self.__CheckVariants()
+      if bSuccess is not True:
+         return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      print(COLBY + sResult)
+      print()
+
+      dictFirstConfig = self.__listMainDocConfigs[0].GetConfig()
+      sBookSourcesFolder = dictFirstConfig['BOOKSOURCES']
+      if not os.path.isdir(sBookSourcesFolder):
+         bSuccess = False
+         sResult  = f"The input folder '{sBookSourcesFolder}' does not exist."
+         return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      sExternalDocFolder = f"{sBookSourcesFolder}/externaldocs"
+
+      listRepositories, dictRenderConfig = self.__GetRepositoryUnion()
+      nNrOfImports = sum([len(oMainDocConfig.Get('IMPORTS')) for oMainDocConfig in self.__listMainDocConfigs
+                          if oMainDocConfig.Get('CONTROL')['UPDATE_EXTERNAL_DOC'] is True])
+      print(COLBY + f"Repositories imported by the variants: {len(listRepositories)} (rendered once instead of {nNrOfImports} times)")
+      print()
+
+      # -- dry run: the plans of all variants (the repositories are rendered once, before any variant is built)
+      if dictFirstConfig['DRYRUN'] is True:
+         listResults = []
+         for oMainDocConfig in self.__listMainDocConfigs:
+            print(COLBY + f"Variant '{oMainDocConfig.Get('VARIANT')}' (output folder '{oMainDocConfig.Get('OUTPUTFOLDER')}'):")
+            print()
+            bPDFIsComplete, bSuccess, sResult, fDuration = self.__BuildVariant(oMainDocConfig, [], oMainDocConfig is self.__listMainDocConfigs[0])
+            if bSuccess is not True:
+               return bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         bSuccess = True
+         sResult  = "Dry run: build plans of all variants printed, no stage executed"
+         return True, bSuccess, sResult
+
+      # -- artifact store shared by all variants (e.g. CI runs on fresh checkouts)
+      if dictFirstConfig['CACHEDIR'] is not None:
+         self.__oArtifactStore = CArtifactStore(dictFirstConfig['CACHEDIR'], dictFirstConfig['CACHEMAXSIZE'])
+
+      # -- the external doc folder and the documentation of the repositories are shared by all variants
+      bSuccess, sResult = self.__PrepareExternalDocFolder(sExternalDocFolder, listRepositories)
+      if bSuccess is not True:
+         self.__CloseArtifactStore()
+         return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+      listRenderResults = []
+      if dictRenderConfig is not None:
+         listRenderResults, bSuccess, sResult = self.__RenderRepositories(dictRenderConfig, listRepositories)
+         if bSuccess is not True:
+            self.__CloseArtifactStore()
+            return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         print(COLBY + sResult)
+         print()
+
+      # -- the variants are built in parallel (the LaTeX compiler is a single threaded process)
+      listVariantResults = [None] * len(self.__listMainDocConfigs)
+      with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.__listMainDocConfigs)) as oExecutor:
+         dictFutures = {}
+         for nIndex, oMainDocConfig in enumerate(self.__listMainDocConfigs):
+            oFuture = oExecutor.submit(self.__BuildVariant, oMainDocConfig, listRenderResults, nIndex == 0)
+            dictFutures[oFuture] = nIndex
+         for oFuture in concurrent.futures.as_completed(dictFutures):
+            listVariantResults[dictFutures[oFuture]] = oFuture.result()
+
+      self.__CloseArtifactStore()
+
+      # -- summary
+      bPDFIsComplete = True
+      bSuccess = True
+      listErrors = []
+      print(COLBY + f"Variants of the main documentation ({len(self.__listMainDocConfigs)}):")
+      for oMainDocConfig, (bVariantPDFIsComplete, bVariantSuccess, sVariantResult, fDuration) in zip(self.__listMainDocConfigs, listVariantResults):
+         sVariant = oMainDocConfig.Get('VARIANT')
+         if bVariantSuccess is True:
+            sStatus = "complete" if bVariantPDFIsComplete is True else "incomplete"
+            print(COLBY + f"* {sVariant} : {sStatus} ({fDuration:.1f} s) : {oMainDocConfig.Get('OUTPUTFOLDER')}/{oMainDocConfig.Get('JOBNAME')}.pdf")
+         else:
+            print(COLBR + f"* {sVariant} : failed ({fDuration:.1f} s)")
+            listErrors.append(f"Variant '{sVariant}':\n{sVariantResult}")
+            if ( (bSuccess is True) or (bVariantSuccess is None) ):
+               bSuccess = bVariantSuccess
+         if bVariantPDFIsComplete is not True:
+            bPDFIsComplete = False
+      print()
+
+      if bSuccess is not True:
+         sResult = "\n".join(listErrors)
+         return bPDFIsComplete, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      if bPDFIsComplete is True:
+         sResult = f"Main documentation generated ({len(self.__listMainDocConfigs)} variants)"
+      else:
+         sResult = f"Main documentation generated ({len(self.__listMainDocConfigs)} variants) - but at least one PDF file is incomplete"
+      return bPDFIsComplete, bSuccess, sResult
+
+   # eof def Build(self):
+
+# eof class CVariantBuilder():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,444 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CWatchBuilder.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing the watch mode of GenMainDoc (command line ``--watch``).
+
+After an initial build the sources are polled for changes. Changes are debounced (a rebuild starts not before
+the sources are stable for ``WATCH_DEBOUNCE`` seconds), and only the affected stages are executed again:
+
+* Only book sources or styles changed: the LaTeX compiler is called (the external documentations are not touched).
+  Changes of files that are not referenced by the main tex file (see ``CTeXDependencies``) do not start a rebuild.
+* A repository listed in ``IMPORTS`` changed: a complete build is started; the documentation of all unchanged
+  repositories is restored from the build cache, therefore only the changed repository is rendered again.
+
+A poll reads the modification times of the watched files and of the folders containing them only. The list of watched
+files (book sources and styles; source files of the repositories, see ``CBuildCache.ListRepositoryFiles()``) is computed
+again only in case of one of these folders changed (a file has been added, removed or renamed).
+
+The watch mode supports a single maindoc configuration only (no variants).
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, time
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CBuildCache import CBuildCache
+from maindoc.CBuildTrace import CBuildTrace
+from maindoc.CTeXDependencies import CTeXDependencies
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+# polling interval (seconds)
+WATCH_POLL_INTERVAL = 1.0
+
+# a rebuild starts not before the sources did not change for this time (seconds)
+WATCH_DEBOUNCE = 1.0
+
+# extensions of the book sources and styles that are watched (all other files within these folders are outputs of the build)
+WATCHED_BOOK_EXTENSIONS = (".tex", ".sty", ".cls", ".bib", ".png", ".jpg", ".jpeg", ".pdf", ".eps", ".svg")
+
+# build stages
+STAGE_LATEX = "latex"
+STAGE_FULL  = "full"
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CWatchBuilder():
+   """
+Builds the main documentation again and again, whenever the sources change.
+
+Method to execute: ``Run()`` (terminated with Ctrl+C)
+   """
+
+   def __init__(self, oMainDocConfig=None, oBuildTrace=None):
+      """
+Constructor of class ``CWatchBuilder``.
+
+* ``oMainDocConfig``
+
+  / *Condition*: required / *Type*: CMainDocConfig() /
+
+  Main documentation configuration containing static and dynamic configuration values.
+
+* ``oBuildTrace``
+
+  / *Condition*: optional / *Type*: CBuildTrace() / *Default*: None /
+
+  Build trace of the initial build.
+      """
+
+      sMethod = "CWatchBuilder.__init__"
+
+      if oMainDocConfig is None:
+         bSuccess = None
+         sResult  = "oMainDocConfig is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__oMainDocConfig    = oMainDocConfig
+      self.__dictMainDocConfig = oMainDocConfig.GetConfig()
+      if len(self.__dictMainDocConfig['MAINDOC_CONFIGFILES']) > 1:
+         bSuccess = None
+         sResult  = "The watch mode supports a single maindoc configuration only"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+      if oBuildTrace is None:
+         oBuildTrace = CBuildTrace()
+      self.__oBuildTrace = oBuildTrace
+      self.__setBookDependencies = set() # files referenced by the main tex file (result of the previous scan)
+      self.__dictWatchLists = {} # key -> (list of watched files, dictionary: folder -> mtime)
+
+   # eof def __init__(self, oMainDocConfig=None, oBuildTrace=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetFolderStates(self, listFolders=[]):
+      """Returns the modification times of folders (dictionary: folder -> mtime; the mtime of a folder changes in case of
+a file within this folder is added, removed or renamed).
+      """
+      dictFolderStates = {}
+      for sFolder in listFolders:
+         try:
+            dictFolderStates[sFolder] = os.stat(sFolder).st_mtime_ns
+         except OSError:
+            continue # deleted in the meantime
+      return dictFolderStates
+
+   # eof def __GetFolderStates(self, listFolders=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetWatchedFiles(self, sKey=None, listRootFolders=[], ListFiles=None):
+      """Returns the list of watched files of ``sKey`` (``ListFiles()`` is called only in case of a folder containing watched files
+changed since the previous call).
+      """
+      if sKey in self.__dictWatchLists:
+         listFiles, dictFolderStates = self.__dictWatchLists[sKey]
+         if self.__GetFolderStates(dictFolderStates) == dictFolderStates:
+            return listFiles
+      listFiles = ListFiles()
+      # (the root folders and all folders between the root folders and the watched files)
+      setFolders = set(listRootFolders)
+      for sFile in listFiles:
+         sFolder = os.path.dirname(sFile)
+         while ( (sFolder not in setFolders) and (os.path.dirname(sFolder) != sFolder) ):
+            setFolders.add(sFolder)
+            sFolder = os.path.dirname(sFolder)
+      self.__dictWatchLists[sKey] = (listFiles, self.__GetFolderStates(sorted(setFolders)))
+      return listFiles
+
+   # eof def __GetWatchedFiles(self, sKey=None, listRootFolders=[], ListFiles=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetFileStates(self, listFiles=[]):
+      """Returns the modification times and sizes of files (dictionary: file -> (mtime, size)).
+      """
+      dictSnapshot = {}
+      for sFile in listFiles:
+         try:
+            oStat = os.stat(sFile)
+         except OSError:
+            continue # deleted in the meantime
+         dictSnapshot[sFile] = (oStat.st_mtime_ns, oStat.st_size)
+      return dictSnapshot
+
+   # eof def __GetFileStates(self, listFiles=[]):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetBookFolders(self):
+      """Returns the folders containing the book sources and styles.
+      """
+      listFolders = [self.__dictMainDocConfig['BOOKSOURCES']]
+      sStylesFolder = CString.NormalizePath(f"{self.__dictMainDocConfig['REFERENCEPATH']}/mainstyles")
+      if os.path.isdir(sStylesFolder) is True:
+         listFolders.append(sStylesFolder)
+      return listFolders
+
+   # eof def __GetBookFolders(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ListBookFiles(self):
+      """Returns the list of all book sources and styles.
+      """
+      sBookSourcesFolder = self.__dictMainDocConfig['BOOKSOURCES']
+      JOBNAME = self.__dictMainDocConfig['JOBNAME']
+      # files written by the build itself into the book sources folder
+      listGeneratedFileNames = [f"{JOBNAME}.pdf", f"{JOBNAME}_includeonly.tex", "BundleVersionDate.tex"]
+      listFiles = []
+      for sFolder in self.__GetBookFolders():
+         for sRootFolder, listSubFolders, listFileNames in os.walk(sFolder):
+            if sRootFolder == sBookSourcesFolder:
+               # the external documentations are outputs of the build (changes of the repositories are watched separately)
+               listSubFolders[:] = [sSubFolder for sSubFolder in listSubFolders if sSubFolder != "externaldocs"]
+            for sFileName in listFileNames:
+               if sFileName.lower().endswith(WATCHED_BOOK_EXTENSIONS) is False:
+                  continue
+               if ( (sRootFolder == sBookSourcesFolder) and (sFileName in listGeneratedFileNames) ):
+                  continue
+               listFiles.append(os.path.join(sRootFolder, sFileName))
+      return listFiles
+
+   # eof def __ListBookFiles(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetBookSnapshot(self):
+      """Returns the modification times and sizes of all book sources and styles (dictionary: file -> (mtime, size)).
+      """
+      return self.__GetFileStates(self.__GetWatchedFiles('BOOK', self.__GetBookFolders(), self.__ListBookFiles))
+
+   # eof def __GetBookSnapshot(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetRepositorySnapshot(self, sRepository=None):
+      """Returns the modification times and sizes of all source files of a repository (dictionary: file -> (mtime, size)).
+      """
+      def ListFiles():
+         return [os.path.join(sRepository, sFile) for sFile in CBuildCache.ListRepositoryFiles(sRepository)]
+      return self.__GetFileStates(self.__GetWatchedFiles(sRepository, [sRepository], ListFiles))
+
+   # eof def __GetRepositorySnapshot(self, sRepository=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetSnapshot(self):
+      """Returns the snapshot of all watched sources (keys: ``BOOK`` and the paths of the repositories).
+      """
+      dictSnapshot = {}
+      dictSnapshot['BOOK'] = self.__GetBookSnapshot()
+      if self.__dictMainDocConfig['CONTROL']['UPDATE_EXTERNAL_DOC'] is True:
+         for sRepository in self.__dictMainDocConfig['IMPORTS']:
+            dictSnapshot[sRepository] = self.__GetRepositorySnapshot(sRepository)
+      return dictSnapshot
+
+   # eof def __GetSnapshot(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __GetBookDependencies(self):
+      """Scans the book sources (see ``CTeXDependencies``). Returns the object containing the dependency graph, or ``None``
+in case of the scan failed.
+      """
+      oTeXDependencies = CTeXDependencies(self.__dictMainDocConfig)
+      bSuccess, sResult = oTeXDependencies.Scan()
+      if bSuccess is not True:
+         return None
+      return oTeXDependencies
+
+   # eof def __GetBookDependencies(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __Build(self, sStage=STAGE_FULL):
+      """Executes the stages of the build affected by the changes. Returns ``(bPDFIsComplete, bSuccess, sResult)``.
+      """
+      sMethod = "CWatchBuilder.__Build"
+
+      if self.__dictMainDocConfig['BUILDDATE'] is None:
+         self.__dictMainDocConfig['NOW'] = time.strftime('%d.%m.%Y - %H:%M:%S')
+      if ( (sStage == STAGE_LATEX) and ('MAINTEXFILE' in self.__dictMainDocConfig) ):
+         if self.__dictMainDocConfig['SIMULATE_ONLY'] is True:
+            return True, True, "Book sources changed; call of LaTeX compiler skipped because of simulation mode"
+         if os.path.isfile(self.__dictMainDocConfig['LATEXINTERPRETER']) is False:
+            bSuccess = False
+            sResult  = f"Missing LaTeX compiler '{self.__dictMainDocConfig['LATEXINTERPRETER']}'"
+            return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         # (a missing file is reported before the LaTeX compiler is started)
+         oTeXDependencies = self.__GetBookDependencies()
+         if ( (oTeXDependencies is not None) and (len(oTeXDependencies.GetMissingFiles()) > 0) ):
+            bSuccess = False
+            sResult  = f"Files referenced by the main tex file not found:\n{oTeXDependencies.FormatMissingFiles()}"
+            return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         # (changed images are optimized again; the variants of unchanged images are taken from the cache)
+         if oTeXDependencies is not None:
+            from maindoc.CImageOptimizer import CImageOptimizer
+            oImageOptimizer = CImageOptimizer(self.__dictMainDocConfig)
+            bSuccess, sResult = oImageOptimizer.Optimize(oTeXDependencies.GetReferences("includegraphics"))
+            del oImageOptimizer
+            if bSuccess is not True:
+               return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         from maindoc.CLaTeXCompiler import CLaTeXCompiler
+         oLaTeXCompiler = CLaTeXCompiler(self.__dictMainDocConfig, self.__oBuildTrace)
+         bSuccess, sResult = oLaTeXCompiler.Compile()
+         del oLaTeXCompiler
+         if bSuccess is not True:
+            return False, bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+         # (the PDF file of a LaTeX-only rebuild is a preview and is not copied to the package folder)
+         bSuccess = True
+         sResult  = f"PDF file updated: {self.__dictMainDocConfig['PDFFILEEXPECTED']}"
+         return False, bSuccess, sResult
+      from maindoc.CDocBuilder import CDocBuilder
+      oDocBuilder = CDocBuilder(self.__oMainDocConfig, self.__oBuildTrace)
+      return oDocBuilder.Build()
+
+   # eof def __Build(self, sStage=STAGE_FULL):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __PrintBuildResult(self, bPDFIsComplete=None, bSuccess=None, sResult=None, fDuration=0.0):
+      """Prints the result of a build (in watch mode a failed build does not terminate the watch).
+      """
+      print()
+      if bSuccess is True:
+         print(COLBG + f"{sResult} ({fDuration:.1f} s)")
+      else:
+         print(COLBR + sResult)
+         print(COLBR + f"Build failed ({fDuration:.1f} s)")
+      print()
+      print(COLBY + "Watching for changes (Ctrl+C to stop) ...")
+      print()
+
+   # eof def __PrintBuildResult(self, bPDFIsComplete=None, bSuccess=None, sResult=None, fDuration=0.0):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Run(self):
+      """
+Executes an initial complete build and afterwards a rebuild of the affected stages after every change of the sources,
+until the watch is stopped with Ctrl+C.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CWatchBuilder.Run"
+
+      nNrOfBuilds = 0
+      try:
+         dictSnapshot = self.__GetSnapshot()
+         fStartTime = time.perf_counter()
+         with self.__oBuildTrace.Span("CDocBuilder.Build"):
+            bPDFIsComplete, bSuccess, sResult = self.__Build(STAGE_FULL)
+         nNrOfBuilds = nNrOfBuilds + 1
+         if self.__oBuildTrace.GetTraceFile() is not None:
+            self.__oBuildTrace.Write()
+         self.__PrintBuildResult(bPDFIsComplete, bSuccess, sResult, time.perf_counter() - fStartTime)
+         bLastBuildFailed = bSuccess is not True
+
+         # later builds restore unchanged repositories from the build cache
+         self.__dictMainDocConfig['IGNORECACHE'] = False
+
+         oTeXDependencies = self.__GetBookDependencies()
+         if oTeXDependencies is not None:
+            self.__setBookDependencies = set(oTeXDependencies.GetFiles())
+
+         while True:
+            time.sleep(WATCH_POLL_INTERVAL)
+            dictNewSnapshot = self.__GetSnapshot()
+            if dictNewSnapshot == dictSnapshot:
+               continue
+
+            # debounce: wait until the sources are stable (e.g. an editor saves several files)
+            while True:
+               time.sleep(WATCH_DEBOUNCE)
+               dictStableSnapshot = self.__GetSnapshot()
+               if dictStableSnapshot == dictNewSnapshot:
+                  break
+               dictNewSnapshot = dictStableSnapshot
+
+            listChangedRepositories = [sKey for sKey in dictNewSnapshot if ( (sKey != 'BOOK') and (dictNewSnapshot[sKey] != dictSnapshot.get(sKey)) )]
+            listChangedBookFiles = sorted(set(dictNewSnapshot['BOOK'].items()) ^ set(dictSnapshot['BOOK'].items()))
+            dictSnapshot = dictNewSnapshot
+
+            # a failed previous build is repeated completely (the LaTeX stage requires the outputs of all previous stages)
+            if ( (len(listChangedRepositories) > 0) or (bLastBuildFailed is True) ):
+               sStage = STAGE_FULL
+               listChanges = [os.path.basename(sRepository) for sRepository in listChangedRepositories]
+               listChanges.extend(sorted(set(os.path.basename(tupleFile[0]) for tupleFile in listChangedBookFiles)))
+            else:
+               sStage = STAGE_LATEX
+               listChanges = sorted(set(os.path.basename(tupleFile[0]) for tupleFile in listChangedBookFiles))
+               # only files referenced by the main tex file (before or after the change) require a rebuild
+               oTeXDependencies = self.__GetBookDependencies()
+               if oTeXDependencies is not None:
+                  setBookDependencies = set(oTeXDependencies.GetFiles())
+                  listReferencedFiles = [tupleFile[0] for tupleFile in listChangedBookFiles
+                                         if CString.NormalizePath(tupleFile[0]) in (setBookDependencies | self.__setBookDependencies)]
+                  self.__setBookDependencies = setBookDependencies
+                  if len(listReferencedFiles) == 0:
+                     print(COLBY + f"Changed: {', '.join(listChanges)} (not referenced by the main tex file) -> no rebuild")
+                     print()
+                     continue
+
+            print(COLBY + f"Changed: {', '.join(listChanges)} -> rebuild ({sStage})")
+            print()
+            fStartTime = time.perf_counter()
+            try:
+               bPDFIsComplete, bSuccess, sResult = self.__Build(sStage)
+            except Exception as ex:
+               bPDFIsComplete, bSuccess, sResult = False, None, CString.FormatResult(sMethod, None, str(ex))
+            nNrOfBuilds = nNrOfBuilds + 1
+            bLastBuildFailed = bSuccess is not True
+            self.__PrintBuildResult(bPDFIsComplete, bSuccess, sResult, time.perf_counter() - fStartTime)
+            # (changes during the build are detected with the next poll)
+      except KeyboardInterrupt:
+         pass
+
+      bSuccess = True
+      sResult  = f"Watch mode stopped after {nNrOfBuilds} build(s)"
+      return bSuccess, sResult
+
+   # eof def Run(self):
+
+# eof class CWatchBuilder():
+
+# --------------------------------------------------------------------------------------------------------------
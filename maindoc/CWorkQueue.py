@@ -0,0 +1,539 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# CWorkQueue.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Python module containing a file based work queue to render the documentation of the repositories on several hosts.
+
+The queue is a folder that is shared by all participating hosts (e.g. a network share). The coordinator
+(``genmaindoc.py --queue <folder>``) writes one job per repository; one or more workers (``genmaindoc.py --worker --queue <folder>``)
+claim the jobs and return the rendered PDF and JSON files.
+
+Layout of the queue folder (one subfolder per coordinator run):
+
+.. code::
+
+   <queue folder>/run-<timestamp>-<host>-<pid>/
+      jobs/<job id>.json        job description (written by the coordinator)
+      claims/<job id>.lock      claim of a worker (created exclusively; contains the worker name and the claim token;
+                                the modification time is the heartbeat)
+      results/<job id>.json     result of the job (published by the worker, only in case of the worker still owns the claim
+                                and no other worker published a result of the job before)
+      artifacts/<job id>.<claim token>/
+                                PDF file, JSON file and log file of the job (written by the worker; one folder per claim,
+                                therefore a worker, whose claim has been released, cannot overwrite the files of the next claim)
+      CANCEL                    the coordinator cancelled the run (remaining jobs are not started)
+      DONE                      the coordinator finished the run
+
+All files are written atomically (temporary file and rename, or hard link in case of the results), therefore a reader
+never sees incomplete files.
+"""
+
+# --------------------------------------------------------------------------------------------------------------
+
+import os, sys, time, json, uuid, socket, shutil, threading
+
+import colorama as col
+
+from PythonExtensionsCollection.String.CString import CString
+
+col.init(autoreset=True)
+COLBR = col.Style.BRIGHT + col.Fore.RED
+COLBG = col.Style.BRIGHT + col.Fore.GREEN
+COLBY = col.Style.BRIGHT + col.Fore.YELLOW
+
+# polling interval of coordinator and workers (seconds)
+QUEUE_POLL_INTERVAL = 0.5
+
+# a worker refreshes its claim in this interval (seconds)
+CLAIM_HEARTBEAT = 10
+
+# a claim without heartbeat for this time (seconds) is handled as abandoned (e.g. worker host crashed); the job is claimable again
+CLAIM_STALE_AFTER = 120
+
+# default for the maximum time (seconds) the coordinator waits for the results (maindoc configuration: "CONTROL" : {"QUEUE_TIMEOUT" : ...})
+QUEUE_TIMEOUT = 3600
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def WriteJsonFileAtomic(sFile=None, dictContent=None):
+   """Writes a JSON file atomically (other hosts see either no file or the complete file).
+   """
+   sTempFile = f"{sFile}.{socket.gethostname()}.{os.getpid()}.tmp"
+   with open(sTempFile, "w", encoding="utf-8") as hFile:
+      json.dump(dictContent, hFile, indent=3)
+   os.replace(sTempFile, sFile)
+
+# eof def WriteJsonFileAtomic(sFile=None, dictContent=None):
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CQueueCancelEvent():
+   """
+File based replacement of ``multiprocessing.Event`` (only ``is_set()`` and ``set()``), shared by all hosts.
+   """
+
+   def __init__(self, sCancelFile=None):
+      self.__sCancelFile = sCancelFile
+
+   def __del__(self):
+      pass
+
+   def is_set(self):
+      return os.path.isfile(self.__sCancelFile)
+
+   def set(self):
+      with open(self.__sCancelFile, "w", encoding="utf-8") as hCancelFile:
+         hCancelFile.write(f"{socket.gethostname()}:{os.getpid()}\n")
+
+# eof class CQueueCancelEvent():
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CWorkQueue():
+   """
+Coordinator side of the work queue.
+
+Methods to execute: ``Submit()``, ``GetResults()`` (repeatedly, until all results are available), ``Cancel()`` (optional), ``Close()``
+   """
+
+   def __init__(self, sQueueFolder=None):
+      """
+Constructor of class ``CWorkQueue``. Creates a new run folder within the queue folder.
+
+* ``sQueueFolder``
+
+  / *Condition*: required / *Type*: str /
+
+  Path to the queue folder (shared by coordinator and workers).
+      """
+
+      sMethod = "CWorkQueue.__init__"
+
+      if sQueueFolder is None:
+         bSuccess = None
+         sResult  = "sQueueFolder is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sQueueFolder = CString.NormalizePath(sQueueFolder)
+      sRunName = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{socket.gethostname()}-{os.getpid()}"
+      self.__sRunFolder = f"{self.__sQueueFolder}/{sRunName}"
+      for sSubFolder in ("jobs", "claims", "results", "artifacts"):
+         os.makedirs(f"{self.__sRunFolder}/{sSubFolder}")
+      self.__oCancelEvent = CQueueCancelEvent(f"{self.__sRunFolder}/CANCEL")
+      self.__setResultsSeen = set()
+
+   # eof def __init__(self, sQueueFolder=None):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetRunFolder(self):
+      """Returns the path to the run folder of this coordinator.
+      """
+      return self.__sRunFolder
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Submit(self, sJobId=None, dictJob=None):
+      """Adds a job to the queue.
+      """
+      WriteJsonFileAtomic(f"{self.__sRunFolder}/jobs/{sJobId}.json", dictJob)
+
+   # eof def Submit(self, sJobId=None, dictJob=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def GetResults(self):
+      """
+Returns the results that are available since the previous call.
+
+**Returns:**
+
+* ``listResults``
+
+  / *Type*: list /
+
+  List of tuples ``(sJobId, dictResult, sArtifactFolder)``.
+      """
+
+      listResults = []
+      sResultsFolder = f"{self.__sRunFolder}/results"
+      for sFileName in sorted(os.listdir(sResultsFolder)):
+         if sFileName.endswith(".json") is False:
+            continue
+         sJobId = sFileName[:-5]
+         if sJobId in self.__setResultsSeen:
+            continue
+         try:
+            with open(f"{sResultsFolder}/{sFileName}", encoding="utf-8") as hResultFile:
+               dictResult = json.load(hResultFile)
+         except Exception:
+            continue # (not expected because of the atomic write; retried with the next call)
+         self.__setResultsSeen.add(sJobId)
+         listResults.append((sJobId, dictResult, f"{self.__sRunFolder}/artifacts/{dictResult.get('ARTIFACTFOLDER', sJobId)}"))
+      return listResults
+
+   # eof def GetResults(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def RecoverStaleClaims(self):
+      """Releases claims of jobs without result, whose worker did not refresh the claim for ``CLAIM_STALE_AFTER`` seconds.
+Returns the list of released job ids.
+      """
+      listReleasedJobIds = []
+      sClaimsFolder = f"{self.__sRunFolder}/claims"
+      for sFileName in os.listdir(sClaimsFolder):
+         if sFileName.endswith(".lock") is False:
+            continue
+         sJobId = sFileName[:-5]
+         if os.path.isfile(f"{self.__sRunFolder}/results/{sJobId}.json") is True:
+            continue
+         sClaimFile = f"{sClaimsFolder}/{sFileName}"
+         try:
+            if (time.time() - os.path.getmtime(sClaimFile)) > CLAIM_STALE_AFTER:
+               # renaming is atomic; the job can be claimed again afterwards
+               os.replace(sClaimFile, f"{sClaimFile}.stale.{int(time.time())}")
+               listReleasedJobIds.append(sJobId)
+         except OSError:
+            pass
+      return listReleasedJobIds
+
+   # eof def RecoverStaleClaims(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Cancel(self):
+      """Cancels the run: the workers do not start remaining jobs and terminate running jobs.
+      """
+      self.__oCancelEvent.set()
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Close(self, bRemoveRunFolder=True):
+      """Finishes the run (the workers ignore the run folder afterwards) and removes the run folder.
+      """
+      try:
+         with open(f"{self.__sRunFolder}/DONE", "w", encoding="utf-8") as hDoneFile:
+            hDoneFile.write(time.strftime('%d.%m.%Y - %H:%M:%S') + "\n")
+         if bRemoveRunFolder is True:
+            shutil.rmtree(self.__sRunFolder, ignore_errors=True)
+      except Exception as ex:
+         print(COLBY + f"Warning: Queue run folder '{self.__sRunFolder}' not closed properly: {ex}")
+
+   # eof def Close(self, bRemoveRunFolder=True):
+
+# eof class CWorkQueue():
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+class CQueueWorker():
+   """
+Worker side of the work queue (``genmaindoc.py --worker --queue <folder>``).
+
+The worker claims jobs of all open runs within the queue folder and renders the documentation of the repositories.
+The repositories must be available on the host of the worker under the same path as on the host of the coordinator.
+
+Method to execute: ``Run()``
+   """
+
+   def __init__(self, sQueueFolder=None, nIdleTimeout=60, bInProcess=False):
+      """
+Constructor of class ``CQueueWorker``.
+
+* ``sQueueFolder``
+
+  / *Condition*: required / *Type*: str /
+
+  Path to the queue folder (shared by coordinator and workers).
+
+* ``nIdleTimeout``
+
+  / *Condition*: optional / *Type*: int / *Default*: 60 /
+
+  The worker terminates after this time (seconds) without any job. 0: the worker never terminates.
+
+* ``bInProcess``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  Execute the package doc generators within the worker process (see ``CInProcessGenerator``).
+      """
+
+      sMethod = "CQueueWorker.__init__"
+
+      if sQueueFolder is None:
+         bSuccess = None
+         sResult  = "sQueueFolder is None"
+         raise Exception(CString.FormatResult(sMethod, bSuccess, sResult))
+
+      self.__sQueueFolder = CString.NormalizePath(sQueueFolder)
+      self.__nIdleTimeout = nIdleTimeout
+      self.__bInProcess   = bInProcess
+      self.__sWorkerName  = f"{socket.gethostname()}:{os.getpid()}"
+
+   # eof def __init__(self, sQueueFolder=None, nIdleTimeout=60, bInProcess=False):
+
+   def __del__(self):
+      pass
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __Claim(self, sRunFolder=None, sJobId=None):
+      """Claims a job. Returns the claim token in case of the claim succeeded (only one worker can succeed), otherwise ``None``.
+      """
+      sClaimFile = f"{sRunFolder}/claims/{sJobId}.lock"
+      try:
+         hClaimFile = os.open(sClaimFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+      except OSError:
+         return None
+      sClaimToken = uuid.uuid4().hex
+      os.write(hClaimFile, f"{self.__sWorkerName}\n{sClaimToken}\n".encode("utf-8"))
+      os.close(hClaimFile)
+      return sClaimToken
+
+   # eof def __Claim(self, sRunFolder=None, sJobId=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __OwnsClaim(self, sClaimFile=None, sClaimToken=None):
+      """Returns ``True`` in case of the claim file still contains the claim token (the claim has not been released
+by the coordinator in the meantime, see ``CWorkQueue.RecoverStaleClaims()``).
+      """
+      try:
+         with open(sClaimFile, encoding="utf-8") as hClaimFile:
+            listLines = hClaimFile.read().splitlines()
+      except OSError:
+         return False
+      return ( (len(listLines) > 1) and (listLines[1] == sClaimToken) )
+
+   # eof def __OwnsClaim(self, sClaimFile=None, sClaimToken=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __Heartbeat(self, sClaimFile=None, sClaimToken=None, oStopEvent=None):
+      """Refreshes the modification time of the claim file until ``oStopEvent`` is set (executed in a separate thread).
+      """
+      while oStopEvent.wait(CLAIM_HEARTBEAT) is False:
+         # (a released claim is not refreshed any more; the claim file can belong to another worker already)
+         if self.__OwnsClaim(sClaimFile, sClaimToken) is False:
+            break
+         try:
+            os.utime(sClaimFile)
+         except OSError:
+            pass
+
+   # eof def __Heartbeat(self, sClaimFile=None, sClaimToken=None, oStopEvent=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __Complete(self, sRunFolder=None, sJobId=None, sClaimToken=None, dictResult=None):
+      """Publishes the result of a job, in case of the worker still owns the claim. Otherwise the job has been released
+and executed again (by another worker); the result and the artifacts of this worker are discarded.
+Returns ``True`` in case of the result has been published.
+      """
+      sArtifactFolder = f"{sRunFolder}/artifacts/{sJobId}.{sClaimToken}"
+      if self.__OwnsClaim(f"{sRunFolder}/claims/{sJobId}.lock", sClaimToken) is False:
+         shutil.rmtree(sArtifactFolder, ignore_errors=True)
+         return False
+      # The claim can be released between the check above and the publishing of the result. Therefore the result is written
+      # to a file of this claim and published with a hard link: creating the link fails in case of another worker already
+      # published a result of the job, therefore at most one result is published per job.
+      sResultFile      = f"{sRunFolder}/results/{sJobId}.json"
+      sClaimResultFile = f"{sResultFile}.{sClaimToken}.tmp"
+      with open(sClaimResultFile, "w", encoding="utf-8") as hFile:
+         json.dump(dictResult, hFile, indent=3)
+      try:
+         os.link(sClaimResultFile, sResultFile)
+         bPublished = True
+      except FileExistsError:
+         bPublished = False
+      finally:
+         os.remove(sClaimResultFile)
+      if bPublished is False:
+         shutil.rmtree(sArtifactFolder, ignore_errors=True)
+      return bPublished
+
+   # eof def __Complete(self, sRunFolder=None, sJobId=None, sClaimToken=None, dictResult=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __Process(self, sRunFolder=None, sJobId=None, sClaimToken=None):
+      """Renders the documentation of a single claimed job and writes the result.
+      """
+      from maindoc.CExternalDocRenderer import RenderRepository
+
+      with open(f"{sRunFolder}/jobs/{sJobId}.json", encoding="utf-8") as hJobFile:
+         dictJob = json.load(hJobFile)
+
+      # the job is executed with the environment of the worker host; the build cache is handled by the coordinator
+      sArtifactFolder = f"{sRunFolder}/artifacts/{sJobId}.{sClaimToken}"
+      dictJob['DESTINATIONFOLDER'] = sArtifactFolder
+      dictJob['PYTHON']            = CString.NormalizePath(sys.executable)
+      dictJob['CACHEFOLDER']       = None
+      dictJob['CACHEDIR']          = None
+      dictJob['INPROCESS']         = self.__bInProcess
+
+      print(COLBY + f"[{self.__sWorkerName}] {os.path.basename(sRunFolder)} : {sJobId} ...")
+      oStopEvent = threading.Event()
+      oHeartbeatThread = threading.Thread(target=self.__Heartbeat, args=(f"{sRunFolder}/claims/{sJobId}.lock", sClaimToken, oStopEvent), daemon=True)
+      oHeartbeatThread.start()
+      try:
+         dictResult = RenderRepository(dictJob, CQueueCancelEvent(f"{sRunFolder}/CANCEL"))
+      finally:
+         oStopEvent.set()
+         oHeartbeatThread.join()
+
+      # the files are returned relative to the artifact folder (the paths on coordinator host can be different)
+      for sKey in ('PDFFILE', 'JSONFILE', 'LOGFILE'):
+         if dictResult[sKey] is not None:
+            dictResult[sKey] = os.path.basename(dictResult[sKey])
+      dictResult['WORKER']         = self.__sWorkerName
+      dictResult['ARTIFACTFOLDER'] = os.path.basename(sArtifactFolder)
+      if self.__Complete(sRunFolder, sJobId, sClaimToken, dictResult) is False:
+         print(COLBY + f"[{self.__sWorkerName}] {os.path.basename(sRunFolder)} : {sJobId} : claim released by the coordinator; result discarded")
+         return
+
+      sLine = f"[{self.__sWorkerName}] {os.path.basename(sRunFolder)} : {sJobId} : {dictResult['STATUS']} ({dictResult['DURATION']:.1f} s)"
+      print((COLBG if dictResult['bSuccess'] is True else COLBR) + sLine)
+
+   # eof def __Process(self, sRunFolder=None, sJobId=None, sClaimToken=None):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def __ProcessNextJob(self):
+      """Claims and processes the next open job of any open run. Returns ``True`` in case of a job has been processed.
+      """
+      if os.path.isdir(self.__sQueueFolder) is False:
+         return False
+      for sRunName in sorted(os.listdir(self.__sQueueFolder)):
+         sRunFolder = f"{self.__sQueueFolder}/{sRunName}"
+         if ( (sRunName.startswith("run-") is False) or (os.path.isdir(sRunFolder) is False) ):
+            continue
+         if ( (os.path.isfile(f"{sRunFolder}/DONE") is True) or (os.path.isfile(f"{sRunFolder}/CANCEL") is True) ):
+            continue
+         try:
+            listJobFileNames = sorted(os.listdir(f"{sRunFolder}/jobs"))
+         except OSError:
+            continue # run folder removed in the meantime
+         for sJobFileName in listJobFileNames:
+            if sJobFileName.endswith(".json") is False:
+               continue
+            sJobId = sJobFileName[:-5]
+            if os.path.isfile(f"{sRunFolder}/results/{sJobId}.json") is True:
+               continue
+            sClaimToken = self.__Claim(sRunFolder, sJobId)
+            if sClaimToken is None:
+               continue
+            try:
+               self.__Process(sRunFolder, sJobId, sClaimToken)
+            except Exception as ex:
+               # the worker continues with the next job in any case
+               if ( (os.path.isfile(f"{sRunFolder}/CANCEL") is True) or (os.path.isdir(sRunFolder) is False) ):
+                  print(COLBY + f"[{self.__sWorkerName}] {sRunName} : {sJobId} : run cancelled by the coordinator")
+               else:
+                  print(COLBR + f"[{self.__sWorkerName}] {sRunName} : {sJobId} : {ex}")
+            return True
+      return False
+
+   # eof def __ProcessNextJob(self):
+
+   # --------------------------------------------------------------------------------------------------------------
+   #TM***
+
+   def Run(self):
+      """
+Processes jobs until no job is available for ``nIdleTimeout`` seconds.
+
+**Returns:**
+
+* ``bSuccess``
+
+  / *Type*: bool /
+
+  Indicates if the computation was successful or not.
+
+* ``sResult``
+
+  / *Type*: str /
+
+  The result of the computation.
+      """
+
+      sMethod = "CQueueWorker.Run"
+
+      print(COLBY + f"Worker '{self.__sWorkerName}' waiting for jobs in '{self.__sQueueFolder}'")
+      print()
+
+      if self.__bInProcess is True:
+         from maindoc.CInProcessGenerator import WarmUpWorker
+         WarmUpWorker()
+
+      nNrOfJobs = 0
+      fLastJobTime = time.time()
+      try:
+         while True:
+            if self.__ProcessNextJob() is True:
+               nNrOfJobs = nNrOfJobs + 1
+               fLastJobTime = time.time()
+               continue
+            if ( (self.__nIdleTimeout > 0) and ((time.time() - fLastJobTime) > self.__nIdleTimeout) ):
+               break
+            time.sleep(QUEUE_POLL_INTERVAL)
+      except KeyboardInterrupt:
+         pass
+      except Exception as ex:
+         bSuccess = None
+         sResult  = str(ex)
+         return bSuccess, CString.FormatResult(sMethod, bSuccess, sResult)
+
+      bSuccess = True
+      sResult  = f"Worker '{self.__sWorkerName}' finished after {nNrOfJobs} job(s)"
+      return bSuccess, sResult
+
+   # eof def Run(self):
+
+# eof class CQueueWorker():
+
+# --------------------------------------------------------------------------------------------------------------
@@ -25,7 +25,8 @@
 #
 # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 #
-# This script deletes folders (as defined in config.CRepositoryConfig, depending on the position of this script):
+# This script synchronizes with the package source folder (or deletes) folders (as defined in config.CRepositoryConfig,
+# depending on the position of this script):
 # - previous builds within this repository
 # - previous installations within
 #   * <Python installation>\Lib\site-packages (Windows)
@@ -55,7 +56,11 @@
 #     > Files added manually within installation folder, are still present there after repeated execution of setuptools.
 #     > Only files deleted manually within installation folder, are are restored there after repeated execution of setuptools.
 #   - No such issues with <Python installation>\Lib\site-packages\<package name>-<versions>.egg-info.
-#   - Solution: explicit deletion of all previous output (all documentation-, build- and installation-folder, except the egg-info folder)
+#   - Solution: explicit synchronization of the previous build and installation folder with the package source folder
+#     (see 'sync_previous_build()' and 'sync_previous_installation()'): files with other content are updated, files not belonging
+#     to the package are removed, unchanged files (e.g. the PDF file) are kept and not copied again by setuptools.
+#   - With SETUP_CLEAN_INSTALL=1 (and in case of the synchronization fails) all previous output is deleted explicitly instead
+#     (all documentation-, build- and installation-folder, except the egg-info folder)
 #     (see 'delete_previous_build()' and 'delete_previous_installation()')
 #
 # --------------------------------------------------------------------------------------------------------------
@@ -156,24 +161,38 @@ if ( ('install' in listCmdArgs) or ('build' in listCmdArgs) or ('sdist' in listC
     if nReturn != SUCCESS:
         sys.exit(nReturn)
 
-    print(COLBY + "Extended setup step 3/5: Deleting previous setup outputs (build, dist, <package name>.egg-info within repository)")
-    print()
+    # previous outputs are synchronized with the package source folder; SETUP_CLEAN_INSTALL=1 deletes them instead
+    bCleanInstall = os.environ.get("SETUP_CLEAN_INSTALL", "").strip().lower() in ("1", "true", "yes")
 
-    nReturn = oExtendedSetup.delete_previous_build()
+    if bCleanInstall is True:
+        print(COLBY + "Extended setup step 3/5: Deleting previous setup outputs (build, dist, <package name>.egg-info within repository)")
+        print()
+        nReturn = oExtendedSetup.delete_previous_build()
+    else:
+        print(COLBY + "Extended setup step 3/5: Synchronizing previous setup outputs (build within repository; dist and <package name>.egg-info are deleted)")
+        print()
+        nReturn = oExtendedSetup.sync_previous_build()
     if nReturn != SUCCESS:
         sys.exit(nReturn)
 
     if ( ('bdist_wheel' in listCmdArgs) or ('build' in listCmdArgs) ):
         print()
-        print(COLBY + "Skipping extended setup step 4/5: Deleting previous package installation folder within site-packages")
+        print(COLBY + "Skipping extended setup step 4/5: Updating previous package installation folder within site-packages")
         print()
-    else:
+    elif bCleanInstall is True:
         print()
         print(COLBY + "Extended setup step 4/5: Deleting previous package installation folder within site-packages") # (<package name> and <package name>_doc under <Python installation>\Lib\site-packages
         print()
         nReturn = oExtendedSetup.delete_previous_installation()
         if nReturn != SUCCESS:
             sys.exit(nReturn)
+    else:
+        print()
+        print(COLBY + "Extended setup step 4/5: Synchronizing previous package installation folder within site-packages")
+        print()
+        nReturn = oExtendedSetup.sync_previous_installation()
+        if nReturn != SUCCESS:
+            sys.exit(nReturn)
 
     README_MD = str(oRepositoryConfig.Get('README_MD'))
     with open(README_MD, "r", encoding="utf-8") as fh:
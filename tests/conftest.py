@@ -0,0 +1,38 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# conftest.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+# The unit tests import the modules of genmaindoc in the same way as genmaindoc.py does (package 'maindoc' within the
+# repository root folder). Execution (within the repository root folder):
+#
+#    python -m pytest -q
+
+import os, sys
+
+sReferencePath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if sReferencePath not in sys.path:
+   sys.path.insert(0, sReferencePath)
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,131 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CArtifactStore.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CArtifactStore`` (content addressed artifact store, command line ``--cache-dir``).
+"""
+
+import os, time
+
+from maindoc.CArtifactStore import CArtifactStore, KIND_PDF, KIND_FORMAT
+
+# --------------------------------------------------------------------------------------------------------------
+
+def WriteFile(sFile=None, bContent=b""):
+   os.makedirs(os.path.dirname(sFile), exist_ok=True)
+   with open(sFile, "wb") as hFile:
+      hFile.write(bContent)
+   return sFile
+
+def ListObjects(sStoreFolder=None):
+   return sorted(sFileName for sRootFolder, listFolders, listFileNames in os.walk(f"{sStoreFolder}/objects") for sFileName in listFileNames)
+
+def Age(sStoreFolder=None, fSeconds=0):
+   """Sets the modification time of all files of the store to the past.
+   """
+   fTime = time.time() - fSeconds
+   for sRootFolder, listFolders, listFileNames in os.walk(sStoreFolder):
+      for sFileName in listFileNames:
+         os.utime(os.path.join(sRootFolder, sFileName), (fTime, fTime))
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_put_and_fetch(tmp_path):
+   sStore = str(tmp_path / "store")
+   sPDFFile = WriteFile(str(tmp_path / "build" / "main.pdf"), b"pdf")
+   sAuxFile = WriteFile(str(tmp_path / "build" / "sub" / "main.aux"), b"aux")
+   oArtifactStore = CArtifactStore(sStore)
+
+   assert oArtifactStore.Fetch(KIND_PDF, "key", str(tmp_path / "restored")) is None
+   bSuccess, sResult = oArtifactStore.Put(KIND_PDF, "key", {'PDFFILE' : sPDFFile, 'AUXFILE' : sAuxFile, 'LOGFILE' : None}, str(tmp_path / "build"))
+   assert bSuccess is True, sResult
+
+   dictFiles = oArtifactStore.Fetch(KIND_PDF, "key", str(tmp_path / "restored"))
+   assert sorted(dictFiles) == ['AUXFILE', 'PDFFILE']
+   assert dictFiles['AUXFILE'].endswith("/restored/sub/main.aux")
+   with open(dictFiles['PDFFILE'], "rb") as hFile:
+      assert hFile.read() == b"pdf"
+   assert oArtifactStore.GetStatistics() == "pdf: 1 hit(s), 1 miss(es)"
+
+def test_identical_content_stored_once(tmp_path):
+   sStore = str(tmp_path / "store")
+   oArtifactStore = CArtifactStore(sStore)
+   oArtifactStore.Put(KIND_PDF, "key1", {'PDFFILE' : WriteFile(str(tmp_path / "a.pdf"), b"same")})
+   oArtifactStore.Put(KIND_FORMAT, "key2", {'FORMATFILE' : WriteFile(str(tmp_path / "b.fmt"), b"same")})
+   assert len(ListObjects(sStore)) == 1
+
+def test_incomplete_entry_is_a_miss(tmp_path):
+   sStore = str(tmp_path / "store")
+   oArtifactStore = CArtifactStore(sStore)
+   oArtifactStore.Put(KIND_PDF, "key", {'PDFFILE' : WriteFile(str(tmp_path / "a.pdf"), b"pdf")})
+   for sRootFolder, listFolders, listFileNames in os.walk(f"{sStore}/objects"):
+      for sFileName in listFileNames:
+         os.remove(os.path.join(sRootFolder, sFileName))
+   assert oArtifactStore.Fetch(KIND_PDF, "key", str(tmp_path / "restored")) is None
+
+def test_evict_least_recently_used(tmp_path):
+   sStore = str(tmp_path / "store")
+   oArtifactStore = CArtifactStore(sStore, nMaxSize=1)
+   oArtifactStore.Put(KIND_PDF, "old", {'PDFFILE' : WriteFile(str(tmp_path / "old.pdf"), b"o" * 700000)})
+   oArtifactStore.Put(KIND_PDF, "new", {'PDFFILE' : WriteFile(str(tmp_path / "new.pdf"), b"n" * 700000)})
+   Age(sStore, 7200)
+   # (the access of an entry refreshes its modification time)
+   assert oArtifactStore.Fetch(KIND_PDF, "new", str(tmp_path / "restored")) is not None
+
+   nSize, nEvicted = oArtifactStore.Evict()
+   assert (nSize, nEvicted) == (700000, 1)
+   assert oArtifactStore.Fetch(KIND_PDF, "old", str(tmp_path / "restored")) is None
+   assert oArtifactStore.Fetch(KIND_PDF, "new", str(tmp_path / "restored")) is not None
+   assert len(ListObjects(sStore)) == 1
+
+def test_evict_keeps_recent_objects(tmp_path):
+   # objects are written before their entry; an object without entry can belong to a concurrent Put()
+   sStore = str(tmp_path / "store")
+   oArtifactStore = CArtifactStore(sStore, nMaxSize=1)
+   oArtifactStore.Put(KIND_PDF, "key", {'PDFFILE' : WriteFile(str(tmp_path / "a.pdf"), b"pdf")})
+   os.remove(f"{sStore}/entries/{KIND_PDF}/key.json")
+   WriteFile(f"{sStore}/objects/ab/abcd.1.2.tmp", b"incomplete")
+
+   oArtifactStore.Evict()
+   assert len(ListObjects(sStore)) == 2
+
+   Age(sStore, 7200)
+   oArtifactStore.Evict()
+   assert ListObjects(sStore) == []
+
+def test_put_refreshes_reused_objects(tmp_path):
+   sStore = str(tmp_path / "store")
+   oArtifactStore = CArtifactStore(sStore)
+   oArtifactStore.Put(KIND_PDF, "key1", {'PDFFILE' : WriteFile(str(tmp_path / "a.pdf"), b"pdf")})
+   Age(sStore, 7200)
+   oArtifactStore.Put(KIND_PDF, "key2", {'PDFFILE' : str(tmp_path / "a.pdf")})
+   sObjectFolder = f"{sStore}/objects"
+   for sRootFolder, listFolders, listFileNames in os.walk(sObjectFolder):
+      for sFileName in listFileNames:
+         assert time.time() - os.path.getmtime(os.path.join(sRootFolder, sFileName)) < 60
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,114 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CBuildGraph.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CBuildGraph`` (dependency graph and scheduler of the build stages).
+"""
+
+import threading
+
+import pytest
+
+from maindoc.CBuildGraph import CBuildGraph
+
+# --------------------------------------------------------------------------------------------------------------
+
+def NewStage(listExecuted=[], sName=None, bSuccess=True, oEvent=None):
+   """Returns a stage function, that records its execution (and optionally waits for ``oEvent``).
+   """
+   def Execute():
+      if oEvent is not None:
+         assert oEvent.wait(5) is True
+      listExecuted.append(sName)
+      return bSuccess, f"{sName} done"
+   return Execute
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_plan():
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("compile", NewStage(), ["main.tex", "imports.tex", "version.tex"], ["main.pdf"])
+   oBuildGraph.AddStage("imports", NewStage(), ["docs"], ["imports.tex"])
+   oBuildGraph.AddStage("render", NewStage(), [], ["docs"])
+   oBuildGraph.AddStage("version", NewStage(), [], ["version.tex"])
+   assert oBuildGraph.GetPlan() == [["render", "version"], ["imports"], ["compile"]]
+   assert oBuildGraph.GetOutputs() == ["main.pdf", "imports.tex", "docs", "version.tex"]
+
+def test_duplicate_stage_and_output():
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("a", NewStage(), [], ["out"])
+   with pytest.raises(Exception):
+      oBuildGraph.AddStage("a", NewStage(), [], [])
+   with pytest.raises(Exception):
+      oBuildGraph.AddStage("b", NewStage(), [], ["out"])
+
+def test_cycle():
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("a", NewStage(), ["y"], ["x"])
+   oBuildGraph.AddStage("b", NewStage(), ["x"], ["y"])
+   with pytest.raises(Exception):
+      oBuildGraph.GetPlan()
+   bSuccess, sResult = oBuildGraph.Execute()
+   assert bSuccess is None
+   assert "Cyclic" in sResult
+
+def test_execute_order_and_parallelism():
+   listExecuted = []
+   # 'first' completes only after 'second' has been started; this works only in case of both are executed in parallel
+   oEvent = threading.Event()
+   def Second():
+      oEvent.set()
+      listExecuted.append("second")
+      return True, "second done"
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("first", NewStage(listExecuted, "first", oEvent=oEvent), [], ["a"])
+   oBuildGraph.AddStage("second", Second, [], ["b"])
+   oBuildGraph.AddStage("last", NewStage(listExecuted, "last"), ["a", "b"], ["c"])
+   bSuccess, sResult = oBuildGraph.Execute()
+   assert bSuccess is True, sResult
+   assert listExecuted == ["second", "first", "last"]
+
+def test_failed_stage_stops_dependents():
+   listExecuted = []
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("broken", NewStage(listExecuted, "broken", bSuccess=False), [], ["a"])
+   oBuildGraph.AddStage("dependent", NewStage(listExecuted, "dependent"), ["a"], ["b"])
+   bSuccess, sResult = oBuildGraph.Execute()
+   assert bSuccess is False
+   assert "Stage 'broken' failed" in sResult
+   assert listExecuted == ["broken"]
+
+def test_exception_is_an_error():
+   def Raise():
+      raise ValueError("unexpected")
+   oBuildGraph = CBuildGraph()
+   oBuildGraph.AddStage("raise", Raise, [], [])
+   bSuccess, sResult = oBuildGraph.Execute()
+   assert bSuccess is None
+   assert "unexpected" in sResult
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,149 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CBuildManifest.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CBuildManifest`` (up-to-date check of the main documentation, command line ``--skip-if-up-to-date``).
+"""
+
+import os
+
+import pytest
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CBuildManifest import CBuildManifest
+from maindoc.CPackageInventory import CPackageInventory
+
+# --------------------------------------------------------------------------------------------------------------
+
+def WriteFile(sFile=None, sContent=""):
+   os.makedirs(os.path.dirname(sFile), exist_ok=True)
+   with open(sFile, "w", encoding="utf-8") as hFile:
+      hFile.write(sContent)
+   return CString.NormalizePath(sFile)
+
+@pytest.fixture
+def listPackages(monkeypatch):
+   """The installed Python packages (can be changed by the test).
+   """
+   listPackages = [("robotframework-documentation", "0.1.0"), ("Sphinx", "7.0.0")]
+   monkeypatch.setattr(CPackageInventory, "ComputeInstalledPackages", staticmethod(lambda: list(listPackages)))
+   return listPackages
+
+@pytest.fixture
+def dictMainDocConfig(tmp_path, listPackages):
+   """Main documentation with one chapter and one imported repository, and the files of a previous build within the package folder.
+The LaTeX compiler is a dummy file (the fingerprint of the TeX installation is based on its time stamp).
+   """
+   sRoot = CString.NormalizePath(str(tmp_path))
+   sBook = f"{sRoot}/book"
+   WriteFile(f"{sBook}/main.tex", "\\input{./BundleVersionDate}\n\\include{include/chapter}\n\\input{./externaldocs/imports}\n")
+   WriteFile(f"{sBook}/include/chapter.tex", "chapter\n")
+   WriteFile(f"{sBook}/BundleVersionDate.tex", "version and date of the build\n")
+   WriteFile(f"{sBook}/externaldocs/imports.tex", "rendered documentation\n")
+   WriteFile(f"{sRoot}/repository/module.py", "print('module')\n")
+   for sFileName in ("main.pdf", "Components.rst", "Components.html"):
+      WriteFile(f"{sRoot}/package/{sFileName}", sFileName)
+   dictMainDocConfig = {'REFERENCEPATH' : sRoot, 'PACKAGENAME' : "package", 'JOBNAME' : "main",
+                        'MAINDOC_CONFIGFILE' : WriteFile(f"{sRoot}/maindoc_config.json", "{}\n"),
+                        'BUNDLE_NAME' : "bundle", 'BUNDLE_VERSION' : "1.0", 'BUNDLE_VERSION_DATE' : "01.2026", 'BUILDDATE' : None,
+                        'SIMULATE_ONLY' : False, 'CONTROL' : {'UPDATE_EXTERNAL_DOC' : True, 'STRICT' : True},
+                        'IMPORTS' : [f"{sRoot}/repository"], 'BOOKSOURCES' : sBook, 'MAINTEXFILENAME' : "main.tex",
+                        'CACHEFOLDER' : f"{sRoot}/cache", 'OUTPUTFOLDER' : sBook, 'EXTERNALDOCFOLDER' : f"{sBook}/externaldocs",
+                        'GENERATEDDOCFOLDER' : f"{sBook}/externaldocs", 'NOW' : "01.01.2026 - 00:00:00",
+                        'LATEXINTERPRETER' : WriteFile(f"{sRoot}/tex/pdflatex", "")}
+   oBuildManifest = CBuildManifest(dictMainDocConfig)
+   dictInputs, bSuccess, sResult = oBuildManifest.ComputeInputs()
+   assert bSuccess is True, sResult
+   bSuccess, sResult = oBuildManifest.Write(dictInputs)
+   assert bSuccess is True, sResult
+   return dictMainDocConfig
+
+def Check(dictMainDocConfig=None):
+   oBuildManifest = CBuildManifest(dictMainDocConfig)
+   dictInputs, bSuccess, sResult = oBuildManifest.ComputeInputs()
+   assert bSuccess is True, sResult
+   return oBuildManifest.Check(dictInputs)
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_up_to_date(dictMainDocConfig):
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is True, sResult
+
+   # files not referenced by the main tex file and the files generated by the build are not inputs
+   WriteFile(f"{dictMainDocConfig['BOOKSOURCES']}/other_main.pdf", "PDF file of another main documentation")
+   WriteFile(f"{dictMainDocConfig['BOOKSOURCES']}/BundleVersionDate.tex", "version and date of the next build\n")
+   WriteFile(f"{dictMainDocConfig['EXTERNALDOCFOLDER']}/imports.tex", "rendered again\n")
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is True, sResult
+
+def test_no_manifest(tmp_path, dictMainDocConfig):
+   os.remove(str(tmp_path / "package" / "build_manifest.json"))
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+   assert sResult.startswith("No build manifest")
+
+@pytest.mark.parametrize("sInput, sFile, sContent", [("booksources",               "book/include/chapter.tex", "chapter changed\n"),
+                                                     ("configuration",             "maindoc_config.json",      "{\"CONTROL\" : {}}\n"),
+                                                     ("repository 'repository'",   "repository/module.py",     "print('changed')\n"),
+                                                     ("tex",                       "tex/pdflatex",             "updated"),
+                                                    ])
+def test_changed_input(tmp_path, dictMainDocConfig, sInput, sFile, sContent):
+   WriteFile(str(tmp_path / sFile), sContent)
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+   assert sResult == f"Inputs changed since the previous build: {sInput}"
+
+def test_changed_bundle_information(dictMainDocConfig):
+   dictMainDocConfig['BUNDLE_VERSION'] = "1.1"
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+   assert sResult == "Inputs changed since the previous build: configuration"
+
+def test_changed_python_environment(dictMainDocConfig, listPackages):
+   # (the distribution of this package is installed by the packaging after the build)
+   listPackages[0] = ("robotframework_documentation", "0.2.0")
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is True, sResult
+
+   listPackages[1] = ("Sphinx", "7.1.0")
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+   assert sResult == "Inputs changed since the previous build: python"
+
+def test_changed_package_folder(tmp_path, dictMainDocConfig):
+   WriteFile(str(tmp_path / "package" / "main.pdf"), "another PDF file")
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+   assert sResult.startswith("File within the package folder changed since the previous build")
+
+   os.remove(str(tmp_path / "package" / "main.pdf"))
+   bUpToDate, sResult = Check(dictMainDocConfig)
+   assert bUpToDate is False
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,139 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CChapterSelection.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CChapterSelection`` (chapter selection of the main documentation, command line ``--chapters``).
+"""
+
+import os
+
+import pytest
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CChapterSelection import CChapterSelection, CHAPTERS_CHANGED
+
+# --------------------------------------------------------------------------------------------------------------
+
+def WriteFile(sFile=None, sContent=""):
+   os.makedirs(os.path.dirname(sFile), exist_ok=True)
+   with open(sFile, "w", encoding="utf-8") as hFile:
+      hFile.write(sContent)
+   return CString.NormalizePath(sFile)
+
+@pytest.fixture
+def dictMainDocConfig(tmp_path):
+   """Book sources with three chapters (one of them commented out); the chapters 'intro' and 'usage' have been typeset before
+(``.aux`` files within the output folder).
+   """
+   sBook   = CString.NormalizePath(str(tmp_path / "book"))
+   sOutput = CString.NormalizePath(str(tmp_path / "output"))
+   WriteFile(f"{sBook}/main.tex", "\\begin{document}\n"
+                                  "\\include{./include/intro}\n"
+                                  "\\include{include/usage}\n"
+                                  "% \\include{include/obsolete}\n"
+                                  "\\include{include/appendix}\n"
+                                  "\\end{document}\n")
+   for sChapter in ("intro", "usage", "appendix"):
+      WriteFile(f"{sBook}/include/{sChapter}.tex", f"{sChapter}\n")
+   for sChapter in ("intro", "usage", "appendix"):
+      WriteFile(f"{sOutput}/include/{sChapter}.aux", "\\relax\n")
+   return {'MAINTEXFILE' : f"{sBook}/main.tex", 'BOOKSOURCES' : sBook, 'OUTPUTFOLDER' : sOutput, 'JOBNAME' : "main",
+           'VARIANT' : None, 'CACHEFOLDER' : CString.NormalizePath(str(tmp_path / "cache")), 'NOW' : "01.01.2026 - 00:00:00"}
+
+def Prepare(dictMainDocConfig=None, listChapters=None):
+   dictMainDocConfig['CHAPTERS'] = listChapters
+   oChapterSelection = CChapterSelection(dictMainDocConfig)
+   sTexFile, bSuccess, sResult = oChapterSelection.Prepare()
+   assert bSuccess is True, sResult
+   return oChapterSelection, sTexFile
+
+def ReadIncludeOnly(sTexFile=None):
+   with open(sTexFile, encoding="utf-8") as hFile:
+      return [sLine.strip() for sLine in hFile if sLine.startswith("\\")]
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_full_build(dictMainDocConfig):
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, None)
+   assert sTexFile == dictMainDocConfig['MAINTEXFILE']
+   assert dictMainDocConfig['CHAPTERSELECTION'] is None
+
+def test_selected_chapters(dictMainDocConfig):
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, ["usage", "./include/intro.tex"])
+   # (the wrapper is written into the output folder; the chapters are kept in the order of the main tex file)
+   assert sTexFile == f"{dictMainDocConfig['OUTPUTFOLDER']}/main_includeonly.tex"
+   assert ReadIncludeOnly(sTexFile) == ["\\includeonly{./include/intro,include/usage}", "\\input{main.tex}"]
+   assert dictMainDocConfig['CHAPTERSELECTION'] == ["./include/intro", "include/usage"]
+
+def test_unknown_chapter(dictMainDocConfig):
+   dictMainDocConfig['CHAPTERS'] = ["obsolete"]
+   sTexFile, bSuccess, sResult = CChapterSelection(dictMainDocConfig).Prepare()
+   assert (sTexFile, bSuccess) == (None, False)
+   assert "Available chapters: include/intro, include/usage, include/appendix" in sResult
+
+def test_chapter_without_aux_file(dictMainDocConfig):
+   os.remove(f"{dictMainDocConfig['OUTPUTFOLDER']}/include/appendix.aux")
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, ["usage"])
+   assert dictMainDocConfig['CHAPTERSELECTION'] == ["include/usage", "include/appendix"]
+
+   # all chapters selected: full build
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, ["usage", "intro"])
+   assert sTexFile == dictMainDocConfig['MAINTEXFILE']
+
+def test_changed_chapters(dictMainDocConfig):
+   # no state of a previous build: full build
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, [CHAPTERS_CHANGED])
+   assert sTexFile == dictMainDocConfig['MAINTEXFILE']
+   oChapterSelection.UpdateState()
+
+   # nothing changed: full build
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, [CHAPTERS_CHANGED])
+   assert sTexFile == dictMainDocConfig['MAINTEXFILE']
+
+   WriteFile(f"{dictMainDocConfig['BOOKSOURCES']}/include/usage.tex", "usage changed\n")
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, [CHAPTERS_CHANGED])
+   assert dictMainDocConfig['CHAPTERSELECTION'] == ["include/usage"]
+   oChapterSelection.UpdateState()
+
+   # the state of the typeset chapter has been updated
+   WriteFile(f"{dictMainDocConfig['BOOKSOURCES']}/include/intro.tex", "intro changed\n")
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, [CHAPTERS_CHANGED])
+   assert dictMainDocConfig['CHAPTERSELECTION'] == ["./include/intro"]
+
+def test_state_per_variant(dictMainDocConfig):
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, None)
+   oChapterSelection.UpdateState()
+   assert os.path.isfile(f"{dictMainDocConfig['CACHEFOLDER']}/chapters/main.json")
+
+   # (another variant has its own state: no previous build known)
+   dictMainDocConfig['VARIANT'] = "variant"
+   WriteFile(f"{dictMainDocConfig['BOOKSOURCES']}/include/usage.tex", "usage changed\n")
+   oChapterSelection, sTexFile = Prepare(dictMainDocConfig, [CHAPTERS_CHANGED])
+   assert sTexFile == dictMainDocConfig['MAINTEXFILE']
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,99 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CGeneratedFile.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CGeneratedFile`` (writer of generated files; replaces a file only in case of the content changed).
+"""
+
+import os
+
+import pytest
+
+from maindoc.CGeneratedFile import CGeneratedFile
+
+# --------------------------------------------------------------------------------------------------------------
+
+def Commit(sFile=None, listLines=[], bTimeStampLine=False):
+   oGeneratedFile = CGeneratedFile(sFile, bTimeStampLine)
+   for sLine in listLines:
+      oGeneratedFile.Write(sLine)
+   return oGeneratedFile.Commit()
+
+def SetOldTime(sFile=None):
+   os.utime(sFile, (1000000000, 1000000000))
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_write_and_unchanged(tmp_path):
+   sFile = str(tmp_path / "file.tex")
+   bChanged, bSuccess, sResult = Commit(sFile, ["line 1", ["line 2", "line 3"]])
+   assert (bChanged, bSuccess) == (True, True)
+   with open(sFile, encoding="utf-8") as hFile:
+      assert hFile.read().splitlines() == ["line 1", "line 2", "line 3"]
+
+   # same content: the file (and its modification time) is kept
+   SetOldTime(sFile)
+   bChanged, bSuccess, sResult = Commit(sFile, ["line 1", "line 2", "line 3"])
+   assert (bChanged, bSuccess) == (False, True)
+   assert os.path.getmtime(sFile) == 1000000000
+
+   bChanged, bSuccess, sResult = Commit(sFile, ["line 1", "line 2 changed", "line 3"])
+   assert (bChanged, bSuccess) == (True, True)
+   assert os.path.getmtime(sFile) != 1000000000
+
+def test_time_stamp_line(tmp_path):
+   sFile = str(tmp_path / "file.tex")
+   Commit(sFile, ["% Generated at 01.01.2026", "content"], bTimeStampLine=True)
+   SetOldTime(sFile)
+
+   # a changed time stamp only does not replace the file (the time stamp of the previous build is kept)
+   bChanged, bSuccess, sResult = Commit(sFile, ["% Generated at 02.01.2026", "content"], bTimeStampLine=True)
+   assert (bChanged, bSuccess) == (False, True)
+   with open(sFile, encoding="utf-8") as hFile:
+      assert hFile.readline().strip() == "% Generated at 01.01.2026"
+
+   # without time stamp handling the first line is compared as well
+   bChanged, bSuccess, sResult = Commit(sFile, ["% Generated at 02.01.2026", "content"])
+   assert bChanged is True
+
+def test_no_temporary_files_left(tmp_path):
+   sFile = str(tmp_path / "file.tex")
+   Commit(sFile, ["a"])
+   Commit(sFile, ["b"])
+   assert os.listdir(str(tmp_path)) == ["file.tex"]
+
+def test_error(tmp_path):
+   # the folder of the file does not exist
+   bChanged, bSuccess, sResult = Commit(str(tmp_path / "missing" / "file.tex"), ["a"])
+   assert (bChanged, bSuccess) == (False, None)
+   assert os.listdir(str(tmp_path)) == []
+
+def test_file_is_required():
+   with pytest.raises(Exception):
+      CGeneratedFile(None)
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CImageOptimizer.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CImageOptimizer`` (optimized variants of the images of the book, maindoc configuration ``OPTIMIZE_IMAGES``).
+
+The Python package ``Pillow`` is optional; the tests of the variants are skipped in case of it is not installed.
+"""
+
+import os, random
+
+import pytest
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CImageOptimizer import CImageOptimizer
+
+# --------------------------------------------------------------------------------------------------------------
+
+@pytest.fixture
+def Image():
+   return pytest.importorskip("PIL.Image")
+
+def NewConfig(tmp_path=None, bOptimize=True):
+   sBook = CString.NormalizePath(str(tmp_path / "book"))
+   return {'CONTROL' : {'OPTIMIZE_IMAGES' : bOptimize}, 'JOBS' : 2, 'BOOKSOURCES' : sBook, 'EXTERNALDOCFOLDER' : f"{sBook}/externaldocs",
+           'CACHEFOLDER' : CString.NormalizePath(str(tmp_path / "cache"))}
+
+def SaveImage(oImage=None, sFile=None, **dictOptions):
+   os.makedirs(os.path.dirname(sFile), exist_ok=True)
+   oImage.save(sFile, **dictOptions)
+   return CString.NormalizePath(sFile)
+
+def Optimize(dictMainDocConfig=None, dictImages={}):
+   """Optimizes the images (argument of ``\\includegraphics`` -> image file); returns the mapping written to ``optimized_graphics.tex``
+(argument -> variant file).
+   """
+   listReferences = [{'ARGUMENT' : sArgument, 'DEPENDENCY' : sImageFile} for sArgument, sImageFile in dictImages.items()]
+   bSuccess, sResult = CImageOptimizer(dictMainDocConfig).Optimize(listReferences)
+   assert bSuccess is True, sResult
+   sGraphicsFolder = f"{dictMainDocConfig['EXTERNALDOCFOLDER']}/graphics"
+   dictMapping = {}
+   with open(f"{dictMainDocConfig['EXTERNALDOCFOLDER']}/optimized_graphics.tex", encoding="utf-8") as hFile:
+      for sLine in hFile:
+         if sLine.startswith("\\expandafter\\def\\csname genmaindoc@graphics@"):
+            sArgument, sVariant = sLine.strip()[len("\\expandafter\\def\\csname genmaindoc@graphics@"):].split("\\endcsname")
+            assert sVariant.startswith("{./externaldocs/graphics/")
+            dictMapping[sArgument] = f"{sGraphicsFolder}/{os.path.basename(sVariant[1:-1])}"
+   return dictMapping, sResult
+
+def NewPhoto(Image=None):
+   """Returns a photo-like image (more than 256 colors, smooth transitions).
+   """
+   import PIL.ImageFilter
+   oNoise = Image.effect_noise((256, 256), 60).filter(PIL.ImageFilter.GaussianBlur(3))
+   return Image.merge("RGB", [oNoise, Image.linear_gradient("L"), oNoise])
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_switched_off(tmp_path):
+   sImageFile = CString.NormalizePath(str(tmp_path / "book" / "img" / "logo.png"))
+   dictMapping, sResult = Optimize(NewConfig(tmp_path, bOptimize=False), {"img/logo" : sImageFile})
+   assert dictMapping == {}
+   assert sResult == "Images not optimized (switched off)"
+
+def test_opaque_image_with_few_colors(tmp_path, Image):
+   import PIL.ImageChops
+   # (random pattern of 8 colors)
+   oRandom = random.Random(1)
+   listColors = [(nColor * 32, 255 - nColor * 32, 0, 255) for nColor in range(8)]
+   oImage = Image.new("RGBA", (400, 300))
+   oImage.putdata([oRandom.choice(listColors) for nPixel in range(400 * 300)])
+   sImageFile = SaveImage(oImage, str(tmp_path / "book" / "img" / "diagram.png"))
+
+   dictMapping, sResult = Optimize(NewConfig(tmp_path), {"img/diagram" : sImageFile})
+   # (alpha channel removed and reduced to a palette image; lossless)
+   with Image.open(dictMapping["img/diagram"]) as oVariant:
+      assert (oVariant.format, oVariant.mode, oVariant.size) == ("PNG", "P", (400, 300))
+      assert PIL.ImageChops.difference(oVariant.convert("RGBA"), oImage).getbbox() is None
+   assert os.path.getsize(dictMapping["img/diagram"]) < os.path.getsize(sImageFile)
+
+def test_high_resolution(tmp_path, Image):
+   sImageFile = SaveImage(NewPhoto(Image), str(tmp_path / "book" / "img" / "scan.png"), dpi=(600, 600))
+
+   dictMapping, sResult = Optimize(NewConfig(tmp_path), {"img/scan" : sImageFile})
+   # (downscaled to the print resolution; the natural size is kept)
+   with Image.open(dictMapping["img/scan"]) as oVariant:
+      assert oVariant.size == (128, 128)
+      assert round(oVariant.info['dpi'][0]) == 300
+
+def test_photo(tmp_path, Image):
+   sImageFile = SaveImage(NewPhoto(Image), str(tmp_path / "book" / "img" / "photo.png"))
+   dictMapping, sResult = Optimize(NewConfig(tmp_path), {"img/photo" : sImageFile})
+   assert dictMapping["img/photo"].endswith(".jpg")
+
+def test_original_kept(tmp_path, Image):
+   # a JPEG file is not encoded once more, and an image without smaller variant is kept as it is
+   sPhotoFile = SaveImage(NewPhoto(Image), str(tmp_path / "book" / "img" / "photo.jpg"), quality=80)
+   sIconFile = SaveImage(Image.new("P", (16, 16)), str(tmp_path / "book" / "img" / "icon.png"), optimize=True)
+
+   dictMapping, sResult = Optimize(NewConfig(tmp_path), {"img/photo" : sPhotoFile, "img/icon" : sIconFile})
+   assert dictMapping == {}
+   assert sResult.startswith("Images optimized: 2 images, 0 variants")
+
+def test_cache(tmp_path, Image):
+   dictMainDocConfig = NewConfig(tmp_path)
+   sPhotoFile = SaveImage(NewPhoto(Image), str(tmp_path / "book" / "img" / "photo.png"))
+   sOtherFile = SaveImage(NewPhoto(Image).rotate(90), str(tmp_path / "book" / "img" / "other.png"))
+   dictMapping, sResult = Optimize(dictMainDocConfig, {"img/photo" : sPhotoFile, "img/other" : sOtherFile})
+   assert "(2 processed, 0 taken from cache)" in sResult
+
+   # unchanged images are taken from the cache; the variants of images that are not referenced any more are removed
+   dictMapping, sResult = Optimize(dictMainDocConfig, {"img/photo" : sPhotoFile})
+   assert "(0 processed, 1 taken from cache)" in sResult
+   assert os.listdir(f"{dictMainDocConfig['EXTERNALDOCFOLDER']}/graphics") == [os.path.basename(dictMapping["img/photo"])]
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,213 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CPDFPageCount.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CPDFPageCount``.
+
+The fixture PDF files are built byte by byte (with correct offsets) and cover the PDF structures supported by
+the parser: classic cross reference table, cross reference stream, objects within a compressed object stream
+and incremental updates.
+"""
+
+import zlib
+
+import pytest
+
+from maindoc.CPDFPageCount import CPDFPageCount
+
+# --------------------------------------------------------------------------------------------------------------
+
+CATALOG = b"<< /Type /Catalog /Pages 2 0 R >>"
+
+def PagesObject(nCount=0):
+   return b"<< /Type /Pages /Kids [] /Count %d >>" % nCount
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def AppendObjects(bPDF=b"", listObjects=[]):
+   """Appends the objects ``(nObject, bContent)`` to ``bPDF``; returns the PDF and the offsets of the objects.
+   """
+   dictOffsets = {}
+   for nObject, bContent in listObjects:
+      dictOffsets[nObject] = len(bPDF)
+      bPDF = bPDF + b"%d 0 obj\n" % nObject + bContent + b"\nendobj\n"
+   return bPDF, dictOffsets
+
+def AppendXRefTable(bPDF=b"", dictOffsets={}, bTrailerEntries=b""):
+   """Appends a cross reference table (one subsection per object), the trailer and ``startxref``.
+   Returns the PDF and the offset of the cross reference table.
+   """
+   nXRef = len(bPDF)
+   bPDF = bPDF + b"xref\n"
+   for nObject in sorted(dictOffsets):
+      bPDF = bPDF + b"%d 1\n%010d 00000 n \n" % (nObject, dictOffsets[nObject])
+   bPDF = bPDF + b"trailer\n<< /Size %d " % (max(dictOffsets) + 1) + bTrailerEntries + b" >>\n"
+   bPDF = bPDF + b"startxref\n%d\n%%%%EOF\n" % nXRef
+   return bPDF, nXRef
+
+def AppendXRefStream(bPDF=b"", dictOffsets={}, nXRefObject=0, bTrailerEntries=b"", dictCompressed={}, bPredictor=False):
+   """Appends a (compressed) cross reference stream object and ``startxref``. ``dictCompressed``: object -> (object stream, index).
+``bPredictor``: the entries are encoded with the PNG predictor 'Up' (like the cross reference streams written by pdfTeX).
+   """
+   nXRef = len(bPDF)
+   dictOffsets = dict(dictOffsets)
+   dictOffsets[nXRefObject] = nXRef
+   bEntries = b"\x00\x00\x00\x00\x00\xff"
+   for nObject in range(1, nXRefObject + 1):
+      if nObject in dictOffsets:
+         bEntries = bEntries + bytes([1]) + dictOffsets[nObject].to_bytes(4, "big") + b"\x00"
+      elif nObject in dictCompressed:
+         nObjStm, nIndex = dictCompressed[nObject]
+         bEntries = bEntries + bytes([2]) + nObjStm.to_bytes(4, "big") + bytes([nIndex])
+      else:
+         bEntries = bEntries + b"\x00\x00\x00\x00\x00\x00"
+   if bPredictor is True:
+      bRows = b""
+      bPrevious = bytes(6)
+      for nRow in range(0, len(bEntries), 6):
+         bRow = bEntries[nRow:nRow + 6]
+         bRows = bRows + b"\x02" + bytes((nByte - nPrevious) & 0xFF for nByte, nPrevious in zip(bRow, bPrevious))
+         bPrevious = bRow
+      bEntries = bRows
+      bTrailerEntries = bTrailerEntries + b" /DecodeParms << /Columns 6 /Predictor 12 >>"
+   bData = zlib.compress(bEntries)
+   bPDF = bPDF + b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 1] " % (nXRefObject, nXRefObject + 1) + bTrailerEntries
+   bPDF = bPDF + b" /Filter /FlateDecode /Length %d >>\nstream\n" % len(bData) + bData + b"\nendstream\nendobj\n"
+   bPDF = bPDF + b"startxref\n%d\n%%%%EOF\n" % nXRef
+   return bPDF
+
+def WritePDF(tmp_path, bPDF=b""):
+   sPDFFile = str(tmp_path / "fixture.pdf")
+   with open(sPDFFile, "wb") as hPDFFile:
+      hPDFFile.write(bPDF)
+   return sPDFFile
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_classic_xref(tmp_path):
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(7))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 7
+
+def test_object_number_is_not_a_prefix_match(tmp_path):
+   # object 12 ends with "2 0 obj" as well; only object 2 is the root of the page tree
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(12, PagesObject(99)), (1, CATALOG), (2, PagesObject(3))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 3
+
+def test_xref_stream(tmp_path):
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.5\n", [(1, CATALOG), (2, PagesObject(12))])
+   bPDF = AppendXRefStream(bPDF, dictOffsets, 3, b"/Root 1 0 R")
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 12
+
+def test_xref_stream_with_predictor(tmp_path):
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.5\n", [(1, CATALOG), (2, PagesObject(15))])
+   bPDF = AppendXRefStream(bPDF, dictOffsets, 3, b"/Root 1 0 R", bPredictor=True)
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 15
+
+def ObjectStream(listObjects=[]):
+   """Returns a compressed object stream containing the objects ``(nObject, bContent)``.
+   """
+   bHeader = b""
+   bObjects = b""
+   for nObject, bContent in listObjects:
+      bHeader = bHeader + b"%d %d " % (nObject, len(bObjects))
+      bObjects = bObjects + bContent + b"\n"
+   bData = zlib.compress(bHeader + bObjects)
+   return b"<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n" % (len(listObjects), len(bHeader), len(bData)) + bData + b"\nendstream"
+
+def test_object_stream(tmp_path):
+   # catalog and root of the page tree are stored within a compressed object stream (object 3)
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.5\n", [(3, ObjectStream([(1, CATALOG), (2, PagesObject(42))]))])
+   bPDF = AppendXRefStream(bPDF, dictOffsets, 4, b"/Root 1 0 R", {1 : (3, 0), 2 : (3, 1)})
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 42
+
+def test_hybrid_xref(tmp_path):
+   # cross reference table with an additional cross reference stream (/XRefStm) listing the objects within object streams
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.5\n", [(1, CATALOG), (3, ObjectStream([(2, PagesObject(21))]))])
+   nXRefStm = len(bPDF)
+   bPDF = AppendXRefStream(bPDF, dictOffsets, 4, b"", {2 : (3, 0)})
+   dictOffsets[4] = nXRefStm
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R /XRefStm %d" % nXRefStm)
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 21
+
+def test_object_located_by_xref_offset(tmp_path):
+   # the object definition the cross reference points to is used, not the last occurrence of '2 0 obj' within the file
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(8))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   bPDF = bPDF + b"%% unreferenced garbage\n2 0 obj\n" + PagesObject(99) + b"\nendobj\n"
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 8
+
+def test_incremental_update(tmp_path):
+   # the update redefines the root of the page tree; the last definition is valid
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(2))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   bPDF, dictOffsets = AppendObjects(bPDF, [(2, PagesObject(5))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R /Prev %d" % nXRef)
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 5
+
+def test_incremental_update_root_in_previous_trailer(tmp_path):
+   # the trailer of the update has no /Root entry; the /Prev chain leads to the trailer containing it
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(2))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   bPDF, dictOffsets = AppendObjects(bPDF, [(2, PagesObject(9))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Prev %d" % nXRef)
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 9
+
+def test_damaged_xref_offset(tmp_path):
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(4))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   bPDF = bPDF.replace(b"startxref\n%d\n" % nXRef, b"startxref\n999999\n")
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) == 4
+
+@pytest.mark.parametrize("bPDF", [b"", b"%PDF-1.4\nno objects\n", b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer << /Root 1 0 R >>\n"])
+def test_unparsable(tmp_path, bPDF):
+   assert CPDFPageCount.ParsePageCount(WritePDF(tmp_path, bPDF)) is None
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_page_count_cache(tmp_path, monkeypatch):
+   bPDF, dictOffsets = AppendObjects(b"%PDF-1.4\n", [(1, CATALOG), (2, PagesObject(6))])
+   bPDF, nXRef = AppendXRefTable(bPDF, dictOffsets, b"/Root 1 0 R")
+   sPDFFile = WritePDF(tmp_path, bPDF)
+   sCacheFolder = str(tmp_path / "cache")
+
+   oPDFPageCount = CPDFPageCount(sCacheFolder)
+   nPageCount, bSuccess, sResult = oPDFPageCount.GetPageCount(sPDFFile)
+   assert (nPageCount, bSuccess) == (6, True)
+   oPDFPageCount.Save()
+
+   # the second instance takes the page count from the cache file (the PDF file is not parsed)
+   def ParsePageCount(sPDFFile=None):
+      raise AssertionError("PDF file parsed in spite of cached page count")
+   monkeypatch.setattr(CPDFPageCount, "ParsePageCount", staticmethod(ParsePageCount))
+   nPageCount, bSuccess, sResult = CPDFPageCount(sCacheFolder).GetPageCount(sPDFFile)
+   assert (nPageCount, bSuccess) == (6, True)
+
+# --------------------------------------------------------------------------------------------------------------
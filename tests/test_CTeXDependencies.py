@@ -0,0 +1,155 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CTeXDependencies.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CTeXDependencies`` (static dependency scanner of the book sources).
+"""
+
+import os
+
+from PythonExtensionsCollection.String.CString import CString
+
+from maindoc.CTeXDependencies import CTeXDependencies
+
+# --------------------------------------------------------------------------------------------------------------
+
+def WriteFile(sFile=None, sContent=""):
+   os.makedirs(os.path.dirname(sFile), exist_ok=True)
+   with open(sFile, "w", encoding="utf-8") as hFile:
+      hFile.write(sContent)
+   return CString.NormalizePath(sFile)
+
+def NewConfig(sBookSourcesFolder=None, sCacheFolder=None, sOutputFolder=None):
+   sBookSourcesFolder = CString.NormalizePath(sBookSourcesFolder)
+   dictMainDocConfig = {'BOOKSOURCES' : sBookSourcesFolder, 'MAINTEXFILENAME' : "main.tex", 'CACHEFOLDER' : sCacheFolder}
+   if sOutputFolder is not None:
+      dictMainDocConfig['OUTPUTFOLDER'] = CString.NormalizePath(sOutputFolder)
+   return dictMainDocConfig
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_references(tmp_path):
+   sBook = str(tmp_path / "book")
+   sMain = WriteFile(f"{sBook}/main.tex", "\\documentclass{report}\n"
+                                          "\\usepackage{styles/common}\n"
+                                          "\\usepackage{hyperref,graphicx}\n"
+                                          "\\begin{document}\n"
+                                          "\\include{include/chapter}\n"
+                                          "% \\input{include/commented_out}\n"
+                                          "\\includepdf[pages=-]{appendix/doc}\n"
+                                          "\\end{document}\n")
+   sStyle    = WriteFile(f"{sBook}/styles/common.sty", "\\RequirePackage{xcolor}\n")
+   sChapter  = WriteFile(f"{sBook}/include/chapter.tex", "\\input{include/section.tex}\n\\includegraphics[width=2cm]{img/logo}\n")
+   sSection  = WriteFile(f"{sBook}/include/section.tex", "text\n")
+   sLogo     = WriteFile(f"{sBook}/img/logo.png", "png")
+   sAppendix = WriteFile(f"{sBook}/appendix/doc.pdf", "pdf")
+   WriteFile(f"{sBook}/unreferenced.pdf", "output of another job")
+
+   oTeXDependencies = CTeXDependencies(NewConfig(sBook))
+   bSuccess, sResult = oTeXDependencies.Scan()
+   assert bSuccess is True, sResult
+   assert oTeXDependencies.GetFiles() == sorted([sMain, sStyle, sChapter, sSection, sLogo, sAppendix])
+   assert oTeXDependencies.GetDependencies(sChapter) == [sSection, sLogo]
+   assert oTeXDependencies.GetDependents(sLogo) == [sChapter]
+   assert oTeXDependencies.GetMissingFiles() == []
+   listGraphics = oTeXDependencies.GetReferences("includegraphics")
+   assert [(dictReference['ARGUMENT'], dictReference['DEPENDENCY'], dictReference['LINE']) for dictReference in listGraphics] == [("img/logo", sLogo, 2)]
+
+def test_missing_and_generated_files(tmp_path):
+   sBook = str(tmp_path / "book")
+   WriteFile(f"{sBook}/main.tex", "\\input{./generated/version}\n"
+                                  "\\input{./externaldocs/imports}\n"
+                                  "\\input{./include/missing}\n"
+                                  "\\includegraphics{./img/nothere}\n")
+   sGeneratedFile   = CString.NormalizePath(f"{sBook}/generated/version.tex")
+   sGeneratedFolder = CString.NormalizePath(f"{sBook}/externaldocs")
+
+   oTeXDependencies = CTeXDependencies(NewConfig(sBook))
+   bSuccess, sResult = oTeXDependencies.Scan([sGeneratedFile, sGeneratedFolder])
+   assert bSuccess is True, sResult
+   assert sGeneratedFile in oTeXDependencies.GetFiles()
+   assert f"{sGeneratedFolder}/imports.tex" in oTeXDependencies.GetFiles()
+   assert oTeXDependencies.FormatMissingFiles().splitlines() == ["main.tex:3: \\input{./include/missing}",
+                                                                 "main.tex:4: \\includegraphics{./img/nothere}"]
+
+def test_graphicspath(tmp_path):
+   sBook = str(tmp_path / "book")
+   # the declaration of the search path is scanned after the reference (breadth first), but is valid for all graphics
+   WriteFile(f"{sBook}/main.tex", "\\input{styles/preamble}\n"
+                                  "\\includegraphics{logo}\n"
+                                  "\\includegraphics{diagram.pdf}\n"
+                                  "\\includegraphics{local}\n"
+                                  "\\includegraphics{unknown}\n")
+   WriteFile(f"{sBook}/styles/preamble.tex", "\\graphicspath{ {./img/}{./pictures/} }\n")
+   sLogo    = WriteFile(f"{sBook}/pictures/logo.jpg", "jpg")
+   sDiagram = WriteFile(f"{sBook}/img/diagram.pdf", "pdf")
+   sLocal   = WriteFile(f"{sBook}/local.png", "png")
+   WriteFile(f"{sBook}/img/local.png", "png (not used; the book sources folder is searched first)")
+
+   oTeXDependencies = CTeXDependencies(NewConfig(sBook))
+   bSuccess, sResult = oTeXDependencies.Scan()
+   assert bSuccess is True, sResult
+   dictGraphics = {dictReference['ARGUMENT'] : dictReference['DEPENDENCY'] for dictReference in oTeXDependencies.GetReferences("includegraphics")}
+   assert dictGraphics == {"logo" : sLogo, "diagram.pdf" : sDiagram, "local" : sLocal}
+   assert [dictMissingFile['ARGUMENT'] for dictMissingFile in oTeXDependencies.GetMissingFiles()] == ["unknown"]
+
+def test_output_folder_first(tmp_path):
+   # in case of a variant build the files generated for the variant are taken from the output folder
+   sBook   = str(tmp_path / "book")
+   sOutput = str(tmp_path / "variant")
+   WriteFile(f"{sBook}/main.tex", "\\input{./BundleVersionDate}\n")
+   WriteFile(f"{sBook}/BundleVersionDate.tex", "book sources\n")
+   sVariantFile = WriteFile(f"{sOutput}/BundleVersionDate.tex", "variant\n")
+
+   oTeXDependencies = CTeXDependencies(NewConfig(sBook, sOutputFolder=sOutput))
+   bSuccess, sResult = oTeXDependencies.Scan()
+   assert bSuccess is True, sResult
+   assert sVariantFile in oTeXDependencies.GetFiles()
+
+def test_cache(tmp_path):
+   sBook  = str(tmp_path / "book")
+   sCache = str(tmp_path / "cache")
+   sMain = WriteFile(f"{sBook}/main.tex", "\\input{include/a}\n")
+   WriteFile(f"{sBook}/include/a.tex", "a\n")
+   WriteFile(f"{sBook}/include/b.tex", "b\n")
+
+   bSuccess, sResult = CTeXDependencies(NewConfig(sBook, sCache)).Scan()
+   assert bSuccess is True, sResult
+   assert os.path.isfile(f"{sCache}/tex_dependencies.json")
+
+   # a changed file is parsed again (size and modification time differ from the cached ones)
+   WriteFile(sMain, "\\input{include/a}\n\\input{include/b}\n")
+   oTeXDependencies = CTeXDependencies(NewConfig(sBook, sCache))
+   bSuccess, sResult = oTeXDependencies.Scan()
+   assert bSuccess is True, sResult
+   assert CString.NormalizePath(f"{sBook}/include/b.tex") in oTeXDependencies.GetFiles()
+
+def test_missing_main_tex_file(tmp_path):
+   bSuccess, sResult = CTeXDependencies(NewConfig(str(tmp_path))).Scan()
+   assert bSuccess is False
+
+# --------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,190 @@
+# **************************************************************************************************************
+#
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+# **************************************************************************************************************
+#
+# test_CWorkQueue.py
+#
+# XC-HWP/ESW3-Queckenstedt
+#
+# 18.10.2026
+#
+# --------------------------------------------------------------------------------------------------------------
+
+"""
+Unit tests of ``CWorkQueue`` and ``CQueueWorker`` (file based work queue of the multi node build).
+
+The package doc generator is replaced by a function that records the jobs; several workers are executed as threads
+sharing the queue folder.
+"""
+
+import os, time, json, threading
+
+import pytest
+
+import maindoc.CWorkQueue
+import maindoc.CExternalDocRenderer
+from maindoc.CWorkQueue import CWorkQueue, CQueueWorker
+
+# --------------------------------------------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def FastQueue(monkeypatch):
+   monkeypatch.setattr(maindoc.CWorkQueue, "QUEUE_POLL_INTERVAL", 0.05)
+   monkeypatch.setattr(maindoc.CWorkQueue, "CLAIM_HEARTBEAT", 0.05)
+
+def FakeRenderRepository(listExecuted=[], Action=None):
+   """Returns a replacement of ``RenderRepository()``, that records the executed jobs (tuples ``(sRunFolder, sJobId, sClaimToken)``)
+and writes a PDF file into the artifact folder. ``Action`` is called with these values before the job completes.
+   """
+   oLock = threading.Lock()
+   def RenderRepository(dictJob=None, oCancelEvent=None):
+      sArtifactFolder = dictJob['DESTINATIONFOLDER']
+      sRunFolder = os.path.dirname(os.path.dirname(sArtifactFolder))
+      sJobId, sClaimToken = os.path.basename(sArtifactFolder).rsplit(".", 1)
+      with oLock:
+         listExecuted.append((sRunFolder, sJobId, sClaimToken))
+      if Action is not None:
+         Action(sRunFolder, sJobId, sClaimToken)
+      os.makedirs(sArtifactFolder, exist_ok=True)
+      sPDFFile = f"{sArtifactFolder}/{dictJob['NAME']}.pdf"
+      with open(sPDFFile, "w", encoding="utf-8") as hFile:
+         hFile.write(dictJob['NAME'])
+      return {'bSuccess' : True, 'sResult' : "done", 'STATUS' : "OK", 'DURATION' : 0.0,
+              'PDFFILE' : sPDFFile, 'JSONFILE' : None, 'LOGFILE' : None}
+   return RenderRepository
+
+def RunWorkers(sQueueFolder=None, nWorkers=1, nIdleTimeout=1):
+   listThreads = [threading.Thread(target=CQueueWorker(sQueueFolder, nIdleTimeout).Run) for nWorker in range(nWorkers)]
+   for oThread in listThreads:
+      oThread.start()
+   for oThread in listThreads:
+      oThread.join()
+
+def WriteClaim(sRunFolder=None, sJobId=None, sClaimToken=None, fAge=0):
+   """Writes a claim file as written by a worker; ``fAge``: seconds since the last heartbeat.
+   """
+   sClaimFile = f"{sRunFolder}/claims/{sJobId}.lock"
+   with open(sClaimFile, "w", encoding="utf-8") as hFile:
+      hFile.write(f"other-host:1\n{sClaimToken}\n")
+   fTime = time.time() - fAge
+   os.utime(sClaimFile, (fTime, fTime))
+   return sClaimFile
+
+# --------------------------------------------------------------------------------------------------------------
+#TM***
+
+def test_several_workers(tmp_path, monkeypatch):
+   listExecuted = []
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository(listExecuted))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   listJobIds = [f"{nJob:04d}_repo" for nJob in range(12)]
+   for sJobId in listJobIds:
+      oWorkQueue.Submit(sJobId, {'NAME' : sJobId})
+
+   RunWorkers(str(tmp_path), nWorkers=4)
+
+   # every job is claimed and executed exactly once
+   assert sorted(tupleJob[1] for tupleJob in listExecuted) == listJobIds
+   listResults = oWorkQueue.GetResults()
+   assert sorted(sJobId for sJobId, dictResult, sArtifactFolder in listResults) == listJobIds
+   for sJobId, dictResult, sArtifactFolder in listResults:
+      with open(f"{sArtifactFolder}/{dictResult['PDFFILE']}", encoding="utf-8") as hFile:
+         assert hFile.read() == sJobId
+   assert oWorkQueue.GetResults() == []
+   oWorkQueue.Close()
+   assert os.listdir(str(tmp_path)) == []
+
+def test_heartbeat(tmp_path, monkeypatch):
+   listHeartbeats = []
+   def Action(sRunFolder=None, sJobId=None, sClaimToken=None):
+      sClaimFile = f"{sRunFolder}/claims/{sJobId}.lock"
+      fTime = time.time() - 3600
+      os.utime(sClaimFile, (fTime, fTime))
+      time.sleep(0.5)
+      listHeartbeats.append(time.time() - os.path.getmtime(sClaimFile))
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository([], Action))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   oWorkQueue.Submit("job", {'NAME' : "job"})
+
+   RunWorkers(str(tmp_path))
+
+   # the claim has been refreshed while the job was executed, therefore it is not recovered as stale
+   assert listHeartbeats[0] < 60
+   assert oWorkQueue.RecoverStaleClaims() == []
+   assert [sJobId for sJobId, dictResult, sArtifactFolder in oWorkQueue.GetResults()] == ["job"]
+
+def test_recover_stale_claims(tmp_path, monkeypatch):
+   listExecuted = []
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository(listExecuted))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   sRunFolder = oWorkQueue.GetRunFolder()
+   for sJobId in ("abandoned", "running", "done"):
+      oWorkQueue.Submit(sJobId, {'NAME' : sJobId})
+   # (claims of other workers: without heartbeat for a long time, refreshed recently, and one of a completed job)
+   WriteClaim(sRunFolder, "abandoned", "token1", fAge=3600)
+   WriteClaim(sRunFolder, "running", "token2")
+   WriteClaim(sRunFolder, "done", "token3", fAge=3600)
+   with open(f"{sRunFolder}/results/done.json", "w", encoding="utf-8") as hFile:
+      json.dump({'STATUS' : "OK"}, hFile)
+
+   assert oWorkQueue.RecoverStaleClaims() == ["abandoned"]
+   RunWorkers(str(tmp_path))
+   assert [tupleJob[1] for tupleJob in listExecuted] == ["abandoned"]
+   assert sorted(sJobId for sJobId, dictResult, sArtifactFolder in oWorkQueue.GetResults()) == ["abandoned", "done"]
+
+def test_released_claim_discards_result(tmp_path, monkeypatch):
+   def Action(sRunFolder=None, sJobId=None, sClaimToken=None):
+      # the coordinator recovers the claim during the execution, and another worker claims the job
+      os.replace(f"{sRunFolder}/claims/{sJobId}.lock", f"{sRunFolder}/claims/{sJobId}.lock.stale")
+      WriteClaim(sRunFolder, sJobId, "other")
+   listExecuted = []
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository(listExecuted, Action))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   sRunFolder = oWorkQueue.GetRunFolder()
+   oWorkQueue.Submit("job", {'NAME' : "job"})
+
+   RunWorkers(str(tmp_path))
+   assert len(listExecuted) == 1
+   assert oWorkQueue.GetResults() == []
+   assert os.listdir(f"{sRunFolder}/artifacts") == []
+
+def test_single_result_per_job(tmp_path, monkeypatch):
+   def Action(sRunFolder=None, sJobId=None, sClaimToken=None):
+      # another worker (claim released in the meantime) published a result of the job first
+      with open(f"{sRunFolder}/results/{sJobId}.json", "w", encoding="utf-8") as hFile:
+         json.dump({'WORKER' : "other", 'ARTIFACTFOLDER' : f"{sJobId}.other"}, hFile)
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository([], Action))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   sRunFolder = oWorkQueue.GetRunFolder()
+   oWorkQueue.Submit("job", {'NAME' : "job"})
+
+   RunWorkers(str(tmp_path))
+   assert [dictResult['WORKER'] for sJobId, dictResult, sArtifactFolder in oWorkQueue.GetResults()] == ["other"]
+   assert os.listdir(f"{sRunFolder}/results") == ["job.json"]
+   assert os.listdir(f"{sRunFolder}/artifacts") == []
+
+def test_cancel(tmp_path, monkeypatch):
+   listExecuted = []
+   monkeypatch.setattr(maindoc.CExternalDocRenderer, "RenderRepository", FakeRenderRepository(listExecuted))
+   oWorkQueue = CWorkQueue(str(tmp_path))
+   oWorkQueue.Submit("job", {'NAME' : "job"})
+   oWorkQueue.Cancel()
+
+   RunWorkers(str(tmp_path))
+   assert listExecuted == []
+
+# --------------------------------------------------------------------------------------------------------------